@@ -0,0 +1,125 @@
+# benchmarks/bench_academy_locator.py
+
+# BENCHMARK DO LOCALIZADOR DE ACADEMIAS ("ONDE TREINAR")
+# Gera um CSV sintético de academias (padrão: 100 mil) em torno de capitais
+# brasileiras e compara, por consulta:
+#   - "perto de mim" (k mais próximas): KDTree vs. varredura haversine de todas;
+#   - busca por texto a cada tecla ("k", "kr", "kra", ...): índice de prefixos
+#     vs. varredura dos nomes normalizados;
+#   - busca por texto ordenada pela distância ao aluno.
+# Reporta p50/p95 em milissegundos e o tempo de carga (CSV + índices).
+#
+# Uso:
+#   python benchmarks/bench_academy_locator.py --academies 100000
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.academy_locator import EARTH_RADIUS_KM, AcademyLocator, normalize_text
+from synthetic import ACADEMY_CITIES, write_academies_csv
+
+# Sequências de teclas digitadas pelo aluno.
+TYPED_QUERIES = ["krav maga sul", "sao paulo", "escola jardim", "porto alegre", "instituto lago 42"]
+
+
+def percentiles(samples: list) -> dict:
+    values = np.array(samples) * 1000
+    return {"p50_ms": round(float(np.percentile(values, 50)), 4), "p95_ms": round(float(np.percentile(values, 95)), 4)}
+
+
+def timed(function, repeats: int = 5) -> list:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas do localizador de academias.")
+    parser.add_argument("--academies", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    rng = np.random.default_rng(1)
+
+    workdir = tempfile.mkdtemp(prefix="bench_academias_")
+    try:
+        path = os.path.join(workdir, "academias.csv")
+        write_academies_csv(path, args.academies)
+        start = time.perf_counter()
+        locator = AcademyLocator.from_csv(path)
+        load_time = time.perf_counter() - start
+
+        # Estruturas da varredura linear (o que a tela faria sem índices).
+        lat = np.radians([r["LATITUDE"] for r in locator.records])
+        lon = np.radians([r["LONGITUDE"] for r in locator.records])
+        names = [" ".join(normalize_text(f"{r['NOME']} {r['CIDADE']} {r['UF']}")) for r in locator.records]
+
+        def scan_nearest(plat, plon, k=10):
+            plat, plon = np.radians(plat), np.radians(plon)
+            a = np.sin((lat - plat) / 2) ** 2 + np.cos(plat) * np.cos(lat) * np.sin((lon - plon) / 2) ** 2
+            distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+            top = np.argpartition(distances, k)[:k]
+            return top[np.argsort(distances[top])]
+
+        def scan_text(query, limit=20):
+            terms = normalize_text(query)
+            found = []
+            for i, text in enumerate(names):
+                words = text.split()
+                if all(any(w.startswith(t) for w in words) for t in terms):
+                    found.append(i)
+                    if len(found) == limit:
+                        break
+            return found
+
+        points = []
+        for _ in range(args.queries):
+            _, _, clat, clon = ACADEMY_CITIES[rng.integers(len(ACADEMY_CITIES))]
+            points.append((clat + rng.normal(0, 0.3), clon + rng.normal(0, 0.3)))
+
+        tree_nearest, linear_nearest, mismatches = [], [], 0
+        for plat, plon in points:
+            tree_nearest += timed(lambda: locator.nearest(plat, plon, k=10))
+            linear_nearest += timed(lambda: scan_nearest(plat, plon), repeats=1)
+            if [a["ID"] for a in locator.nearest(plat, plon, k=10)] != list(scan_nearest(plat, plon)):
+                mismatches += 1
+
+        keystrokes = [query[:n] for query in TYPED_QUERIES for n in range(1, len(query) + 1) if query[n - 1] != " "]
+        index_text, linear_text, near_text = [], [], []
+        for query in keystrokes:
+            index_text += timed(lambda: locator.search(query))
+            linear_text += timed(lambda: scan_text(query), repeats=1)
+            near_text += timed(lambda: locator.search(query, near=points[0]))
+
+        report = {
+            "academias": len(locator),
+            "carga_csv_e_indices_s": round(load_time, 2),
+            "perto_de_mim_kdtree": percentiles(tree_nearest),
+            "perto_de_mim_varredura": percentiles(linear_nearest),
+            "perto_de_mim_divergencias": mismatches,
+            "teclas_digitadas": len(keystrokes),
+            "texto_indice_prefixos": percentiles(index_text),
+            "texto_varredura": percentiles(linear_text),
+            "texto_ordenado_por_distancia": percentiles(near_text),
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
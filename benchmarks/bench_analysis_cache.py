@@ -0,0 +1,87 @@
+# benchmarks/bench_analysis_cache.py
+
+# BENCHMARK DO CACHE DE RESULTADOS DE ANÁLISE
+# Analisa um par de vídeos sintéticos com o MediaPipe e repete a análise do
+# mesmo conteúdo (com outro nome de arquivo, como um reenvio do aluno) usando
+# o mesmo cache em disco. Mede o tempo da primeira análise (miss), da repetição
+# (hit) e o tamanho da entrada gravada.
+#
+# Uso:
+#   python benchmarks/bench_analysis_cache.py --frames 90 --repeats 3
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from synthetic import write_stick_figure_video
+
+
+def timed_analysis(analyzer, videos) -> float:
+    analyzer.load_video_from_path(videos[0], is_aluno=True)
+    analyzer.load_video_from_path(videos[1], is_aluno=False)
+    start = time.perf_counter()
+    analyzer.run_analysis()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primeira análise x análise repetida com cache.")
+    parser.add_argument("--frames", type=int, default=90)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.analysis_cache import AnalysisCache
+    from src.video_analyzer import VideoAnalyzer
+
+    workdir = tempfile.mkdtemp(prefix="bench_cache_")
+    videos = (os.path.join(workdir, "aluno.avi"), os.path.join(workdir, "mestre.avi"))
+    write_stick_figure_video(videos[0], args.frames, width=640, height=480, variant=1)
+    write_stick_figure_video(videos[1], args.frames, width=640, height=480, variant=0)
+    cache = AnalysisCache(os.path.join(workdir, "cache"))
+
+    analyzer = VideoAnalyzer(cache=cache)
+    miss_s = timed_analysis(analyzer, videos)
+
+    hit_times = []
+    for i in range(args.repeats):
+        resent = tuple(os.path.join(workdir, f"reenvio{i}_{os.path.basename(v)}") for v in videos)
+        for source, target in zip(videos, resent):
+            shutil.copyfile(source, target)
+        repeated = VideoAnalyzer(cache=cache)
+        hit_times.append(timed_analysis(repeated, resent))
+        assert repeated.cache_hit
+        repeated.close()
+        # O cache guarda as pontuações em float32 (formato de sessão).
+        max_score_diff = max(
+            abs(a["score"] - b["score"])
+            for a, b in zip(repeated.comparison_results, analyzer.comparison_results)
+        )
+
+    analyzer.close()
+    hit_s = min(hit_times)
+    results = {
+        "frames": args.frames,
+        "resolucao": "640x480",
+        "primeira_analise_s": round(miss_s, 3),
+        "analise_repetida_ms": round(hit_s * 1000, 1),
+        "aceleracao": round(miss_s / hit_s, 1),
+        "entrada_no_cache_kb": round(cache.total_bytes / 1024, 1),
+        "maior_diferenca_de_pontuacao": max_score_diff,
+        "hits": cache.hits,
+        "misses": cache.misses,
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
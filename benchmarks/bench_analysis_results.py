@@ -0,0 +1,129 @@
+# benchmarks/bench_analysis_results.py
+
+# BENCHMARK DA LEITURA DE RESULTADOS PARCIAIS
+# Compara duas formas de a interface ler os resultados enquanto a análise roda:
+#   - "copia_das_listas": copia as listas do VideoAnalyzer (comparison_results e
+#     landmarks) a cada atualização e monta o array de pontuações, o único jeito
+#     seguro de lê-las sem travas; o custo cresce com o histórico;
+#   - "snapshot": AnalysisResults.snapshot() e leitura só dos frames novos desde
+#     a atualização anterior.
+# Mede o custo de uma atualização com históricos de tamanhos diferentes e, com
+# uma thread escritora real, quantas leituras das listas saíram inconsistentes
+# (tamanhos diferentes entre as listas) contra nenhuma nos snapshots.
+#
+# Uso:
+#   python benchmarks/bench_analysis_results.py --frames 1000 10000 50000
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.analysis_results import AnalysisResults
+from src.config import KEY_ANGLE_DEFINITIONS
+
+ANGLES = list(KEY_ANGLE_DEFINITIONS)
+LANDMARKS = [{"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 1.0}] * 33
+DIFFS = {name: 3.0 for name in ANGLES}
+
+
+class LegacyLists:
+    """As listas do VideoAnalyzer, preenchidas uma de cada vez como no loop da análise."""
+
+    def __init__(self):
+        self.aluno_landmarks_list = []
+        self.mestre_landmarks_list = []
+        self.comparison_results = []
+
+    def append(self, score: float):
+        self.aluno_landmarks_list.append(LANDMARKS)
+        self.mestre_landmarks_list.append(LANDMARKS)
+        self.comparison_results.append({"score": score, "feedback": "", "diffs": DIFFS})
+
+    def read(self) -> tuple:
+        results = list(self.comparison_results)
+        aluno = list(self.aluno_landmarks_list)
+        scores = np.array([r["score"] for r in results], dtype=np.float32)
+        return len(results), len(aluno), scores
+
+
+def refresh_cost(num_frames: int, repeats: int) -> dict:
+    """Custo médio (ms) de uma atualização da interface com 'num_frames' no histórico."""
+    legacy = LegacyLists()
+    results = AnalysisResults(num_frames + 1, ANGLES)
+    for i in range(num_frames):
+        legacy.append(float(i))
+        results.append(float(i), "", DIFFS, LANDMARKS, LANDMARKS)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        legacy.read()
+    legacy_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        snapshot = results.snapshot()
+        # Um frame novo desde a atualização anterior, mais as estatísticas do gráfico.
+        snapshot.frame_results(snapshot.num_frames - 1)
+        float(snapshot.scores.mean())
+    snapshot_ms = (time.perf_counter() - start) / repeats * 1000
+    return {
+        "frames_no_historico": num_frames,
+        "copia_das_listas_ms": round(legacy_ms, 3),
+        "snapshot_ms": round(snapshot_ms, 3),
+    }
+
+
+def torn_reads(num_frames: int) -> dict:
+    """Leituras inconsistentes com uma thread escritora e uma leitora concorrentes."""
+    legacy = LegacyLists()
+    results = AnalysisResults(num_frames, ANGLES)
+    done = threading.Event()
+    stats = {"leituras_listas": 0, "listas_inconsistentes": 0, "leituras_snapshot": 0, "snapshots_inconsistentes": 0}
+
+    def reader():
+        while not done.is_set():
+            # Leitura crua das listas, sem copiar: tamanhos lidos em instantes diferentes.
+            if len(legacy.comparison_results) != len(legacy.aluno_landmarks_list):
+                stats["listas_inconsistentes"] += 1
+            stats["leituras_listas"] += 1
+            snapshot = results.snapshot()
+            last = snapshot.num_frames - 1
+            if last >= 0 and (snapshot.scores[last] != last or np.isnan(snapshot.aluno_landmarks[last, 0, 0])):
+                stats["snapshots_inconsistentes"] += 1
+            stats["leituras_snapshot"] += 1
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(num_frames):
+        legacy.append(float(i))
+        results.append(float(i), "", DIFFS, LANDMARKS, LANDMARKS)
+    done.set()
+    thread.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leitura de resultados parciais da análise.")
+    parser.add_argument("--frames", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--concurrent-frames", type=int, default=20000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    report = {
+        "atualizacao": [refresh_cost(n, args.repeats) for n in args.frames],
+        "concorrencia": torn_reads(args.concurrent_frames),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
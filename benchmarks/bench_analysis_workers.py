@@ -0,0 +1,139 @@
+# benchmarks/bench_analysis_workers.py
+
+# BENCHMARK DA RESPONSIVIDADE DO SERVIDOR DURANTE ANÁLISES
+# Uma thread "sonda" faz o papel do laço de eventos da interface: acorda a cada
+# 20 ms e mede o atraso em relação ao horário previsto. O atraso é medido em:
+#   - ocioso: nenhuma análise em andamento (referência);
+#   - thread: N análises com VideoAnalyzer.analyze_and_compare, em threads do
+#     próprio processo (configuração anterior);
+#   - processos: as mesmas N análises enviadas à fila e executadas pelo
+#     AnalysisWorkerPool em processos separados.
+# Informa o atraso da sonda (p50/p95/máximo) e o tempo total das análises.
+#
+# Uso:
+#   python benchmarks/bench_analysis_workers.py --jobs 2 --workers 2 --frames 90
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from synthetic import write_stick_figure_video
+
+PROBE_INTERVAL = 0.02
+
+
+class LatencyProbe:
+    """Thread que mede o atraso de acordar a cada PROBE_INTERVAL segundos."""
+
+    def __init__(self):
+        self.delays_ms = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        expected = time.perf_counter() + PROBE_INTERVAL
+        while not self._stop.is_set():
+            time.sleep(max(expected - time.perf_counter(), 0))
+            now = time.perf_counter()
+            self.delays_ms.append((now - expected) * 1000)
+            expected = now + PROBE_INTERVAL
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def report(self) -> dict:
+        delays = sorted(self.delays_ms)
+        return {
+            "atraso_p50_ms": round(statistics.median(delays), 2),
+            "atraso_p95_ms": round(delays[int(len(delays) * 0.95) - 1], 2),
+            "atraso_max_ms": round(delays[-1], 2),
+        }
+
+
+def run_idle(seconds):
+    with LatencyProbe() as probe:
+        time.sleep(seconds)
+    return probe.report()
+
+
+def run_threads(videos, num_jobs):
+    from src.video_analyzer import VideoAnalyzer
+
+    analyzers = [VideoAnalyzer() for _ in range(num_jobs)]
+    start = time.perf_counter()
+    with LatencyProbe() as probe:
+        for analyzer in analyzers:
+            analyzer.load_video_from_path(videos[0], is_aluno=True)
+            analyzer.load_video_from_path(videos[1], is_aluno=False)
+            analyzer.analyze_and_compare(lambda: None)
+        for analyzer in analyzers:
+            analyzer.processing_thread.join()
+            analyzer.close()
+    return {"total_s": round(time.perf_counter() - start, 2), **probe.report()}
+
+
+def run_processes(videos, num_jobs, num_workers, workdir):
+    from src.analysis_jobs import AnalysisWorkerPool
+
+    pool = AnalysisWorkerPool(
+        num_workers=num_workers,
+        db_path=os.path.join(workdir, "fila.sqlite3"),
+        results_dir=os.path.join(workdir, "resultados"),
+        poll_interval=0.1,
+        # Os jobs repetem o mesmo par de vídeos; o cache esconderia o custo da análise.
+        use_cache=False,
+        log_dir=os.path.join(workdir, "logs"),
+    )
+    start = time.perf_counter()
+    with LatencyProbe() as probe:
+        pool.start()
+        job_ids = [pool.queue.submit(*videos) for _ in range(num_jobs)]
+        jobs = [pool.queue.wait(job_id) for job_id in job_ids]
+    total = time.perf_counter() - start
+    pool.stop()
+    return {
+        "total_s": round(total, 2),
+        # O pool limita os workers às vagas de CPU do governor.
+        "workers_usados": pool.num_workers,
+        "jobs_concluidos": sum(job.status == "concluido" for job in jobs),
+        **probe.report(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Responsividade do servidor durante análises.")
+    parser.add_argument("--jobs", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=90)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = tempfile.mkdtemp(prefix="bench_analysis_workers_")
+    videos = (os.path.join(workdir, "aluno.avi"), os.path.join(workdir, "mestre.avi"))
+    write_stick_figure_video(videos[0], args.frames, variant=1)
+    write_stick_figure_video(videos[1], args.frames, variant=0)
+
+    results = {"jobs": args.jobs, "workers": args.workers, "frames": args.frames, "cpus": os.cpu_count()}
+    results["ocioso"] = run_idle(2.0)
+    results["thread"] = run_threads(videos, args.jobs)
+    results["processos"] = run_processes(videos, args.jobs, args.workers, workdir)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_asset_sync.py
+
+# BENCHMARK DA SINCRONIZAÇÃO OFFLINE DOS ASSETS
+# Gera uma biblioteca sintética (PDFs e vídeos de várias faixas, conteúdo
+# aleatório), serve a pasta por HTTP local com suporte a Range e mede, com o
+# AssetSyncClient:
+#   - a primeira sincronização (tudo é baixado);
+#   - uma sincronização sem mudanças (só o manifesto trafega);
+#   - sincronizações depois de alterar 1 arquivo e 10% dos arquivos;
+#   - a regeração do manifesto no servidor, completa e incremental.
+# Para cada cenário: bytes enviados pelo servidor, tempo e a fração em relação
+# a baixar a biblioteca inteira de novo.
+#
+# Uso:
+#   python benchmarks/bench_asset_sync.py --files 60 --mb-per-file 1
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.asset_sync import AssetSyncClient, build_manifest, update_manifest
+from src.config import ASSET_MANIFEST_NAME, RANK_HIERARCHY
+from synthetic import LocalAssetServer
+
+
+def write_library(root: str, num_files: int, mb_per_file: float, rng: random.Random) -> list:
+    paths = []
+    ranks = list(RANK_HIERARCHY)
+    for rank in ranks:
+        path = os.path.join(root, "programa_tecnico", f"{rank}.pdf")
+        paths.append(path)
+    for i in range(max(num_files - len(ranks), 0)):
+        rank = ranks[i % len(ranks)]
+        paths.append(os.path.join(root, "videos_tecnicas", rank, f"tecnica_{i:03d}.mp4"))
+    for path in paths:
+        rewrite(path, mb_per_file, rng)
+    return paths
+
+
+def rewrite(path: str, mb_per_file: float, rng: random.Random):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    size = int(mb_per_file * (1 << 20) * rng.uniform(0.5, 1.5))
+    with open(path, "wb") as f:
+        f.write(rng.randbytes(size))
+
+
+def measure(server, client, ranks, library_bytes) -> dict:
+    server.reset_counters()
+    report = client.sync(ranks)
+    sent = server.stats["bytes_sent"]
+    return {
+        "arquivos_baixados": len(report.downloaded),
+        "mb_transferidos": round(sent / (1 << 20), 2),
+        "fracao_da_biblioteca": round(sent / library_bytes, 4),
+        "tempo_s": round(report.elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tráfego e tempo da sincronização incremental de assets.")
+    parser.add_argument("--files", type=int, default=60)
+    parser.add_argument("--mb-per-file", type=float, default=1.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(7)
+
+    workdir = tempfile.mkdtemp(prefix="bench_sync_")
+    try:
+        server_root = os.path.join(workdir, "servidor")
+        paths = write_library(server_root, args.files, args.mb_per_file, rng)
+        start = time.perf_counter()
+        update_manifest(server_root)
+        full_manifest = time.perf_counter() - start
+        library_bytes = sum(os.path.getsize(p) for p in paths)
+        ranks = list(RANK_HIERARCHY)
+
+        report = {
+            "arquivos": len(paths),
+            "biblioteca_mb": round(library_bytes / (1 << 20), 1),
+            "manifesto_kb": round(os.path.getsize(os.path.join(server_root, ASSET_MANIFEST_NAME)) / 1024, 1),
+            "manifesto_completo_s": round(full_manifest, 3),
+        }
+        with LocalAssetServer(server_root) as server:
+            client = AssetSyncClient(server.url(""), os.path.join(workdir, "celular"))
+            report["primeira_sincronizacao"] = measure(server, client, ranks, library_bytes)
+            report["sem_mudancas"] = measure(server, client, ranks, library_bytes)
+
+            rewrite(rng.choice(paths), args.mb_per_file, rng)
+            start = time.perf_counter()
+            update_manifest(server_root)
+            report["manifesto_incremental_s"] = round(time.perf_counter() - start, 3)
+            report["um_arquivo_alterado"] = measure(server, client, ranks, library_bytes)
+
+            for path in rng.sample(paths, max(1, len(paths) // 10)):
+                rewrite(path, args.mb_per_file, rng)
+            update_manifest(server_root)
+            report["dez_por_cento_alterados"] = measure(server, client, ranks, library_bytes)
+
+            # Aluno de faixa branca: só a sua faixa, mesmo com a biblioteca inteira no servidor.
+            beginner = AssetSyncClient(server.url(""), os.path.join(workdir, "iniciante"))
+            report["so_faixa_inicial"] = measure(server, beginner, ranks[:1], library_bytes)
+
+        # Conferência: o manifesto incremental é igual ao reconstruído do zero.
+        assert build_manifest(server_root)["files"] == json.load(
+            open(os.path.join(server_root, ASSET_MANIFEST_NAME), encoding="utf-8")
+        )["files"]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_drawing.py
+
+# BENCHMARK DO DESENHO DO ESQUELETO
+# Compara o custo por frame do desenho anterior (três chamadas a
+# mp_drawing.draw_landmarks sobre uma cópia do frame) com o SkeletonDrawer
+# vetorizado, com e sem cópia do frame.
+#
+# Uso:
+#   python benchmarks/bench_drawing.py --width 1920 --height 1080 --frames 500
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import mediapipe as mp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.pose_backends import landmarks_from_array
+from src.skeleton_drawer import SkeletonDrawer
+
+
+def _legacy_draw(image, pose_landmarks, groups, styles):
+    annotated = image.copy()
+    for connections, style in zip(groups, styles):
+        mp.solutions.drawing_utils.draw_landmarks(
+            annotated, pose_landmarks, connections, style, style
+        )
+    return annotated
+
+
+def _time_ms(func, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do desenho do esqueleto.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    landmarks = np.column_stack(
+        [rng.uniform(0.2, 0.8, (33, 3)), np.full(33, 0.9)]
+    ).astype(np.float32)
+    pose_landmarks = landmarks_from_array(landmarks)
+    image = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+
+    spec = mp.solutions.drawing_utils.DrawingSpec
+    connections = mp.solutions.pose.POSE_CONNECTIONS
+    names = POSE_LANDMARK_NAMES
+    left = {c for c in connections if "LEFT" in names[c[0]] and "LEFT" in names[c[1]]}
+    right = {c for c in connections if "RIGHT" in names[c[0]] and "RIGHT" in names[c[1]]}
+    groups = [left, right, connections - left - right]
+    styles = [
+        spec(color=color, thickness=2, circle_radius=2)
+        for color in [(0, 165, 255), (255, 100, 0), (255, 255, 255)]
+    ]
+
+    drawer = SkeletonDrawer()
+    results = {
+        "resolution": f"{args.width}x{args.height}",
+        "legacy_draw_landmarks_ms": _time_ms(
+            lambda: _legacy_draw(image, pose_landmarks, groups, styles), args.frames
+        ),
+        "vectorized_copy_ms": _time_ms(
+            lambda: drawer.draw_by_side(image, pose_landmarks), args.frames
+        ),
+        "vectorized_in_place_ms": _time_ms(
+            lambda: drawer.draw_by_side(image, pose_landmarks, in_place=True), args.frames
+        ),
+    }
+    results = {k: round(v, 3) if isinstance(v, float) else v for k, v in results.items()}
+    results["frame_budget_60fps_ms"] = round(1000 / 60, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_frame_delivery.py
+
+# BENCHMARK DA ENTREGA DE FRAMES DO ANALISADOR
+# Monta uma análise sintética de 5.000 frames (aluno | mestre em 1280x720,
+# com frames anotados reaproveitados de um conjunto pequeno para caber na
+# memória) e mede:
+#   - custo e tamanho de um frame no caminho ingênuo (PNG na resolução
+#     original + base64) contra o JPEG na largura de exibição;
+#   - navegações simuladas com o controle deslizante gerando pedidos em ritmo
+#     constante: arrasto rápido até o fim e de volta por um trecho
+#     (--scrub-hz, pulando frames) e avanço frame a frame (--step-hz, como
+#     ao reproduzir ou arrastar devagar). Reporta quantos frames chegaram à
+#     tela por segundo, a latência do pedido até a entrega e a fração das
+#     entregas que já estava codificada no cache.
+#
+# Uso:
+#   python benchmarks/bench_frame_delivery.py --frames 5000 --scrub-hz 240 --step-hz 30
+
+import argparse
+import base64
+import json
+import logging
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.analysis_results import AnalysisResults
+from src.frame_delivery import AnalysisFrameSource, FrameDelivery, JpegFrameEncoder
+from synthetic import draw_stick_figure, pose_to_landmarks, stick_figure_pose
+
+
+def synthetic_results(num_frames: int, width: int, height: int, distinct: int = 40) -> AnalysisResults:
+    poses = [stick_figure_pose(i / distinct) for i in range(distinct)]
+    # Textura de fundo: um frame de câmera real não é preto e liso como o boneco.
+    texture = np.random.default_rng(0).normal(90, 25, (height, width, 3)).clip(0, 255).astype(np.uint8)
+    frames = [cv2.add(draw_stick_figure(pose, width, height), texture) for pose in poses]
+    landmarks = [pose_to_landmarks(pose) for pose in poses]
+    results = AnalysisResults(num_frames, ["RIGHT_ELBOW_ANGLE"])
+    for i in range(num_frames):
+        k = i % distinct
+        results.append(90.0, "", {}, landmarks[k], landmarks[k], frames[k], frames[k])
+    results.finish()
+    return results
+
+
+def percentiles_ms(samples: list) -> dict:
+    values = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+    }
+
+
+def encoding_cost(results: AnalysisResults, display_width: int) -> dict:
+    """Composição + codificação de um frame nos dois caminhos."""
+    snapshot = results.snapshot()
+    original = AnalysisFrameSource(results.snapshot, display_width=10**6)
+    display = AnalysisFrameSource(results.snapshot, display_width=display_width)
+    encoder = JpegFrameEncoder(display_width=display_width)
+    png = lambda: base64.b64encode(cv2.imencode(".png", original.render(0, snapshot))[1]).decode("ascii")
+    report = {}
+    for label, encode in (
+        ("png_original_base64", png),
+        ("jpeg_exibicao_base64", lambda: encoder.encode(display.render(0, snapshot))),
+    ):
+        start = time.perf_counter()
+        for _ in range(10):
+            payload = encode()
+        report[label] = {
+            "ms_por_frame": round((time.perf_counter() - start) / 10 * 1000, 2),
+            "kb_por_frame": round(len(payload) / 1024, 1),
+        }
+    return report
+
+
+def navigate(results: AnalysisResults, path: list, rate_hz: float) -> dict:
+    """Pede os frames de 'path' a 'rate_hz' pedidos por segundo."""
+    requested_at = {}
+    latencies = []
+
+    def on_frame(index, payload):
+        latencies.append(time.perf_counter() - requested_at[index])
+
+    delivery = FrameDelivery(AnalysisFrameSource(results.snapshot), on_frame).start()
+    interval = 1.0 / rate_hz
+    start = time.perf_counter()
+    for step, index in enumerate(path):
+        requested_at[index] = time.perf_counter()
+        delivery.request(index)
+        # Pedidos em ritmo constante, como eventos do controle deslizante.
+        delay = start + (step + 1) * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    time.sleep(0.3)
+    elapsed = time.perf_counter() - start
+    delivery.close()
+    return {
+        "pedidos": len(path),
+        "entregas": delivery.delivered_count,
+        "frames_na_tela_por_s": round(delivery.delivered_count / elapsed, 1),
+        "latencia_pedido_entrega": percentiles_ms(latencies),
+        "entregas_do_cache": round(delivery.served_from_cache / max(delivery.delivered_count, 1), 3),
+        "cache_mb": round(delivery.cache.size_bytes / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrega de frames da tela do Analisador.")
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--display-width", type=int, default=960)
+    parser.add_argument("--scrub-hz", type=float, default=240.0)
+    parser.add_argument("--back", type=int, default=600)
+    parser.add_argument("--step-hz", type=float, default=30.0)
+    parser.add_argument("--steps", type=int, default=150)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    results = synthetic_results(args.frames, args.width, args.height)
+    report = {
+        "frames": args.frames,
+        "codificacao": encoding_cost(results, args.display_width),
+        "arrasto_rapido": navigate(
+            results,
+            list(range(0, args.frames, 2)) + list(range(args.frames - 1, args.frames - args.back, -2)),
+            args.scrub_hz,
+        ),
+        "frame_a_frame": navigate(results, list(range(1000, 1000 + args.steps)), args.step_hz),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
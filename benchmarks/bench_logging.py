@@ -0,0 +1,123 @@
+# benchmarks/bench_logging.py
+
+# BENCHMARK DO CUSTO DO LOGGING NO LOOP DE ANÁLISE
+# Mede o tempo por frame do MotionComparator.compare_poses (a parte do loop de
+# análise que registra logs a cada frame) em três configurações:
+#   - sem_logging: logging desativado (referência);
+#   - sincrono_legado: configuração anterior (FileHandler + StreamHandler
+#     síncronos, tudo em DEBUG) com as chamadas antigas (f-strings formatadas
+#     e gravadas em disco a cada frame);
+#   - assincrono: setup_logging atual (QueueHandler/QueueListener, níveis por
+#     subsistema) com as chamadas atuais (lazy e amostradas).
+# Em todas as configurações o console é redirecionado para /dev/null.
+#
+# Uso:
+#   python benchmarks/bench_logging.py --frames 5000
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.motion_comparator import MotionComparator
+from src.utils import setup_logging, shutdown_logging
+
+legacy_logger = logging.getLogger("src.motion_comparator.legado")
+
+
+def _make_frames(num_frames):
+    """Pares de poses diferentes; no aluno falta o pulso esquerdo (gera avisos)."""
+    frames = []
+    for i in range(num_frames):
+        aluno = [
+            {"x": 0.3 + j / 90 + i % 7 / 100, "y": 0.2 + j / 45, "z": 0.0, "visibility": 0.9, "name": n}
+            for j, n in enumerate(POSE_LANDMARK_NAMES)
+            if n != "LEFT_WRIST"
+        ]
+        mestre = [
+            {"x": 0.5 - j / 70, "y": 0.2 + j / 40, "z": 0.0, "visibility": 0.9, "name": n}
+            for j, n in enumerate(POSE_LANDMARK_NAMES)
+        ]
+        frames.append((aluno, mestre))
+    return frames
+
+
+def _legacy_hot_path(comparator, aluno, mestre):
+    """Reproduz as chamadas de log por frame da versão anterior (f-strings sempre formatadas)."""
+    score, feedback, diffs = comparator.compare_poses(aluno, mestre)
+    for angle_name, diff in diffs.items():
+        if diff == 180:
+            legacy_logger.warning(
+                f"Não foi possível calcular o ângulo {angle_name}: Landmark 'LEFT_WRIST' não encontrado."
+            )
+    legacy_logger.info(f"Feedback gerado: '{feedback}'")
+    return score
+
+
+def _reset_root():
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.NOTSET)
+
+
+def _run(frames, step):
+    comparator = MotionComparator()
+    start = time.perf_counter()
+    for aluno, mestre in frames:
+        step(comparator, aluno, mestre)
+    return (time.perf_counter() - start) * 1000 / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do custo do logging por frame.")
+    parser.add_argument("--frames", type=int, default=5000)
+    args = parser.parse_args()
+
+    frames = _make_frames(args.frames)
+    devnull = open(os.devnull, "w")
+    log_dir = tempfile.mkdtemp(prefix="bench_logging_")
+    results = {"frames": args.frames}
+
+    _reset_root()
+    logging.disable(logging.CRITICAL)
+    results["sem_logging_ms"] = _run(frames, lambda c, a, m: c.compare_poses(a, m))
+
+    _reset_root()
+    legacy_file = os.path.join(log_dir, "legacy.log")
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler(legacy_file, mode="w"), logging.StreamHandler(devnull)],
+        force=True,
+    )
+    # As chamadas atuais do comparador ficam mudas: só as legadas são medidas.
+    logging.getLogger("src.motion_comparator").setLevel(logging.CRITICAL)
+    legacy_logger.setLevel(logging.DEBUG)
+    results["sincrono_legado_ms"] = _run(frames, _legacy_hot_path)
+    results["sincrono_legado_log_kb"] = os.path.getsize(legacy_file) // 1024
+
+    _reset_root()
+    logging.getLogger("src.motion_comparator").setLevel(logging.NOTSET)
+    setup_logging(log_dir=log_dir, log_file="async.log", stream=devnull)
+    results["assincrono_ms"] = _run(frames, lambda c, a, m: c.compare_poses(a, m))
+    shutdown_logging()
+    results["assincrono_log_kb"] = os.path.getsize(os.path.join(log_dir, "async.log")) // 1024
+
+    baseline = results["sem_logging_ms"]
+    for key in ("sincrono_legado", "assincrono"):
+        results[f"{key}_overhead_ms"] = results[f"{key}_ms"] - baseline
+    results = {k: round(v, 4) if isinstance(v, float) else v for k, v in results.items()}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
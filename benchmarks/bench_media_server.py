@@ -0,0 +1,162 @@
+# benchmarks/bench_media_server.py
+
+# TESTE DE CARGA DO SERVIDOR DE MÍDIA
+# Vários espectadores simultâneos assistindo a vídeos de técnicas e buscando
+# pontos aleatórios da linha do tempo. Cada início de reprodução ou busca pede
+# uma janela de --window-mb a partir da posição escolhida, como faz o player.
+# Compara:
+#   - "estatico_sem_range": servidor estático que ignora Range (200 com o
+#     arquivo inteiro); para chegar à posição o player baixa tudo até ela;
+#   - "media_server_copia": src/media_server.py enviando com send() (cópia
+#     pelo espaço do usuário);
+#   - "media_server_sendfile": src/media_server.py com os.sendfile.
+# Mede latência por busca (p50/p95), bytes transferidos e vazão agregada, e
+# quanto uma segunda visita ao vídeo transfere (If-None-Match quando há ETag).
+#
+# Uso:
+#   python benchmarks/bench_media_server.py --viewers 16 --seeks 30
+
+import argparse
+import functools
+import http.client
+import http.server
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.media_server import MediaServer
+
+
+class _StaticHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def viewer(base_url: str, paths: list, sizes: list, seeks: int, window: int, seed: int, results: list):
+    """Um espectador: abre um vídeo e faz 'seeks' buscas, cada uma por uma janela."""
+    rng = random.Random(seed)
+    parsed = urllib.parse.urlsplit(base_url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+    index = rng.randrange(len(paths))
+    latencies, transferred, etag = [], 0, None
+    positions = [0] + [rng.randrange(sizes[index]) for _ in range(seeks)]
+    for position in positions:
+        end = min(position + window, sizes[index]) - 1
+        start = time.perf_counter()
+        connection.request("GET", paths[index], headers={"Range": f"bytes={position}-{end}"})
+        response = connection.getresponse()
+        etag = response.getheader("ETag", etag)
+        if response.status == 206:
+            transferred += len(response.read())
+        else:
+            # Sem Range: lê desde o início até cobrir a janela e abandona a conexão.
+            needed = end + 1
+            while needed > 0:
+                block = response.read(min(needed, 1 << 20))
+                if not block:
+                    break
+                needed -= len(block)
+                transferred += len(block)
+            connection.close()
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+        latencies.append(time.perf_counter() - start)
+    # Segunda visita: com ETag o navegador revalida o que já tem; sem ele, baixa de novo.
+    connection.close()
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+    connection.request("GET", paths[index], headers={"If-None-Match": etag} if etag else {})
+    response = connection.getresponse()
+    revalidated = len(response.read())
+    connection.close()
+    results.append((latencies, transferred, revalidated))
+
+
+def run_load(base_url: str, paths: list, sizes: list, args) -> dict:
+    results = []
+    threads = [
+        threading.Thread(target=viewer, args=(base_url, paths, sizes, args.seeks, args.window, seed, results))
+        for seed in range(args.viewers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate([r[0] for r in results]) * 1000
+    transferred = sum(r[1] for r in results)
+    useful = args.viewers * (args.seeks + 1) * args.window
+    return {
+        "busca_p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "busca_p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "mb_transferidos": round(transferred / (1 << 20), 1),
+        "bytes_por_byte_util": round(transferred / useful, 2),
+        "vazao_mb_s": round(transferred / (1 << 20) / elapsed, 1),
+        "revalidacao_kb": round(sum(r[2] for r in results) / 1024, 1),
+        "tempo_total_s": round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de espectadores simultâneos buscando nos vídeos.")
+    parser.add_argument("--videos", type=int, default=6)
+    parser.add_argument("--video-mb", type=float, default=24.0)
+    parser.add_argument("--viewers", type=int, default=16)
+    parser.add_argument("--seeks", type=int, default=30)
+    parser.add_argument("--window-mb", type=float, default=1.0)
+    args = parser.parse_args()
+    args.window = int(args.window_mb * (1 << 20))
+    logging.disable(logging.CRITICAL)
+
+    workdir = tempfile.mkdtemp(prefix="bench_media_")
+    try:
+        video_dir = os.path.join(workdir, "videos_tecnicas", "Preta")
+        os.makedirs(video_dir)
+        relative, sizes = [], []
+        rng = random.Random(3)
+        for i in range(args.videos):
+            path = os.path.join(video_dir, f"tecnica_{i}.mp4")
+            with open(path, "wb") as f:
+                f.write(rng.randbytes(int(args.video_mb * (1 << 20))))
+            relative.append(f"videos_tecnicas/Preta/tecnica_{i}.mp4")
+            sizes.append(os.path.getsize(path))
+
+        report = {"espectadores": args.viewers, "buscas_por_espectador": args.seeks, "nucleos": os.cpu_count()}
+
+        static = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(_StaticHandler, directory=workdir)
+        )
+        # Conexões abandonadas no meio do arquivo são esperadas aqui.
+        static.handle_error = lambda request, client_address: None
+        threading.Thread(target=static.serve_forever, daemon=True).start()
+        host, port = static.server_address
+        report["estatico_sem_range"] = run_load(
+            f"http://{host}:{port}", ["/" + urllib.parse.quote(p) for p in relative], sizes, args
+        )
+        static.shutdown()
+        static.server_close()
+
+        with MediaServer(workdir, port=0) as server:
+            paths = [urllib.parse.urlsplit(server.url(p)).path for p in relative]
+            with patch.object(socket.socket, "sendfile", socket.socket._sendfile_use_send):
+                report["media_server_copia"] = run_load(server.base_url, paths, sizes, args)
+            report["media_server_sendfile"] = run_load(server.base_url, paths, sizes, args)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_pdf_viewer.py
+
+# BENCHMARK DO VISUALIZADOR DE PDF
+# Gera um programa técnico sintético de 100 páginas (fpdf2) e mede, com o
+# PdfPageService:
+#   - abertura a frio (sem cache): tempo até a primeira página estar pronta;
+#   - tempo até todas as páginas no zoom padrão ficarem prontas em segundo plano;
+#   - tempo até uma página distante (pedida como visível) ficar pronta com a
+#     fila de segundo plano cheia;
+#   - abertura a quente (cache em disco, como após reiniciar o servidor) e o
+#     tamanho médio de uma página enviada ao cliente.
+# Usa o renderizador configurado (PyMuPDF ou Poppler). Sem nenhum deles
+# instalado, --simulated-ms simula o custo de renderizar cada página.
+#
+# Uso:
+#   python benchmarks/bench_pdf_viewer.py --pages 100
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pdf_pages import PdfPageService, PdfRenderer, create_pdf_renderer
+
+
+class SimulatedRenderer(PdfRenderer):
+    """Página A4 com texto desenhado pelo OpenCV e um custo fixo por página."""
+
+    name = "simulado"
+
+    def __init__(self, num_pages: int, cost_ms: float):
+        self.num_pages = num_pages
+        self.cost = cost_ms / 1000
+
+    def page_sizes(self, path):
+        return [(595.0, 842.0)] * self.num_pages
+
+    def render(self, path, page, zoom):
+        time.sleep(self.cost)
+        image = np.full((int(842 * zoom), int(595 * zoom), 3), 255, dtype=np.uint8)
+        for line in range(40):
+            y = int((60 + line * 19) * zoom)
+            cv2.putText(image, f"Pagina {page + 1} - tecnica {line}", (int(40 * zoom), y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5 * zoom, (0, 0, 0), 1)
+        return image
+
+
+def write_program_pdf(path: str, num_pages: int):
+    from fpdf import FPDF
+
+    pdf = FPDF(format="A4")
+    pdf.set_font("Helvetica", size=11)
+    for page in range(num_pages):
+        pdf.add_page()
+        pdf.cell(0, 10, f"Programa tecnico - pagina {page + 1}", new_x="LMARGIN", new_y="NEXT")
+        for line in range(40):
+            pdf.cell(0, 6, f"Tecnica {line}: defesa, contra-ataque e deslocamento.", new_x="LMARGIN", new_y="NEXT")
+    pdf.output(path)
+
+
+def wait_until(condition, timeout: float = 600.0) -> float:
+    start = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("Tempo esgotado aguardando a renderização.")
+        time.sleep(0.002)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Abertura e navegação no visualizador de PDF.")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--simulated-ms", type=float, default=40.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    workdir = tempfile.mkdtemp(prefix="bench_pdf_")
+    try:
+        pdf_path = os.path.join(workdir, "Programa.pdf")
+        write_program_pdf(pdf_path, args.pages)
+        try:
+            renderer = create_pdf_renderer()
+        except ImportError:
+            renderer = SimulatedRenderer(args.pages, args.simulated_ms)
+        cache_dir = os.path.join(workdir, "cache")
+
+        service = PdfPageService(cache_dir, renderer)
+        opened_at = time.perf_counter()
+        document = service.open(pdf_path)
+        cold_open = time.perf_counter() - opened_at
+        # Pedido de uma página distante com a fila de segundo plano cheia.
+        far_page = document.page_count * 4 // 5
+        service.request_pages(document, [far_page])
+        far_ready = wait_until(lambda: service.is_ready(document, far_page))
+        wait_until(lambda: all(service.is_ready(document, p) for p in range(document.page_count)))
+        all_ready = time.perf_counter() - opened_at
+        service.close()
+
+        warm = PdfPageService(cache_dir, renderer)
+        start = time.perf_counter()
+        reopened = warm.open(pdf_path)
+        first_payload = warm.page_base64(reopened, 0)
+        warm_open = time.perf_counter() - start
+        warm.close()
+        sizes = [os.path.getsize(warm.page_path(reopened, p)) for p in range(reopened.page_count)]
+
+        report = {
+            "renderizador": renderer.name,
+            "paginas": document.page_count,
+            "abertura_a_frio_primeira_pagina_ms": round(cold_open * 1000, 1),
+            "pagina_distante_pronta_ms": round(far_ready * 1000, 1),
+            "todas_as_paginas_zoom_padrao_s": round(all_ready, 2),
+            "abertura_a_quente_ms": round(warm_open * 1000, 1),
+            "kb_por_pagina_enviada": round(np.mean(sizes) / 1024, 1),
+            "kb_primeira_pagina_base64": round(len(first_payload) / 1024, 1),
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
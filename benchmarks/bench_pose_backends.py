@@ -0,0 +1,125 @@
+# benchmarks/bench_pose_backends.py
+
+# BENCHMARK DOS BACKENDS DE POSE
+# Compara latência e precisão de cada backend nos vídeos de exemplo de
+# assets/videos_tecnicas. Como não há anotação manual, a precisão é medida
+# contra um backend de referência (por padrão o modelo "heavy"):
+#   - detection_rate: fração dos frames com pose detectada;
+#   - mean_error: distância média (coordenadas normalizadas) aos landmarks da referência;
+#   - pck_5: fração dos landmarks a menos de 5% da imagem da referência.
+#
+# Uso:
+#   python benchmarks/bench_pose_backends.py
+#   python benchmarks/bench_pose_backends.py --backends mediapipe_lite mediapipe_full --frames 60
+#   python benchmarks/bench_pose_backends.py --backends onnx --onnx-model pose_landmark.onnx
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_estimator import PoseEstimator
+from src.session_store import landmarks_list_to_array
+
+VIDEOS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "videos_tecnicas")
+
+
+def run_backend(backend: str, videos: list, max_frames: int, options: dict) -> dict:
+    """Roda um backend nos vídeos e retorna latências e landmarks por vídeo."""
+    latencies, landmarks = [], {}
+    for video in videos:
+        # Um estimador novo por vídeo, para não herdar o rastreamento do vídeo anterior.
+        estimator = PoseEstimator(backend, **options)
+        cap = cv2.VideoCapture(video)
+        per_frame = []
+        while len(per_frame) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            results = estimator.estimate_pose(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+            per_frame.append(
+                landmarks_list_to_array(estimator.get_landmarks_as_list(results.pose_landmarks))
+            )
+        cap.release()
+        estimator.close()
+        landmarks[video] = np.stack(per_frame) if per_frame else np.empty((0, 33, 4))
+    return {"latencies": np.asarray(latencies), "landmarks": landmarks}
+
+
+def accuracy_against(reference: dict, candidate: dict) -> dict:
+    """Calcula as métricas de concordância com o backend de referência."""
+    errors, detected, total = [], 0, 0
+    for video, ref in reference["landmarks"].items():
+        cand = candidate["landmarks"].get(video)
+        n = min(len(ref), len(cand))
+        total += n
+        detected += int((~np.isnan(cand[:n, 0, 0])).sum())
+        both = ~np.isnan(ref[:n, 0, 0]) & ~np.isnan(cand[:n, 0, 0])
+        if both.any():
+            diff = ref[:n][both][:, :, :2] - cand[:n][both][:, :, :2]
+            errors.append(np.linalg.norm(diff, axis=2).ravel())
+    errors = np.concatenate(errors) if errors else np.array([np.nan])
+    return {
+        "detection_rate": round(detected / total, 3) if total else 0.0,
+        "mean_error": round(float(np.nanmean(errors)), 4),
+        "pck_5": round(float(np.nanmean(errors < 0.05)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de pose.")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["mediapipe_lite", "mediapipe_full", "mediapipe_heavy"],
+    )
+    parser.add_argument("--reference", default="mediapipe_heavy")
+    parser.add_argument("--frames", type=int, default=90, help="Frames por vídeo.")
+    parser.add_argument("--tasks-model", help="Arquivo .task para o backend mediapipe_tasks.")
+    parser.add_argument("--onnx-model", help="Arquivo .onnx para o backend onnx.")
+    args = parser.parse_args()
+
+    videos = sorted(glob.glob(os.path.join(VIDEOS_DIR, "**", "*.mp4"), recursive=True))
+    backend_options = {
+        "mediapipe_tasks": {"model_path": args.tasks_model},
+        "onnx": {"model_path": args.onnx_model},
+    }
+
+    runs = {}
+    for backend in dict.fromkeys([args.reference] + args.backends):
+        try:
+            runs[backend] = run_backend(
+                backend, videos, args.frames, backend_options.get(backend, {})
+            )
+        except Exception as e:
+            print(f"Backend '{backend}' ignorado: {e}", file=sys.stderr)
+
+    report = {}
+    for backend in args.backends:
+        if backend not in runs:
+            continue
+        latencies = runs[backend]["latencies"]
+        report[backend] = {
+            "frames": int(latencies.size),
+            "latency_mean_ms": round(float(latencies.mean()), 2),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "fps": round(1000.0 / float(latencies.mean()), 1),
+        }
+        if args.reference in runs:
+            report[backend].update(accuracy_against(runs[args.reference], runs[backend]))
+
+    summary = {"videos": len(videos), "reference": args.reference, "backends": report}
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
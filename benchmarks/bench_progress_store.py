@@ -0,0 +1,113 @@
+# benchmarks/bench_progress_store.py
+
+# BENCHMARK DO HISTÓRICO DE PROGRESSO
+# Grava históricos sintéticos crescentes (resumos de análise com 8
+# articulações) e mede, para um aluno com 100, 1.000 e 5.000 sessões:
+#   - a consulta do painel (ProgressStore.user_overview), que lê só os agregados;
+#   - a mesma informação reagregada a cada visita a partir dos resumos
+#     (GROUP BY e funções de janela do SQLite sobre o histórico do aluno);
+#   - o custo de gravar uma sessão (resumo + atualização dos agregados).
+#
+# Uso:
+#   python benchmarks/bench_progress_store.py --sizes 100 1000 5000
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import KEY_ANGLE_DEFINITIONS
+from src.progress_store import ProgressStore
+
+TECHNIQUES = ["Soco Direto", "Chute Frontal", "Defesa 360", "Faca", "Bastão", "Estrangulamento"]
+
+# Reagregação sem os agregados: o que o painel faria a cada visita.
+NAIVE_QUERIES = (
+    "SELECT technique, COUNT(*), AVG(avg_score), MAX(avg_score), MAX(session_id) FROM progress_sessions"
+    " WHERE user = ? GROUP BY technique",
+    "SELECT technique, AVG(avg_score) FROM (SELECT technique, avg_score, ROW_NUMBER() OVER"
+    " (PARTITION BY technique ORDER BY session_id DESC) AS position FROM progress_sessions WHERE user = ?)"
+    " WHERE position <= 10 GROUP BY technique",
+    "SELECT angle_name, COUNT(*), AVG(mean_diff) FROM progress_session_joints WHERE user = ? GROUP BY angle_name",
+    "SELECT angle_name, AVG(mean_diff) FROM (SELECT angle_name, mean_diff, ROW_NUMBER() OVER"
+    " (PARTITION BY angle_name ORDER BY session_id DESC) AS position FROM progress_session_joints WHERE user = ?)"
+    " WHERE position <= 10 GROUP BY angle_name",
+)
+
+
+def summary(rng) -> dict:
+    return {
+        "num_frames": int(rng.integers(60, 600)),
+        "avg_score": float(rng.uniform(30, 95)),
+        "max_score": float(rng.uniform(90, 100)),
+        "joints": {name: (float(rng.uniform(0, 60)), int(rng.integers(30, 600))) for name in KEY_ANGLE_DEFINITIONS},
+    }
+
+
+def percentile_ms(samples: list, q: float) -> float:
+    return round(float(np.percentile(np.array(samples) * 1000, q)), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas do painel de progresso com históricos crescentes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--other-users", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    rng = np.random.default_rng(0)
+
+    workdir = tempfile.mkdtemp(prefix="bench_progress_")
+    try:
+        store = ProgressStore(os.path.join(workdir, "progress.sqlite3"))
+        # Outros alunos, para que as tabelas não contenham só o aluno medido.
+        for user in range(args.other_users):
+            for _ in range(100):
+                store.record_session(f"aluno{user}", TECHNIQUES[int(rng.integers(len(TECHNIQUES)))], summary(rng), rank="Verde")
+
+        report = {"outros_alunos": args.other_users, "historicos": []}
+        recorded = 0
+        insert_times = []
+        for size in sorted(args.sizes):
+            while recorded < size:
+                start = time.perf_counter()
+                store.record_session("medido", TECHNIQUES[recorded % len(TECHNIQUES)], summary(rng), rank="Verde")
+                insert_times.append(time.perf_counter() - start)
+                recorded += 1
+
+            overview_times, naive_times = [], []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                store.user_overview("medido")
+                overview_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                with store._lock:
+                    for query in NAIVE_QUERIES:
+                        store._db.execute(query, ("medido",)).fetchall()
+                naive_times.append(time.perf_counter() - start)
+
+            report["historicos"].append({
+                "sessoes_do_aluno": size,
+                "painel_agregados_p50_ms": percentile_ms(overview_times, 50),
+                "painel_agregados_p95_ms": percentile_ms(overview_times, 95),
+                "painel_reagregando_p50_ms": percentile_ms(naive_times, 50),
+                "painel_reagregando_p95_ms": percentile_ms(naive_times, 95),
+            })
+        report["gravacao_sessao_p50_ms"] = percentile_ms(insert_times, 50)
+        report["gravacao_sessao_p95_ms"] = percentile_ms(insert_times, 95)
+        store.close()
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
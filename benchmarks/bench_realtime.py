@@ -0,0 +1,56 @@
+# benchmarks/bench_realtime.py
+
+# BENCHMARK DO MODO DE ANÁLISE EM TEMPO REAL
+# Roda o RealtimeAnalyzer contra uma câmera (ou um arquivo que simula a câmera)
+# e reporta o fps alcançado, os frames descartados e a latência ponta a ponta.
+#
+# Uso:
+#   python benchmarks/bench_realtime.py --master "assets/videos_tecnicas/Branca/Passos_Planos.mp4"
+#   python benchmarks/bench_realtime.py --master mestre.mp4 --source 0 --seconds 20
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_estimator import PoseEstimator
+from src.realtime_analyzer import RealtimeAnalyzer, extract_landmark_sequence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da análise em tempo real.")
+    parser.add_argument("--master", required=True, help="Vídeo do mestre.")
+    parser.add_argument(
+        "--source",
+        default=None,
+        help="Índice da câmera ou caminho de um vídeo (padrão: o próprio vídeo do mestre).",
+    )
+    parser.add_argument("--seconds", type=float, default=None, help="Duração máxima.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Orçamento de latência.")
+    args = parser.parse_args()
+
+    source = args.source if args.source is not None else args.master
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+
+    pose_estimator = PoseEstimator()
+    master_landmarks, master_fps = extract_landmark_sequence(args.master, pose_estimator)
+    analyzer = RealtimeAnalyzer(
+        master_landmarks,
+        master_fps=master_fps,
+        source=source,
+        pose_estimator=pose_estimator,
+        latency_budget_ms=args.budget_ms,
+        loop_master=False,
+    )
+    try:
+        stats = analyzer.run(max_seconds=args.seconds)
+    finally:
+        pose_estimator.close()
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_repetitions.py
+
+# BENCHMARK DA SEGMENTAÇÃO DE REPETIÇÕES
+# Simula gravações longas de um aluno executando o mesmo soco várias vezes, com
+# ritmo variável (cada repetição dura de 0,8 a 1,4 vez a do mestre), uma pausa
+# inicial e ruído de detecção. Para cada gravação mede:
+#   - o tempo da segmentação e da pontuação (apenas sobre os landmarks);
+#   - o erro das fronteiras encontradas em relação às verdadeiras;
+#   - a nota média rep a rep contra a comparação frame a frame com o mestre
+#     repetido em sequência (o que o VideoAnalyzer faria com o vídeo inteiro).
+# Como o aluno executa o movimento correto, a nota esperada é próxima de 100.
+#
+# Uso:
+#   python benchmarks/bench_repetitions.py --reps 5 20 60
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.repetitions import score_repetitions, segment_repetitions, summarize_repetitions
+from src.session_store import landmarks_list_to_array
+from synthetic import pose_to_landmarks, stick_figure_pose
+
+MASTER_FRAMES = 30
+
+
+def drill(num_reps: int, rng) -> tuple:
+    """Landmarks (N, 33, 4) de uma gravação com 'num_reps' repetições e as fronteiras reais."""
+    lengths = rng.integers(int(0.8 * MASTER_FRAMES), int(1.4 * MASTER_FRAMES) + 1, num_reps)
+    phases = [0.0] * 15
+    boundaries = [15]
+    for length in lengths:
+        phases += list(np.arange(length) / length)
+        boundaries.append(boundaries[-1] + int(length))
+    landmarks = np.stack([landmarks_list_to_array(pose_to_landmarks(stick_figure_pose(t))) for t in phases])
+    landmarks[..., :2] += rng.normal(0, 0.003, landmarks[..., :2].shape)
+    return landmarks, boundaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segmentação de repetições em gravações longas.")
+    parser.add_argument("--reps", type=int, nargs="+", default=[5, 20, 60])
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = np.random.default_rng(0)
+    mestre = np.stack(
+        [landmarks_list_to_array(pose_to_landmarks(stick_figure_pose(i / MASTER_FRAMES))) for i in range(MASTER_FRAMES)]
+    )
+    results = []
+    for num_reps in args.reps:
+        aluno, boundaries = drill(num_reps, rng)
+        start = time.perf_counter()
+        segments = segment_repetitions(aluno, fps=30)
+        segment_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        summary = summarize_repetitions(score_repetitions(aluno, mestre, segments))
+        score_ms = (time.perf_counter() - start) * 1000
+
+        found = np.array([s for s, _ in segments] + [segments[-1][1]])
+        truth = np.array(boundaries)
+        errors = np.abs(found[:, None] - truth[None, :]).min(axis=1) if len(found) else np.array([])
+
+        # Frame a frame contra o mestre em sequência: blocos do tamanho do mestre, sem reamostrar.
+        blocks = [(i, i + MASTER_FRAMES) for i in range(0, len(aluno) - MASTER_FRAMES + 1, MASTER_FRAMES)]
+        lockstep = summarize_repetitions(score_repetitions(aluno, mestre, blocks))
+        results.append(
+            {
+                "repeticoes_reais": num_reps,
+                "frames": len(aluno),
+                "repeticoes_encontradas": summary["num_repetitions"],
+                "erro_fronteira_max_frames": int(errors.max()),
+                "segmentacao_ms": round(segment_ms, 2),
+                "pontuacao_ms": round(score_ms, 2),
+                "nota_rep_a_rep": round(summary["avg_score"], 1),
+                "nota_frame_a_frame": round(lockstep["avg_score"], 1),
+            }
+        )
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_resource_governor.py
+
+# BENCHMARK DO CONTROLE DE ADMISSÃO COM ANÁLISES SIMULTÂNEAS
+# Dispara N análises ao mesmo tempo (como N envios simultâneos) sobre vídeos
+# sintéticos em 1280x720 e mede o pico de memória residente do processo:
+#   - sem_limite: governor com vagas e memória de sobra (todas rodam juntas,
+#     com os frames em resolução cheia, como antes);
+#   - com_governor: orçamento de memória limitado (--budget-mb); os jobs
+#     excedentes esperam na fila ou rodam com a resolução reduzida.
+# Ao terminar, cada job libera seus frames (como os workers de análise), o que
+# devolve a memória reservada no governor. Cada cenário roda em um processo próprio, para que o pico de memória
+# (ru_maxrss) de um não contamine o outro.
+#
+# Uso:
+#   python benchmarks/bench_resource_governor.py --jobs 4 --frames 60 --budget-mb 400
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from synthetic import write_stick_figure_video
+
+
+def _round_mb(value):
+    # None em plataformas sem o módulo resource (Windows).
+    return round(value, 1) if value is not None else None
+
+
+def run_scenario(videos, num_jobs, cpu_slots, budget_mb, results):
+    logging.disable(logging.CRITICAL)
+    from src.metrics import peak_rss_mb
+    from src.resource_governor import ResourceGovernor
+    from src.video_analyzer import VideoAnalyzer
+
+    governor = ResourceGovernor(cpu_slots=cpu_slots, memory_budget_mb=budget_mb)
+    analyzers = [VideoAnalyzer(governor=governor) for _ in range(num_jobs)]
+    baseline_rss = peak_rss_mb()
+    max_queue = [0]
+
+    def on_event(event):
+        if event.stage == "fila":
+            max_queue[0] = max(max_queue[0], event.queue_position or 0)
+
+    start = time.perf_counter()
+    for analyzer in analyzers:
+        analyzer.load_video_from_path(videos[0], is_aluno=True)
+        analyzer.load_video_from_path(videos[1], is_aluno=False)
+        # Como um worker, cada job entrega o resultado e libera os frames ao terminar.
+        analyzer.analyze_and_compare(analyzer.clear_frames, event_callback=on_event)
+    for analyzer in analyzers:
+        analyzer.processing_thread.join()
+    results.update(
+        {
+            "total_s": round(time.perf_counter() - start, 2),
+            "pico_rss_mb": _round_mb(peak_rss_mb()),
+            "rss_antes_das_analises_mb": _round_mb(baseline_rss),
+            "escalas": sorted(a.frame_scale for a in analyzers),
+            "maior_posicao_na_fila": max_queue[0],
+            "frames_analisados": sum(len(a.comparison_results) for a in analyzers),
+            "fps_medido_pelo_governor": round(governor.fps, 2),
+        }
+    )
+    for analyzer in analyzers:
+        analyzer.close()
+
+
+def _in_subprocess(*args):
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+    results = manager.dict()
+    process = context.Process(target=run_scenario, args=(*args, results))
+    process.start()
+    process.join()
+    return dict(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análises simultâneas com e sem controle de admissão.")
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--budget-mb", type=float, default=400)
+    parser.add_argument("--slots", type=int, default=2)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_governor_")
+    videos = (os.path.join(workdir, "aluno.avi"), os.path.join(workdir, "mestre.avi"))
+    write_stick_figure_video(videos[0], args.frames, width=1280, height=720, variant=1)
+    write_stick_figure_video(videos[1], args.frames, width=1280, height=720, variant=0)
+
+    results = {"jobs": args.jobs, "frames": args.frames, "resolucao": "1280x720"}
+    results["sem_limite"] = _in_subprocess(videos, args.jobs, args.jobs, 1e6)
+    results["com_governor"] = _in_subprocess(videos, args.jobs, args.slots, args.budget_mb)
+    results["com_governor"].update({"vagas_cpu": args.slots, "orcamento_mb": args.budget_mb})
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
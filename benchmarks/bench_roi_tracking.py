@@ -0,0 +1,140 @@
+# benchmarks/bench_roi_tracking.py
+
+# BENCHMARK DO RASTREAMENTO POR ROI
+# Simula "tomadas abertas de dojo" colocando cada frame dos vídeos de exemplo
+# no centro-esquerda de uma tela preta 'widen' vezes maior (o praticante passa
+# a ocupar uma pequena parte da imagem). Compara a inferência no frame inteiro
+# com o rastreamento por ROI, medindo:
+#   - ms_per_frame / fps: custo por frame (inclui a conversão BGR->RGB);
+#   - detection_rate: fração de frames com pose detectada;
+#   - mean_error: distância média aos landmarks obtidos no vídeo original
+#     (pessoa grande no quadro), remapeados para as coordenadas da tela larga.
+#
+# Uso:
+#   python benchmarks/bench_roi_tracking.py --widen 3 --frames 120
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_estimator import PoseEstimator
+from src.session_store import landmarks_list_to_array
+
+VIDEOS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "videos_tecnicas")
+
+
+def _read_frames(video: str, max_frames: int) -> list:
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _widen(frame: np.ndarray, factor: int) -> tuple[np.ndarray, tuple]:
+    """Coloca o frame em uma tela 'factor' vezes maior e retorna o deslocamento."""
+    h, w = frame.shape[:2]
+    canvas = np.zeros((h * factor, w * factor, 3), dtype=np.uint8)
+    y0, x0 = (h * factor - h) // 2, (w * factor - w) // 3
+    canvas[y0 : y0 + h, x0 : x0 + w] = frame
+    return canvas, (x0, y0)
+
+
+def _run(frames: list, roi_tracking: bool) -> tuple[np.ndarray, float, dict]:
+    estimator = PoseEstimator(roi_tracking=roi_tracking)
+    landmarks = []
+    start = time.perf_counter()
+    for frame in frames:
+        results = estimator.estimate_pose(frame)
+        landmarks.append(
+            landmarks_list_to_array(estimator.get_landmarks_as_list(results.pose_landmarks))
+        )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    counters = {}
+    if roi_tracking:
+        backend = estimator.backend
+        counters = {
+            "roi_frames": backend.roi_frames,
+            "full_frames": backend.full_frames,
+            "fallbacks": backend.fallbacks,
+        }
+    estimator.close()
+    return np.stack(landmarks), elapsed_ms / max(len(frames), 1), counters
+
+
+def _error(reference: np.ndarray, candidate: np.ndarray) -> float | None:
+    both = ~np.isnan(reference[:, 0, 0]) & ~np.isnan(candidate[:, 0, 0])
+    if not both.any():
+        return None
+    diff = reference[both][:, :, :2] - candidate[both][:, :, :2]
+    return float(np.linalg.norm(diff, axis=2).mean())
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do rastreamento por ROI.")
+    parser.add_argument("--widen", type=int, default=3, help="Fator de ampliação da tela.")
+    parser.add_argument("--frames", type=int, default=120, help="Frames por vídeo.")
+    parser.add_argument("--match", default="", help="Só vídeos cujo caminho contém este texto.")
+    args = parser.parse_args()
+
+    videos = sorted(glob.glob(os.path.join(VIDEOS_DIR, "**", "*.mp4"), recursive=True))
+    videos = [v for v in videos if args.match in v]
+    totals = {"full": [], "roi": []}
+    report = {}
+    for video in videos:
+        frames = _read_frames(video, args.frames)
+        if not frames:
+            continue
+        reference, _, _ = _run(frames, roi_tracking=False)
+        wide_frames, offset = [], (0, 0)
+        for frame in frames:
+            canvas, offset = _widen(frame, args.widen)
+            wide_frames.append(canvas)
+        # Remapeia a referência para as coordenadas normalizadas da tela larga.
+        h, w = frames[0].shape[:2]
+        reference[:, :, 0] = (reference[:, :, 0] * w + offset[0]) / (w * args.widen)
+        reference[:, :, 1] = (reference[:, :, 1] * h + offset[1]) / (h * args.widen)
+
+        entry = {}
+        for mode in ("full", "roi"):
+            landmarks, ms, counters = _run(wide_frames, roi_tracking=mode == "roi")
+            detection = float((~np.isnan(landmarks[:, 0, 0])).mean())
+            entry[mode] = {
+                "ms_per_frame": round(ms, 2),
+                "fps": round(1000 / ms, 1),
+                "detection_rate": round(detection, 3),
+                "mean_error": _round(_error(reference, landmarks), 4),
+                **counters,
+            }
+            totals[mode].append((ms, detection))
+        report[os.path.relpath(video, VIDEOS_DIR)] = entry
+
+    summary = {
+        mode: {
+            "ms_per_frame": round(float(np.mean([t[0] for t in values])), 2),
+            "detection_rate": round(float(np.mean([t[1] for t in values])), 3),
+        }
+        for mode, values in totals.items()
+        if values
+    }
+    print(json.dumps({"widen": args.widen, "summary": summary, "videos": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
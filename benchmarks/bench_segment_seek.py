@@ -0,0 +1,109 @@
+# benchmarks/bench_segment_seek.py
+
+# BENCHMARK DA ANÁLISE DE TRECHOS
+# Gera um vídeo MPEG-4 longo com o índice de cada frame gravado na imagem e
+# mede o custo de chegar a uma janela de N segundos perto do fim do vídeo:
+#   - sequencial: lendo todos os frames desde o início (comportamento anterior);
+#   - busca: open_segment (CAP_PROP_POS_FRAMES + correção da posição).
+# Também confere, pelo índice gravado, se o primeiro frame lido após a busca
+# é exatamente o frame pedido.
+#
+# Uso:
+#   python benchmarks/bench_segment_seek.py --minutes 60 --window 10
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.video_seek import open_segment
+
+BITS = 20
+BLOCK = 16
+
+
+def _encode(frame, index):
+    for bit in range(BITS):
+        frame[:BLOCK, bit * BLOCK : (bit + 1) * BLOCK] = 255 if index >> bit & 1 else 0
+
+
+def _decode(frame):
+    return sum(
+        1 << bit for bit in range(BITS) if frame[: BLOCK, bit * BLOCK + BLOCK // 2].mean() > 127
+    )
+
+
+def _write_video(path, num_frames, width, height, fps):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    base = np.full((height, width, 3), 90, dtype=np.uint8)
+    for i in range(num_frames):
+        frame = base.copy()
+        x = (i * 3) % (width - 60)
+        cv2.rectangle(frame, (x, height // 3), (x + 60, height - 20), (40, 120, 200), -1)
+        _encode(frame, i)
+        writer.write(frame)
+    writer.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca direta em trechos de vídeo.")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--window", type=float, default=10.0, help="Duração do trecho em segundos.")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    num_frames = int(args.minutes * 60 * args.fps)
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_seek_"), "longo.mp4")
+    _write_video(path, num_frames, args.width, args.height, args.fps)
+
+    duration = num_frames / args.fps
+    start_s = duration - args.window - 5.0
+    segment = (start_s, start_s + args.window)
+    start_frame = int(round(start_s * args.fps))
+    window_frames = int(round(args.window * args.fps))
+
+    # Comportamento anterior: lê desde o frame 0 até o fim da janela.
+    cap = cv2.VideoCapture(path)
+    begin = time.perf_counter()
+    for _ in range(start_frame + window_frames):
+        cap.read()
+    sequential_s = time.perf_counter() - begin
+    cap.release()
+
+    cap = cv2.VideoCapture(path)
+    begin = time.perf_counter()
+    position, count = open_segment(cap, segment)
+    seek_s = time.perf_counter() - begin
+    first = cap.read()[1]
+    for _ in range(count - 1):
+        cap.read()
+    segment_s = time.perf_counter() - begin
+    cap.release()
+
+    results = {
+        "video_frames": num_frames,
+        "window_frames": count,
+        "sequential_decode_s": round(sequential_s, 3),
+        "seek_s": round(seek_s, 4),
+        "seek_plus_window_decode_s": round(segment_s, 3),
+        "speedup": round(sequential_s / segment_s, 1),
+        "requested_start_frame": start_frame,
+        "decoded_start_frame": _decode(first),
+        "frame_accurate": _decode(first) == start_frame == position,
+    }
+    print(json.dumps(results, indent=2))
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
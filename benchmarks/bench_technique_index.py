@@ -0,0 +1,104 @@
+# benchmarks/bench_technique_index.py
+
+# BENCHMARK DA BUSCA DE TÉCNICAS PARECIDAS
+# Gera uma biblioteca sintética de descritores (variações de poucas técnicas
+# base, distribuídas pelas faixas) e mede:
+#   - o tempo para montar o índice (uma BallTree por faixa);
+#   - a latência das consultas top-k filtradas pelas faixas de um aluno
+#     iniciante (poucas faixas) e de um mestre (todas), comparada com a busca
+#     exaustiva em uma matriz NumPy com máscara de faixas;
+#   - o tempo do descritor de um clipe de aluno (a partir dos landmarks).
+# A extração de pose do clipe (MediaPipe) não entra na medida.
+#
+# Uso:
+#   python benchmarks/bench_technique_index.py --videos 20000 --queries 500
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import RANK_HIERARCHY
+from src.technique_index import DESCRIPTOR_SIZE, TechniqueIndex, pose_descriptor
+
+
+def percentiles_ms(samples: list) -> dict:
+    values = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+    }
+
+
+def flat_query(descriptors, ranks, query, k, allowed):
+    """Busca exaustiva: distância para todas as linhas das faixas permitidas."""
+    rows = np.flatnonzero(np.isin(ranks, allowed))
+    distances = np.linalg.norm(descriptors[rows] - query, axis=1)
+    nearest = np.argpartition(distances, min(k, len(rows) - 1))[:k]
+    return rows[nearest[np.argsort(distances[nearest])]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência da busca de técnicas parecidas.")
+    parser.add_argument("--videos", type=int, default=20000)
+    parser.add_argument("--techniques", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = np.random.default_rng(0)
+    dimension = DESCRIPTOR_SIZE
+    centers = rng.random((args.techniques, dimension), dtype=np.float32)
+    labels = rng.integers(0, args.techniques, args.videos)
+    descriptors = centers[labels] + rng.normal(0, 0.03, (args.videos, dimension)).astype(np.float32)
+    library_ranks = RANK_HIERARCHY[:-1]
+    ranks = [library_ranks[label % len(library_ranks)] for label in labels]
+    videos = [f"biblioteca/{rank}/video_{i}.mp4" for i, rank in enumerate(ranks)]
+
+    start = time.perf_counter()
+    index = TechniqueIndex(descriptors, ranks, videos)
+    build_s = time.perf_counter() - start
+
+    queries = centers[rng.integers(0, args.techniques, args.queries)]
+    queries = queries + rng.normal(0, 0.03, queries.shape).astype(np.float32)
+    rank_array = np.array(ranks)
+    results = {
+        "videos": args.videos,
+        "dimensao": dimension,
+        "montagem_do_indice_s": round(build_s, 3),
+    }
+    for label, allowed in (("iniciante", RANK_HIERARCHY[:2]), ("mestre", RANK_HIERARCHY)):
+        tree_times, flat_times, agree = [], [], 0
+        for query in queries:
+            t0 = time.perf_counter()
+            found = index.query(query, k=args.k, ranks=allowed)
+            t1 = time.perf_counter()
+            expected = flat_query(descriptors, rank_array, query, args.k, allowed)
+            t2 = time.perf_counter()
+            tree_times.append(t1 - t0)
+            flat_times.append(t2 - t1)
+            agree += [r["video"] for r in found] == [videos[i] for i in expected]
+        results[label] = {
+            "faixas": len(allowed),
+            "balltree": percentiles_ms(tree_times),
+            "matriz_numpy": percentiles_ms(flat_times),
+            "mesmo_resultado": f"{agree}/{len(queries)}",
+        }
+
+    clip = rng.random((300, 33, 4), dtype=np.float32)
+    start = time.perf_counter()
+    for _ in range(20):
+        pose_descriptor(clip)
+    results["descritor_clipe_300_frames_ms"] = round((time.perf_counter() - start) / 20 * 1000, 3)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_user_directory.py
+
+# TESTE DE CARGA: LOGINS SIMULTÂNEOS NO MODO SERVIDOR
+# Simula N conexões do Flet chegando ao mesmo tempo (uma thread por sessão),
+# cada uma criando seu AuthService e fazendo login, com a planilha servida por
+# um servidor HTTP local (ver synthetic.py). Compara:
+#   - por_sessao: configuração anterior, um AuthService com planilha própria
+#     por sessão (um download e um DataFrame por conexão);
+#   - compartilhado: todas as sessões sobre o mesmo UserDirectory.
+# Para cada modo informa o tempo total, a latência de login (p50/p95), o número
+# de downloads da planilha e o pico de memória alocada (tracemalloc).
+#
+# Uso:
+#   python benchmarks/bench_user_directory.py --sessions 500 --users 2000
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.auth import AuthService
+from src.user_directory import UserDirectory
+from synthetic import LocalSheetServer, write_users_csv
+
+
+def run_sessions(num_sessions, credentials, make_service):
+    """Dispara as sessões ao mesmo tempo e mede cada login (criação do serviço + login)."""
+    latencies = [0.0] * num_sessions
+    services = [None] * num_sessions
+    failures = [0]
+    barrier = threading.Barrier(num_sessions)
+
+    def session(i):
+        barrier.wait()
+        start = time.perf_counter()
+        # Como o app, cada sessão mantém seu serviço vivo até o fim da conexão.
+        services[i] = make_service()
+        index = i % len(credentials)
+        user = services[i].login(*credentials[index])
+        # Na planilha sintética, um em cada dez usuários está inativo.
+        if (user is None) != (index % 10 == 0):
+            failures[0] += 1
+        latencies[i] = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(num_sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    directories = {id(s.directory): s.directory for s in services}.values()
+    return {
+        "total_s": round(total_s, 3),
+        "login_p50_ms": round(statistics.median(latencies), 2),
+        "login_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "downloads": sum(d.fetch_count for d in directories),
+        "pico_memoria_mb": round(peak / 1e6, 1),
+        "falhas": failures[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga de logins simultâneos.")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = tempfile.mkdtemp(prefix="bench_user_directory_")
+    credentials = write_users_csv(os.path.join(workdir, "usuarios.csv"), args.users)
+    results = {"sessoes": args.sessions, "usuarios": args.users}
+    with LocalSheetServer(workdir) as server:
+        url = server.url("usuarios.csv")
+        results["por_sessao"] = run_sessions(args.sessions, credentials, lambda: AuthService(url))
+        directory = UserDirectory(url, refresh_interval=60)
+        results["compartilhado"] = run_sessions(
+            args.sessions, credentials, lambda: AuthService(url, directory=directory)
+        )
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
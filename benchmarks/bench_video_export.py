@@ -0,0 +1,116 @@
+# benchmarks/bench_video_export.py
+
+# BENCHMARK DA EXPORTAÇÃO DO VÍDEO LADO A LADO
+# Gera dois vídeos sintéticos com a duração pedida e uma sessão com landmarks
+# para todos os frames. Mede o tempo só de decodificação dos dois vídeos e o
+# tempo da exportação completa (decodificação + desenho + composição +
+# codificação), além do pico de memória do processo durante a exportação.
+#
+# Uso:
+#   python benchmarks/bench_video_export.py --minutes 10 --width 640 --height 360
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.metrics import peak_rss_mb
+from src.session_store import AnalysisSession
+from src.video_exporter import export_session_video
+
+
+def _write_video(path, num_frames, width, height, fps):
+    # Fundo em gradiente com um retângulo em movimento: conteúdo comprimível,
+    # mais próximo de um vídeo real do que ruído aleatório.
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    gradient = np.linspace(40, 200, width, dtype=np.uint8)
+    base = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+    for i in range(num_frames):
+        frame = base.copy()
+        x = (i * 4) % max(width - 80, 1)
+        cv2.rectangle(frame, (x, height // 4), (x + 80, 3 * height // 4), (30, 90, 220), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def _decode_only(paths):
+    start = time.perf_counter()
+    caps = [cv2.VideoCapture(p) for p in paths]
+    while all(cap.read()[0] for cap in caps):
+        pass
+    for cap in caps:
+        cap.release()
+    return time.perf_counter() - start
+
+
+def _max_rss_mb():
+    # None em plataformas sem o módulo resource (Windows).
+    peak = peak_rss_mb()
+    return round(peak, 1) if peak is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da exportação do vídeo anotado.")
+    parser.add_argument("--minutes", type=float, default=1.0)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--backend", default="auto", choices=["auto", "ffmpeg", "opencv"])
+    args = parser.parse_args()
+
+    num_frames = int(args.minutes * 60 * args.fps)
+    workdir = tempfile.mkdtemp(prefix="bench_export_")
+    video_aluno = os.path.join(workdir, "aluno.mp4")
+    video_mestre = os.path.join(workdir, "mestre.mp4")
+    for path in (video_aluno, video_mestre):
+        _write_video(path, num_frames, args.width, args.height, args.fps)
+
+    rng = np.random.default_rng(1)
+    landmarks = np.empty((num_frames, 33, 4), dtype=np.float32)
+    landmarks[..., :3] = rng.uniform(0.2, 0.8, (num_frames, 33, 3))
+    landmarks[..., 3] = 0.9
+    session = AnalysisSession(
+        landmarks,
+        landmarks,
+        rng.uniform(50, 100, num_frames).astype(np.float32),
+        np.zeros((num_frames, 0), dtype=np.float32),
+        [],
+        video_aluno=video_aluno,
+        video_mestre=video_mestre,
+        fps=args.fps,
+    )
+
+    decode_seconds = _decode_only([video_aluno, video_mestre])
+    rss_before = _max_rss_mb()
+    start = time.perf_counter()
+    output = export_session_video(
+        session, os.path.join(workdir, "saida.mp4"), backend=args.backend
+    )
+    export_seconds = time.perf_counter() - start
+
+    results = {
+        "frames": num_frames,
+        "resolution": f"{args.width}x{args.height}",
+        "decode_only_s": round(decode_seconds, 2),
+        "export_s": round(export_seconds, 2),
+        "export_fps": round(num_frames / export_seconds, 1),
+        "export_vs_decode": round(export_seconds / decode_seconds, 2),
+        "max_rss_before_mb": rss_before,
+        "max_rss_after_mb": _max_rss_mb(),
+        "output_mb": round(os.path.getsize(output) / 2**20, 1),
+    }
+    print(json.dumps(results, indent=2))
+    for name in os.listdir(workdir):
+        os.remove(os.path.join(workdir, name))
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# benchmarks/run_suite.py
+
+# SUÍTE DE BENCHMARKS REPRODUTÍVEL (OFFLINE)
+# Mede as operações principais do app com dados sintéticos (ver synthetic.py):
+#   - auth_load_users: AuthService lendo a planilha de um servidor HTTP local;
+#   - auth_login: login contra uma planilha de 1000 usuários;
+#   - views: construção das telas de dashboard, programa e vídeos;
+#   - pose_estimator: inferência nos frames do vídeo sintético do boneco;
+#   - motion_comparator: comparação aluno x mestre com os landmarks do gabarito;
+#   - render_3d: render_3d_skeleton;
+#   - report: geração do relatório PDF com o ReportGenerator.
+# O tempo de cada caso é a mediana de várias repetições. Os resultados são
+# comparados com o baseline salvo; um caso mais lento que
+# baseline * (1 + tolerância) é uma regressão e faz o processo sair com código 1.
+# Os baselines dependem da máquina: grave um novo com --update-baseline ao
+# trocar de ambiente.
+#
+# Uso:
+#   python benchmarks/run_suite.py                     # compara com o baseline
+#   python benchmarks/run_suite.py --update-baseline   # grava um novo baseline
+#   python benchmarks/run_suite.py --only auth_login motion_comparator --tolerance 0.3
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from synthetic import (
+    LocalSheetServer,
+    draw_stick_figure,
+    stick_figure_pose,
+    write_stick_figure_video,
+    write_users_csv,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "suite_baseline.json")
+
+
+def _median_ms(func, repeats: int, per_call: int = 1) -> float:
+    """Mediana, em ms por chamada, de 'repeats' execuções de func (que faz 'per_call' chamadas)."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000 / per_call)
+    return statistics.median(samples)
+
+
+class SuiteContext:
+    """Dados sintéticos compartilhados pelos casos, gerados uma única vez."""
+
+    def __init__(self, workdir: str, sheet_url: str, credentials: list):
+        self.workdir = workdir
+        self.sheet_url = sheet_url
+        self.credentials = credentials
+        self.video_mestre = os.path.join(workdir, "mestre.avi")
+        self.video_aluno = os.path.join(workdir, "aluno.avi")
+        self.landmarks_mestre = write_stick_figure_video(self.video_mestre, 60, variant=0)
+        self.landmarks_aluno = write_stick_figure_video(self.video_aluno, 60, variant=1)
+
+
+def case_auth_load_users(ctx, repeats):
+    from src.auth import AuthService
+
+    ms = _median_ms(lambda: AuthService(ctx.sheet_url), repeats)
+    return {"ms": ms, "usuarios": len(AuthService(ctx.sheet_url).user_data)}
+
+
+def case_auth_login(ctx, repeats):
+    from src.auth import AuthService
+
+    service = AuthService(ctx.sheet_url)
+    rng = random.Random(0)
+    sample = [rng.choice(ctx.credentials) for _ in range(200)]
+
+    def run():
+        for cpf, senha in sample:
+            service.login(cpf, senha)
+
+    return {"ms": _median_ms(run, repeats, per_call=len(sample))}
+
+
+def case_views(ctx, repeats):
+    # O main lê a URL da planilha na importação.
+    os.environ["FBKMKLN_SHEET_URL"] = ctx.sheet_url
+    from main import AppFBKMKLN
+
+    app = AppFBKMKLN(MagicMock())
+    user = {"LOGIN": "bench", "GRADUACAO_ATUAL": "PRETA"}
+
+    def run():
+        app.create_dashboard_view(user)
+        app.create_program_view(user)
+        app.create_videos_view(user)
+
+    return {"ms": _median_ms(run, repeats)}
+
+
+def case_pose_estimator(ctx, repeats):
+    import cv2
+    from src.pose_estimator import PoseEstimator
+
+    cap = cv2.VideoCapture(ctx.video_aluno)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+
+    estimator = PoseEstimator()
+    detected = [0]
+
+    def run():
+        for frame in frames:
+            if estimator.estimate_pose(frame).pose_landmarks:
+                detected[0] += 1
+
+    with estimator:
+        ms = _median_ms(run, repeats, per_call=len(frames))
+    return {"ms": ms, "detection_rate": round(detected[0] / (len(frames) * repeats), 3)}
+
+
+def case_motion_comparator(ctx, repeats):
+    from src.motion_comparator import MotionComparator
+
+    comparator = MotionComparator()
+    pairs = list(zip(ctx.landmarks_aluno, ctx.landmarks_mestre))
+
+    def run():
+        for aluno, mestre in pairs:
+            comparator.compare_poses(aluno, mestre)
+
+    return {"ms": _median_ms(run, repeats, per_call=len(pairs))}
+
+
+def case_render_3d(ctx, repeats):
+    from src.renderer_3d import render_3d_skeleton
+
+    landmarks = ctx.landmarks_aluno[15]
+    return {"ms": _median_ms(lambda: render_3d_skeleton(landmarks), repeats)}
+
+
+def case_report(ctx, repeats):
+    from src.motion_comparator import MotionComparator
+    from src.report_generator import ReportGenerator
+
+    comparator = MotionComparator()
+    results = [
+        dict(zip(("score", "feedback", "diffs"), comparator.compare_poses(a, m)))
+        for a, m in zip(ctx.landmarks_aluno, ctx.landmarks_mestre)
+    ]
+    scores = [r["score"] for r in results]
+    best, worst = int(np.argmax(scores)), int(np.argmin(scores))
+    frame = draw_stick_figure(stick_figure_pose(0.25), 640, 480)
+    output = os.path.join(ctx.workdir, "relatorio.pdf")
+
+    def run():
+        report = ReportGenerator(
+            scores, results, frame, frame, frame, frame,
+            results[best]["diffs"], results[worst]["diffs"],
+            comparator.readable_angle_names,
+        )
+        ok, error = report.generate(output)
+        if not ok:
+            raise RuntimeError(f"Falha ao gerar o relatório: {error}")
+
+    # O ReportGenerator grava imagens temporárias no diretório atual.
+    cwd = os.getcwd()
+    os.chdir(ctx.workdir)
+    try:
+        return {"ms": _median_ms(run, repeats)}
+    finally:
+        os.chdir(cwd)
+
+
+# nome -> (função, repetições padrão)
+CASES = {
+    "auth_load_users": (case_auth_load_users, 5),
+    "auth_login": (case_auth_login, 5),
+    "views": (case_views, 5),
+    "pose_estimator": (case_pose_estimator, 3),
+    "motion_comparator": (case_motion_comparator, 5),
+    "render_3d": (case_render_3d, 5),
+    "report": (case_report, 5),
+}
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """Retorna a lista de regressões (casos mais lentos que o baseline além da tolerância)."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None:
+            continue
+        limit = reference["ms"] * (1 + tolerance)
+        result["baseline_ms"] = reference["ms"]
+        result["ratio"] = round(result["ms"] / reference["ms"], 3) if reference["ms"] else None
+        if result["ms"] > limit:
+            regressions.append(
+                f"{name}: {result['ms']:.3f} ms > limite {limit:.3f} ms (baseline {reference['ms']:.3f} ms)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks offline com baseline.")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="Casos a executar.")
+    parser.add_argument("--repeats", type=int, help="Sobrescreve o número de repetições dos casos.")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Lentidão aceita em relação ao baseline (0.5 = até 50%% mais lento).")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # Os logs dos casos não interessam aqui; só os resultados em JSON.
+    import logging
+
+    logging.disable(logging.CRITICAL)
+
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    # Os logs dos casos (ex: o main importado em case_views) ficam fora do projeto.
+    import src.config
+
+    src.config.LOG_DIR = os.path.join(workdir, "logs")
+    credentials = write_users_csv(os.path.join(workdir, "usuarios.csv"))
+    results = {}
+    with LocalSheetServer(workdir) as server:
+        ctx = SuiteContext(workdir, server.url("usuarios.csv"), credentials)
+        for name in args.only or CASES:
+            func, repeats = CASES[name]
+            result = func(ctx, args.repeats or repeats)
+            results[name] = {k: round(v, 4) if isinstance(v, float) else v for k, v in result.items()}
+
+    report = {"machine": platform.node(), "python": platform.python_version(), "cases": results}
+    exit_code = 0
+    if args.update_baseline:
+        baseline = {"cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({k: v for k, v in report.items() if k != "cases"})
+        baseline["cases"].update({name: {"ms": r["ms"]} for name, r in results.items()})
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        report["baseline_atualizado"] = args.baseline
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+    else:
+        report["aviso"] = "Baseline não encontrado; rode com --update-baseline para criá-lo."
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
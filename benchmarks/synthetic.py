@@ -0,0 +1,302 @@
+# benchmarks/synthetic.py
+
+# DADOS SINTÉTICOS PARA OS BENCHMARKS
+# Gera, de forma determinística e sem acesso à rede:
+#   - vídeos de um "boneco de palitos" executando um soco (cv2.VideoWriter),
+#     junto com os landmarks exatos de cada frame (gabarito);
+#   - uma planilha CSV de usuários com as mesmas colunas da planilha real;
+#   - um CSV de academias espalhadas em torno de capitais brasileiras;
+#   - um servidor HTTP local que serve a planilha, no lugar do SHEET_URL;
+#   - um servidor HTTP local com suporte a Range que serve uma pasta de assets,
+#     contando os bytes enviados (sincronização offline).
+
+import csv
+import functools
+import http.server
+import math
+import os
+import sys
+import threading
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES, RANK_HIERARCHY
+
+# Posição base (normalizada) das articulações do boneco em guarda.
+_BASE_POSE = {
+    "NOSE": (0.50, 0.16),
+    "LEFT_SHOULDER": (0.56, 0.28),
+    "RIGHT_SHOULDER": (0.44, 0.28),
+    "LEFT_ELBOW": (0.60, 0.40),
+    "RIGHT_ELBOW": (0.40, 0.40),
+    "LEFT_WRIST": (0.55, 0.30),
+    "RIGHT_WRIST": (0.45, 0.30),
+    "LEFT_HIP": (0.54, 0.55),
+    "RIGHT_HIP": (0.46, 0.55),
+    "LEFT_KNEE": (0.57, 0.72),
+    "RIGHT_KNEE": (0.43, 0.72),
+    "LEFT_ANKLE": (0.58, 0.90),
+    "RIGHT_ANKLE": (0.42, 0.90),
+}
+
+# Segmentos desenhados no vídeo (o tronco é um polígono preenchido).
+_LIMBS = [
+    ("LEFT_SHOULDER", "LEFT_ELBOW"),
+    ("LEFT_ELBOW", "LEFT_WRIST"),
+    ("RIGHT_SHOULDER", "RIGHT_ELBOW"),
+    ("RIGHT_ELBOW", "RIGHT_WRIST"),
+    ("LEFT_HIP", "LEFT_KNEE"),
+    ("LEFT_KNEE", "LEFT_ANKLE"),
+    ("RIGHT_HIP", "RIGHT_KNEE"),
+    ("RIGHT_KNEE", "RIGHT_ANKLE"),
+]
+
+# Landmarks sem posição própria herdam a da articulação mais próxima.
+# A ordem importa: "FOOT_INDEX" precisa ser testado antes de "INDEX".
+_FALLBACK = {
+    "EYE": "NOSE", "EAR": "NOSE", "MOUTH": "NOSE",
+    "HEEL": "ANKLE", "FOOT_INDEX": "ANKLE",
+    "PINKY": "WRIST", "INDEX": "WRIST", "THUMB": "WRIST",
+}
+
+
+def stick_figure_pose(t: float, variant: int = 0) -> dict:
+    """
+    Articulações do boneco no instante t (em ciclos do golpe; 0 a 1 = um soco
+    de direita completo). 'variant' desloca o movimento, gerando um "aluno"
+    ligeiramente diferente do "mestre".
+    """
+    punch = 0.5 - 0.5 * math.cos(2 * math.pi * t)  # 0 = guarda, 1 = braço estendido
+    punch *= 1.0 - 0.25 * variant
+    pose = dict(_BASE_POSE)
+    pose["RIGHT_ELBOW"] = (0.40 - 0.08 * punch, 0.40 - 0.12 * punch)
+    pose["RIGHT_WRIST"] = (0.45 - 0.25 * punch, 0.30 - 0.02 * punch)
+    # Pequena oscilação do corpo, como uma base em movimento.
+    sway = 0.01 * math.sin(2 * math.pi * t * 0.5)
+    return {name: (x + sway, y) for name, (x, y) in pose.items()}
+
+
+def pose_to_landmarks(pose: dict) -> list:
+    """Converte as articulações para o formato de get_landmarks_as_list (33 landmarks)."""
+    landmarks = []
+    for name in POSE_LANDMARK_NAMES:
+        if name in pose:
+            x, y = pose[name]
+        else:
+            side = name.split("_")[0]
+            suffix = next(k for k in _FALLBACK if k in name)
+            target = _FALLBACK[suffix]
+            x, y = pose[target if target == "NOSE" else f"{side}_{target}"]
+        landmarks.append({"x": x, "y": y, "z": 0.0, "visibility": 0.99, "name": name})
+    return landmarks
+
+
+def draw_stick_figure(pose: dict, width: int, height: int) -> np.ndarray:
+    """Desenha o boneco (cabeça, tronco e membros) sobre um fundo cinza."""
+    frame = np.full((height, width, 3), 90, dtype=np.uint8)
+    scale = np.array([width, height])
+    px = {name: tuple(int(v) for v in np.array(xy) * scale) for name, xy in pose.items()}
+    limb = max(int(0.025 * height), 2)
+    skin, shirt, pants = (150, 180, 225), (40, 40, 40), (120, 60, 30)
+    torso = np.array(
+        [px["LEFT_SHOULDER"], px["RIGHT_SHOULDER"], px["RIGHT_HIP"], px["LEFT_HIP"]], dtype=np.int32
+    )
+    cv2.fillPoly(frame, [torso], shirt)
+    for a, b in _LIMBS:
+        color = pants if "HIP" in a or "KNEE" in a else shirt
+        cv2.line(frame, px[a], px[b], color, limb * 2)
+    for name in ("LEFT_WRIST", "RIGHT_WRIST"):
+        cv2.circle(frame, px[name], limb, skin, -1)
+    cv2.circle(frame, px["NOSE"], int(0.06 * height), skin, -1)
+    return frame
+
+
+def write_stick_figure_video(
+    path: str,
+    num_frames: int = 90,
+    width: int = 640,
+    height: int = 480,
+    fps: float = 30.0,
+    variant: int = 0,
+    cycle_frames: int = 30,
+) -> list:
+    """
+    Grava o vídeo do boneco e retorna os landmarks exatos de cada frame.
+    O formato MJPG/.avi é usado por estar disponível em qualquer build do OpenCV.
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+    if not writer.isOpened():
+        raise ValueError(f"Não foi possível criar o vídeo sintético: {path}")
+    landmarks = []
+    try:
+        for i in range(num_frames):
+            pose = stick_figure_pose(i / cycle_frames, variant)
+            writer.write(draw_stick_figure(pose, width, height))
+            landmarks.append(pose_to_landmarks(pose))
+    finally:
+        writer.release()
+    return landmarks
+
+
+def write_users_csv(path: str, num_users: int = 1000) -> list:
+    """
+    Grava uma planilha de usuários com as colunas da planilha real.
+    Retorna as credenciais (cpf, senha) de cada usuário, na ordem do arquivo.
+    """
+    ranks = RANK_HIERARCHY
+    credentials = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CPF", "Senha", "STATUS", "NOME", "LOGIN", "GRADUACAO_ATUAL"])
+        for i in range(num_users):
+            cpf, senha = f"{10000000000 + i * 7919:011d}", f"senha{i}"
+            status = "Ativo" if i % 10 else "Inativo"
+            writer.writerow([cpf, senha, status, f"Aluno {i}", f"aluno{i}", ranks[i % len(ranks)]])
+            credentials.append((cpf, senha))
+    return credentials
+
+
+# Capitais usadas como centros das academias sintéticas (cidade, UF, lat, lon).
+ACADEMY_CITIES = [
+    ("São Paulo", "SP", -23.55, -46.63),
+    ("Rio de Janeiro", "RJ", -22.91, -43.17),
+    ("Belo Horizonte", "MG", -19.92, -43.94),
+    ("Brasília", "DF", -15.79, -47.88),
+    ("Salvador", "BA", -12.97, -38.50),
+    ("Fortaleza", "CE", -3.73, -38.52),
+    ("Curitiba", "PR", -25.43, -49.27),
+    ("Porto Alegre", "RS", -30.03, -51.23),
+    ("Recife", "PE", -8.05, -34.88),
+    ("Manaus", "AM", -3.12, -60.02),
+    ("Goiânia", "GO", -16.68, -49.25),
+    ("Florianópolis", "SC", -27.59, -48.55),
+]
+ACADEMY_WORDS = ["Krav Maga", "Defesa Pessoal", "Centro de Treinamento", "Academia", "Instituto", "Escola"]
+ACADEMY_SUFFIXES = ["Centro", "Norte", "Sul", "Leste", "Oeste", "Vila Nova", "Jardim", "Lago", "Praia", "Alto"]
+
+
+def write_academies_csv(path: str, num_academies: int = 500, seed: int = 0) -> list:
+    """Grava o CSV de academias (colunas de src/academy_locator.py) e retorna as linhas."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(num_academies):
+        city, uf, lat, lon = ACADEMY_CITIES[i % len(ACADEMY_CITIES)]
+        rows.append({
+            "NOME": f"{rng.choice(ACADEMY_WORDS)} {rng.choice(ACADEMY_SUFFIXES)} {i}",
+            "CIDADE": city,
+            "UF": uf,
+            "ENDERECO": f"Rua {i}, {int(rng.integers(1, 2000))}",
+            "LATITUDE": f"{lat + rng.normal(0, 0.15):.6f}",
+            "LONGITUDE": f"{lon + rng.normal(0, 0.15):.6f}",
+            "HORARIOS": "Seg/Qua/Sex 19h-21h",
+            "TELEFONE": f"(11) 9{i:08d}",
+        })
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["NOME"])
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSheetServer:
+    """
+    Servidor HTTP local (127.0.0.1, porta livre) que serve um diretório com a
+    planilha CSV. Usado no lugar do Google Sheets para rodar sem rede.
+    """
+
+    def __init__(self, directory: str):
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, filename: str) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/{filename}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+class _RangeHandler(_QuietHandler):
+    """Serve arquivos com suporte a "Range: bytes=a-b" e conta os bytes enviados."""
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"] += 1
+            failing = stats["fail_after"] is not None and stats["requests"] > stats["fail_after"]
+        if failing:
+            self.send_error(503, "Falha simulada")
+            return None
+        if not range_header or not os.path.isfile(path):
+            return super().send_head()
+        size = os.path.getsize(path)
+        start_text, _, end_text = range_header.removeprefix("bytes=").partition("-")
+        start = int(start_text)
+        end = min(int(end_text) if end_text else size - 1, size - 1)
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self._remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "_remaining", None)
+        sent = 0
+        while remaining is None or remaining > 0:
+            block = source.read(65536 if remaining is None else min(65536, remaining))
+            if not block:
+                break
+            outputfile.write(block)
+            sent += len(block)
+            if remaining is not None:
+                remaining -= len(block)
+        with self.server.stats["lock"]:
+            self.server.stats["bytes_sent"] += sent
+
+
+class LocalAssetServer(LocalSheetServer):
+    """
+    Servidor HTTP local com suporte a Range para uma pasta de assets. 'stats'
+    acumula requisições e bytes enviados; fail_after(n) faz as requisições
+    seguintes à n-ésima falharem (simula uma queda de conexão).
+    """
+
+    def __init__(self, directory: str):
+        handler = functools.partial(_RangeHandler, directory=directory)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.stats = {"lock": threading.Lock(), "requests": 0, "bytes_sent": 0, "fail_after": None}
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def stats(self) -> dict:
+        return self.server.stats
+
+    def fail_after(self, requests: int | None):
+        with self.stats["lock"]:
+            self.stats["fail_after"] = None if requests is None else self.stats["requests"] + requests
+
+    def reset_counters(self):
+        with self.stats["lock"]:
+            self.stats["requests"] = 0
+            self.stats["bytes_sent"] = 0
@@ -10,25 +10,89 @@ import logging
 import sys
 import os
 
+# bisect localiza as páginas visíveis do PDF a partir da posição da rolagem.
+import bisect
+
+# threading e time rodam a sincronização dos assets e o acompanhamento das
+# análises sem travar a interface.
+import threading
+import time
+
+# sqlite3 define os erros do histórico de progresso.
+import sqlite3
+
 try:
     # Tenta importar os módulos da nossa estrutura de pastas 'src'.
+    from src.academy_locator import get_default_academy_locator
+    from src.analysis_jobs import JOB_DONE, JOB_RUNNING, get_default_worker_pool
+    from src.analysis_results import AnalysisResults
+    from src.asset_sync import AssetSyncClient, AssetSyncError
     from src.auth import AuthService
+    from src.frame_delivery import AnalysisFrameSource, FrameDelivery
+    from src.media_server import get_media_server
+    from src.pdf_pages import get_default_pdf_service
+    from src.progress_store import get_default_progress_store
     from src.utils import setup_logging
-    from src.config import RANK_HIERARCHY
+    from src.config import (
+        ANALYSIS_CHECKPOINT_SECONDS,
+        ANALYSIS_JOB_POLL_SECONDS,
+        ASSET_SYNC_URL,
+        MEDIA_SERVER_ENABLED,
+        MEDIA_SERVER_PUBLIC_URL,
+        PROGRESS_DB_PATH,
+        RANK_HIERARCHY,
+        USER_DIRECTORY_REFRESH_SECONDS,
+        USER_SESSION_DB,
+        USER_SESSION_TTL_SECONDS,
+    )
+    from src.user_directory import UserDirectory
+    from src.user_sessions import UserSessionStore
 except ImportError:
     # Se falhar (ex: executando o script de um local inesperado), ajusta o path e tenta novamente.
     sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+    from src.academy_locator import get_default_academy_locator
+    from src.analysis_jobs import JOB_DONE, JOB_RUNNING, get_default_worker_pool
+    from src.analysis_results import AnalysisResults
+    from src.asset_sync import AssetSyncClient, AssetSyncError
     from src.auth import AuthService
+    from src.frame_delivery import AnalysisFrameSource, FrameDelivery
+    from src.media_server import get_media_server
+    from src.pdf_pages import get_default_pdf_service
+    from src.progress_store import get_default_progress_store
     from src.utils import setup_logging
-    from src.config import RANK_HIERARCHY
+    from src.config import (
+        ANALYSIS_CHECKPOINT_SECONDS,
+        ANALYSIS_JOB_POLL_SECONDS,
+        ASSET_SYNC_URL,
+        MEDIA_SERVER_ENABLED,
+        MEDIA_SERVER_PUBLIC_URL,
+        PROGRESS_DB_PATH,
+        RANK_HIERARCHY,
+        USER_DIRECTORY_REFRESH_SECONDS,
+        USER_SESSION_DB,
+        USER_SESSION_TTL_SECONDS,
+    )
+    from src.user_directory import UserDirectory
+    from src.user_sessions import UserSessionStore
 
 # URL da planilha do Google Sheets que serve como nosso banco de dados de usuários.
-SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ3u0Mnny-vm3aZkbYoXQo85IwbfkI6FtD7T_uNhnSLMTzZZarFgRJJTmONncFo8U7cUGlsYTj17aMM/pub?gid=0&single=true&output=csv"
+# A variável de ambiente FBKMKLN_SHEET_URL permite apontar para outra fonte
+# (ex: um CSV local nos benchmarks, que rodam sem acesso à rede).
+SHEET_URL = os.environ.get("FBKMKLN_SHEET_URL") or "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ3u0Mnny-vm3aZkbYoXQo85IwbfkI6FtD7T_uNhnSLMTzZZarFgRJJTmONncFo8U7cUGlsYTj17aMM/pub?gid=0&single=true&output=csv"
 
 # Inicializa o sistema de logging usando nossa função utilitária.
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Sessões de login, compartilhadas por todas as conexões (páginas) do servidor.
+# O navegador guarda apenas o token opaco da sessão.
+SESSION_STORE = UserSessionStore(USER_SESSION_TTL_SECONDS, USER_SESSION_DB)
+SESSION_TOKEN_KEY = "session_token"
+
+# Planilha de usuários carregada uma única vez por processo e compartilhada por
+# todas as conexões, em vez de um DataFrame por sessão.
+USER_DIRECTORY = UserDirectory(SHEET_URL, refresh_interval=USER_DIRECTORY_REFRESH_SECONDS)
+
 
 class AppFBKMKLN:
     """
@@ -42,8 +106,8 @@ class AppFBKMKLN:
         logger.debug("Inicializando a classe AppFBKMKLN.")
         # Armazena a instância da página principal do Flet.
         self.page = page
-        # Cria uma instância do nosso serviço de autenticação.
-        self.auth_service = AuthService(sheet_url=SHEET_URL)
+        # Cria uma instância do nosso serviço de autenticação, sobre o diretório compartilhado.
+        self.auth_service = AuthService(sheet_url=SHEET_URL, directory=USER_DIRECTORY)
         # Define os caminhos padrão para as pastas de assets.
         self.program_path = "assets/programa_tecnico"
         self.videos_path = "assets/videos_tecnicas"
@@ -51,6 +115,23 @@ class AppFBKMKLN:
         os.makedirs(self.program_path, exist_ok=True)
         os.makedirs(self.videos_path, exist_ok=True)
 
+        # Análise desta conexão: vídeos escolhidos, job em andamento na fila dos
+        # workers e último resultado carregado; e a entrega de frames exibida.
+        self.analysis_state = {
+            "aluno": None,
+            "mestre": None,
+            "job_id": None,
+            "watcher": None,
+            "session": None,
+            "results": None,
+            "generation": 0,
+        }
+        self.frame_delivery = None
+
+        # Recupera, uma única vez por conexão, o token salvo no navegador. A partir
+        # daqui a navegação consulta apenas o SESSION_STORE, no servidor.
+        self.session_token = self.page.client_storage.get(SESSION_TOKEN_KEY)
+
         # Configura as propriedades da página e o sistema de rotas.
         self.setup_page_and_routes()
         # Inicia a aplicação na rota raiz ("/").
@@ -72,8 +153,8 @@ class AppFBKMKLN:
         # Limpa a tela antes de desenhar a nova View.
         self.page.views.clear()
 
-        # Recupera os dados do usuário do armazenamento da sessão.
-        user_data = self.page.client_storage.get("user_data")
+        # Recupera os dados do usuário da sessão no servidor (sem acessar o navegador).
+        user_data = SESSION_STORE.get(self.session_token)
 
         # Lógica de Roteamento.
         if self.page.route == "/":
@@ -82,6 +163,11 @@ class AppFBKMKLN:
             self.page.views.append(self.create_dashboard_view(user=user_data))
         elif self.page.route == "/program" and user_data:
             self.page.views.append(self.create_program_view(user=user_data))
+        elif self.page.route.startswith("/program_viewer") and user_data:
+            rank = self.page.route.split("?rank=")[-1]
+            self.page.views.append(self.create_pdf_viewer_view(user=user_data, rank=rank))
+        elif self.page.route == "/analyzer" and user_data:
+            self.page.views.append(self.create_analyzer_view(user=user_data))
         elif self.page.route == "/videos" and user_data:
             self.page.views.append(self.create_videos_view(user=user_data))
         # NOVA ROTA para a tela de detalhes do vídeo.
@@ -117,18 +203,40 @@ class AppFBKMKLN:
         user_data = self.auth_service.login(cpf, senha)
 
         if user_data:
-            self.page.client_storage.set("user_data", user_data)
+            self.session_token = SESSION_STORE.create(user_data)
+            self.page.client_storage.set(SESSION_TOKEN_KEY, self.session_token)
+            # Versões anteriores guardavam a linha completa do usuário no navegador.
+            self.page.client_storage.remove("user_data")
+            self.start_asset_sync(user_data)
             self.page.go("/dashboard")
         else:
             self.login_status.value = "CPF, senha inválidos ou usuário inativo."
             self.page.update()
 
+    def start_asset_sync(self, user_data: dict):
+        """
+        Atualiza em segundo plano os PDFs e vídeos das faixas acessíveis ao
+        usuário, baixando só o que mudou no servidor (ver src/asset_sync.py).
+        """
+        if not ASSET_SYNC_URL:
+            return
+        ranks = self.auth_service.get_accessible_ranks(user_data)
+
+        def run():
+            try:
+                AssetSyncClient(ASSET_SYNC_URL, "assets").sync(ranks)
+            except AssetSyncError as e:
+                logger.warning(f"Sincronização de assets indisponível, usando a cópia local: {e}")
+
+        threading.Thread(target=run, name="asset-sync", daemon=True).start()
+
     def logout(self, e):
         """Limpa os dados da sessão e volta para a tela de login."""
-        logger.info(
-            f"Usuário '{self.page.client_storage.get('user_data').get('LOGIN')}' fazendo logout."
-        )
-        self.page.client_storage.remove("user_data")
+        user_data = SESSION_STORE.get(self.session_token) or {}
+        logger.info(f"Usuário '{user_data.get('LOGIN')}' fazendo logout.")
+        SESSION_STORE.revoke(self.session_token)
+        self.session_token = None
+        self.page.client_storage.remove(SESSION_TOKEN_KEY)
         self.page.go("/")
 
     def create_login_view(self) -> ft.View:
@@ -219,7 +327,7 @@ class AppFBKMKLN:
         btn_analisador = ft.ElevatedButton(
             "Analisador de Movimentos",
             icon=ft.Icons.ANALYTICS,
-            on_click=lambda e: logger.debug("Botão 'Analisador de Movimentos' clicado"),
+            on_click=lambda _: self.page.go("/analyzer"),
             height=50,
             style=button_style,
         )
@@ -249,6 +357,8 @@ class AppFBKMKLN:
             style=button_style,
         )
 
+        progress_text = self.progress_summary(user)
+
         dashboard_buttons = ft.ResponsiveRow(
             [
                 ft.Column([btn_programa], col={"xs": 12, "sm": 6, "md": 4}),
@@ -272,7 +382,8 @@ class AppFBKMKLN:
                         header_content,
                         ft.Divider(height=20, color=ft.Colors.WHITE24),
                         dashboard_buttons,
-                    ],
+                    ]
+                    + ([ft.Text(progress_text, color=ft.Colors.WHITE70)] if progress_text else []),
                     spacing=25,
                     expand=True,
                     alignment=ft.MainAxisAlignment.START,
@@ -290,6 +401,8 @@ class AppFBKMKLN:
         accessible_ranks = self.auth_service.get_accessible_ranks(user)
 
         program_buttons = []
+        # Sem renderizador de PDF no servidor, o arquivo abre no leitor do sistema.
+        use_viewer = get_default_pdf_service().has_renderer()
         try:
             all_programs = os.listdir(self.program_path)
             logger.debug(
@@ -303,15 +416,21 @@ class AppFBKMKLN:
                         logger.debug(
                             f"Permissão concedida para '{pdf_file}'. Criando botão."
                         )
-                        pdf_path = os.path.join(self.program_path, pdf_file).replace(
-                            "\\", "/"
-                        )
+                        if use_viewer:
+                            on_click = lambda _, r=rank: self.page.go(
+                                f"/program_viewer?rank={r}"
+                            )
+                        else:
+                            pdf_path = os.path.join(self.program_path, pdf_file).replace(
+                                "\\", "/"
+                            )
+                            on_click = lambda _, p=pdf_path: self.page.launch_url(
+                                f"file:///{os.path.abspath(p)}"
+                            )
                         button = ft.ElevatedButton(
                             text=f"Programa - Faixa {rank}",
                             icon=ft.Icons.PICTURE_AS_PDF,
-                            on_click=lambda _, p=pdf_path: self.page.launch_url(
-                                f"file:///{os.path.abspath(p)}"
-                            ),
+                            on_click=on_click,
                             height=50,
                         )
                         program_buttons.append(button)
@@ -350,6 +469,150 @@ class AppFBKMKLN:
             padding=20,
         )
 
+    def create_pdf_viewer_view(self, user: dict, rank: str) -> ft.View:
+        """
+        Cria e retorna a View que exibe o programa técnico de uma faixa dentro do
+        app. As páginas chegam como imagens pré-renderizadas (src/pdf_pages.py) e
+        só as visíveis na rolagem são enviadas ao cliente.
+        """
+        logger.info(f"Abrindo o programa da faixa '{rank}' para o usuário: {user.get('LOGIN')}")
+        back_row = ft.Row(
+            [
+                ft.IconButton(
+                    icon=ft.Icons.ARROW_BACK,
+                    on_click=lambda _: close_viewer(),
+                    tooltip="Voltar",
+                ),
+                ft.Text(f"Programa - Faixa {rank}", size=18, weight=ft.FontWeight.BOLD),
+            ]
+        )
+        pdf_path = os.path.join(self.program_path, f"{rank}.pdf").replace("\\", "/")
+        service = get_default_pdf_service()
+        document = None
+
+        def close_viewer():
+            if document is not None:
+                service.unsubscribe(document, on_page_ready)
+            self.page.go("/program")
+
+        def error_view(message: str) -> ft.View:
+            return ft.View(
+                "/program_viewer", [back_row, ft.Text(message, color=ft.Colors.RED)], padding=20
+            )
+
+        # A faixa vem da rota: confere a permissão de novo antes de abrir o arquivo.
+        if rank not in self.auth_service.get_accessible_ranks(user) or not os.path.exists(pdf_path):
+            logger.warning(f"Programa da faixa '{rank}' inacessível ou inexistente.")
+            return error_view("Programa técnico não disponível.")
+
+        page_spacing = 10
+        # Páginas carregadas além das visíveis, em cada direção.
+        load_margin = 2
+        base_width = max(int((self.page.width or 800) - 60), 300)
+        state = {"zoom": service.default_zoom, "first": 0, "last": 1, "loaded": {}}
+        slots = []
+        offsets = []
+
+        def display_width() -> int:
+            return int(base_width * state["zoom"] / service.default_zoom)
+
+        def layout_slots():
+            # Espaço reservado para cada página (pela proporção), antes da imagem chegar.
+            width = display_width()
+            offsets.clear()
+            position = 0
+            for page_index, slot in enumerate(slots):
+                slot.width = width
+                slot.height = int(width * document.aspect(page_index))
+                offsets.append(position)
+                position += slot.height + page_spacing
+            list_view.width = width
+
+        def show_pages():
+            zoom = state["zoom"]
+            first, last = state["first"], state["last"]
+            loaded = state["loaded"]
+            for page_index in list(loaded):
+                if page_index < first - load_margin or page_index > last + load_margin:
+                    # Páginas longe da rolagem saem do cliente.
+                    slots[page_index].content = None
+                    del loaded[page_index]
+            for page_index in range(max(first - load_margin, 0), min(last + load_margin, document.page_count - 1) + 1):
+                if loaded.get(page_index) != zoom and service.is_ready(document, page_index, zoom):
+                    slots[page_index].content = ft.Image(
+                        src_base64=service.page_base64(document, page_index, zoom),
+                        fit=ft.ImageFit.CONTAIN,
+                        gapless_playback=True,
+                    )
+                    loaded[page_index] = zoom
+            service.request_pages(document, range(first, last + 1), zoom, margin=load_margin)
+
+        def on_page_ready(page_index, zoom):
+            # Chamado pela thread de renderização.
+            if zoom == state["zoom"] and state["first"] - load_margin <= page_index <= state["last"] + load_margin:
+                show_pages()
+                self.page.update()
+
+        def on_scroll(e: ft.OnScrollEvent):
+            first = max(bisect.bisect_right(offsets, e.pixels) - 1, 0)
+            last = max(bisect.bisect_right(offsets, e.pixels + e.viewport_dimension) - 1, first)
+            if (first, last) != (state["first"], state["last"]):
+                state["first"], state["last"] = first, last
+                show_pages()
+                self.page.update()
+
+        def change_zoom(step: int):
+            levels = sorted(service.zoom_levels)
+            position = levels.index(state["zoom"]) + step
+            if 0 <= position < len(levels):
+                state["zoom"] = levels[position]
+                zoom_text.value = f"{state['zoom'] / service.default_zoom:.0%}"
+                layout_slots()
+                show_pages()
+                self.page.update()
+
+        try:
+            document = service.open(pdf_path, on_page_ready=on_page_ready)
+        except Exception as e:
+            logger.error(f"Erro ao abrir o programa técnico {pdf_path}: {e}", exc_info=True)
+            return error_view("Não foi possível abrir o programa técnico.")
+
+        slots.extend(
+            ft.Container(bgcolor=ft.Colors.WHITE10, border_radius=ft.border_radius.all(4))
+            for _ in range(document.page_count)
+        )
+        list_view = ft.ListView(
+            controls=slots, spacing=page_spacing, on_scroll=on_scroll, on_scroll_interval=100
+        )
+        zoom_text = ft.Text("100%")
+        layout_slots()
+        show_pages()
+
+        back_row.controls.extend(
+            [
+                ft.Container(expand=True),
+                ft.IconButton(icon=ft.Icons.ZOOM_OUT, on_click=lambda _: change_zoom(-1), tooltip="Diminuir"),
+                zoom_text,
+                ft.IconButton(icon=ft.Icons.ZOOM_IN, on_click=lambda _: change_zoom(1), tooltip="Aumentar"),
+            ]
+        )
+        return ft.View(
+            f"/program_viewer?rank={rank}",
+            [
+                back_row,
+                ft.Divider(),
+                # Com zoom maior que a tela, as páginas rolam também na horizontal.
+                ft.Row(
+                    [list_view],
+                    scroll=ft.ScrollMode.AUTO,
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    vertical_alignment=ft.CrossAxisAlignment.STRETCH,
+                    expand=True,
+                ),
+            ],
+            padding=20,
+        )
+
     def create_videos_view(self, user: dict) -> ft.View:
         """Cria e retorna a View que lista os vídeos de técnicas acessíveis."""
         logger.info(
@@ -450,6 +713,22 @@ class AppFBKMKLN:
             padding=20,
         )
 
+    def media_resource(self, path: str) -> str:
+        """
+        Recurso para o ft.Video. No modo web com MEDIA_SERVER_PUBLIC_URL
+        configurada, a URL do servidor de mídia (Range, ETag e cache pelo hash do
+        conteúdo); nos demais, o caminho do asset.
+        """
+        # Sem endereço público, o navegador não alcança o servidor de mídia
+        # (ele escuta em MEDIA_SERVER_HOST, em geral só localhost).
+        if not MEDIA_SERVER_ENABLED or not MEDIA_SERVER_PUBLIC_URL or self.page.web is not True:
+            return path
+        try:
+            return get_media_server(MEDIA_SERVER_PUBLIC_URL).url(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Servidor de mídia indisponível para '{path}', usando o asset: {e}")
+            return path
+
     def create_video_details_view(self, video_path: str) -> ft.View:
         """Cria e retorna a View de detalhes para um vídeo específico."""
         logger.info(f"Criando a tela de detalhes para o vídeo: {video_path}")
@@ -470,7 +749,7 @@ class AppFBKMKLN:
 
         video_player = ft.Video(
             expand=True,
-            playlist=[ft.VideoMedia(resource=video_path)],  # Use 'resource' para assets
+            playlist=[ft.VideoMedia(resource=self.media_resource(video_path))],
             playlist_mode=ft.PlaylistMode.NONE,
             autoplay=False,
         )
@@ -532,9 +811,369 @@ class AppFBKMKLN:
             padding=20,
         )
 
+    def record_progress(self, user: dict, video_mestre_path: str | None, snapshot):
+        """Guarda o resumo da análise no histórico de progresso do aluno."""
+        if not snapshot.num_frames:
+            return
+        technique = os.path.splitext(os.path.basename(video_mestre_path or ""))[0].replace("_", " ").title()
+        try:
+            get_default_progress_store().record_session(
+                user.get("LOGIN"), technique or "Sem nome", snapshot, rank=user.get("GRADUACAO_ATUAL")
+            )
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Não foi possível registrar o progresso de '{user.get('LOGIN')}': {e}")
+
+    def progress_summary(self, user: dict) -> str | None:
+        """Resumo do progresso para o dashboard (None se o aluno ainda não tem análises)."""
+        # Sem o arquivo ainda não há histórico: não cria o banco só para consultá-lo.
+        if not os.path.exists(PROGRESS_DB_PATH):
+            return None
+        try:
+            overview = get_default_progress_store().user_overview(user.get("LOGIN"))
+        except sqlite3.Error as e:
+            logger.error(f"Não foi possível consultar o progresso: {e}")
+            return None
+        if not overview["sessions"]:
+            return None
+        text = f"Seu progresso: {overview['sessions']} análises, nota média {overview['avg_score']:.0f}%"
+        latest = overview["techniques"][0]
+        text += f". {latest['technique']}: média recente {latest['rolling_score']:.0f}%"
+        if overview["weakest_joints"]:
+            focus = overview["weakest_joints"][0].replace("_ANGLE", "").replace("_", " ").lower()
+            text += f". Foco: {focus}"
+        return text + "."
+
+    def create_analyzer_view(self, user: dict) -> ft.View:
+        """Cria e retorna a View do Analisador de Movimentos (aluno x mestre)."""
+        logger.info(f"Criando a tela do analisador para o usuário: {user.get('LOGIN')}")
+        # A análise roda nos processos worker (src/analysis_jobs.py): esta tela só
+        # envia o job, consulta o progresso na fila e exibe os resultados parciais
+        # salvos pelo worker durante a análise e, ao final, a sessão completa.
+        state = self.analysis_state
+
+        frame_image = ft.Image(
+            src="/icon.jpg", fit=ft.ImageFit.CONTAIN, gapless_playback=True, expand=True
+        )
+        status_text = ft.Text("Selecione os vídeos do aluno e do mestre.", color=ft.Colors.WHITE70)
+        frame_text = ft.Text("")
+        progress_bar = ft.ProgressBar(value=0, visible=False)
+        frame_slider = ft.Slider(min=0, max=1, value=0, disabled=True, expand=True)
+        aluno_label = ft.Text(os.path.basename(state["aluno"] or "") or "Nenhum vídeo")
+        mestre_label = ft.Text(os.path.basename(state["mestre"] or "") or "Nenhum vídeo")
+        analyze_button = ft.ElevatedButton("Analisar", icon=ft.Icons.PLAY_ARROW)
+
+        def update_button():
+            analyze_button.disabled = (
+                not (state["aluno"] and state["mestre"]) or state["job_id"] is not None
+            )
+
+        def show_frame(index, payload):
+            # Chamado pela thread do FrameDelivery, no máximo FRAME_DELIVERY_MAX_FPS vezes/s.
+            frame_image.src = None
+            frame_image.src_base64 = payload
+            score = state["results"].snapshot().frame_result(index)["score"]
+            frame_text.value = f"Frame {index + 1} - {score:.0f}%"
+            self.page.update()
+
+        def start_delivery():
+            if self.frame_delivery:
+                self.frame_delivery.close()
+            session = state["session"]
+            # O resultado exibido é trocado a cada resultado parcial do worker.
+            source = AnalysisFrameSource(
+                lambda: state["results"].snapshot(),
+                session.video_aluno,
+                session.video_mestre,
+                session.metadata.get("start_frames"),
+            )
+            self.frame_delivery = FrameDelivery(source, show_frame).start()
+            update_slider()
+
+        def update_slider():
+            num_frames = state["session"].num_frames
+            if num_frames:
+                frame_slider.max = max(num_frames - 1, 1)
+                frame_slider.disabled = False
+                self.frame_delivery.request(min(int(frame_slider.value or 0), num_frames - 1))
+
+        def show_session(session):
+            state["generation"] += 1
+            state["session"] = session
+            state["results"] = AnalysisResults.from_session(session, state["generation"])
+
+        def on_slider_change(e):
+            if self.frame_delivery:
+                self.frame_delivery.request(int(e.control.value))
+
+        def show_result(job):
+            state["job_id"] = None
+            progress_bar.visible = False
+            update_button()
+            if job is None or job.status != JOB_DONE:
+                status_text.value = f"A análise foi interrompida: {job.error if job else 'job não encontrado'}"
+                self.page.update()
+                return
+            try:
+                session = get_default_worker_pool().queue.load_result(job.job_id)
+            except (ValueError, OSError) as ex:
+                logger.error(f"Não foi possível carregar o resultado do job {job.job_id}: {ex}")
+                status_text.value = f"Não foi possível carregar o resultado da análise: {ex}"
+                self.page.update()
+                return
+            show_session(session)
+            status_text.value = (
+                f"Análise concluída: {session.num_frames} frames, "
+                f"nota média {session.summary()['avg_score']:.0f}%."
+            )
+            self.record_progress(user, session.video_mestre, session)
+            start_delivery()
+            self.page.update()
+
+        def show_partial(pool, job_id):
+            # Frames já analisados, salvos pelo worker durante a análise.
+            session = pool.load_partial(job_id)
+            shown = state["session"].num_frames if state["session"] is not None else 0
+            if session is None or session.num_frames <= shown:
+                return
+            show_session(session)
+            if self.frame_delivery is None:
+                start_delivery()
+            else:
+                update_slider()
+
+        def watch_job(job_id, token):
+            # Só o acompanhamento mais recente (ex: a tela foi reaberta) conclui o job.
+            pool = get_default_worker_pool()
+            last_partial = 0.0
+            while state["watcher"] is token:
+                job = pool.queue.get(job_id)
+                if job is None or job.finished:
+                    show_result(job)
+                    return
+                progress_bar.value = job.progress if job.status == JOB_RUNNING else None
+                if job.status == JOB_RUNNING:
+                    if time.monotonic() - last_partial >= ANALYSIS_CHECKPOINT_SECONDS:
+                        last_partial = time.monotonic()
+                        show_partial(pool, job_id)
+                    status_text.value = f"Analisando: {job.progress:.0%}"
+                else:
+                    queued = pool.queue_status(job_id)
+                    status_text.value = "Na fila de análise"
+                    if queued:
+                        status_text.value += f": posição {queued['position']}"
+                        if queued["eta_seconds"] is not None:
+                            status_text.value += f", espera estimada de {queued['eta_seconds']:.0f}s"
+                    status_text.value += "."
+                self.page.update()
+                time.sleep(ANALYSIS_JOB_POLL_SECONDS)
+
+        def start_watching():
+            token = object()
+            state["watcher"] = token
+            progress_bar.visible = True
+            threading.Thread(target=watch_job, args=(state["job_id"], token), daemon=True).start()
+
+        def analyze(e):
+            if state["job_id"] is not None:
+                return
+            if self.frame_delivery:
+                self.frame_delivery.close()
+                self.frame_delivery = None
+            state["session"] = state["results"] = None
+            frame_slider.value = 0
+            frame_slider.disabled = True
+            try:
+                state["job_id"] = get_default_worker_pool().queue.submit(state["aluno"], state["mestre"])
+            except (ValueError, sqlite3.Error) as ex:
+                logger.error(f"Não foi possível iniciar a análise: {ex}")
+                status_text.value = f"Não foi possível iniciar a análise: {ex}"
+                self.page.update()
+                return
+            progress_bar.value = 0
+            status_text.value = "Análise enviada."
+            update_button()
+            start_watching()
+            self.page.update()
+
+        def on_video_picked(e: ft.FilePickerResultEvent, is_aluno: bool):
+            if not e.files:
+                return
+            path = e.files[0].path
+            if not path or not os.path.isfile(path):
+                logger.error(f"Vídeo selecionado indisponível no servidor: {path}")
+                status_text.value = "Não foi possível abrir o vídeo: o arquivo não está disponível no servidor"
+            else:
+                state["aluno" if is_aluno else "mestre"] = path
+                (aluno_label if is_aluno else mestre_label).value = os.path.basename(path)
+                status_text.value = "Vídeo carregado."
+            update_button()
+            self.page.update()
+
+        frame_slider.on_change = on_slider_change
+        analyze_button.on_click = analyze
+        update_button()
+        aluno_picker = ft.FilePicker(on_result=lambda e: on_video_picked(e, True))
+        mestre_picker = ft.FilePicker(on_result=lambda e: on_video_picked(e, False))
+        # Os seletores ficam na overlay da página; os da visita anterior são trocados.
+        for picker in getattr(self, "_analyzer_pickers", ()):
+            if picker in self.page.overlay:
+                self.page.overlay.remove(picker)
+        self._analyzer_pickers = (aluno_picker, mestre_picker)
+        self.page.overlay.extend(self._analyzer_pickers)
+
+        video_extensions = ["mp4", "mov", "avi"]
+        pick_row = ft.ResponsiveRow(
+            [
+                ft.Column(
+                    [
+                        ft.OutlinedButton(
+                            "Vídeo do aluno",
+                            icon=ft.Icons.PERSON,
+                            on_click=lambda _: aluno_picker.pick_files(
+                                allowed_extensions=video_extensions
+                            ),
+                        ),
+                        aluno_label,
+                    ],
+                    col={"xs": 12, "sm": 6},
+                ),
+                ft.Column(
+                    [
+                        ft.OutlinedButton(
+                            "Vídeo do mestre",
+                            icon=ft.Icons.SPORTS_MARTIAL_ARTS,
+                            on_click=lambda _: mestre_picker.pick_files(
+                                allowed_extensions=video_extensions
+                            ),
+                        ),
+                        mestre_label,
+                    ],
+                    col={"xs": 12, "sm": 6},
+                ),
+            ],
+            spacing=10,
+        )
+
+        # Voltar à tela mostra o último resultado (parcial, se o job ainda roda)
+        # e retoma o acompanhamento do job.
+        if state["results"] is not None:
+            start_delivery()
+        if state["job_id"] is not None:
+            status_text.value = "Análise em andamento."
+            start_watching()
+
+        return ft.View(
+            "/analyzer",
+            [
+                ft.Row(
+                    [
+                        ft.IconButton(
+                            icon=ft.Icons.ARROW_BACK,
+                            on_click=lambda _: self.close_analyzer(),
+                            tooltip="Voltar",
+                        )
+                    ]
+                ),
+                ft.Text("Analisador de Movimentos", size=24, weight=ft.FontWeight.BOLD),
+                ft.Divider(),
+                pick_row,
+                ft.Row([analyze_button, status_text], spacing=15, wrap=True),
+                progress_bar,
+                ft.Container(
+                    frame_image,
+                    bgcolor=ft.Colors.BLACK,
+                    border_radius=ft.border_radius.all(15),
+                    alignment=ft.alignment.center,
+                    expand=True,
+                ),
+                ft.Row([frame_slider, frame_text]),
+            ],
+            padding=20,
+        )
+
+    def close_analyzer(self):
+        """Encerra a entrega de frames e volta ao dashboard."""
+        if self.frame_delivery:
+            self.frame_delivery.close()
+            self.frame_delivery = None
+        self.page.go("/dashboard")
+
     def create_training_location_view(self) -> ft.View:
-        """Cria e retorna a View (placeholder) para 'Onde Treinar'."""
+        """Cria e retorna a View 'Onde Treinar': busca de academias por nome/cidade e por proximidade."""
         logger.info("Criando a tela 'Onde Treinar'.")
+        locator = get_default_academy_locator()
+        position = {"coords": None}
+
+        status_text = ft.Text("", color=ft.Colors.WHITE70)
+        results_list = ft.ListView(spacing=10, expand=True)
+
+        def academy_tile(academy: dict) -> ft.Container:
+            details = [f"{academy.get('CIDADE', '')} - {academy.get('UF', '')}", academy.get("ENDERECO", "")]
+            if academy.get("HORARIOS"):
+                details.append(f"Horários: {academy['HORARIOS']}")
+            if academy.get("TELEFONE"):
+                details.append(f"Telefone: {academy['TELEFONE']}")
+            title = [ft.Text(academy["NOME"], weight=ft.FontWeight.BOLD, expand=True)]
+            if "DISTANCIA_KM" in academy:
+                title.append(ft.Text(f"{academy['DISTANCIA_KM']:.1f} km", color=ft.Colors.AMBER))
+            return ft.Container(
+                content=ft.Column(
+                    [ft.Row(title)] + [ft.Text(line, size=13) for line in details if line],
+                    spacing=4,
+                ),
+                padding=15,
+                border=ft.border.all(1, ft.Colors.WHITE24),
+                border_radius=ft.border_radius.all(8),
+                bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.WHITE),
+            )
+
+        def show(academies: list, empty_message: str):
+            results_list.controls = [academy_tile(a) for a in academies]
+            status_text.value = "" if academies else empty_message
+            self.page.update()
+
+        def on_search(e):
+            query = search_field.value or ""
+            if query.strip():
+                show(locator.search(query, near=position["coords"]), "Nenhuma academia encontrada.")
+            elif position["coords"]:
+                show(locator.nearest(*position["coords"]), "Nenhuma academia cadastrada.")
+            else:
+                show([], "Digite o nome da academia ou da cidade.")
+
+        def on_near_me(e):
+            geolocator = ft.Geolocator()
+            self.page.overlay.append(geolocator)
+            self.page.update()
+            try:
+                # Pede a permissão antes: sem ela, get_current_position falha direto.
+                permission = geolocator.request_permission(wait_timeout=30)
+                if permission in (ft.GeolocatorPermissionStatus.DENIED, ft.GeolocatorPermissionStatus.DENIED_FOREVER):
+                    logger.info("Permissão de localização negada pelo usuário.")
+                    status_text.value = "Permita o acesso à localização para ver as academias próximas."
+                    self.page.update()
+                    return
+                current = geolocator.get_current_position(wait_timeout=10)
+                position["coords"] = (current.latitude, current.longitude)
+            except Exception as ex:
+                logger.warning(f"Localização indisponível: {ex}")
+                status_text.value = "Não foi possível obter sua localização."
+                self.page.update()
+                return
+            finally:
+                self.page.overlay.remove(geolocator)
+            on_search(e)
+
+        search_field = ft.TextField(
+            label="Nome da academia ou cidade",
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=on_search,
+            expand=True,
+        )
+        if not len(locator):
+            status_text.value = "Nenhuma academia cadastrada."
+        else:
+            status_text.value = f"{len(locator)} academias filiadas."
 
         return ft.View(
             "/training_location",
@@ -545,19 +1184,18 @@ class AppFBKMKLN:
                             icon=ft.Icons.ARROW_BACK,
                             on_click=lambda _: self.page.go("/dashboard"),
                             tooltip="Voltar",
-                        )
+                        ),
+                        ft.Text("Onde Treinar", size=24, weight=ft.FontWeight.BOLD),
                     ]
                 ),
-                ft.Column(
+                ft.Row(
                     [
-                        ft.Text("Onde Treinar", size=24, weight=ft.FontWeight.BOLD),
-                        ft.Divider(),
-                        ft.Text("Funcionalidade em desenvolvimento.", size=16),
-                        ft.Text("Em breve: Endereços, horários e mapa."),
-                    ],
-                    spacing=15,
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        search_field,
+                        ft.ElevatedButton("Perto de mim", icon=ft.Icons.MY_LOCATION, on_click=on_near_me),
+                    ]
                 ),
+                status_text,
+                results_list,
             ],
             padding=20,
         )
@@ -0,0 +1,233 @@
+# src/academy_locator.py
+
+# LOCALIZADOR DE ACADEMIAS ("ONDE TREINAR")
+# As academias filiadas vêm de um CSV local (ACADEMIES_CSV_PATH) com as colunas
+# NOME, CIDADE, UF, ENDERECO, LATITUDE, LONGITUDE e, opcionais, HORARIOS e
+# TELEFONE. Com centenas (ou milhares) de academias, percorrer a lista inteira
+# a cada tecla digitada ou a cada "perto de mim" fica lento. Na carga são
+# montados dois índices:
+#   - espacial: KDTree (scikit-learn) sobre as coordenadas projetadas na esfera
+#     unitária (x, y, z). A distância em linha reta entre dois pontos da esfera
+#     cresce junto com a distância pela superfície, então os k mais próximos
+#     na árvore são os k mais próximos de verdade; a distância em km é
+#     convertida depois (haversine);
+#   - de prefixos: o vocabulário ordenado dos termos normalizados (minúsculas,
+#     sem acento) do nome, cidade e UF, com os ids das academias de cada termo
+#     em sequência. Os termos com um prefixo formam um intervalo contíguo do
+#     vocabulário, achado por busca binária (bisect).
+# As academias são numeradas em ordem alfabética de nome: sem localização, os
+# resultados de uma busca já saem ordenados pelo menor id.
+
+import bisect
+import csv
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+from src.config import ACADEMIES_CSV_PATH, ACADEMY_NEAREST_K, ACADEMY_SEARCH_LIMIT
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Quando os candidatos de uma busca com localização passam desta fração das
+# academias, a árvore acha os mais próximos entre eles mais rápido do que
+# medir a distância de cada um.
+NEAR_SEARCH_TREE_FRACTION = 0.1
+
+
+def normalize_text(text: str) -> list:
+    """Termos de busca de um texto: minúsculas, sem acentos, só letras e números."""
+    # NFKD separa os acentos das letras; o encode ASCII descarta os acentos.
+    plain = unicodedata.normalize("NFKD", str(text).lower()).encode("ascii", "ignore").decode("ascii")
+    return _TOKEN_PATTERN.findall(plain)
+
+
+def to_unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """Coordenadas (graus) projetadas na esfera unitária, shape (N, 3)."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord):
+    """Distância pela superfície (km) a partir da distância em linha reta na esfera unitária."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+
+class AcademyLocator:
+    """Academias com índice espacial (vizinhos mais próximos) e de prefixos (texto)."""
+
+    def __init__(self, records: list):
+        valid = []
+        for record in records:
+            try:
+                lat, lon = float(record["LATITUDE"]), float(record["LONGITUDE"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if -90 <= lat <= 90 and -180 <= lon <= 180 and str(record.get("NOME", "")).strip():
+                valid.append(dict(record, LATITUDE=lat, LONGITUDE=lon))
+        if len(valid) < len(records):
+            logger.warning(f"{len(records) - len(valid)} academias ignoradas (nome ou coordenadas inválidas).")
+        terms = [normalize_text(f"{r['NOME']} {r.get('CIDADE', '')} {r.get('UF', '')}") for r in valid]
+        # Os termos começam pelos do nome: ordenar por eles é ordenar pelo nome.
+        order = sorted(range(len(valid)), key=terms.__getitem__)
+        self.records = [valid[i] for i in order]
+        valid = self.records
+
+        self._points = to_unit_vectors([r["LATITUDE"] for r in valid], [r["LONGITUDE"] for r in valid])
+        self._tree = KDTree(self._points) if valid else None
+
+        # Lista de ids por termo, já em ordem crescente (os ids são percorridos em ordem).
+        postings = {}
+        for academy_id, i in enumerate(order):
+            for term in terms[i]:
+                ids = postings.setdefault(term, [])
+                if not ids or ids[-1] != academy_id:
+                    ids.append(academy_id)
+        # Vocabulário ordenado; os ids do termo i ficam em _term_ids[_offsets[i]:_offsets[i + 1]].
+        self._vocabulary = sorted(postings)
+        sizes = np.fromiter((len(postings[term]) for term in self._vocabulary), dtype=np.int64, count=len(postings))
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self._term_ids = np.fromiter(
+            (academy_id for term in self._vocabulary for academy_id in postings[term]),
+            dtype=np.int32,
+            count=int(self._offsets[-1]),
+        )
+        logger.info(f"Localizador de academias: {len(valid)} academias, {len(self._vocabulary)} termos indexados.")
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AcademyLocator":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            # Linhas com menos colunas que o cabeçalho trazem None nas que faltam.
+            rows = [
+                {key.strip().upper(): value or "" for key, value in row.items() if key}
+                for row in csv.DictReader(f)
+            ]
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _result(self, academy_id: int, distance_km: float | None = None) -> dict:
+        result = dict(self.records[academy_id])
+        result["ID"] = int(academy_id)
+        if distance_km is not None:
+            result["DISTANCIA_KM"] = round(float(distance_km), 2)
+        return result
+
+    def nearest(self, latitude: float, longitude: float, k: int = ACADEMY_NEAREST_K, max_km: float | None = None) -> list:
+        """As k academias mais próximas do ponto, da mais próxima para a mais distante."""
+        if self._tree is None or k <= 0:
+            return []
+        point = to_unit_vectors([latitude], [longitude])
+        chords, ids = self._tree.query(point, k=min(k, len(self.records)))
+        distances = chord_to_km(chords[0])
+        return [
+            self._result(academy_id, distance)
+            for academy_id, distance in zip(ids[0], distances)
+            if max_km is None or distance <= max_km
+        ]
+
+    def _prefix_ids(self, prefix: str) -> np.ndarray:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        # "\uffff" é maior que qualquer caractere dos termos normalizados.
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff", lo=start)
+        return self._term_ids[self._offsets[start] : self._offsets[end]]
+
+    def search(
+        self,
+        text: str,
+        near: tuple | None = None,
+        limit: int = ACADEMY_SEARCH_LIMIT,
+    ) -> list:
+        """
+        Academias cujo nome, cidade ou UF têm termos começando com cada palavra
+        de 'text' ("kra sao" acha "Krav Maga Centro", São Paulo). Com
+        near=(lat, lon), ordena pela distância; senão, pelo nome.
+        """
+        terms = normalize_text(text)
+        if not terms or not self.records:
+            return []
+        # A palavra mais seletiva define os candidatos; as outras filtram.
+        matches = sorted((self._prefix_ids(term) for term in set(terms)), key=len)
+        candidates = matches[0]
+        if len(matches) > 1 and len(candidates):
+            mask = np.zeros(len(self.records), dtype=bool)
+            for other in matches[1:]:
+                mask[:] = False
+                mask[other] = True
+                candidates = candidates[mask[candidates]]
+        if not len(candidates):
+            return []
+        if near is not None and len(candidates) > NEAR_SEARCH_TREE_FRACTION * len(self.records):
+            found = self._nearest_matching(candidates, near, limit)
+            if found is not None:
+                return found
+        # O mesmo id aparece uma vez por termo que casa com o prefixo.
+        candidates = np.unique(candidates)
+        if near is None:
+            return [self._result(academy_id) for academy_id in candidates[:limit]]
+        point = to_unit_vectors([near[0]], [near[1]])[0]
+        chords = np.linalg.norm(self._points[candidates] - point, axis=1)
+        if len(candidates) > limit:
+            top = np.argpartition(chords, limit)[:limit]
+            candidates, chords = candidates[top], chords[top]
+        order = np.argsort(chords)
+        distances = chord_to_km(chords[order])
+        return [self._result(academy_id, distance) for academy_id, distance in zip(candidates[order], distances)]
+
+    def _nearest_matching(self, candidates: np.ndarray, near: tuple, limit: int) -> list | None:
+        """
+        Busca ampla ("s", "centro") ordenada por distância: em vez de medir a
+        distância de todos os candidatos, pede à árvore os vizinhos mais
+        próximos até 'limit' deles estarem entre os candidatos. None se os
+        candidatos estiverem longe do ponto (a árvore teria de percorrer demais).
+        """
+        mask = np.zeros(len(self.records), dtype=bool)
+        mask[candidates] = True
+        point = to_unit_vectors([near[0]], [near[1]])
+        # Candidatos espalhados por igual: ~limit * N / candidatos vizinhos bastariam.
+        expected = limit * len(self.records) // len(candidates) + 1
+        max_k = min(len(self.records), 16 * expected)
+        k = min(max_k, 2 * expected)
+        while True:
+            chords, ids = self._tree.query(point, k=k)
+            hits = mask[ids[0]]
+            if hits.sum() >= limit or k == len(self.records):
+                break
+            if k == max_k:
+                return None
+            k = min(k * 4, max_k)
+        ids, chords = ids[0][hits][:limit], chords[0][hits][:limit]
+        return [self._result(academy_id, distance) for academy_id, distance in zip(ids, chord_to_km(chords))]
+
+
+_default_locator = None
+_default_locator_key = None
+_default_locator_lock = threading.Lock()
+
+
+def get_default_academy_locator(path: str = ACADEMIES_CSV_PATH) -> AcademyLocator:
+    """Localizador do processo, recarregado quando o CSV muda. Vazio sem o arquivo."""
+    global _default_locator, _default_locator_key
+    try:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        key = (os.path.abspath(path), None, None)
+    with _default_locator_lock:
+        if _default_locator is None or _default_locator_key != key:
+            if key[1] is None:
+                logger.warning(f"Arquivo de academias não encontrado: {path}")
+                _default_locator = AcademyLocator([])
+            else:
+                _default_locator = AcademyLocator.from_csv(path)
+            _default_locator_key = key
+        return _default_locator
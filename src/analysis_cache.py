@@ -0,0 +1,210 @@
+# src/analysis_cache.py
+
+# CACHE DE RESULTADOS DE ANÁLISE
+# Alunos costumam reenviar o mesmo vídeo e instrutores refazem comparações só
+# para gerar o relatório de novo. O resultado de uma análise (landmarks,
+# pontuações, diferenças de ângulo e feedback) é guardado no formato de sessão
+# (.npz, ver src/session_store.py), indexado por uma chave que combina:
+#   - o hash do CONTEÚDO dos dois vídeos (não o nome do arquivo);
+#   - os trechos analisados, em frames;
+#   - a configuração do modelo de pose (PoseEstimator.config);
+#   - a versão da lógica de comparação (MotionComparator.VERSION) e os ângulos.
+# O índice fica em SQLite, compartilhado pelos processos worker. Os arquivos
+# são removidos por ordem de último acesso (LRU) quando o total passa do
+# orçamento de disco, e cada leitura confere tamanho e hash do arquivo: uma
+# entrada corrompida é descartada e a análise roda normalmente.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.config import ANALYSIS_CACHE_DIR, ANALYSIS_CACHE_MAX_MB
+from src.session_store import AnalysisSession, load_session, save_session
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Versão do formato da chave/entradas; incrementar invalida todo o cache.
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 1 << 20
+
+# Hash de conteúdo por (caminho, tamanho, mtime): evita reler um vídeo inalterado.
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_content_hash(path: str) -> str:
+    """Hash (BLAKE2b) do conteúdo do arquivo, memorizado enquanto ele não mudar."""
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    with _file_hashes_lock:
+        cached = _file_hashes.get(memo_key)
+    if cached is None:
+        cached = _hash_file(path)
+        with _file_hashes_lock:
+            _file_hashes[memo_key] = cached
+    return cached
+
+
+def analysis_cache_key(
+    aluno_hash: str,
+    mestre_hash: str,
+    pose_config: dict,
+    comparator_version: int,
+    angle_names: list,
+    frame_ranges: dict,
+) -> str:
+    """Chave do cache para uma análise (hash SHA-256 dos parâmetros que definem o resultado)."""
+    payload = {
+        "formato": CACHE_FORMAT_VERSION,
+        "aluno": aluno_hash,
+        "mestre": mestre_hash,
+        "pose": pose_config,
+        "comparador": comparator_version,
+        "angulos": list(angle_names),
+        "trechos": frame_ranges,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AnalysisCache:
+    """Resultados de análise em disco, com índice SQLite e remoção LRU por orçamento."""
+
+    def __init__(self, cache_dir: str | None = None, max_mb: float | None = None):
+        self.cache_dir = cache_dir or ANALYSIS_CACHE_DIR
+        self.max_bytes = int((ANALYSIS_CACHE_MAX_MB if max_mb is None else max_mb) * 2**20)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(self.cache_dir, "index.sqlite3"), timeout=30, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY, filename TEXT NOT NULL, size INTEGER NOT NULL,"
+                " digest TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    def get(self, key: str) -> AnalysisSession | None:
+        """Retorna a sessão em cache para a chave, ou None (ausente ou corrompida)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filename, size, digest FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        filename, size, digest = row
+        path = self._path(filename)
+        try:
+            if os.path.getsize(path) != size or _hash_file(path) != digest:
+                raise ValueError("tamanho ou hash não confere")
+            # Sem mmap: o arquivo pode ser removido pela política LRU depois.
+            session = load_session(path, mmap=False)
+        except Exception as e:
+            logger.warning(f"Entrada do cache de análises descartada ({key[:12]}): {e}")
+            self._discard(key, filename)
+            self.misses += 1
+            return None
+        with self._lock:
+            self._db.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+        self.hits += 1
+        return session
+
+    def put(self, key: str, session: AnalysisSession) -> bool:
+        """Guarda a sessão. Retorna False se ela sozinha excede o orçamento de disco."""
+        filename = f"{key}.npz"
+        # Grava em um arquivo temporário e troca de uma vez: leitores nunca veem
+        # um arquivo pela metade.
+        tmp_path = save_session(session, self._path(f"{key}.{os.getpid()}.tmp.npz"))
+        size = os.path.getsize(tmp_path)
+        if size > self.max_bytes:
+            os.remove(tmp_path)
+            logger.info(f"Resultado de {size / 2**20:.1f} MB maior que o orçamento do cache; não armazenado.")
+            return False
+        digest = _hash_file(tmp_path)
+        os.replace(tmp_path, self._path(filename))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (key, filename, size, digest, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, filename, size, digest, now, now),
+            )
+            self._db.commit()
+        self._evict(keep=key)
+        return True
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def _evict(self, keep: str):
+        """Remove as entradas usadas há mais tempo até o total caber no orçamento."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, filename, size FROM cache_entries ORDER BY last_access"
+            ).fetchall()
+        total = sum(size for _, _, size in rows)
+        for key, filename, size in rows:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._discard(key, filename)
+            total -= size
+            logger.debug(f"Entrada {key[:12]} removida do cache de análises (LRU).")
+
+    def _discard(self, key: str, filename: str):
+        with self._lock:
+            self._db.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._db.commit()
+        try:
+            os.remove(self._path(filename))
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> AnalysisCache:
+    """Cache compartilhado pelas análises do processo, criado com os valores de config."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AnalysisCache()
+        return _default_cache
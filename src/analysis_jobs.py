@@ -0,0 +1,676 @@
+# src/analysis_jobs.py
+
+# ANÁLISE EM PROCESSOS SEPARADOS COM FILA DE JOBS LOCAL
+# Rodando em uma thread do servidor Flet, a inferência do MediaPipe disputa o
+# GIL e a CPU com a interface de todas as sessões. Aqui cada análise vira um
+# job em uma fila SQLite local (sem broker externo) e é executada por processos
+# worker separados, com prioridade de CPU reduzida (nice). A interface só
+# grava o job e consulta o status; o resultado é salvo como sessão .npz (ver
+# src/session_store.py) e carregado sob demanda.
+#
+# A fila é durável: jobs pendentes sobrevivem a um reinício do servidor, e um
+# job que estava em execução quando o worker morreu volta para a fila (até
+# ANALYSIS_JOB_MAX_ATTEMPTS tentativas). Cada arquivo de fila deve ser usado por
+# um único servidor.
+
+import atexit
+import heapq
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from src.analysis_cache import AnalysisCache
+from src.config import (
+    ANALYSIS_CACHE_DIR,
+    ANALYSIS_CACHE_ENABLED,
+    ANALYSIS_CHECKPOINT_SECONDS,
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    ANALYSIS_JOB_POLL_SECONDS,
+    ANALYSIS_QUEUE_DB,
+    ANALYSIS_RESULTS_DIR,
+    ANALYSIS_WORKER_LOG_FILE,
+    ANALYSIS_WORKER_NICE,
+    ANALYSIS_WORKERS,
+    LOG_DIR,
+)
+from src.progress_bus import ProgressBus
+from src.resource_governor import ResourceGovernor, default_cpu_slots, default_memory_budget_mb
+from src.session_store import AnalysisSession, load_session, save_session
+from src.utils import get_logger, setup_logging, shutdown_logging
+from src.video_seek import VideoSegment
+
+logger = get_logger(__name__)
+
+JOB_PENDING = "pendente"
+JOB_RUNNING = "executando"
+JOB_DONE = "concluido"
+JOB_FAILED = "falhou"
+
+# Frequência máxima com que um worker grava o progresso do job na fila.
+PROGRESS_WRITE_HZ = 2.0
+# Jobs concluídos mais recentes usados para estimar a duração de um job na fila.
+ETA_HISTORY_JOBS = 20
+# Sufixo do arquivo com o resultado parcial de um job em execução.
+PARTIAL_RESULT_SUFFIX = ".parcial.npz"
+
+_COLUMNS = (
+    "job_id",
+    "status",
+    "video_aluno",
+    "video_mestre",
+    "options_json",
+    "progress",
+    "result_path",
+    "summary_json",
+    "error",
+    "attempts",
+    "worker_pid",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+
+class AnalysisJob:
+    """Estado de um job de análise, como registrado na fila."""
+
+    def __init__(self, row: tuple):
+        values = dict(zip(_COLUMNS, row))
+        self.job_id = values["job_id"]
+        self.status = values["status"]
+        self.video_aluno = values["video_aluno"]
+        self.video_mestre = values["video_mestre"]
+        self.options = json.loads(values["options_json"])
+        self.progress = values["progress"]
+        self.result_path = values["result_path"]
+        self.summary = json.loads(values["summary_json"]) if values["summary_json"] else None
+        self.error = values["error"]
+        self.attempts = values["attempts"]
+        self.worker_pid = values["worker_pid"]
+        self.created_at = values["created_at"]
+        self.started_at = values["started_at"]
+        self.finished_at = values["finished_at"]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def __repr__(self):
+        return (
+            f"AnalysisJob(job_id='{self.job_id}', status='{self.status}', "
+            f"progress={self.progress:.2f}, attempts={self.attempts})"
+        )
+
+
+class AnalysisJobQueue:
+    """
+    Fila durável de jobs de análise em SQLite, compartilhada pelo servidor
+    (que envia e consulta jobs) e pelos processos worker (que os executam).
+    Cada processo abre a sua própria instância sobre o mesmo arquivo.
+    """
+
+    def __init__(self, db_path: str | None = None, max_attempts: int | None = None):
+        self.db_path = db_path or ANALYSIS_QUEUE_DB
+        self.max_attempts = max_attempts or ANALYSIS_JOB_MAX_ATTEMPTS
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: as transações são abertas explicitamente (claim).
+        self._db = sqlite3.connect(
+            self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL permite que a interface leia o status enquanto um worker grava.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+                " job_id TEXT PRIMARY KEY, status TEXT NOT NULL,"
+                " video_aluno TEXT NOT NULL, video_mestre TEXT NOT NULL,"
+                " options_json TEXT NOT NULL, progress REAL NOT NULL DEFAULT 0,"
+                " result_path TEXT, summary_json TEXT, error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0, worker_pid INTEGER,"
+                " created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS analysis_jobs_status"
+                " ON analysis_jobs (status, created_at)"
+            )
+
+    def submit(
+        self,
+        video_aluno: str,
+        video_mestre: str,
+        aluno_segment=None,
+        mestre_segment=None,
+        repetitions: bool = False,
+    ) -> str:
+        """
+        Enfileira a análise de um par de vídeos já gravados em disco. Com
+        'repetitions', o vídeo do aluno é dividido em repetições, cada uma
+        pontuada contra o mestre; o resultado fica apenas no resumo do job.
+
+        Returns:
+            str: O identificador do job, usado para consultar status e resultado.
+        """
+        for path in (video_aluno, video_mestre):
+            if not os.path.exists(path):
+                raise ValueError(f"Vídeo não encontrado: {path}")
+        options = {}
+        for name, value in (("aluno_segment", aluno_segment), ("mestre_segment", mestre_segment)):
+            if value is not None:
+                segment = VideoSegment.coerce(value)  # valida antes de enfileirar
+                options[name] = [segment.start, segment.end]
+        if repetitions:
+            options["repetitions"] = True
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO analysis_jobs"
+                " (job_id, status, video_aluno, video_mestre, options_json, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    JOB_PENDING,
+                    os.path.abspath(video_aluno),
+                    os.path.abspath(video_mestre),
+                    json.dumps(options),
+                    time.time(),
+                ),
+            )
+        logger.info(f"Job de análise {job_id} enfileirado.")
+        return job_id
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        """Retorna o estado atual do job (None se não existir)."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM analysis_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return AnalysisJob(row) if row else None
+
+    def list_jobs(self, status: str | None = None) -> list:
+        """Lista os jobs (opcionalmente só os de um status), do mais antigo ao mais novo."""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM analysis_jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY created_at", params).fetchall()
+        return [AnalysisJob(row) for row in rows]
+
+    def wait(self, job_id: str, timeout: float | None = None, poll_interval: float = 0.2) -> AnalysisJob:
+        """Consulta o job até ele terminar (ou até 'timeout' segundos) e retorna o último estado."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise ValueError(f"Job de análise inexistente: {job_id}")
+            if job.finished or (deadline is not None and time.monotonic() >= deadline):
+                return job
+            time.sleep(poll_interval)
+
+    def queue_status(self, job_id: str, num_workers: int = 1) -> dict | None:
+        """
+        Posição de um job pendente na fila (1 = o próximo a ser reservado) e a
+        espera estimada até um dos 'num_workers' ficar livre para ele, pela
+        duração média dos últimos jobs concluídos e pelo progresso dos que estão
+        em execução. Sem histórico, 'eta_seconds' é None.
+
+        Returns:
+            dict | None: {"position", "eta_seconds"}, ou None se o job não está pendente.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, created_at FROM analysis_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None or row[0] != JOB_PENDING:
+                return None
+            ahead = self._db.execute(
+                "SELECT COUNT(*) FROM analysis_jobs WHERE status = ? AND created_at < ?",
+                (JOB_PENDING, row[1]),
+            ).fetchone()[0]
+            running = self._db.execute(
+                "SELECT started_at, progress FROM analysis_jobs WHERE status = ?", (JOB_RUNNING,)
+            ).fetchall()
+            durations = [
+                duration
+                for (duration,) in self._db.execute(
+                    "SELECT finished_at - started_at FROM analysis_jobs"
+                    " WHERE status = ? AND started_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?",
+                    (JOB_DONE, ETA_HISTORY_JOBS),
+                )
+            ]
+        status = {"position": ahead + 1, "eta_seconds": None}
+        if not durations:
+            return status
+        average = sum(durations) / len(durations)
+        now = time.time()
+        # Instantes em que cada worker fica livre, simulando a fila em ordem.
+        free_at = []
+        for started_at, progress in running:
+            elapsed = now - started_at
+            remaining = elapsed * (1 - progress) / progress if progress > 0 else average - elapsed
+            free_at.append(max(remaining, 0.0))
+        free_at += [0.0] * max(num_workers - len(free_at), 0)
+        heapq.heapify(free_at)
+        for _ in range(ahead):
+            heapq.heappush(free_at, heapq.heappop(free_at) + average)
+        status["eta_seconds"] = free_at[0]
+        return status
+
+    def load_result(self, job_id: str, mmap: bool = True) -> AnalysisSession:
+        """Carrega a sessão produzida por um job concluído."""
+        job = self.get(job_id)
+        if job is None or job.status != JOB_DONE:
+            raise ValueError(f"O job {job_id} não tem resultado (status: {job and job.status}).")
+        if job.result_path is None:
+            raise ValueError(f"O job {job_id} não gera sessão; o resultado está em job.summary.")
+        return load_session(job.result_path, mmap=mmap)
+
+    # --- Operações usadas pelos workers ---
+
+    def claim(self, worker_pid: int) -> AnalysisJob | None:
+        """Reserva atomicamente o job pendente mais antigo para o worker."""
+        with self._lock:
+            # BEGIN IMMEDIATE trava a escrita: dois workers nunca pegam o mesmo job.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT job_id FROM analysis_jobs WHERE status = ?"
+                    " ORDER BY created_at LIMIT 1",
+                    (JOB_PENDING,),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE analysis_jobs SET status = ?, worker_pid = ?, started_at = ?,"
+                        " attempts = attempts + 1, progress = 0 WHERE job_id = ?",
+                        (JOB_RUNNING, worker_pid, time.time(), row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def update_progress(self, job_id: str, progress: float):
+        with self._lock:
+            self._db.execute(
+                "UPDATE analysis_jobs SET progress = ? WHERE job_id = ? AND status = ?",
+                (progress, job_id, JOB_RUNNING),
+            )
+
+    def complete(self, job_id: str, result_path: str | None, summary: dict):
+        with self._lock:
+            self._db.execute(
+                "UPDATE analysis_jobs SET status = ?, progress = 1, result_path = ?,"
+                " summary_json = ?, error = NULL, finished_at = ? WHERE job_id = ?",
+                (JOB_DONE, result_path, json.dumps(summary), time.time(), job_id),
+            )
+        logger.info(f"Job de análise {job_id} concluído: {result_path}")
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE analysis_jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (JOB_FAILED, error, time.time(), job_id),
+            )
+        logger.error(f"Job de análise {job_id} falhou: {error}")
+
+    def requeue_orphaned(self, alive_pids=()) -> int:
+        """
+        Devolve à fila os jobs 'executando' cujo worker não está mais vivo (ex:
+        o processo morreu ou o servidor foi reiniciado). Jobs que já esgotaram
+        as tentativas são marcados como falha. Retorna quantos jobs foram afetados.
+        """
+        alive = set(alive_pids)
+        orphaned = [job for job in self.list_jobs(JOB_RUNNING) if job.worker_pid not in alive]
+        for job in orphaned:
+            if job.attempts >= self.max_attempts:
+                self.fail(job.job_id, f"O worker (pid {job.worker_pid}) foi encerrado durante a análise.")
+                continue
+            with self._lock:
+                self._db.execute(
+                    "UPDATE analysis_jobs SET status = ?, worker_pid = NULL, progress = 0"
+                    " WHERE job_id = ? AND status = ?",
+                    (JOB_PENDING, job.job_id, JOB_RUNNING),
+                )
+            logger.warning(f"Job de análise {job.job_id} devolvido à fila (worker {job.worker_pid} encerrado).")
+        return len(orphaned)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def partial_result_path(results_dir: str, job_id: str) -> str:
+    """Arquivo com os frames já analisados de um job em execução."""
+    return os.path.join(results_dir, f"{job_id}{PARTIAL_RESULT_SUFFIX}")
+
+
+class PartialResultWriter:
+    """
+    Assinante do ProgressBus do job que salva, no máximo a cada 'interval'
+    segundos, os frames já publicados pelo analisador (snapshot_results) como
+    uma sessão parcial. O arquivo é trocado atomicamente: quem o lê nunca vê
+    uma gravação pela metade.
+    """
+
+    def __init__(self, analyzer, path: str, interval: float = ANALYSIS_CHECKPOINT_SECONDS):
+        self.analyzer = analyzer
+        self.path = path
+        self.interval = interval
+        # Só os resultados deste job: o buffer da análise anterior tem geração menor.
+        self._generation = analyzer.results.generation
+        self._saved_frames = 0
+        self._last_save = 0.0
+
+    def __call__(self, event):
+        now = time.monotonic()
+        if event.done or now - self._last_save < self.interval:
+            return
+        snapshot = self.analyzer.snapshot_results()
+        if snapshot.generation <= self._generation or snapshot.num_frames <= self._saved_frames:
+            return
+        self._last_save = now
+        session = AnalysisSession(
+            snapshot.aluno_landmarks,
+            snapshot.mestre_landmarks,
+            snapshot.scores,
+            snapshot.angle_diffs,
+            snapshot.angle_names,
+            snapshot.feedbacks,
+            video_aluno=self.analyzer.video_aluno_path,
+            video_mestre=self.analyzer.video_mestre_path,
+            metadata={
+                "start_frames": dict(self.analyzer.segment_start_frames),
+                "total_frames": snapshot.total_frames,
+            },
+        )
+        temporary = self.path[: -len(".npz")] + ".tmp.npz"
+        try:
+            save_session(session, temporary)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o resultado parcial em {self.path}: {e}")
+            return
+        self._saved_frames = snapshot.num_frames
+
+    def remove(self):
+        for path in (self.path, self.path[: -len(".npz")] + ".tmp.npz"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _process_job(queue: AnalysisJobQueue, analyzer, job: AnalysisJob, results_dir: str):
+    """Executa um job no worker e registra o resultado (ou o erro) na fila."""
+    progress_bus = ProgressBus(max_rate_hz=PROGRESS_WRITE_HZ)
+    progress_bus.subscribe(lambda event: queue.update_progress(job.job_id, event.progress))
+    partial = PartialResultWriter(analyzer, partial_result_path(results_dir, job.job_id))
+    if not job.options.get("repetitions"):
+        progress_bus.subscribe(partial)
+    progress_bus.start()
+    try:
+        analyzer.load_video_from_path(job.video_aluno, is_aluno=True)
+        analyzer.load_video_from_path(job.video_mestre, is_aluno=False)
+        if job.options.get("repetitions"):
+            summary = analyzer.run_repetition_analysis(
+                progress_bus,
+                aluno_segment=job.options.get("aluno_segment"),
+                mestre_segment=job.options.get("mestre_segment"),
+            )
+            progress_bus.close()
+            summary["metricas"] = analyzer.metrics.snapshot()
+            queue.complete(job.job_id, None, summary)
+            return
+        # Só landmarks e pontuações vão para a sessão salva: os frames não são guardados.
+        analyzer.run_analysis(
+            progress_bus,
+            aluno_segment=job.options.get("aluno_segment"),
+            mestre_segment=job.options.get("mestre_segment"),
+            keep_frames=False,
+        )
+        progress_bus.close()
+        session = AnalysisSession.from_analyzer(analyzer)
+        result_path = save_session(session, os.path.join(results_dir, f"{job.job_id}.npz"))
+        summary = session.summary()
+        summary["metricas"] = analyzer.metrics.snapshot()
+        summary["cache"] = analyzer.cache_hit
+        queue.complete(job.job_id, result_path, summary)
+    except Exception as e:
+        progress_bus.close()
+        queue.fail(job.job_id, f"{type(e).__name__}: {e}")
+    finally:
+        # O resultado parcial só serve enquanto o job está em execução.
+        partial.remove()
+        # O worker reaproveita o analisador (e o modelo carregado) no próximo job.
+        analyzer.clear_frames()
+        for cap in (analyzer.cap_aluno, analyzer.cap_mestre):
+            if cap is not None:
+                cap.release()
+
+
+def run_worker(
+    db_path: str,
+    results_dir: str,
+    stop_event,
+    poll_interval: float = ANALYSIS_JOB_POLL_SECONDS,
+    nice: int = 0,
+    log_file: str | None = None,
+    cache_dir: str | None = None,
+    log_dir: str | None = None,
+    memory_budget_mb: float | None = None,
+):
+    """
+    Laço principal de um processo worker: reserva jobs da fila e os executa até
+    'stop_event' ser sinalizado. Roda em um processo próprio (ver AnalysisWorkerPool).
+    Com 'cache_dir', os resultados são compartilhados com os demais workers pelo
+    cache de análises. 'memory_budget_mb' é a parte deste worker no orçamento de
+    memória do pool (padrão: o orçamento do processo, ver ResourceGovernor).
+    """
+    exit_code = 0
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+    setup_logging(log_dir=log_dir, log_file=log_file, console=False)
+    queue = AnalysisJobQueue(db_path)
+    os.makedirs(results_dir, exist_ok=True)
+    analyzer = None
+    pid = os.getpid()
+    logger.info(f"Worker de análise iniciado (pid {pid}).")
+    try:
+        while not stop_event.is_set():
+            job = queue.claim(pid)
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+            logger.info(f"Worker {pid} executando o job {job.job_id} (tentativa {job.attempts}).")
+            if analyzer is None:
+                # Importado só no worker: o servidor não precisa carregar o MediaPipe.
+                from src.video_analyzer import VideoAnalyzer
+
+                # Um job por vez, dentro da parte do worker no orçamento do pool.
+                governor = ResourceGovernor(cpu_slots=1, memory_budget_mb=memory_budget_mb)
+                analyzer = VideoAnalyzer(cache=AnalysisCache(cache_dir) if cache_dir else None, governor=governor)
+            _process_job(queue, analyzer, job, results_dir)
+    except Exception as e:
+        logger.error(f"Erro no worker de análise {pid}: {e}", exc_info=True)
+        exit_code = 1
+    finally:
+        if analyzer is not None:
+            analyzer.close()
+        queue.close()
+        logger.info(f"Worker de análise encerrado (pid {pid}).")
+        shutdown_logging()
+    if exit_code:
+        sys.exit(exit_code)
+
+
+class AnalysisWorkerPool:
+    """
+    Mantém 'num_workers' processos worker consumindo a fila. Workers que morrem
+    são substituídos e o job que executavam volta para a fila.
+
+    Exemplo:
+        with AnalysisWorkerPool(num_workers=2) as pool:
+            job_id = pool.queue.submit("aluno.mp4", "mestre.mp4")
+            ...
+            job = pool.queue.get(job_id)  # status, progresso, erro
+            session = pool.queue.load_result(job_id)
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        db_path: str | None = None,
+        results_dir: str | None = None,
+        poll_interval: float | None = None,
+        nice: int | None = None,
+        use_cache: bool | None = None,
+        cache_dir: str | None = None,
+        log_dir: str | None = None,
+        memory_budget_mb: float | None = None,
+    ):
+        """
+        Os parâmetros omitidos usam os valores ANALYSIS_* de src/config.py. Cada
+        worker grava o próprio log em 'log_dir' (padrão: LOG_DIR), no arquivo
+        ANALYSIS_WORKER_LOG_FILE.
+
+        O orçamento do ResourceGovernor vale para o pool inteiro: no máximo um
+        worker por vaga de CPU e 'memory_budget_mb' (padrão: o do governor)
+        dividido igualmente entre os workers.
+        """
+        self.num_workers = ANALYSIS_WORKERS if num_workers is None else num_workers
+        if self.num_workers < 1:
+            raise ValueError(f"O pool precisa de pelo menos um worker: {self.num_workers}")
+        cpu_slots = default_cpu_slots()
+        if self.num_workers > cpu_slots:
+            logger.warning(
+                f"{self.num_workers} workers pedidos, mas só há {cpu_slots} vaga(s) de CPU; usando {cpu_slots}."
+            )
+            self.num_workers = cpu_slots
+        if memory_budget_mb is None:
+            memory_budget_mb = default_memory_budget_mb()
+        self.worker_memory_budget_mb = memory_budget_mb / self.num_workers
+        self.db_path = db_path or ANALYSIS_QUEUE_DB
+        self.results_dir = results_dir or ANALYSIS_RESULTS_DIR
+        self.poll_interval = ANALYSIS_JOB_POLL_SECONDS if poll_interval is None else poll_interval
+        self.nice = ANALYSIS_WORKER_NICE if nice is None else nice
+        use_cache = ANALYSIS_CACHE_ENABLED if use_cache is None else use_cache
+        self.cache_dir = (cache_dir or ANALYSIS_CACHE_DIR) if use_cache else None
+        self.log_dir = log_dir or LOG_DIR
+        self.queue = AnalysisJobQueue(self.db_path)
+        # "spawn": o servidor tem várias threads, e fork com threads não é seguro.
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._workers = {}  # índice -> Process
+        self._monitor_thread = None
+
+    def start(self) -> "AnalysisWorkerPool":
+        # Jobs 'executando' de uma execução anterior do servidor não têm mais worker.
+        self.queue.requeue_orphaned()
+        for index in range(self.num_workers):
+            self._spawn(index)
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor_thread.start()
+        logger.info(f"Pool de análise iniciado com {self.num_workers} worker(s).")
+        return self
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=run_worker,
+            args=(self.db_path, self.results_dir, self._stop_event),
+            kwargs={
+                "poll_interval": self.poll_interval,
+                "nice": self.nice,
+                "log_file": ANALYSIS_WORKER_LOG_FILE.format(index=index),
+                "log_dir": self.log_dir,
+                "cache_dir": self.cache_dir,
+                "memory_budget_mb": self.worker_memory_budget_mb,
+            },
+            name=f"analysis-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[index] = process
+
+    def queue_status(self, job_id: str) -> dict | None:
+        """Posição e espera estimada de um job pendente (ver AnalysisJobQueue.queue_status)."""
+        return self.queue.queue_status(job_id, self.num_workers)
+
+    def load_partial(self, job_id: str) -> AnalysisSession | None:
+        """
+        Frames já analisados de um job em execução (salvos pelo worker a cada
+        ANALYSIS_CHECKPOINT_SECONDS), ou None se ainda não há resultado parcial.
+        """
+        try:
+            return load_session(partial_result_path(self.results_dir, job_id), mmap=False)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+
+    @property
+    def worker_pids(self) -> list:
+        return [p.pid for p in self._workers.values() if p.is_alive()]
+
+    def _monitor_loop(self):
+        while not self._stop_event.wait(max(self.poll_interval * 4, 1.0)):
+            dead = [i for i, p in self._workers.items() if not p.is_alive()]
+            if not dead:
+                continue
+            for index in dead:
+                logger.warning(
+                    f"Worker de análise {index} encerrado (código {self._workers[index].exitcode}); reiniciando."
+                )
+            self.queue.requeue_orphaned(self.worker_pids)
+            for index in dead:
+                if not self._stop_event.is_set():
+                    self._spawn(index)
+
+    def stop(self, timeout: float = 10.0):
+        """Sinaliza os workers, aguarda o job em andamento e encerra os processos."""
+        self._stop_event.set()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout)
+            self._monitor_thread = None
+        deadline = time.monotonic() + timeout
+        for process in self._workers.values():
+            process.join(max(deadline - time.monotonic(), 0.1))
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        self._workers.clear()
+        # Jobs interrompidos pelo terminate() voltam para a fila.
+        self.queue.requeue_orphaned()
+        logger.info("Pool de análise encerrado.")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_worker_pool() -> AnalysisWorkerPool:
+    """Pool de workers do processo (configuração ANALYSIS_*), iniciado no primeiro uso."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = AnalysisWorkerPool().start()
+            atexit.register(_default_pool.stop)
+        return _default_pool
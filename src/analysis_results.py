@@ -0,0 +1,174 @@
+# src/analysis_results.py
+
+# RESULTADOS PARCIAIS DA ANÁLISE
+# A thread de análise produz um frame por vez enquanto a interface quer mostrar
+# o que já foi calculado. As listas do VideoAnalyzer (comparison_results,
+# processed_frames_*, *_landmarks_list) são preenchidas uma de cada vez, então
+# um leitor concorrente pode ver a pontuação de um frame antes dos landmarks
+# dele, ou uma lista sendo esvaziada pela próxima análise.
+#
+# AnalysisResults resolve isso sem travas no caminho da escrita:
+#   - os arrays são pré-alocados com o número de frames da análise, no mesmo
+#     formato colunar da AnalysisSession;
+#   - a thread de análise (única escritora) grava o frame i e só depois publica
+#     o contador frames_ready = i + 1. Frames abaixo do contador não mudam mais;
+#   - snapshot() lê o contador uma vez e devolve visões somente leitura dos
+#     arrays até ele, sem copiar o histórico;
+#   - cada análise cria um buffer novo (nova geração) em vez de limpar o
+#     anterior, então quem ainda guarda um snapshot antigo continua com dados
+#     íntegros.
+
+import numpy as np
+
+from src.config import POSE_LANDMARK_NAMES
+from src.session_store import LANDMARK_FIELDS, AnalysisSession, landmarks_list_to_array
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def _read_only(array: np.ndarray, count: int) -> np.ndarray:
+    """Visão somente leitura das 'count' primeiras linhas do array (sem cópia)."""
+    view = array[:count]
+    view.flags.writeable = False
+    return view
+
+
+class ResultsSnapshot(AnalysisSession):
+    """
+    Visão consistente dos frames já publicados de uma análise. É uma
+    AnalysisSession (frame_result, landmarks_as_list, summary) cujos arrays são
+    visões somente leitura do buffer; acrescenta os frames anotados e o estado
+    da análise no momento do snapshot.
+    """
+
+    def __init__(self, results: "AnalysisResults", count: int, finished: bool):
+        super().__init__(
+            _read_only(results.aluno_landmarks, count),
+            _read_only(results.mestre_landmarks, count),
+            _read_only(results.scores, count),
+            _read_only(results.angle_diffs, count),
+            results.angle_names,
+            _read_only(results.feedbacks, count),
+        )
+        self.generation = results.generation
+        self.total_frames = results.capacity
+        self.finished = finished
+        self._processed_aluno = _read_only(results.processed_aluno, count)
+        self._processed_mestre = _read_only(results.processed_mestre, count)
+
+    @property
+    def progress(self) -> float:
+        if self.finished or self.total_frames == 0:
+            return 1.0
+        return self.num_frames / self.total_frames
+
+    def processed_frame(self, index: int, is_aluno: bool = True) -> np.ndarray | None:
+        """Frame anotado (com o esqueleto) de um dos vídeos; None se não foi guardado."""
+        frames = self._processed_aluno if is_aluno else self._processed_mestre
+        return frames[index]
+
+    def frame_results(self, start: int = 0, end: int | None = None) -> list:
+        """
+        Resultados dos frames [start, end) no formato de comparison_results. Com
+        start = número de frames do snapshot anterior, a interface lê só o que
+        chegou desde a última atualização.
+        """
+        end = self.num_frames if end is None else min(end, self.num_frames)
+        return [self.frame_result(i) for i in range(start, end)]
+
+
+class AnalysisResults:
+    """
+    Buffer pré-alocado dos resultados de uma análise, escrito por uma única
+    thread e lido por qualquer número de threads via snapshot().
+    """
+
+    def __init__(self, capacity: int, angle_names: list, generation: int = 0):
+        if capacity < 0:
+            raise ValueError("A capacidade do buffer de resultados não pode ser negativa.")
+        self.capacity = int(capacity)
+        self.angle_names = list(angle_names)
+        self.generation = generation
+        self._angle_columns = {name: j for j, name in enumerate(self.angle_names)}
+
+        shape = (self.capacity, len(POSE_LANDMARK_NAMES), len(LANDMARK_FIELDS))
+        self.aluno_landmarks = np.full(shape, np.nan, dtype=np.float32)
+        self.mestre_landmarks = np.full(shape, np.nan, dtype=np.float32)
+        self.scores = np.zeros(self.capacity, dtype=np.float32)
+        self.angle_diffs = np.full((self.capacity, len(self.angle_names)), np.nan, dtype=np.float32)
+        # Arrays de objetos: cada posição recebe uma referência, sem copiar o frame.
+        self.feedbacks = np.full(self.capacity, "", dtype=object)
+        self.processed_aluno = np.full(self.capacity, None, dtype=object)
+        self.processed_mestre = np.full(self.capacity, None, dtype=object)
+
+        self._ready = 0
+        self._finished = False
+
+    @property
+    def frames_ready(self) -> int:
+        return self._ready
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def append(
+        self,
+        score: float,
+        feedback: str,
+        diffs: dict,
+        aluno_landmarks: list | None,
+        mestre_landmarks: list | None,
+        processed_aluno: np.ndarray | None = None,
+        processed_mestre: np.ndarray | None = None,
+    ):
+        """Grava o próximo frame e o publica. Deve ser chamado só pela thread de análise."""
+        i = self._ready
+        if i >= self.capacity:
+            raise ValueError(f"Buffer de resultados cheio ({self.capacity} frames).")
+        self.aluno_landmarks[i] = landmarks_list_to_array(aluno_landmarks)
+        self.mestre_landmarks[i] = landmarks_list_to_array(mestre_landmarks)
+        self.scores[i] = score
+        for name, value in diffs.items():
+            column = self._angle_columns.get(name)
+            if column is not None:
+                self.angle_diffs[i, column] = value
+        self.feedbacks[i] = feedback
+        self.processed_aluno[i] = processed_aluno
+        self.processed_mestre[i] = processed_mestre
+        # Publicação: o contador só avança depois que o frame está completo.
+        self._ready = i + 1
+
+    def finish(self):
+        """Marca a análise como concluída (inclusive se terminou antes da capacidade)."""
+        self._finished = True
+
+    def release_frames(self):
+        """
+        Solta as referências aos frames anotados (ex: VideoAnalyzer.clear_frames).
+        Os arrays são trocados, não limpos: snapshots já entregues continuam com
+        os frames que tinham.
+        """
+        self.processed_aluno = np.full(self.capacity, None, dtype=object)
+        self.processed_mestre = np.full(self.capacity, None, dtype=object)
+
+    def snapshot(self) -> ResultsSnapshot:
+        """Visão imutável dos frames publicados até agora (custo constante, sem cópia)."""
+        # finished é lido antes do contador: se a análise já terminou, o
+        # contador lido em seguida é o final.
+        finished = self._finished
+        return ResultsSnapshot(self, self._ready, finished)
+
+    @classmethod
+    def from_session(cls, session: AnalysisSession, generation: int = 0) -> "AnalysisResults":
+        """Buffer já concluído com os resultados de uma sessão (ex: vinda do cache)."""
+        results = cls(session.num_frames, session.angle_names, generation)
+        results.aluno_landmarks[:] = session.aluno_landmarks
+        results.mestre_landmarks[:] = session.mestre_landmarks
+        results.scores[:] = session.scores
+        results.angle_diffs[:] = session.angle_diffs
+        results.feedbacks[:] = [str(feedback) for feedback in session.feedbacks]
+        results._ready = session.num_frames
+        results.finish()
+        return results
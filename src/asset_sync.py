@@ -0,0 +1,407 @@
+# src/asset_sync.py
+
+# SINCRONIZAÇÃO DOS ASSETS PARA USO OFFLINE
+# Os PDFs do programa técnico e os vídeos de técnicas ficam em assets/ e, sem
+# sincronização, cada atualização exige distribuir a árvore inteira de novo.
+# Aqui:
+#   - o servidor gera um manifesto (build_manifest) com o hash SHA-256 de cada
+#     arquivo de programa_tecnico/ e videos_tecnicas/, a faixa a que ele
+#     pertence e o hash de cada bloco de ASSET_SYNC_CHUNK_BYTES. O manifesto é
+#     servido junto com os assets (ASSET_MANIFEST_NAME) e só os arquivos
+#     alterados são lidos de novo ao regerá-lo;
+#   - o cliente (AssetSyncClient) baixa o manifesto e compara com o estado
+#     local (tamanho, mtime e hash do que já baixou, sem reler a biblioteca),
+#     baixando só os arquivos novos ou alterados das faixas acessíveis ao
+#     aluno. Cada arquivo vem em blocos por HTTP Range, verificados um a um: um
+#     download interrompido continua do último bloco válido, e o arquivo só
+#     substitui o anterior depois de conferido por inteiro.
+# Assim o tráfego e o tempo de uma atualização dependem do que mudou, não do
+# tamanho da biblioteca.
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+from src.config import (
+    ASSET_MANIFEST_NAME,
+    ASSET_SYNC_CHUNK_BYTES,
+    ASSET_SYNC_DIRS,
+    ASSET_SYNC_RETRIES,
+    ASSET_SYNC_TIMEOUT_SECONDS,
+)
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Versão do formato do manifesto; clientes rejeitam versões que não conhecem.
+MANIFEST_FORMAT_VERSION = 1
+# Estado local do cliente: o que já foi baixado e verificado.
+SYNC_STATE_NAME = ".asset_sync_state.json"
+READ_BLOCK_BYTES = 1 << 20
+
+# Um lock por pasta local: clientes do mesmo processo não sincronizam a mesma pasta ao mesmo tempo.
+_DIR_LOCKS = {}
+_DIR_LOCKS_GUARD = threading.Lock()
+
+
+def _directory_lock(local_dir: str) -> threading.Lock:
+    with _DIR_LOCKS_GUARD:
+        return _DIR_LOCKS.setdefault(os.path.abspath(local_dir), threading.Lock())
+
+
+class AssetSyncError(RuntimeError):
+    """Falha ao sincronizar um asset (rede, servidor ou conteúdo que não confere)."""
+
+
+def asset_rank(relative_path: str) -> str | None:
+    """
+    Faixa de um asset pelo caminho relativo: programa_tecnico/<Faixa>.pdf ou
+    videos_tecnicas/<Faixa>/<video>. None para arquivos fora dessas pastas.
+    """
+    parts = relative_path.split("/")
+    if parts[0] == "programa_tecnico" and len(parts) == 2:
+        return os.path.splitext(parts[1])[0]
+    if parts[0] == "videos_tecnicas" and len(parts) >= 3:
+        return parts[1]
+    return None
+
+
+def hash_file_chunks(path: str, chunk_size: int = ASSET_SYNC_CHUNK_BYTES) -> tuple[str, list]:
+    """Hash SHA-256 do arquivo inteiro e de cada bloco de 'chunk_size' bytes."""
+    digest = hashlib.sha256()
+    chunks = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            chunks.append(hashlib.sha256(chunk).hexdigest())
+    return digest.hexdigest(), chunks
+
+
+def build_manifest(
+    assets_dir: str,
+    previous: dict | None = None,
+    chunk_size: int = ASSET_SYNC_CHUNK_BYTES,
+    asset_dirs: tuple = ASSET_SYNC_DIRS,
+) -> dict:
+    """
+    Manifesto dos assets sincronizáveis. Arquivos com o mesmo tamanho e mtime
+    de 'previous' (o manifesto anterior) reaproveitam os hashes sem reler o
+    conteúdo.
+    """
+    reusable = {}
+    if previous and previous.get("version") == MANIFEST_FORMAT_VERSION and previous.get("chunk_size") == chunk_size:
+        reusable = previous.get("files", {})
+    files = {}
+    hashed = 0
+    for asset_dir in asset_dirs:
+        root = os.path.join(assets_dir, asset_dir)
+        for directory, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                relative = os.path.relpath(path, assets_dir).replace(os.sep, "/")
+                rank = asset_rank(relative)
+                if rank is None or filename.startswith("."):
+                    continue
+                stat = os.stat(path)
+                entry = reusable.get(relative)
+                if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                    sha256, chunks = hash_file_chunks(path, chunk_size)
+                    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256, "chunks": chunks}
+                    hashed += 1
+                files[relative] = dict(entry, rank=rank)
+    logger.info(f"Manifesto de assets: {len(files)} arquivos ({hashed} lidos de novo).")
+    return {
+        "version": MANIFEST_FORMAT_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "chunk_size": chunk_size,
+        "files": dict(sorted(files.items())),
+    }
+
+
+def _write_json_atomic(path: str, data: dict):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(temp_path, path)
+
+
+def load_manifest(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_manifest(
+    assets_dir: str, manifest_path: str | None = None, chunk_size: int = ASSET_SYNC_CHUNK_BYTES
+) -> dict:
+    """Regera o manifesto dentro de assets/ (incremental em relação ao atual)."""
+    manifest_path = manifest_path or os.path.join(assets_dir, ASSET_MANIFEST_NAME)
+    manifest = build_manifest(assets_dir, previous=load_manifest(manifest_path), chunk_size=chunk_size)
+    _write_json_atomic(manifest_path, manifest)
+    return manifest
+
+
+class SyncReport:
+    """Resumo de uma sincronização."""
+
+    def __init__(self):
+        self.downloaded = []
+        self.deleted = []
+        self.up_to_date = 0
+        self.bytes_downloaded = 0
+        self.resumed_bytes = 0
+        self.failed = {}
+        self.elapsed = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "baixados": len(self.downloaded),
+            "removidos": len(self.deleted),
+            "atualizados": self.up_to_date,
+            "bytes_baixados": self.bytes_downloaded,
+            "bytes_retomados": self.resumed_bytes,
+            "falhas": dict(self.failed),
+            "tempo_s": round(self.elapsed, 3),
+        }
+
+
+class AssetSyncClient:
+    """
+    Mantém em 'local_dir' a cópia dos assets das faixas acessíveis ao aluno,
+    a partir do manifesto servido em 'base_url' (a URL da pasta assets/).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        local_dir: str,
+        retries: int = ASSET_SYNC_RETRIES,
+        timeout: float = ASSET_SYNC_TIMEOUT_SECONDS,
+    ):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.local_dir = local_dir
+        self.retries = retries
+        self.timeout = timeout
+        self.state_path = os.path.join(local_dir, SYNC_STATE_NAME)
+        self._lock = _directory_lock(local_dir)
+        os.makedirs(local_dir, exist_ok=True)
+        self.state = load_manifest(self.state_path) or {"files": {}}
+
+    def _url(self, relative_path: str) -> str:
+        return self.base_url + urllib.parse.quote(relative_path)
+
+    def _local_path(self, relative_path: str) -> str:
+        path = os.path.normpath(os.path.join(self.local_dir, relative_path))
+        # O manifesto vem da rede: nenhum caminho pode sair da pasta local.
+        if os.path.commonpath([path, os.path.abspath(self.local_dir)]) != os.path.abspath(self.local_dir):
+            raise AssetSyncError(f"Caminho inválido no manifesto: {relative_path}")
+        return path
+
+    def fetch_manifest(self) -> dict:
+        try:
+            with urllib.request.urlopen(self._url(ASSET_MANIFEST_NAME), timeout=self.timeout) as response:
+                manifest = json.loads(response.read().decode("utf-8"))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise AssetSyncError(f"Não foi possível obter o manifesto de assets: {e}") from e
+        if manifest.get("version") != MANIFEST_FORMAT_VERSION:
+            raise AssetSyncError(f"Versão do manifesto não suportada: {manifest.get('version')}")
+        for relative_path in manifest["files"]:
+            self._local_path(relative_path)
+        return manifest
+
+    def _is_current(self, relative_path: str, entry: dict, chunk_size: int) -> bool:
+        """
+        Arquivo local igual ao do manifesto, conferido pelo estado salvo (sem
+        reler). Um arquivo sem estado (ex: os assets que vêm com a instalação)
+        é lido uma vez e, se o hash conferir, passa a constar do estado.
+        """
+        known = self.state["files"].get(relative_path)
+        if known is not None and known["sha256"] != entry["sha256"]:
+            return False
+        try:
+            stat = os.stat(self._local_path(relative_path))
+        except OSError:
+            return False
+        if known is not None:
+            return stat.st_size == known["size"] and stat.st_mtime_ns == known["mtime_ns"]
+        if stat.st_size != entry["size"]:
+            return False
+        sha256, _ = hash_file_chunks(self._local_path(relative_path), chunk_size)
+        if sha256 != entry["sha256"]:
+            return False
+        logger.debug(f"'{relative_path}' já está igual ao manifesto; registrado sem baixar.")
+        self.state["files"][relative_path] = {
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rank": entry["rank"],
+        }
+        return True
+
+    def plan(self, manifest: dict, ranks) -> tuple[list, list]:
+        """Arquivos a baixar e a remover para deixar as faixas 'ranks' iguais ao manifesto."""
+        ranks = set(ranks)
+        wanted = {path: entry for path, entry in manifest["files"].items() if entry["rank"] in ranks}
+        downloads = [
+            path for path, entry in wanted.items() if not self._is_current(path, entry, manifest["chunk_size"])
+        ]
+        # Arquivos baixados antes que saíram do manifesto (ou de uma faixa ainda acessível).
+        removals = [
+            path
+            for path, known in self.state["files"].items()
+            if path not in manifest["files"] and known.get("rank") in ranks
+        ]
+        return downloads, removals
+
+    def sync(self, ranks, progress_callback=None) -> SyncReport:
+        """
+        Sincroniza as faixas 'ranks'. progress_callback(bytes_feitos, bytes_totais)
+        é chamado a cada bloco baixado.
+        """
+        ranks = set(ranks)
+        with self._lock:
+            start = time.perf_counter()
+            report = SyncReport()
+            self.state = load_manifest(self.state_path) or {"files": {}}
+            manifest = self.fetch_manifest()
+            downloads, removals = self.plan(manifest, ranks)
+            wanted = sum(1 for entry in manifest["files"].values() if entry["rank"] in ranks)
+            report.up_to_date = wanted - len(downloads)
+            total_bytes = sum(manifest["files"][path]["size"] for path in downloads)
+            done_bytes = [0]
+
+            def on_chunk(size):
+                done_bytes[0] += size
+                if progress_callback:
+                    progress_callback(done_bytes[0], total_bytes)
+
+            for relative_path in downloads:
+                entry = manifest["files"][relative_path]
+                try:
+                    downloaded, resumed = self._download(relative_path, entry, manifest["chunk_size"], on_chunk)
+                except AssetSyncError as e:
+                    logger.error(f"Falha ao sincronizar '{relative_path}': {e}")
+                    report.failed[relative_path] = str(e)
+                    continue
+                report.downloaded.append(relative_path)
+                report.bytes_downloaded += downloaded
+                report.resumed_bytes += resumed
+                self._save_state()
+            for relative_path in removals:
+                try:
+                    os.remove(self._local_path(relative_path))
+                except FileNotFoundError:
+                    pass
+                self.state["files"].pop(relative_path, None)
+                report.deleted.append(relative_path)
+            self._save_state()
+            report.elapsed = time.perf_counter() - start
+            logger.info(f"Sincronização de assets concluída: {report.to_dict()}")
+            return report
+
+    def _save_state(self):
+        _write_json_atomic(self.state_path, self.state)
+
+    def _download(self, relative_path: str, entry: dict, chunk_size: int, on_chunk) -> tuple[int, int]:
+        """Baixa o arquivo em blocos verificados. Retorna (bytes baixados, bytes reaproveitados)."""
+        destination = self._local_path(relative_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # O nome do parcial inclui o hash esperado: um parcial de outra versão é ignorado.
+        partial_path = f"{destination}.{entry['sha256'][:16]}.part"
+        valid_chunks = self._valid_prefix(partial_path, entry["chunks"], chunk_size)
+        resumed = valid_chunks * chunk_size if valid_chunks < len(entry["chunks"]) else entry["size"]
+        downloaded = 0
+        with open(partial_path, "r+b" if os.path.exists(partial_path) else "wb") as f:
+            f.truncate(resumed)
+            f.seek(resumed)
+            for index in range(valid_chunks, len(entry["chunks"])):
+                start = index * chunk_size
+                end = min(start + chunk_size, entry["size"]) - 1
+                data = self._fetch_chunk(relative_path, start, end, entry["chunks"][index])
+                f.write(data)
+                # Cada bloco é gravado em disco antes do próximo: uma queda perde no máximo um bloco.
+                f.flush()
+                downloaded += len(data)
+                on_chunk(len(data))
+
+        sha256, _ = hash_file_chunks(partial_path, chunk_size)
+        if sha256 != entry["sha256"] or os.path.getsize(partial_path) != entry["size"]:
+            os.remove(partial_path)
+            raise AssetSyncError("o arquivo montado não confere com o manifesto")
+        os.replace(partial_path, destination)
+        stat = os.stat(destination)
+        self.state["files"][relative_path] = {
+            "sha256": entry["sha256"],
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rank": entry["rank"],
+        }
+        if resumed:
+            logger.info(f"Download de '{relative_path}' retomado a partir de {resumed} bytes.")
+        return downloaded, resumed
+
+    @staticmethod
+    def _valid_prefix(partial_path: str, chunk_hashes: list, chunk_size: int) -> int:
+        """Número de blocos completos e corretos no início de um download parcial."""
+        if not os.path.exists(partial_path):
+            return 0
+        valid = 0
+        with open(partial_path, "rb") as f:
+            for expected in chunk_hashes:
+                chunk = f.read(chunk_size)
+                if not chunk or hashlib.sha256(chunk).hexdigest() != expected:
+                    break
+                valid += 1
+        return valid
+
+    def _fetch_chunk(self, relative_path: str, start: int, end: int, expected: str) -> bytes:
+        """Baixa os bytes [start, end] por HTTP Range, com novas tentativas e verificação."""
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(min(0.2 * 2 ** (attempt - 1), 2.0))
+            request = urllib.request.Request(self._url(relative_path), headers={"Range": f"bytes={start}-{end}"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if response.status == 206:
+                        data = response.read()
+                    else:
+                        # Servidor sem suporte a Range: descarta o início e lê só o bloco.
+                        remaining = start
+                        while remaining:
+                            skipped = response.read(min(remaining, READ_BLOCK_BYTES))
+                            if not skipped:
+                                break
+                            remaining -= len(skipped)
+                        data = response.read(end - start + 1)
+            except (urllib.error.URLError, OSError) as e:
+                last_error = e
+                continue
+            if hashlib.sha256(data).hexdigest() == expected:
+                return data
+            last_error = f"bloco {start}-{end} com hash diferente do manifesto"
+        raise AssetSyncError(f"falha ao baixar os bytes {start}-{end}: {last_error}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.utils import setup_logging
+
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Gera o manifesto dos assets sincronizáveis.")
+    parser.add_argument("--assets", default="assets")
+    args = parser.parse_args()
+    result = update_manifest(args.assets)
+    print(f"{len(result['files'])} arquivos no manifesto.")
@@ -3,6 +3,7 @@ import logging
 import pandas as pd
 
 from src.config import RANK_HIERARCHY
+from src.user_directory import UserDirectory
 
 logger = logging.getLogger(__name__)
 
@@ -12,34 +13,38 @@ class AuthService:
     Serviço de autenticação e autorização que lê dados de uma planilha.
     """
 
-    def __init__(self, sheet_url: str):
+    def __init__(self, sheet_url: str, directory: UserDirectory | None = None):
+        """
+        Args:
+            sheet_url (str): URL (ou caminho) do CSV da planilha de usuários.
+            directory (UserDirectory): Diretório compartilhado com outras sessões.
+                Se None, o serviço usa um diretório próprio, recarregado a cada
+                load_users().
+        """
         self.sheet_url = sheet_url
-        self.user_data = None
+        self.directory = directory or UserDirectory(sheet_url)
         self.load_users()
 
+    @property
+    def user_data(self) -> pd.DataFrame:
+        """DataFrame da planilha no snapshot atual (somente leitura)."""
+        return self.directory.snapshot.frame
+
     def load_users(self):
-        try:
-            logger.info(f"Recarregando dados dos usuários de: {self.sheet_url}")
-            self.user_data = pd.read_csv(self.sheet_url, dtype={"CPF": str})
-            logger.info(f"{len(self.user_data)} usuários carregados com sucesso.")
-        except Exception as e:
-            logger.error(
-                f"Falha ao carregar ou processar a planilha de usuários: {e}",
-                exc_info=True,
-            )
-            self.user_data = pd.DataFrame()
+        """Recarrega a planilha se o snapshot do diretório estiver desatualizado."""
+        self.directory.refresh_if_stale()
 
     def login(self, cpf: str, senha: str) -> dict | None:
-        if self.user_data is None or self.user_data.empty:
+        snapshot = self.directory.snapshot
+        if snapshot.empty:
             logger.error("Tentativa de login sem dados de usuários carregados.")
             return None
         cpf_cleaned = cpf.replace(".", "").replace("-", "")
-        user_row = self.user_data[self.user_data["CPF"] == cpf_cleaned]
-        if not user_row.empty:
-            user = user_row.iloc[0]
+        user = snapshot.find(cpf_cleaned)
+        if user is not None:
             if str(user["Senha"]) == senha and user["STATUS"] == "Ativo":
                 logger.info(f"Login bem-sucedido para o usuário: {user['NOME']}.")
-                return user.to_dict()
+                return user
         logger.warning(f"Tentativa de login falhou para o CPF: {cpf_cleaned}.")
         return None
 
@@ -50,19 +55,21 @@ class AuthService:
         - Para as outras faixas, libera "todas as anteriores + a atual + a próxima".
         """
         user_rank = user_data.get("GRADUACAO_ATUAL")
-        logger.debug(f"Calculando permissões para a faixa: '{user_rank}'.")
+        logger.debug("Calculando permissões para a faixa: '%s'.", user_rank)
 
         # **CORREÇÃO APLICADA:** A verificação da faixa "PRETA" agora é a primeira.
         # Se o usuário for PRETA, a função retorna a lista completa e encerra.
         if user_rank == "PRETA":
-            logger.info(
-                f"Usuário 'PRETA' (Mestre) detectado. Concedendo acesso a todas as {len(RANK_HIERARCHY)} faixas."
+            logger.debug(
+                "Usuário 'PRETA' (Mestre) detectado. Concedendo acesso a todas as %d faixas.",
+                len(RANK_HIERARCHY),
             )
             return RANK_HIERARCHY
 
         if user_rank not in RANK_HIERARCHY:
             logger.warning(
-                f"A faixa '{user_rank}' do usuário não foi encontrada na hierarquia. Acesso negado."
+                "A faixa '%s' do usuário não foi encontrada na hierarquia. Acesso negado.",
+                user_rank,
             )
             return []
 
@@ -73,12 +80,12 @@ class AuthService:
             )
             accessible_ranks = RANK_HIERARCHY[: highest_accessible_index + 1]
 
-            logger.info(
-                f"Usuário com faixa '{user_rank}' tem acesso a: {accessible_ranks}"
+            logger.debug(
+                "Usuário com faixa '%s' tem acesso a: %s", user_rank, accessible_ranks
             )
             return accessible_ranks
         except Exception as e:
             logger.error(
-                f"Erro ao determinar faixas acessíveis para '{user_rank}': {e}"
+                "Erro ao determinar faixas acessíveis para '%s': %s", user_rank, e
             )
             return []
@@ -5,6 +5,7 @@
 
 # logging é importado para registrar informações sobre a configuração.
 import logging
+import os
 
 # Obtém uma instância do logger.
 logger = logging.getLogger(__name__)
@@ -25,5 +26,247 @@ RANK_HIERARCHY = [
     "PRETA"           # Novo nível de acesso total (Mestre)
 ]
 
+# NOMES DOS LANDMARKS DO MEDIAPIPE POSE, NA ORDEM DOS ÍNDICES DO MODELO.
+# Mantidos aqui para que módulos que só manipulam arrays (sessões salvas,
+# índices, desenho vetorizado) não precisem importar o MediaPipe.
+POSE_LANDMARK_NAMES = [
+    "NOSE",
+    "LEFT_EYE_INNER",
+    "LEFT_EYE",
+    "LEFT_EYE_OUTER",
+    "RIGHT_EYE_INNER",
+    "RIGHT_EYE",
+    "RIGHT_EYE_OUTER",
+    "LEFT_EAR",
+    "RIGHT_EAR",
+    "MOUTH_LEFT",
+    "MOUTH_RIGHT",
+    "LEFT_SHOULDER",
+    "RIGHT_SHOULDER",
+    "LEFT_ELBOW",
+    "RIGHT_ELBOW",
+    "LEFT_WRIST",
+    "RIGHT_WRIST",
+    "LEFT_PINKY",
+    "RIGHT_PINKY",
+    "LEFT_INDEX",
+    "RIGHT_INDEX",
+    "LEFT_THUMB",
+    "RIGHT_THUMB",
+    "LEFT_HIP",
+    "RIGHT_HIP",
+    "LEFT_KNEE",
+    "RIGHT_KNEE",
+    "LEFT_ANKLE",
+    "RIGHT_ANKLE",
+    "LEFT_HEEL",
+    "RIGHT_HEEL",
+    "LEFT_FOOT_INDEX",
+    "RIGHT_FOOT_INDEX",
+]
+
+# Conexões do esqueleto (pares de índices de POSE_LANDMARK_NAMES), iguais a
+# mp.solutions.pose.POSE_CONNECTIONS.
+POSE_CONNECTIONS = [
+    (0, 1), (0, 4), (1, 2), (2, 3), (3, 7), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (11, 23), (12, 14), (12, 24), (13, 15), (14, 16),
+    (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22), (17, 19),
+    (18, 20), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (27, 31), (28, 30), (28, 32), (29, 31), (30, 32),
+]
+
+# ÂNGULOS CHAVE DA COMPARAÇÃO DE MOVIMENTOS
+# Cada ângulo é definido pelos landmarks (ponta, vértice, ponta). Usados pelo
+# MotionComparator e pelo índice de técnicas (src/technique_index.py).
+KEY_ANGLE_DEFINITIONS = {
+    "LEFT_ELBOW_ANGLE": ("LEFT_SHOULDER", "LEFT_ELBOW", "LEFT_WRIST"),
+    "RIGHT_ELBOW_ANGLE": ("RIGHT_SHOULDER", "RIGHT_ELBOW", "RIGHT_WRIST"),
+    "LEFT_SHOULDER_ANGLE": ("LEFT_HIP", "LEFT_SHOULDER", "LEFT_ELBOW"),
+    "RIGHT_SHOULDER_ANGLE": ("RIGHT_HIP", "RIGHT_SHOULDER", "RIGHT_ELBOW"),
+    "LEFT_KNEE_ANGLE": ("LEFT_HIP", "LEFT_KNEE", "LEFT_ANKLE"),
+    "RIGHT_KNEE_ANGLE": ("RIGHT_HIP", "RIGHT_KNEE", "RIGHT_ANKLE"),
+    "LEFT_HIP_ANGLE": ("LEFT_SHOULDER", "LEFT_HIP", "LEFT_KNEE"),
+    "RIGHT_HIP_ANGLE": ("RIGHT_SHOULDER", "RIGHT_HIP", "RIGHT_KNEE"),
+}
+
+# BACKEND DE ESTIMATIVA DE POSE
+# Nome do backend usado por padrão pelo PoseEstimator (ver src/pose_backends.py)
+# e as opções repassadas a ele. Os perfis permitem escolher o modelo pelo uso:
+# "preview" para prévias rápidas, "exame" para avaliação com máxima precisão.
+POSE_BACKEND = "mediapipe_full"
+POSE_BACKEND_OPTIONS = {
+    "min_detection_confidence": 0.5,
+    "min_tracking_confidence": 0.5,
+}
+POSE_BACKEND_PROFILES = {
+    "preview": "mediapipe_lite",
+    "padrao": "mediapipe_full",
+    "exame": "mediapipe_heavy",
+}
+
+# RASTREAMENTO POR REGIÃO DE INTERESSE (ROI)
+# Quando ativo, a inferência roda apenas no recorte em torno da pose do frame
+# anterior (ver RoiTrackingBackend), voltando ao frame inteiro se a pose se perder.
+POSE_ROI_TRACKING = False
+POSE_ROI_OPTIONS = {
+    "padding": 0.3,
+    "crop_size": 384,
+    "min_confidence": 0.5,
+}
+
+# LOGGING
+# Os registros são enfileirados pela thread que os emite e gravados por uma
+# thread própria (ver setup_logging), em um arquivo com rotação por tamanho.
+# A variável de ambiente FBKMKLN_LOG_DIR troca a pasta (os testes e benchmarks
+# usam uma pasta temporária, fora da árvore do projeto).
+LOG_DIR = os.environ.get("FBKMKLN_LOG_DIR") or "logs"
+LOG_FILE = "app.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_LEVEL = "DEBUG"
+# Níveis por subsistema. Os módulos executados a cada frame ficam em INFO para
+# que as mensagens de depuração sejam descartadas antes de qualquer formatação.
+LOG_LEVELS = {
+    "src.motion_comparator": "INFO",
+    "src.renderer_3d": "INFO",
+    "src.skeleton_drawer": "INFO",
+    "matplotlib": "WARNING",
+    "PIL": "WARNING",
+    "urllib3": "WARNING",
+}
+
+# INSTRUMENTAÇÃO DA ANÁLISE
+# As métricas por etapa (ver src/metrics.py) são sempre coletadas. Os perfis de
+# CPU (cProfile) e de memória (tracemalloc) são opcionais, pois deixam a análise
+# mais lenta; quando ativos, os arquivos são gravados em ANALYSIS_PROFILE_DIR.
+# Se ANALYSIS_METRICS_PATH for definido, as métricas de cada análise são gravadas
+# nele (formato Prometheus para ".prom", JSON nos demais casos).
+ANALYSIS_PROFILE_CPU = False
+ANALYSIS_PROFILE_MEMORY = False
+ANALYSIS_PROFILE_DIR = "logs/profiles"
+ANALYSIS_METRICS_PATH = None
+
+# ANÁLISE EM PROCESSOS SEPARADOS
+# Fila SQLite de jobs de análise e processos worker que os executam (ver
+# src/analysis_jobs.py). Os workers rodam com prioridade de CPU reduzida
+# (nice) para que a interface continue responsiva durante as análises. Um job
+# interrompido pela morte do worker é repetido até ANALYSIS_JOB_MAX_ATTEMPTS vezes.
+# Cada worker grava o próprio log em LOG_DIR ("{index}" = número do worker).
+# Durante a análise, o worker salva os frames já analisados a cada
+# ANALYSIS_CHECKPOINT_SECONDS, para a interface mostrar o resultado parcial.
+ANALYSIS_WORKERS = 2
+ANALYSIS_QUEUE_DB = "data/analysis_jobs.sqlite3"
+ANALYSIS_RESULTS_DIR = "data/analysis_results"
+ANALYSIS_JOB_POLL_SECONDS = 0.5
+ANALYSIS_JOB_MAX_ATTEMPTS = 2
+ANALYSIS_WORKER_NICE = 10
+ANALYSIS_WORKER_LOG_FILE = "analysis_worker_{index}.log"
+ANALYSIS_CHECKPOINT_SECONDS = 2.0
+
+# CONTROLE DE ADMISSÃO DAS ANÁLISES
+# Limites do ResourceGovernor (ver src/resource_governor.py): análises
+# simultâneas (None = número de CPUs) e memória para os frames das análises em
+# andamento (None = metade da memória física). Com o AnalysisWorkerPool, o total
+# vale para o pool: no máximo uma análise por vaga de CPU e a memória dividida
+# igualmente entre os workers. Jobs que não cabem
+# esperam em fila ou rodam com a resolução reduzida, até a altura mínima abaixo.
+# ANALYSIS_INITIAL_FPS é a vazão assumida nas estimativas de espera até a
+# primeira análise terminar.
+ANALYSIS_CPU_SLOTS = None
+ANALYSIS_MEMORY_BUDGET_MB = None
+ANALYSIS_MIN_INFERENCE_HEIGHT = 360
+ANALYSIS_INITIAL_FPS = 10.0
+
+# CACHE DE RESULTADOS DE ANÁLISE
+# Resultados indexados pelo hash do conteúdo dos vídeos, pelos trechos e pela
+# configuração do modelo (ver src/analysis_cache.py). As entradas menos usadas
+# são removidas quando o total em disco passa de ANALYSIS_CACHE_MAX_MB.
+ANALYSIS_CACHE_ENABLED = True
+ANALYSIS_CACHE_DIR = "data/analysis_cache"
+ANALYSIS_CACHE_MAX_MB = 512
+
+# SESSÕES DE USUÁRIO
+# Validade das sessões de login e arquivo SQLite para persisti-las entre
+# reinícios do servidor (None mantém as sessões apenas em memória).
+USER_SESSION_TTL_SECONDS = 12 * 3600
+USER_SESSION_DB = None
+
+# DIRETÓRIO DE USUÁRIOS
+# A planilha de usuários é compartilhada por todas as sessões do servidor (ver
+# src/user_directory.py) e só é baixada de novo, ao abrir a tela de login,
+# depois deste intervalo em segundos.
+USER_DIRECTORY_REFRESH_SECONDS = 60
+
+# ÍNDICE DE TÉCNICAS
+# Índice de descritores de pose da biblioteca de vídeos (ver
+# src/technique_index.py), gerado offline com:
+#   python -m src.technique_index
+# Os vídeos são amostrados a TECHNIQUE_INDEX_SAMPLE_FPS quadros por segundo.
+TECHNIQUE_VIDEOS_DIR = "assets/videos_tecnicas"
+TECHNIQUE_INDEX_PATH = "data/technique_index.npz"
+TECHNIQUE_INDEX_SAMPLE_FPS = 10.0
+
+# ENTREGA DE FRAMES DO ANALISADOR
+# Frames exibidos na tela do Analisador (ver src/frame_delivery.py): JPEG na
+# largura de exibição, no máximo FRAME_DELIVERY_MAX_FPS entregas por segundo ao
+# navegar, FRAME_DELIVERY_PREFETCH frames pré-codificados ao redor da posição
+# atual e um cache LRU de FRAME_DELIVERY_CACHE_MB com os frames já codificados.
+FRAME_DELIVERY_DISPLAY_WIDTH = 960
+FRAME_DELIVERY_JPEG_QUALITY = 75
+FRAME_DELIVERY_MAX_FPS = 24.0
+FRAME_DELIVERY_PREFETCH = 12
+FRAME_DELIVERY_CACHE_MB = 64
+
+# VISUALIZADOR DE PDF
+# Páginas dos programas técnicos renderizadas em JPEG (ver src/pdf_pages.py)
+# nos níveis de zoom abaixo (1.0 = 72 dpi; o primeiro é o padrão), guardadas
+# em PDF_PAGE_CACHE_DIR por hash do conteúdo do PDF. PDF_VIEWER_RENDERER:
+# "auto", "pymupdf" (pacote opcional pymupdf) ou "poppler" (pdftoppm).
+PDF_VIEWER_ZOOM_LEVELS = (1.5, 1.0, 2.5)
+PDF_VIEWER_RENDERER = "auto"
+PDF_PAGE_CACHE_DIR = "data/pdf_pages"
+PDF_PAGE_JPEG_QUALITY = 80
+
+# SINCRONIZAÇÃO OFFLINE DOS ASSETS
+# Pastas de assets/ sincronizadas por faixa (ver src/asset_sync.py) e nome do
+# manifesto de hashes servido junto com elas. Os arquivos são baixados em
+# blocos de ASSET_SYNC_CHUNK_BYTES, verificados um a um. ASSET_SYNC_URL é a URL
+# da pasta assets/ no servidor; None desliga a sincronização (assets locais).
+ASSET_SYNC_DIRS = ("programa_tecnico", "videos_tecnicas")
+ASSET_MANIFEST_NAME = "asset_manifest.json"
+ASSET_SYNC_CHUNK_BYTES = 1 << 20
+ASSET_SYNC_RETRIES = 3
+ASSET_SYNC_TIMEOUT_SECONDS = 30
+ASSET_SYNC_URL = None
+
+# SERVIDOR DE MÍDIA (MODO WEB)
+# Vídeos e PDFs de assets/ servidos com Range, ETag e cache de longa duração
+# (ver src/media_server.py). MEDIA_SERVER_PUBLIC_URL é o endereço do servidor
+# visto pelo navegador (ex: atrás de um proxy); com None, os vídeos do modo web
+# usam o caminho do asset servido pelo Flet.
+MEDIA_SERVER_ENABLED = True
+MEDIA_SERVER_HOST = "127.0.0.1"
+MEDIA_SERVER_PORT = 8551
+MEDIA_SERVER_PUBLIC_URL = None
+MEDIA_SERVER_DIRS = ("videos_tecnicas", "programa_tecnico")
+MEDIA_SERVER_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# ONDE TREINAR
+# CSV das academias filiadas (ver src/academy_locator.py para as colunas),
+# quantas academias mostrar em "perto de mim" e o máximo de resultados de uma
+# busca por nome ou cidade.
+ACADEMIES_CSV_PATH = "data/academias.csv"
+ACADEMY_NEAREST_K = 10
+ACADEMY_SEARCH_LIMIT = 20
+
+# HISTÓRICO DE PROGRESSO
+# Resumo de cada análise concluída, por aluno, técnica e articulação (ver
+# src/progress_store.py). As médias móveis usam as últimas
+# PROGRESS_ROLLING_WINDOW sessões e, a exponencial, o peso PROGRESS_EMA_ALPHA
+# para a sessão mais recente.
+PROGRESS_DB_PATH = "data/progress.sqlite3"
+PROGRESS_ROLLING_WINDOW = 10
+PROGRESS_EMA_ALPHA = 0.2
+
 # Log para confirmar que a configuração foi carregada.
 logger.debug(f"Hierarquia de faixas configurada com {len(RANK_HIERARCHY)} níveis.")
\ No newline at end of file
@@ -0,0 +1,328 @@
+# src/frame_delivery.py
+
+# ENTREGA DE FRAMES PARA A TELA DO ANALISADOR
+# Para exibir um frame em um ft.Image, o array precisa virar uma imagem
+# codificada em base64. Codificar o frame na resolução original (ou em PNG) a
+# cada movimento do controle deslizante deixa a navegação lenta e sobrecarrega
+# a conexão com o cliente. Aqui a entrega é feita em três partes:
+#   - AnalysisFrameSource monta o frame lado a lado já na resolução de exibição;
+#     JpegFrameEncoder garante a largura (reusando o buffer do
+#     redimensionamento) e codifica em JPEG com parâmetros fixos;
+#   - EncodedFrameCache guarda os frames já codificados (LRU limitado em bytes);
+#   - FrameDelivery atende os pedidos da interface como o ProgressBus: só o
+#     pedido mais recente é atendido, no máximo 'max_fps' vezes por segundo, e
+#     no tempo livre os frames ao redor da posição atual são pré-codificados,
+#     primeiro na direção em que o usuário está navegando.
+
+import base64
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from src.config import (
+    FRAME_DELIVERY_CACHE_MB,
+    FRAME_DELIVERY_DISPLAY_WIDTH,
+    FRAME_DELIVERY_JPEG_QUALITY,
+    FRAME_DELIVERY_MAX_FPS,
+    FRAME_DELIVERY_PREFETCH,
+)
+from src.utils import get_logger
+from src.skeleton_drawer import SkeletonDrawer
+from src.video_exporter import SideBySideComposer
+from src.video_seek import seek_to_frame
+
+logger = get_logger(__name__)
+
+
+class JpegFrameEncoder:
+    """
+    Codifica frames BGR em JPEG/base64 na largura de exibição. O buffer de
+    destino do redimensionamento é reaproveitado enquanto o tamanho não muda.
+    """
+
+    def __init__(self, display_width: int = FRAME_DELIVERY_DISPLAY_WIDTH, quality: int = FRAME_DELIVERY_JPEG_QUALITY):
+        if display_width <= 0:
+            raise ValueError("A largura de exibição deve ser positiva.")
+        self.display_width = display_width
+        self.quality = quality
+        self._params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    def encode(self, frame: np.ndarray) -> str:
+        """Retorna o frame em JPEG codificado em base64 (para ft.Image.src_base64)."""
+        with self._lock:
+            height, width = frame.shape[:2]
+            if width > self.display_width:
+                size = (self.display_width, max(1, int(round(height * self.display_width / width))))
+                if self._buffer is None or self._buffer.shape != (size[1], size[0]) + frame.shape[2:]:
+                    self._buffer = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+                frame = cv2.resize(frame, size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode(".jpg", frame, self._params)
+        if not ok:
+            raise ValueError("Não foi possível codificar o frame em JPEG.")
+        return base64.b64encode(encoded).decode("ascii")
+
+
+class EncodedFrameCache:
+    """Cache LRU de frames codificados, limitado pelo total de bytes guardados."""
+
+    def __init__(self, max_mb: float = FRAME_DELIVERY_CACHE_MB):
+        self.max_bytes = int(max_mb * 2**20)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key) -> str | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload: str):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+class AnalysisFrameSource:
+    """
+    Frames lado a lado (aluno | mestre, com a pontuação) de uma análise, lidos
+    dos snapshots do VideoAnalyzer (snapshot_results). Frames anotados que não
+    estão na memória (resultado vindo do cache, ou após clear_frames) são
+    decodificados dos vídeos originais e desenhados com os landmarks salvos.
+    """
+
+    def __init__(
+        self,
+        snapshot_provider,
+        video_aluno: str | None = None,
+        video_mestre: str | None = None,
+        start_frames: dict | None = None,
+        display_width: int = FRAME_DELIVERY_DISPLAY_WIDTH,
+    ):
+        self.snapshot_provider = snapshot_provider
+        self.video_aluno = video_aluno
+        self.video_mestre = video_mestre
+        self.start_frames = start_frames or {}
+        self.display_width = display_width
+        self.composer = SideBySideComposer()
+        self.drawer = None
+        self._caps = None
+        self._next_index = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        return self.snapshot_provider()
+
+    def render(self, index: int, snapshot=None) -> np.ndarray | None:
+        """Frame composto de 'index'; None se ele ainda não foi analisado."""
+        snapshot = snapshot or self.snapshot()
+        if not 0 <= index < snapshot.num_frames:
+            return None
+        frame_aluno = snapshot.processed_frame(index, is_aluno=True)
+        frame_mestre = snapshot.processed_frame(index, is_aluno=False)
+        if frame_aluno is None or frame_mestre is None:
+            frames = self._decode(index, snapshot)
+            if frames is None:
+                return None
+            frame_aluno, frame_mestre = frames
+        with self._lock:
+            if self.composer.panel_sizes is None:
+                # Compõe já na altura em que os dois painéis somam a largura de
+                # exibição, sem montar o frame na resolução original.
+                aspect = sum(frame.shape[1] / frame.shape[0] for frame in (frame_aluno, frame_mestre))
+                self.composer.max_height = max(2, int(self.display_width / aspect))
+            return self.composer.compose(frame_aluno, frame_mestre, float(snapshot.scores[index]))
+
+    def _decode(self, index: int, snapshot) -> tuple | None:
+        if not self.video_aluno or not self.video_mestre:
+            return None
+        with self._lock:
+            if self._caps is None:
+                self._caps = (cv2.VideoCapture(self.video_aluno), cv2.VideoCapture(self.video_mestre))
+                self.drawer = SkeletonDrawer()
+            frames = []
+            for cap, key in zip(self._caps, ("aluno", "mestre")):
+                # Navegação para frente lê em sequência; saltos posicionam o vídeo.
+                if index != self._next_index:
+                    seek_to_frame(cap, self.start_frames.get(key, 0) + index)
+                ret, frame = cap.read()
+                if not ret:
+                    self._next_index = None
+                    return None
+                frames.append(frame)
+            self._next_index = index + 1
+        for frame, landmarks in zip(frames, (snapshot.aluno_landmarks[index], snapshot.mestre_landmarks[index])):
+            # Frames sem pose estão no buffer como NaN.
+            if not np.isnan(landmarks[0, 0]):
+                self.drawer.draw_by_side(frame, landmarks, in_place=True)
+        return tuple(frames)
+
+    def close(self):
+        with self._lock:
+            if self._caps is not None:
+                for cap in self._caps:
+                    cap.release()
+                self._caps = None
+
+
+class FrameDelivery:
+    """
+    Atende os pedidos de frame da interface (ex: o controle deslizante do
+    Analisador) em uma thread própria. request() é O(1) e pode ser chamado a
+    cada evento; on_frame(index, payload_base64) recebe só o pedido mais recente,
+    no máximo 'max_fps' vezes por segundo.
+    """
+
+    def __init__(
+        self,
+        source: AnalysisFrameSource,
+        on_frame,
+        encoder: JpegFrameEncoder | None = None,
+        cache: EncodedFrameCache | None = None,
+        max_fps: float = FRAME_DELIVERY_MAX_FPS,
+        prefetch: int = FRAME_DELIVERY_PREFETCH,
+    ):
+        self.source = source
+        self.on_frame = on_frame
+        self.encoder = encoder or JpegFrameEncoder()
+        self.cache = cache or EncodedFrameCache()
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.prefetch = prefetch
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        # Passo (em frames) entre as duas últimas entregas: direção e velocidade da navegação.
+        self._stride = 1
+        self.delivered_count = 0
+        self.requested_count = 0
+        # Entregas atendidas por frames já codificados (pela pré-codificação ou antes).
+        self.served_from_cache = 0
+
+    def start(self) -> "FrameDelivery":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._delivery_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def request(self, index: int):
+        """Pede a exibição do frame 'index'. Pedidos ainda não atendidos são substituídos."""
+        with self._lock:
+            self._pending = int(index)
+            self.requested_count += 1
+        self._wakeup.set()
+
+    def frame(self, index: int, snapshot=None) -> str | None:
+        """Frame codificado (base64), do cache ou codificado agora; None se indisponível."""
+        snapshot = snapshot or self.source.snapshot()
+        key = (snapshot.generation, index)
+        payload = self.cache.get(key)
+        if payload is not None:
+            return payload
+        frame = self.source.render(index, snapshot)
+        if frame is None:
+            return None
+        payload = self.encoder.encode(frame)
+        self.cache.put(key, payload)
+        return payload
+
+    def close(self, timeout: float = 5.0):
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.source.close()
+
+    def _take_pending(self) -> int | None:
+        with self._lock:
+            index, self._pending = self._pending, None
+            return index
+
+    def _deliver(self, index: int, last_index: int | None):
+        if last_index is not None and index != last_index:
+            self._stride = index - last_index
+        try:
+            snapshot = self.source.snapshot()
+            self.served_from_cache += (snapshot.generation, index) in self.cache
+            payload = self.frame(index, snapshot)
+            if payload is not None:
+                self.on_frame(index, payload)
+                self.delivered_count += 1
+        except Exception as e:
+            # Um erro ao exibir um frame não deve encerrar a entrega dos próximos.
+            logger.error(f"Erro ao entregar o frame {index}: {e}", exc_info=True)
+
+    def _prefetch_candidates(self, index: int) -> list:
+        """Frames a pré-codificar, do mais ao menos provável de ser pedido em seguida."""
+        direction = 1 if self._stride > 0 else -1
+        # Navegação rápida: as próximas posições no passo atual do controle.
+        candidates = [index + self._stride * k for k in (1, 2)] if abs(self._stride) > 1 else []
+        # Janela ao redor: dois frames na direção da navegação para cada um na oposta.
+        for offset in range(1, self.prefetch + 1):
+            candidates.append(index + direction * offset)
+            if offset % 2 == 0:
+                candidates.append(index - direction * offset // 2)
+        return candidates
+
+    def _prefetch_around(self, index: int, deadline: float):
+        """
+        Pré-codifica os frames ao redor de 'index'. Até 'deadline' (o intervalo
+        mínimo entre entregas) nenhum pedido pode ser atendido mesmo, então o
+        tempo é usado aqui; depois dele, um novo pedido interrompe o trabalho.
+        """
+        snapshot = self.source.snapshot()
+        for candidate in self._prefetch_candidates(index):
+            if self._closed.is_set() or (self._wakeup.is_set() and time.perf_counter() >= deadline):
+                return
+            if 0 <= candidate < snapshot.num_frames and (snapshot.generation, candidate) not in self.cache:
+                try:
+                    self.frame(candidate, snapshot)
+                except Exception as e:
+                    logger.error(f"Erro ao pré-codificar o frame {candidate}: {e}")
+                    return
+
+    def _delivery_loop(self):
+        last_index = None
+        while not self._closed.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            index = self._take_pending()
+            if index is None:
+                continue
+            deadline = time.perf_counter() + self.min_interval
+            self._deliver(index, last_index)
+            last_index = index
+            self._prefetch_around(index, deadline)
+            # Limita a taxa de entrega; pedidos feitos nesse meio-tempo são agrupados.
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                self._closed.wait(remaining)
@@ -0,0 +1,269 @@
+# src/media_server.py
+
+# SERVIDOR DE MÍDIA PARA O MODO WEB
+# No modo web o ft.Video carrega os vídeos de assets/ pelo servidor estático
+# padrão do Flet, e o navegador acaba baixando o vídeo de novo a cada busca na
+# linha do tempo, sem validar o que já tem em cache. Este servidor atende
+# assets/videos_tecnicas e assets/programa_tecnico (e o manifesto da
+# sincronização offline, ver src/asset_sync.py) com:
+#   - requisições parciais (Range: bytes=a-b, a- e -n), 206 e 416;
+#   - ETag (hash do conteúdo) e Last-Modified, com If-None-Match,
+#     If-Modified-Since e If-Range;
+#   - URLs com o hash do conteúdo (/v/<hash>/<caminho>), servidas com cache
+#     "immutable" de um ano: quando o arquivo muda, a URL muda junto. As URLs
+#     sem hash são revalidadas a cada uso (Cache-Control: no-cache);
+#   - envio do arquivo por socket.sendfile (os.sendfile: o conteúdo vai do
+#     cache de páginas do sistema direto para o socket, sem passar pelo Python).
+
+import email.utils
+import http.server
+import mimetypes
+import os
+import threading
+import urllib.parse
+
+from src.analysis_cache import file_content_hash
+from src.config import (
+    ASSET_MANIFEST_NAME,
+    MEDIA_SERVER_DIRS,
+    MEDIA_SERVER_HOST,
+    MEDIA_SERVER_IMMUTABLE_MAX_AGE,
+    MEDIA_SERVER_PORT,
+)
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Prefixo das URLs com hash do conteúdo e tamanho do hash usado nelas.
+VERSIONED_PREFIX = "v"
+URL_HASH_LENGTH = 16
+
+mimetypes.add_type("video/mp4", ".mp4")
+mimetypes.add_type("video/quicktime", ".mov")
+mimetypes.add_type("video/x-msvideo", ".avi")
+
+
+def parse_range(header: str, size: int):
+    """
+    Interpreta um cabeçalho Range de um único intervalo. Retorna (início, fim)
+    inclusivo, None para ignorar o cabeçalho (servir o arquivo inteiro) ou
+    ValueError para um intervalo fora do arquivo (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # Vários intervalos (multipart/byteranges) não são usados por players de vídeo.
+        return None
+    start_text, separator, end_text = spec.strip().partition("-")
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        # Cabeçalho malformado é ignorado (RFC 9110), não é erro.
+        return None
+    if not separator or (start is None and end is None):
+        return None
+    if start is None:
+        if end <= 0:
+            raise ValueError("Intervalo de sufixo vazio.")
+        return max(size - end, 0), size - 1
+    end = size - 1 if end is None else end
+    if start >= size or end < start:
+        raise ValueError(f"Intervalo {start}-{end} fora do arquivo de {size} bytes.")
+    return start, min(end, size - 1)
+
+
+class MediaLibrary:
+    """Resolve caminhos de URL para arquivos de mídia dentro de 'assets_dir'."""
+
+    def __init__(self, assets_dir: str, media_dirs: tuple = MEDIA_SERVER_DIRS):
+        self.assets_dir = os.path.abspath(assets_dir)
+        self.media_dirs = tuple(media_dirs)
+
+    def relative_path(self, path: str) -> str:
+        """Caminho relativo a assets/ (separador '/') de um caminho local ou relativo."""
+        absolute = os.path.abspath(path)
+        if absolute.startswith(self.assets_dir + os.sep):
+            path = os.path.relpath(absolute, self.assets_dir)
+        return path.replace("\\", "/").lstrip("/")
+
+    def resolve(self, relative_path: str) -> str | None:
+        """Arquivo servível para o caminho relativo, ou None (fora das pastas de mídia)."""
+        path = os.path.normpath(os.path.join(self.assets_dir, *relative_path.split("/")))
+        if not path.startswith(self.assets_dir + os.sep) or not os.path.isfile(path):
+            return None
+        # A pasta é conferida depois de normalizar o caminho ("videos_tecnicas/../x").
+        parts = os.path.relpath(path, self.assets_dir).split(os.sep)
+        if parts != [ASSET_MANIFEST_NAME] and (len(parts) < 2 or parts[0] not in self.media_dirs):
+            return None
+        return path
+
+    def content_hash(self, path: str) -> str:
+        return file_content_hash(path)[:URL_HASH_LENGTH]
+
+    def versioned_path(self, relative_path: str) -> str:
+        """Caminho de URL com o hash do conteúdo atual do arquivo."""
+        path = self.resolve(relative_path)
+        if path is None:
+            raise ValueError(f"Arquivo de mídia não encontrado: {relative_path}")
+        return f"/{VERSIONED_PREFIX}/{self.content_hash(path)}/{urllib.parse.quote(relative_path)}"
+
+
+class MediaRequestHandler(http.server.BaseHTTPRequestHandler):
+    """GET/HEAD com Range, validação condicional e envio por sendfile."""
+
+    server_version = "FBKMKLNMedia/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        library = self.server.library
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path).lstrip("/")
+        immutable = False
+        expected_hash = None
+        if url_path.startswith(f"{VERSIONED_PREFIX}/"):
+            _, expected_hash, url_path = (url_path.split("/", 2) + ["", ""])[:3]
+            immutable = True
+        path = library.resolve(url_path)
+        if path is None:
+            self._send_status(404)
+            return
+
+        stat = os.stat(path)
+        etag = f'"{library.content_hash(path)}"'
+        if immutable and etag.strip('"') != expected_hash:
+            # URL de uma versão antiga: nunca servir outro conteúdo sob uma URL "imutável".
+            self._send_status(404)
+            return
+        headers = {
+            "ETag": etag,
+            "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": (
+                f"public, max-age={MEDIA_SERVER_IMMUTABLE_MAX_AGE}, immutable" if immutable else "no-cache"
+            ),
+        }
+        if self._not_modified(etag, stat.st_mtime):
+            self._send_status(304, headers)
+            return
+
+        size = stat.st_size
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and size and (if_range is None or if_range.strip() in (etag, headers["Last-Modified"])):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                self._send_status(416, {"Content-Range": f"bytes */{size}"})
+                return
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        length = end - start + 1 if size else 0
+        self.send_response(status)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body and length:
+            with open(path, "rb") as f:
+                try:
+                    # Zero-cópia com os.sendfile; sem ele, socket.sendfile recai em send().
+                    self.connection.sendfile(f, offset=start, count=length)
+                except (BrokenPipeError, ConnectionResetError):
+                    # O player cancelou a requisição (busca para outro ponto do vídeo).
+                    self.close_connection = True
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def _send_status(self, status: int, headers: dict | None = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class MediaServer:
+    """
+    Servidor HTTP de mídia em uma thread própria. Use url() para obter a URL
+    (com hash do conteúdo) de um arquivo de assets/ a ser passada ao ft.Video.
+    """
+
+    def __init__(
+        self,
+        assets_dir: str = "assets",
+        host: str = MEDIA_SERVER_HOST,
+        port: int = MEDIA_SERVER_PORT,
+        public_url: str | None = None,
+    ):
+        self.library = MediaLibrary(assets_dir)
+        self.server = http.server.ThreadingHTTPServer((host, port), MediaRequestHandler)
+        self.server.daemon_threads = True
+        self.server.library = self.library
+        bound_host, bound_port = self.server.server_address[:2]
+        self.base_url = (public_url or f"http://{bound_host}:{bound_port}").rstrip("/")
+        self._thread = None
+
+    def url(self, path: str, versioned: bool = True) -> str:
+        relative = self.library.relative_path(path)
+        if versioned:
+            return self.base_url + self.library.versioned_path(relative)
+        return f"{self.base_url}/{urllib.parse.quote(relative)}"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.server.serve_forever, name="media-server", daemon=True)
+            self._thread.start()
+            logger.info(f"Servidor de mídia atendendo em {self.base_url}")
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+_default_server = None
+_default_server_lock = threading.Lock()
+
+
+def get_media_server(public_url: str | None = None) -> MediaServer:
+    """Servidor de mídia do processo, iniciado no primeiro uso."""
+    global _default_server
+    with _default_server_lock:
+        if _default_server is None:
+            _default_server = MediaServer(public_url=public_url).start()
+        return _default_server
@@ -0,0 +1,240 @@
+# src/metrics.py
+
+# INSTRUMENTAÇÃO DO PIPELINE DE ANÁLISE
+# PipelineMetrics acumula, por job, o tempo de cada etapa (decodificação,
+# inferência, desenho, comparação...), contadores, profundidade de filas e o
+# pico de memória do processo. As medições custam uma chamada a
+# time.perf_counter por etapa, então ficam sempre ativas.
+# JobProfiler é o gancho opcional (desligado por padrão) para capturar um
+# perfil de CPU (cProfile) e de alocações (tracemalloc) de um job.
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from contextlib import contextmanager
+import numpy as np
+from src.utils import get_logger
+
+try:
+    import resource
+except ImportError:  # Windows: o módulo resource só existe em sistemas POSIX.
+    resource = None
+
+logger = get_logger(__name__)
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memória residente do processo, em MB (None onde não há como medir)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é reportado em bytes no macOS e em KB no Linux.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class PipelineMetrics:
+    """
+    Temporizadores por etapa, contadores e medidores de um job de análise.
+    Seguro para uso por várias threads (ex: análise e escrita do vídeo exportado).
+    """
+
+    def __init__(self, name: str = "analise"):
+        self.name = name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end = None
+        self._lock = threading.Lock()
+        self._durations = {}  # etapa -> array('d') com as durações em ms
+        self._counters = {}
+        self._gauges = {}  # medidor -> [último valor, máximo]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede o tempo do bloco e o registra na etapa informada."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, stage: str, duration_ms: float):
+        """Registra a duração (em ms) de uma execução da etapa."""
+        with self._lock:
+            durations = self._durations.get(stage)
+            if durations is None:
+                durations = self._durations[stage] = array("d")
+            durations.append(duration_ms)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float):
+        """Registra o valor atual de um medidor (ex: profundidade de uma fila) e seu máximo."""
+        with self._lock:
+            current = self._gauges.get(name)
+            if current is None:
+                self._gauges[name] = [value, value]
+            else:
+                current[0] = value
+                current[1] = max(current[1], value)
+
+    def finish(self):
+        """Marca o fim do job (o tempo decorrido para de contar)."""
+        self._end = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return end - self._start
+
+    def snapshot(self) -> dict:
+        """Retorna um resumo das métricas (cópia independente do estado interno)."""
+        with self._lock:
+            durations = {k: np.frombuffer(v, dtype=np.float64).copy() for k, v in self._durations.items()}
+            counters = dict(self._counters)
+            gauges = {k: {"atual": v[0], "maximo": v[1]} for k, v in self._gauges.items()}
+
+        stages = {}
+        for stage, values in durations.items():
+            if len(values) == 0:
+                continue
+            p50, p95 = np.percentile(values, [50, 95])
+            stages[stage] = {
+                "count": int(len(values)),
+                "total_ms": round(float(values.sum()), 3),
+                "mean_ms": round(float(values.mean()), 3),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "max_ms": round(float(values.max()), 3),
+            }
+        elapsed = self.elapsed_seconds
+        frames = counters.get("frames_analisados", 0)
+        peak_rss = peak_rss_mb()
+        return {
+            "job": self.name,
+            "started_at": self.started_at,
+            "elapsed_s": round(elapsed, 3),
+            "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+            "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+            "stages": stages,
+            "counters": counters,
+            "gauges": gauges,
+        }
+
+    def bottleneck(self) -> str | None:
+        """Etapa com o maior tempo acumulado."""
+        stages = self.snapshot()["stages"]
+        if not stages:
+            return None
+        return max(stages, key=lambda stage: stages[stage]["total_ms"])
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, prefix: str = "kravmaga_analise") -> str:
+        """Exporta as métricas no formato texto do Prometheus."""
+        snapshot = self.snapshot()
+        job = snapshot["job"]
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, stats in snapshot["stages"].items():
+            labels = f'job="{job}",stage="{stage}"'
+            lines.append(f'{prefix}_stage_seconds{{{labels},quantile="0.5"}} {stats["p50_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_stage_seconds{{{labels},quantile="0.95"}} {stats["p95_ms"] / 1000:.6f}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {stats['total_ms'] / 1000:.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {stats['count']}")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in snapshot["counters"].items():
+            lines.append(f'{prefix}_events_total{{job="{job}",event="{name}"}} {value}')
+        lines.append(f"# TYPE {prefix}_gauge gauge")
+        for name, values in snapshot["gauges"].items():
+            lines.append(f'{prefix}_gauge{{job="{job}",name="{name}"}} {values["atual"]}')
+            lines.append(f'{prefix}_gauge_max{{job="{job}",name="{name}"}} {values["maximo"]}')
+        if snapshot["peak_rss_mb"] is not None:
+            lines.append(f"# TYPE {prefix}_peak_rss_bytes gauge")
+            lines.append(f'{prefix}_peak_rss_bytes{{job="{job}"}} {int(snapshot["peak_rss_mb"] * 2**20)}')
+        lines.append(f"# TYPE {prefix}_elapsed_seconds gauge")
+        lines.append(f'{prefix}_elapsed_seconds{{job="{job}"}} {snapshot["elapsed_s"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> str:
+        """Grava as métricas em disco: formato Prometheus para '.prom', JSON nos demais casos."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+
+class JobProfiler:
+    """
+    Captura, opcionalmente, um perfil de CPU (cProfile) e um resumo das alocações
+    (tracemalloc) do job executado dentro do bloco 'with'.
+
+    O cProfile só mede a thread em que foi ativado, por isso o bloco deve
+    envolver o código da própria thread de análise.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        job_name: str = "analise",
+        cpu: bool = False,
+        memory: bool = False,
+        top_allocations: int = 25,
+    ):
+        self.output_dir = output_dir
+        self.job_name = job_name
+        self.cpu = cpu
+        self.memory = memory
+        self.top_allocations = top_allocations
+        self.outputs = {}
+        self._profile = None
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.cpu or self.memory
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.cpu:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(
+            self.output_dir, f"{self.job_name}_{time.strftime('%Y%m%d_%H%M%S')}"
+        )
+        if self._profile is not None:
+            self._profile.disable()
+            self.outputs["cpu"] = f"{prefix}.prof"
+            self._profile.dump_stats(self.outputs["cpu"])
+            self._profile = None
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            self.outputs["memory"] = f"{prefix}_tracemalloc.txt"
+            with open(self.outputs["memory"], "w", encoding="utf-8") as f:
+                f.write(f"Memória rastreada: atual={current / 2**20:.1f} MB, pico={peak / 2**20:.1f} MB\n")
+                for stat in snapshot.statistics("lineno")[: self.top_allocations]:
+                    f.write(f"{stat}\n")
+        logger.info(f"Perfis do job '{self.job_name}' gravados: {self.outputs}")
+        return False
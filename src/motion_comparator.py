@@ -3,9 +3,12 @@
 import logging
 import numpy as np
 import mediapipe as mp
-from src.utils import get_logger, calculate_angle
+from src.config import KEY_ANGLE_DEFINITIONS
+from src.utils import LogSampler, get_logger, calculate_angle
 
 logger = get_logger(__name__)
+# Os avisos de compare_poses se repetem a cada frame: registra só uma amostra.
+sampled_logger = LogSampler(logger, every=100)
 
 
 class MotionComparator:
@@ -13,6 +16,10 @@ class MotionComparator:
     Compara os movimentos do aluno com os do mestre com lógica aprimorada e feedback em português.
     """
 
+    # Versão da lógica de comparação. Deve ser incrementada sempre que a pontuação,
+    # o feedback ou os ângulos mudarem, invalidando os resultados em cache.
+    VERSION = 1
+
     def __init__(self):
         """
         Construtor da classe MotionComparator.
@@ -20,16 +27,7 @@ class MotionComparator:
         """
         logger.info("Inicializando MotionComparator.")
         # Define as articulações (vértices) e os pontos que formam os ângulos.
-        self.KEY_ANGLES = {
-            "LEFT_ELBOW_ANGLE": ("LEFT_SHOULDER", "LEFT_ELBOW", "LEFT_WRIST"),
-            "RIGHT_ELBOW_ANGLE": ("RIGHT_SHOULDER", "RIGHT_ELBOW", "RIGHT_WRIST"),
-            "LEFT_SHOULDER_ANGLE": ("LEFT_HIP", "LEFT_SHOULDER", "LEFT_ELBOW"),
-            "RIGHT_SHOULDER_ANGLE": ("RIGHT_HIP", "RIGHT_SHOULDER", "RIGHT_ELBOW"),
-            "LEFT_KNEE_ANGLE": ("LEFT_HIP", "LEFT_KNEE", "LEFT_ANKLE"),
-            "RIGHT_KNEE_ANGLE": ("RIGHT_HIP", "RIGHT_KNEE", "RIGHT_ANKLE"),
-            "LEFT_HIP_ANGLE": ("LEFT_SHOULDER", "LEFT_HIP", "LEFT_KNEE"),
-            "RIGHT_HIP_ANGLE": ("RIGHT_SHOULDER", "RIGHT_HIP", "RIGHT_KNEE"),
-        }
+        self.KEY_ANGLES = dict(KEY_ANGLE_DEFINITIONS)
         # Mapeia os nomes dos landmarks para seus índices numéricos no MediaPipe.
         self.landmark_indices = {
             name: landmark.value
@@ -99,7 +97,9 @@ class MotionComparator:
 
             except ValueError as e:
                 # Se um landmark não for encontrado, trata como erro e assume a pior diferença.
-                logger.warning(f"Não foi possível calcular o ângulo {angle_name}: {e}")
+                sampled_logger.warning(
+                    angle_name, "Não foi possível calcular o ângulo %s: %s", angle_name, e
+                )
                 (
                     angles_aluno[angle_name],
                     angles_mestre[angle_name],
@@ -138,5 +138,5 @@ class MotionComparator:
             return "Excelente movimento!"
 
         feedback = ". ".join(errors)
-        logger.info(f"Feedback gerado: '{feedback}'")
+        logger.debug("Feedback gerado: '%s'", feedback)
         return feedback
@@ -0,0 +1,426 @@
+# src/pdf_pages.py
+
+# PÁGINAS DOS PROGRAMAS TÉCNICOS (PDF) PRÉ-RENDERIZADAS
+# O programa técnico de cada faixa era aberto com page.launch_url("file:///..."),
+# o que não funciona na web nem no celular e depende de um visualizador externo.
+# O visualizador do app exibe as páginas como imagens:
+#   - as páginas são renderizadas em alguns níveis de zoom (PDF_VIEWER_ZOOM_LEVELS,
+#     1.0 = 72 dpi) e gravadas em JPEG no disco, em uma pasta por hash do
+#     CONTEÚDO do PDF: um arquivo substituído gera páginas novas, e um arquivo
+#     inalterado nunca é renderizado de novo, nem após reiniciar o servidor;
+#   - ao abrir um documento, só as dimensões das páginas e a primeira página
+#     são obtidas na hora; as demais são renderizadas por uma thread em segundo
+#     plano, com prioridade para as páginas visíveis (request_pages);
+#   - a interface busca apenas as páginas visíveis (page_base64).
+# A renderização usa o PyMuPDF (pacote opcional 'pymupdf') ou, na falta dele,
+# o pdftoppm/pdfinfo do Poppler, se estiverem instalados.
+
+import base64
+import heapq
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+
+from src.analysis_cache import file_content_hash
+from src.config import (
+    PDF_PAGE_CACHE_DIR,
+    PDF_PAGE_JPEG_QUALITY,
+    PDF_VIEWER_RENDERER,
+    PDF_VIEWER_ZOOM_LEVELS,
+)
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Versão do formato das páginas em cache; incrementar faz renderizar tudo de novo.
+PDF_CACHE_FORMAT_VERSION = 1
+
+# Prioridades da fila de renderização (menor = antes).
+PRIORITY_VISIBLE = 0
+PRIORITY_NEARBY = 1
+PRIORITY_BACKGROUND = 2
+
+
+class PdfRenderer(ABC):
+    """Interface dos renderizadores de PDF: dimensões das páginas e imagem de uma página."""
+
+    name = "base"
+
+    @abstractmethod
+    def page_sizes(self, path: str) -> list:
+        """Lista de (largura, altura) de cada página, em pontos (1/72 pol)."""
+
+    @abstractmethod
+    def render(self, path: str, page: int, zoom: float) -> np.ndarray:
+        """Imagem BGR da página (índice a partir de 0) com 'zoom' pixels por ponto."""
+
+    def close(self):
+        pass
+
+
+class PyMuPdfRenderer(PdfRenderer):
+    """Renderização com o PyMuPDF (dependência opcional: pymupdf)."""
+
+    name = "pymupdf"
+
+    def __init__(self):
+        try:
+            import fitz
+        except ImportError as e:
+            raise ImportError(
+                "O renderizador 'pymupdf' requer o pacote opcional 'pymupdf' (pip install pymupdf)."
+            ) from e
+        self._fitz = fitz
+        # Documentos abertos, reaproveitados entre as páginas do mesmo arquivo.
+        self._documents = {}
+
+    def _document(self, path: str):
+        document = self._documents.get(path)
+        if document is None:
+            document = self._documents[path] = self._fitz.open(path)
+        return document
+
+    def page_sizes(self, path: str) -> list:
+        return [(page.rect.width, page.rect.height) for page in self._document(path)]
+
+    def render(self, path: str, page: int, zoom: float) -> np.ndarray:
+        pixmap = self._document(path)[page].get_pixmap(
+            matrix=self._fitz.Matrix(zoom, zoom), alpha=False
+        )
+        image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+        return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+    def close(self):
+        for document in self._documents.values():
+            document.close()
+        self._documents.clear()
+
+
+class PopplerRenderer(PdfRenderer):
+    """Renderização com os utilitários do Poppler (pdfinfo e pdftoppm) em subprocessos."""
+
+    name = "poppler"
+
+    def __init__(self, pdfinfo_path: str = "pdfinfo", pdftoppm_path: str = "pdftoppm"):
+        self.pdfinfo_path = shutil.which(pdfinfo_path)
+        self.pdftoppm_path = shutil.which(pdftoppm_path)
+        if self.pdfinfo_path is None or self.pdftoppm_path is None:
+            raise RuntimeError("pdfinfo/pdftoppm (Poppler) não encontrados no PATH.")
+
+    def page_sizes(self, path: str) -> list:
+        output = subprocess.run(
+            [self.pdfinfo_path, "-f", "1", "-l", "100000", path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        sizes = re.findall(r"^Page\s+\d+\s+size:\s+([\d.]+) x ([\d.]+)", output, re.MULTILINE)
+        return [(float(width), float(height)) for width, height in sizes]
+
+    def render(self, path: str, page: int, zoom: float) -> np.ndarray:
+        number = str(page + 1)
+        png = subprocess.run(
+            [self.pdftoppm_path, "-f", number, "-l", number, "-r", f"{72 * zoom:g}", "-png", "-singlefile", path],
+            capture_output=True, check=True,
+        ).stdout
+        image = cv2.imdecode(np.frombuffer(png, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"pdftoppm não gerou a página {page + 1} de {path}.")
+        return image
+
+
+def create_pdf_renderer(backend: str = "auto") -> PdfRenderer:
+    """
+    Cria o renderizador de PDF. Com backend="auto", usa o PyMuPDF se estiver
+    instalado e, senão, o Poppler.
+    """
+    if backend == "auto":
+        try:
+            return PyMuPdfRenderer()
+        except ImportError:
+            try:
+                return PopplerRenderer()
+            except RuntimeError:
+                raise ImportError(
+                    "Nenhum renderizador de PDF disponível: instale o pacote 'pymupdf' ou o Poppler (pdftoppm)."
+                ) from None
+    if backend == "pymupdf":
+        return PyMuPdfRenderer()
+    if backend == "poppler":
+        return PopplerRenderer()
+    raise ValueError(f"Renderizador de PDF desconhecido: '{backend}'. Use 'auto', 'pymupdf' ou 'poppler'.")
+
+
+class PdfDocument:
+    """Documento aberto no visualizador: hash do conteúdo e dimensões das páginas."""
+
+    def __init__(self, path: str, content_hash: str, page_sizes: list):
+        self.path = path
+        self.content_hash = content_hash
+        self.page_sizes = [tuple(size) for size in page_sizes]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_sizes)
+
+    def aspect(self, page: int) -> float:
+        """Altura / largura da página (para reservar o espaço antes da imagem chegar)."""
+        width, height = self.page_sizes[page]
+        return height / width if width else 1.0
+
+
+class PdfPageCache:
+    """Imagens das páginas em disco: <cache_dir>/<hash do PDF>/<página>_z<zoom>.jpg."""
+
+    def __init__(self, cache_dir: str | None = None, quality: int | None = None):
+        self.cache_dir = cache_dir or PDF_PAGE_CACHE_DIR
+        self.quality = PDF_PAGE_JPEG_QUALITY if quality is None else quality
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _document_dir(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, content_hash)
+
+    def page_path(self, content_hash: str, page: int, zoom: float) -> str:
+        return os.path.join(self._document_dir(content_hash), f"{page:05d}_z{zoom:g}.jpg")
+
+    def has(self, content_hash: str, page: int, zoom: float) -> bool:
+        return os.path.exists(self.page_path(content_hash, page, zoom))
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        # Leitores nunca veem uma imagem pela metade.
+        os.replace(temp_path, path)
+
+    def load_info(self, content_hash: str) -> dict | None:
+        try:
+            with open(os.path.join(self._document_dir(content_hash), "info.json"), encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if info.get("formato") != PDF_CACHE_FORMAT_VERSION:
+            return None
+        return info
+
+    def save_info(self, content_hash: str, page_sizes: list):
+        info = {"formato": PDF_CACHE_FORMAT_VERSION, "page_sizes": [list(size) for size in page_sizes]}
+        self._write_atomic(
+            os.path.join(self._document_dir(content_hash), "info.json"),
+            json.dumps(info).encode("utf-8"),
+        )
+
+    def put(self, content_hash: str, page: int, zoom: float, image: np.ndarray) -> str:
+        ok, encoded = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), int(self.quality)])
+        if not ok:
+            raise ValueError(f"Não foi possível codificar a página {page + 1} em JPEG.")
+        path = self.page_path(content_hash, page, zoom)
+        self._write_atomic(path, encoded.tobytes())
+        return path
+
+
+class PdfPageService:
+    """
+    Abre os PDFs do programa técnico e entrega as páginas como imagens,
+    renderizando-as em segundo plano e guardando-as no PdfPageCache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        renderer: PdfRenderer | None = None,
+        zoom_levels: tuple | None = None,
+        quality: int | None = None,
+    ):
+        self.cache = PdfPageCache(cache_dir, quality)
+        self._renderer = renderer
+        self.zoom_levels = tuple(zoom_levels or PDF_VIEWER_ZOOM_LEVELS)
+        if not self.zoom_levels:
+            raise ValueError("Informe ao menos um nível de zoom.")
+        # Renderizadores de PDF não são seguros entre threads.
+        self._render_lock = threading.Lock()
+        self._queue = []
+        self._queued = {}
+        self._sequence = itertools.count()
+        self._queue_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        self._documents = {}
+        self._listeners = {}
+        self.rendered_count = 0
+
+    @property
+    def renderer(self) -> PdfRenderer:
+        if self._renderer is None:
+            self._renderer = create_pdf_renderer(PDF_VIEWER_RENDERER)
+        return self._renderer
+
+    def has_renderer(self) -> bool:
+        """Indica se há um renderizador de PDF instalado (PyMuPDF ou Poppler)."""
+        try:
+            self.renderer
+        except (ImportError, RuntimeError) as e:
+            logger.warning(f"Visualizador de PDF indisponível: {e}")
+            return False
+        return True
+
+    @property
+    def default_zoom(self) -> float:
+        return self.zoom_levels[0]
+
+    def open(self, path: str, on_page_ready=None) -> PdfDocument:
+        """
+        Abre o PDF: lê (ou obtém do cache) as dimensões das páginas, garante a
+        primeira página no zoom padrão e agenda as demais em segundo plano.
+        on_page_ready(página, zoom) é chamado pela thread de renderização.
+        """
+        content_hash = file_content_hash(path)
+        info = self.cache.load_info(content_hash)
+        if info is None:
+            with self._render_lock:
+                page_sizes = self.renderer.page_sizes(path)
+            if not page_sizes:
+                raise ValueError(f"O PDF não tem páginas: {path}")
+            self.cache.save_info(content_hash, page_sizes)
+        else:
+            page_sizes = info["page_sizes"]
+        document = PdfDocument(path, content_hash, page_sizes)
+        self._documents[content_hash] = document
+        if on_page_ready is not None:
+            self._listeners.setdefault(content_hash, []).append(on_page_ready)
+
+        # A primeira página é exibida assim que o documento abre.
+        self.page_path(document, 0, self.default_zoom)
+        # Zoom padrão de todas as páginas primeiro, depois os demais níveis.
+        for zoom in self.zoom_levels:
+            for page in range(document.page_count):
+                self._enqueue(PRIORITY_BACKGROUND, document, page, zoom)
+        self._start()
+        logger.info(f"PDF aberto no visualizador: {path} ({document.page_count} páginas).")
+        return document
+
+    def unsubscribe(self, document: PdfDocument, on_page_ready):
+        listeners = self._listeners.get(document.content_hash, [])
+        if on_page_ready in listeners:
+            listeners.remove(on_page_ready)
+
+    def request_pages(self, document: PdfDocument, pages, zoom: float | None = None, margin: int = 2):
+        """Passa à frente da fila as páginas visíveis e, logo depois, as 'margin' vizinhas."""
+        zoom = self.default_zoom if zoom is None else zoom
+        pages = list(pages)
+        for page in pages:
+            self._enqueue(PRIORITY_VISIBLE, document, page, zoom)
+        if pages:
+            for page in range(min(pages) - margin, max(pages) + margin + 1):
+                self._enqueue(PRIORITY_NEARBY, document, page, zoom)
+        self._start()
+
+    def is_ready(self, document: PdfDocument, page: int, zoom: float | None = None) -> bool:
+        zoom = self.default_zoom if zoom is None else zoom
+        return self.cache.has(document.content_hash, page, zoom)
+
+    def page_path(self, document: PdfDocument, page: int, zoom: float | None = None) -> str:
+        """Caminho da imagem da página, renderizando-a agora se ainda não estiver no cache."""
+        zoom = self.default_zoom if zoom is None else zoom
+        if not 0 <= page < document.page_count:
+            raise ValueError(f"Página {page + 1} fora do documento ({document.page_count} páginas).")
+        if zoom not in self.zoom_levels:
+            raise ValueError(f"Zoom {zoom} não configurado. Use um de {self.zoom_levels}.")
+        path = self.cache.page_path(document.content_hash, page, zoom)
+        if not os.path.exists(path):
+            with self._render_lock:
+                # Outra thread pode ter renderizado enquanto esta esperava.
+                if not os.path.exists(path):
+                    image = self.renderer.render(document.path, page, zoom)
+                    path = self.cache.put(document.content_hash, page, zoom, image)
+                    self.rendered_count += 1
+        return path
+
+    def page_base64(self, document: PdfDocument, page: int, zoom: float | None = None) -> str:
+        """Imagem da página em base64, para ft.Image.src_base64."""
+        with open(self.page_path(document, page, zoom), "rb") as f:
+            return base64.b64encode(f.read()).decode("ascii")
+
+    def close(self, timeout: float = 5.0):
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._renderer is not None:
+            with self._render_lock:
+                self._renderer.close()
+
+    def _start(self):
+        if self._thread is None and not self._closed.is_set():
+            self._thread = threading.Thread(target=self._render_loop, daemon=True)
+            self._thread.start()
+
+    def _enqueue(self, priority: int, document: PdfDocument, page: int, zoom: float):
+        if not 0 <= page < document.page_count:
+            return
+        if self.cache.has(document.content_hash, page, zoom):
+            return
+        key = (document.content_hash, page, zoom)
+        with self._queue_lock:
+            # Um pedido já na fila com prioridade igual ou maior basta.
+            if self._queued.get(key, PRIORITY_BACKGROUND + 1) <= priority:
+                return
+            self._queued[key] = priority
+            heapq.heappush(self._queue, (priority, next(self._sequence), key))
+        self._wakeup.set()
+
+    def _next_task(self) -> tuple | None:
+        with self._queue_lock:
+            while self._queue:
+                priority, _, key = heapq.heappop(self._queue)
+                # Entradas superadas por um pedido mais prioritário são descartadas.
+                if self._queued.get(key) == priority:
+                    del self._queued[key]
+                    return key
+            self._wakeup.clear()
+            return None
+
+    def _render_loop(self):
+        while not self._closed.is_set():
+            task = self._next_task()
+            if task is None:
+                self._wakeup.wait()
+                continue
+            content_hash, page, zoom = task
+            document = self._documents.get(content_hash)
+            if document is None:
+                continue
+            try:
+                self.page_path(document, page, zoom)
+            except Exception as e:
+                logger.error(f"Erro ao renderizar a página {page + 1} de {document.path}: {e}")
+                continue
+            for listener in list(self._listeners.get(content_hash, [])):
+                try:
+                    listener(page, zoom)
+                except Exception as e:
+                    # Um erro na interface não deve interromper a renderização.
+                    logger.error(f"Erro ao avisar que a página {page + 1} está pronta: {e}", exc_info=True)
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_default_pdf_service() -> PdfPageService:
+    """Serviço de páginas compartilhado por todas as conexões do servidor."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = PdfPageService()
+        return _default_service
@@ -0,0 +1,374 @@
+# src/pose_backends.py
+
+# BACKENDS DE ESTIMATIVA DE POSE
+# Cada backend recebe um frame RGB e devolve um objeto com o atributo
+# 'pose_landmarks' no mesmo formato do MediaPipe Solutions
+# (NormalizedLandmarkList com 33 landmarks, ou None quando não há pose).
+# Assim o PoseEstimator, o desenho e a comparação funcionam com qualquer backend.
+
+import time
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Número de landmarks do modelo BlazePose usado em todo o app.
+NUM_POSE_LANDMARKS = 33
+
+
+class PoseResult:
+    """Resultado de um backend, compatível com os resultados do MediaPipe Solutions."""
+
+    def __init__(self, pose_landmarks=None):
+        self.pose_landmarks = pose_landmarks
+
+
+def landmarks_from_array(array: np.ndarray):
+    """
+    Converte um array (33, 4) com x, y, z e visibility normalizados em um
+    NormalizedLandmarkList do MediaPipe, aceito por drawing_utils.
+    """
+    return landmark_pb2.NormalizedLandmarkList(
+        landmark=[
+            landmark_pb2.NormalizedLandmark(
+                x=float(x), y=float(y), z=float(z), visibility=float(v)
+            )
+            for x, y, z, v in array[:NUM_POSE_LANDMARKS]
+        ]
+    )
+
+
+class PoseBackend(ABC):
+    """Interface comum dos backends de pose."""
+
+    name = "base"
+
+    @abstractmethod
+    def process(self, image_rgb: np.ndarray) -> PoseResult:
+        """Estima a pose em um frame RGB."""
+
+    def process_bgr(self, image_bgr: np.ndarray) -> PoseResult:
+        """Estima a pose em um frame BGR (formato do OpenCV)."""
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        image_rgb.flags.writeable = False
+        return self.process(image_rgb)
+
+    def close(self):
+        """Libera os recursos do backend."""
+
+
+class MediaPipeSolutionsBackend(PoseBackend):
+    """
+    Backend padrão: MediaPipe Solutions Pose.
+    model_complexity 0 = lite (prévias rápidas), 1 = full, 2 = heavy (avaliação de exame).
+    """
+
+    def __init__(
+        self,
+        model_complexity: int = 1,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5,
+        static_image_mode: bool = False,
+    ):
+        self.name = ("mediapipe_lite", "mediapipe_full", "mediapipe_heavy")[model_complexity]
+        self.pose = mp.solutions.pose.Pose(
+            static_image_mode=static_image_mode,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+
+    def process(self, image_rgb: np.ndarray):
+        # O resultado do Solutions já tem o formato esperado.
+        return self.pose.process(image_rgb)
+
+    def close(self):
+        if self.pose:
+            self.pose.close()
+            self.pose = None
+
+
+class MediaPipeTasksBackend(PoseBackend):
+    """
+    Backend baseado na MediaPipe Tasks API (PoseLandmarker em modo VIDEO).
+    Requer um arquivo de modelo .task (ex: pose_landmarker_lite.task).
+    """
+
+    name = "mediapipe_tasks"
+
+    def __init__(
+        self,
+        model_path: str,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5,
+    ):
+        vision = mp.tasks.vision
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+        self._start = time.perf_counter()
+        self._last_timestamp_ms = -1
+
+    def process(self, image_rgb: np.ndarray) -> PoseResult:
+        # O modo VIDEO exige timestamps estritamente crescentes.
+        timestamp_ms = int((time.perf_counter() - self._start) * 1000)
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(image_rgb))
+        result = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        if not result.pose_landmarks:
+            return PoseResult(None)
+        landmarks = np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility or 0.0) for lm in result.pose_landmarks[0]],
+            dtype=np.float32,
+        )
+        return PoseResult(landmarks_from_array(landmarks))
+
+    def close(self):
+        if self.landmarker:
+            self.landmarker.close()
+            self.landmarker = None
+
+
+class OnnxPoseBackend(PoseBackend):
+    """
+    Backend em CPU via ONNX Runtime (dependência opcional: onnxruntime).
+
+    Espera um modelo de landmarks no formato BlazePose: entrada NHWC float32
+    normalizada em [0, 1] e primeira saída com (x, y, z, visibility, presence)
+    por landmark, em pixels da imagem de entrada. A visibilidade é convertida
+    com sigmoide, como no grafo original do MediaPipe.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, min_visibility: float = 0.5, num_threads: int = 0):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "O backend 'onnx' requer o pacote opcional 'onnxruntime' (pip install onnxruntime)."
+            ) from e
+
+        session_options = ort.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Formato NHWC: [1, altura, largura, 3].
+        self.input_height, self.input_width = int(model_input.shape[1]), int(model_input.shape[2])
+        self.min_visibility = min_visibility
+
+    def process(self, image_rgb: np.ndarray) -> PoseResult:
+        resized = cv2.resize(image_rgb, (self.input_width, self.input_height))
+        tensor = (resized.astype(np.float32) / 255.0)[np.newaxis]
+        raw = self.session.run(None, {self.input_name: tensor})[0].reshape(-1, 5)
+        raw = raw[:NUM_POSE_LANDMARKS]
+
+        landmarks = np.empty((NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+        landmarks[:, 0] = raw[:, 0] / self.input_width
+        landmarks[:, 1] = raw[:, 1] / self.input_height
+        landmarks[:, 2] = raw[:, 2] / self.input_width
+        landmarks[:, 3] = 1.0 / (1.0 + np.exp(-raw[:, 3]))
+        if landmarks[:, 3].max() < self.min_visibility:
+            return PoseResult(None)
+        return PoseResult(landmarks_from_array(landmarks))
+
+    def close(self):
+        self.session = None
+
+
+class RoiTrackingBackend(PoseBackend):
+    """
+    Envoltório que roda o backend interno apenas na região em torno da pose do
+    frame anterior (bounding box com margem), em vez do frame inteiro.
+
+    Em tomadas abertas, onde o praticante ocupa uma pequena parte da imagem, o
+    recorte reduz o custo de conversão/redimensionamento e entrega ao modelo a
+    pessoa em resolução maior. Os landmarks são remapeados para coordenadas
+    normalizadas do frame inteiro. Quando a confiança cai (pose perdida ou
+    tronco pouco visível), volta para a detecção no frame inteiro.
+
+    A região é um quadrado que só é movido quando a pose se aproxima da borda
+    (histerese) e é sempre redimensionada para o mesmo tamanho. Com uma entrada
+    estável, o rastreamento interno do MediaPipe não precisa redetectar a pessoa.
+    """
+
+    # Ombros e quadris: usados para medir a confiança do rastreamento.
+    TORSO_LANDMARKS = (11, 12, 23, 24)
+
+    def __init__(
+        self,
+        inner: PoseBackend,
+        full_frame_backend: PoseBackend | None = None,
+        padding: float = 0.3,
+        crop_size: int = 512,
+        min_confidence: float = 0.5,
+        min_roi_fraction: float = 0.1,
+    ):
+        """
+        Args:
+            inner (PoseBackend): Backend que faz a inferência nos recortes.
+            full_frame_backend (PoseBackend): Backend usado na detecção em frame inteiro.
+                     Uma instância separada é recomendada para backends com rastreamento
+                     interno (MediaPipe em modo vídeo): alternar entre recortes e frames
+                     inteiros na mesma instância faz o rastreador perder a pose.
+            padding (float): Margem adicionada em cada lado, como fração do tamanho da pose.
+            crop_size (int): Lado do recorte quadrado enviado ao modelo (em pixels).
+            min_confidence (float): Visibilidade média mínima do tronco para manter o rastreamento.
+            min_roi_fraction (float): Tamanho mínimo do recorte, como fração do frame.
+        """
+        self.inner = inner
+        self.full_frame_backend = full_frame_backend or inner
+        self.name = f"{inner.name}+roi"
+        self.padding = padding
+        self.crop_size = crop_size
+        self.min_confidence = min_confidence
+        self.min_roi_fraction = min_roi_fraction
+        self.roi = None  # (x0, y0, lado) em pixels do frame inteiro
+        self.frame_shape = None  # (altura, largura) dos frames rastreados
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        """Descarta o rastreamento (ex: ao trocar de vídeo)."""
+        self.roi = None
+        self.frame_shape = None
+
+    def _landmark_array(self, pose_landmarks) -> np.ndarray:
+        return np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+            dtype=np.float32,
+        )
+
+    def _confident(self, landmarks: np.ndarray) -> bool:
+        torso = landmarks[list(self.TORSO_LANDMARKS), 3]
+        return float(np.mean(torso)) >= self.min_confidence
+
+    def _update_roi(self, landmarks: np.ndarray, width: int, height: int):
+        """
+        Mantém a região atual enquanto a pose couber nela com folga; caso contrário,
+        recalcula um quadrado centrado na pose, com margem, dentro do frame.
+        """
+        # Usa todos os landmarks, não só os visíveis: o modelo também estima a posição
+        # de partes fora do recorte, e ignorá-las faria a região encolher a cada frame.
+        xy = np.clip(landmarks[:, :2], 0.0, 1.0)
+        x0, y0 = xy[:, 0].min() * width, xy[:, 1].min() * height
+        x1, y1 = xy[:, 0].max() * width, xy[:, 1].max() * height
+        pose_size = max(x1 - x0, y1 - y0, self.min_roi_fraction * max(width, height))
+
+        if self.roi is not None:
+            rx, ry, side = self.roi
+            slack = side * self.padding / 4
+            fits = (
+                x0 - rx >= slack
+                and y0 - ry >= slack
+                and rx + side - x1 >= slack
+                and ry + side - y1 >= slack
+            )
+            # A pose continua dentro da região e não encolheu demais: nada muda.
+            if fits and pose_size * (1 + 2 * self.padding) > side * 0.6:
+                return
+
+        side = int(min(pose_size * (1 + 2 * self.padding), width, height))
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        # Desloca o quadrado para dentro do frame em vez de cortá-lo.
+        rx = int(min(max(cx - side / 2, 0), width - side))
+        ry = int(min(max(cy - side / 2, 0), height - side))
+        self.roi = (rx, ry, side) if side >= 2 else None
+
+    def _process_full(self, image: np.ndarray, is_bgr: bool):
+        self.full_frames += 1
+        self.roi = None
+        backend = self.full_frame_backend
+        results = backend.process_bgr(image) if is_bgr else backend.process(image)
+        if results.pose_landmarks:
+            landmarks = self._landmark_array(results.pose_landmarks)
+            if self._confident(landmarks):
+                self._update_roi(landmarks, image.shape[1], image.shape[0])
+        return results
+
+    def _process(self, image: np.ndarray, is_bgr: bool):
+        height, width = image.shape[:2]
+        if self.frame_shape != (height, width):
+            # Outro vídeo (ou resolução): a região anterior não vale para este frame.
+            self.reset()
+            self.frame_shape = (height, width)
+        if self.roi is None:
+            return self._process_full(image, is_bgr)
+
+        # Mantém a região dentro do frame atual.
+        rx, ry, side = self.roi
+        side = min(side, width, height)
+        rx, ry = min(max(rx, 0), width - side), min(max(ry, 0), height - side)
+        if side < 2:
+            return self._process_full(image, is_bgr)
+        self.roi = (rx, ry, side)
+        crop = image[ry : ry + side, rx : rx + side]
+        # INTER_LINEAR: INTER_AREA custa mais que a própria economia do recorte.
+        crop = cv2.resize(
+            crop, (self.crop_size, self.crop_size), interpolation=cv2.INTER_LINEAR
+        )
+        # Só o recorte é convertido de BGR para RGB, não o frame inteiro.
+        results = self.inner.process_bgr(crop) if is_bgr else self.inner.process(crop)
+
+        landmarks = None
+        if results.pose_landmarks:
+            landmarks = self._landmark_array(results.pose_landmarks)
+        if landmarks is None or not self._confident(landmarks):
+            self.fallbacks += 1
+            return self._process_full(image, is_bgr)
+
+        # Remapeia de coordenadas normalizadas do recorte para o frame inteiro.
+        # O z do MediaPipe usa a mesma escala de x, por isso é escalado pela largura.
+        landmarks[:, 0] = (landmarks[:, 0] * side + rx) / width
+        landmarks[:, 1] = (landmarks[:, 1] * side + ry) / height
+        landmarks[:, 2] = landmarks[:, 2] * side / width
+        self.roi_frames += 1
+        self._update_roi(landmarks, width, height)
+        return PoseResult(landmarks_from_array(landmarks))
+
+    def process(self, image_rgb: np.ndarray):
+        return self._process(image_rgb, is_bgr=False)
+
+    def process_bgr(self, image_bgr: np.ndarray):
+        return self._process(image_bgr, is_bgr=True)
+
+    def close(self):
+        self.inner.close()
+        if self.full_frame_backend is not self.inner:
+            self.full_frame_backend.close()
+
+
+# Registro dos backends disponíveis. Cada entrada recebe as opções do config.
+POSE_BACKENDS = {
+    "mediapipe_lite": lambda **options: MediaPipeSolutionsBackend(model_complexity=0, **options),
+    "mediapipe_full": lambda **options: MediaPipeSolutionsBackend(model_complexity=1, **options),
+    "mediapipe_heavy": lambda **options: MediaPipeSolutionsBackend(model_complexity=2, **options),
+    "mediapipe_tasks": MediaPipeTasksBackend,
+    "onnx": OnnxPoseBackend,
+}
+
+
+def create_pose_backend(name: str, **options) -> PoseBackend:
+    """Cria um backend pelo nome registrado em POSE_BACKENDS."""
+    if name not in POSE_BACKENDS:
+        raise ValueError(
+            f"Backend de pose desconhecido: '{name}'. Disponíveis: {sorted(POSE_BACKENDS)}"
+        )
+    logger.info(f"Criando backend de pose '{name}' com opções {options}.")
+    return POSE_BACKENDS[name](**options)
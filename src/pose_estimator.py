@@ -1,9 +1,20 @@
 # src/pose_estimator.py
 
+import sys
+
 import mediapipe as mp
 import cv2
 import numpy as np
 from src.utils import get_logger
+from src.config import (
+    POSE_BACKEND,
+    POSE_BACKEND_OPTIONS,
+    POSE_BACKEND_PROFILES,
+    POSE_ROI_OPTIONS,
+    POSE_ROI_TRACKING,
+)
+from src.pose_backends import PoseBackend, RoiTrackingBackend, create_pose_backend
+from src.skeleton_drawer import SkeletonDrawer
 
 # Obtém uma instância do logger para este módulo.
 logger = get_logger(__name__)
@@ -11,22 +22,55 @@ logger = get_logger(__name__)
 
 class PoseEstimator:
     """
-    Estima a pose usando MediaPipe Pose e permite desenhar esqueletos com estilos customizados.
+    Estima a pose com um backend configurável (MediaPipe Pose por padrão) e permite
+    desenhar esqueletos com estilos customizados.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None, roi_tracking: bool | None = None, **backend_options):
         """
         Construtor da classe PoseEstimator.
-        Inicializa o modelo MediaPipe Pose e define os diferentes estilos de desenho.
+        Inicializa o backend de pose e define os diferentes estilos de desenho.
+
+        Args:
+            backend: Nome de um backend registrado (ex: "mediapipe_lite"), um perfil de
+                     POSE_BACKEND_PROFILES (ex: "exame") ou uma instância de PoseBackend.
+                     Se omitido, usa POSE_BACKEND do config.
+            roi_tracking (bool): Roda a inferência só no recorte em torno da pose anterior.
+                     Se omitido, usa POSE_ROI_TRACKING do config.
+            **backend_options: Opções repassadas ao backend (sobrepõem POSE_BACKEND_OPTIONS).
         """
-        logger.info("Inicializando PoseEstimator com MediaPipe Pose...")
-        # Inicializa o modelo de detecção de pose do MediaPipe.
-        self.pose = mp.solutions.pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
+        if roi_tracking is None:
+            roi_tracking = POSE_ROI_TRACKING
+        if isinstance(backend, PoseBackend):
+            self.backend = backend
+            options = {}
+            if roi_tracking and not isinstance(backend, RoiTrackingBackend):
+                self.backend = RoiTrackingBackend(backend, **POSE_ROI_OPTIONS)
+        else:
+            backend_name = backend or POSE_BACKEND
+            backend_name = POSE_BACKEND_PROFILES.get(backend_name, backend_name)
+            options = dict(backend_options)
+            # As opções de confiança padrão só se aplicam aos backends do MediaPipe.
+            if backend_name.startswith("mediapipe"):
+                options = {**POSE_BACKEND_OPTIONS, **options}
+            self.backend = create_pose_backend(backend_name, **options)
+            if roi_tracking:
+                # Instâncias separadas para os recortes e para o frame inteiro, de modo
+                # que o rastreamento interno de cada uma veja sempre a mesma geometria.
+                self.backend = RoiTrackingBackend(
+                    self.backend,
+                    full_frame_backend=create_pose_backend(backend_name, **options),
+                    **POSE_ROI_OPTIONS,
+                )
+        # Configuração que determina os landmarks produzidos (usada como parte da
+        # chave do cache de resultados, ver src/analysis_cache.py).
+        self.config = {
+            "backend": self.backend.name,
+            "options": options,
+            "roi_tracking": bool(roi_tracking),
+            "roi_options": POSE_ROI_OPTIONS if roi_tracking else None,
+        }
+        logger.info(f"Inicializando PoseEstimator com o backend '{self.backend.name}'...")
         # Utilitário de desenho do MediaPipe.
         self.mp_drawing = mp.solutions.drawing_utils
 
@@ -52,26 +96,14 @@ class PoseEstimator:
             color=(255, 100, 0), thickness=2, circle_radius=2
         )  # Azul
 
-        # Mapeamento das conexões do esqueleto para os lados esquerdo e direito.
-        # POSE_CONNECTIONS é uma lista de tuplas, cada tupla representa um "osso" conectando dois pontos (landmarks).
-        pose_connections = mp.solutions.pose.POSE_CONNECTIONS
-
-        # Filtra as conexões para identificar as que pertencem ao lado esquerdo do corpo.
-        self.left_connections = {
-            conn
-            for conn in pose_connections
-            if "LEFT" in str(conn[0]) and "LEFT" in str(conn[1])
-        }
-        # Filtra as conexões para identificar as que pertencem ao lado direito do corpo.
-        self.right_connections = {
-            conn
-            for conn in pose_connections
-            if "RIGHT" in str(conn[0]) and "RIGHT" in str(conn[1])
-        }
-        # As conexões restantes são consideradas centrais (tronco).
-        self.center_connections = (
-            pose_connections - self.left_connections - self.right_connections
+        # Motor de desenho vetorizado. As conexões já são separadas por lado
+        # (esquerdo, direito e tronco) e pré-calculadas como arrays de índices.
+        self.drawer = SkeletonDrawer(
+            thickness=self.default_style.thickness,
+            feedback_thickness=self.correct_style.thickness,
+            feedback_point_radius=self.correct_style.circle_radius,
         )
+        self._feedback_key_angles = None
 
         logger.info(
             "PoseEstimator inicializado com estilos de desenho por lado e por feedback."
@@ -86,14 +118,16 @@ class PoseEstimator:
             image (np.ndarray): O frame de imagem em formato BGR.
 
         Returns:
-            mediapipe.python.solutions.pose.PoseResults: Os resultados da detecção de pose.
+            Os resultados da detecção, com o atributo 'pose_landmarks' no formato do MediaPipe.
         """
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image_rgb.flags.writeable = False
-        results = self.pose.process(image_rgb)
+        # A conversão para RGB fica a cargo do backend: o rastreamento por ROI,
+        # por exemplo, converte apenas o recorte em vez do frame inteiro.
+        results = self.backend.process_bgr(image)
         return results
 
-    def draw_skeleton_by_side(self, image: np.ndarray, pose_landmarks) -> np.ndarray:
+    def draw_skeleton_by_side(
+        self, image: np.ndarray, pose_landmarks, in_place: bool = False
+    ) -> np.ndarray:
         """
         Desenha o esqueleto na imagem com cores diferentes para cada lado.
         Lado esquerdo em laranja, lado direito em azul.
@@ -101,37 +135,12 @@ class PoseEstimator:
         Args:
             image (np.ndarray): A imagem onde o esqueleto será desenhado.
             pose_landmarks: O objeto de landmarks retornado pelo MediaPipe.
+            in_place (bool): Desenha diretamente em 'image', sem copiar o frame.
 
         Returns:
             np.ndarray: A imagem com o esqueleto colorido desenhado.
         """
-        annotated_image = image.copy()
-        if pose_landmarks:
-            # Desenha as conexões do lado esquerdo em laranja.
-            self.mp_drawing.draw_landmarks(
-                annotated_image,
-                pose_landmarks,
-                self.left_connections,
-                self.left_side_style,
-                self.left_side_style,
-            )
-            # Desenha as conexões do lado direito em azul.
-            self.mp_drawing.draw_landmarks(
-                annotated_image,
-                pose_landmarks,
-                self.right_connections,
-                self.right_side_style,
-                self.right_side_style,
-            )
-            # Desenha as conexões centrais com o estilo padrão (branco).
-            self.mp_drawing.draw_landmarks(
-                annotated_image,
-                pose_landmarks,
-                self.center_connections,
-                self.default_style,
-                self.default_style,
-            )
-        return annotated_image
+        return self.drawer.draw_by_side(image, pose_landmarks, in_place=in_place)
 
     def draw_feedback_skeleton(
         self,
@@ -140,6 +149,7 @@ class PoseEstimator:
         angle_diffs: dict,
         key_angles: dict,
         threshold: float = 15.0,
+        in_place: bool = False,
     ) -> np.ndarray:
         """
         Desenha o esqueleto na imagem destacando acertos (verde) e erros (vermelho).
@@ -151,50 +161,18 @@ class PoseEstimator:
             angle_diffs (dict): Dicionário com as diferenças de ângulo para colorir.
             key_angles (dict): Mapeamento dos nomes dos ângulos para os landmarks que os formam.
             threshold (float): Limiar para considerar um ângulo como incorreto.
+            in_place (bool): Desenha diretamente em 'image', sem copiar o frame.
 
         Returns:
             np.ndarray: A imagem com o esqueleto de feedback.
         """
-        annotated_image = image.copy()
-        if not landmarks_list or not angle_diffs:
-            return annotated_image
-
-        # Dicionário para armazenar a cor de cada conexão.
-        connection_colors = {}
-
-        # Determina a cor de cada articulação com base na diferença de ângulo.
-        for angle_name, diff in angle_diffs.items():
-            style = self.correct_style if diff <= threshold else self.incorrect_style
-            p1_name, p2_name, p3_name = key_angles[angle_name]
-
-            # As duas "pernas" do ângulo (ex: Ombro-Cotovelo, Cotovelo-Pulso).
-            connection1 = tuple(sorted((p1_name, p2_name)))
-            connection2 = tuple(sorted((p2_name, p3_name)))
-
-            # Prioriza o vermelho: se uma conexão fizer parte de um ângulo ruim, ela fica vermelha.
-            if connection_colors.get(connection1) != self.incorrect_style.color:
-                connection_colors[connection1] = style.color
-            if connection_colors.get(connection2) != self.incorrect_style.color:
-                connection_colors[connection2] = style.color
-
-        # Desenha as conexões e os pontos com as cores definidas.
-        for (p1_name, p2_name), color in connection_colors.items():
-            p1 = next((lm for lm in landmarks_list if lm["name"] == p1_name), None)
-            p2 = next((lm for lm in landmarks_list if lm["name"] == p2_name), None)
-
-            if p1 and p2 and p1["visibility"] > 0.5 and p2["visibility"] > 0.5:
-                pt1 = (int(p1["x"] * image.shape[1]), int(p1["y"] * image.shape[0]))
-                pt2 = (int(p2["x"] * image.shape[1]), int(p2["y"] * image.shape[0]))
-                # Desenha a linha e os círculos para cada conexão.
-                cv2.line(annotated_image, pt1, pt2, color, self.correct_style.thickness)
-                cv2.circle(
-                    annotated_image, pt1, self.correct_style.circle_radius, color, -1
-                )
-                cv2.circle(
-                    annotated_image, pt2, self.correct_style.circle_radius, color, -1
-                )
-
-        return annotated_image
+        # As tabelas de conexões dos ângulos só são recalculadas se o mapa mudar.
+        if key_angles is not self._feedback_key_angles:
+            self.drawer.set_key_angles(key_angles)
+            self._feedback_key_angles = key_angles
+        return self.drawer.draw_feedback(
+            image, landmarks_list, angle_diffs, threshold=threshold, in_place=in_place
+        )
 
     def get_landmarks_as_list(self, pose_landmarks):
         """Converte o objeto de landmarks do MediaPipe para uma lista de dicionários."""
@@ -216,8 +194,24 @@ class PoseEstimator:
             for i, lm in enumerate(pose_landmarks.landmark)
         ]
 
+    def close(self):
+        """Libera os recursos do backend de pose. Pode ser chamado mais de uma vez."""
+        backend = getattr(self, "backend", None)
+        if backend:
+            self.backend = None
+            backend.close()
+            logger.info("Recursos do backend de pose liberados.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def __del__(self):
-        """Destrutor para liberar os recursos do MediaPipe Pose."""
-        if hasattr(self, "pose") and self.pose:
-            self.pose.close()
-            logger.info("Recursos do MediaPipe Pose liberados.")
+        """Destrutor: rede de segurança para quem não chamou close()."""
+        # Fechar o grafo do MediaPipe durante o encerramento do interpretador pode
+        # travar o processo; nesse caso o sistema operacional libera os recursos.
+        if sys.is_finalizing():
+            return
+        self.close()
@@ -0,0 +1,163 @@
+# src/progress_bus.py
+
+import threading
+import time
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProgressEvent:
+    """
+    Evento de progresso de uma análise. Além da fração concluída, carrega
+    métricas úteis para a interface (fps, tempo restante e pontuação atual).
+    """
+
+    __slots__ = (
+        "progress",
+        "frames_done",
+        "total_frames",
+        "fps",
+        "eta_seconds",
+        "score",
+        "stage",
+        "done",
+        "queue_position",
+    )
+
+    def __init__(
+        self,
+        progress: float,
+        frames_done: int = 0,
+        total_frames: int = 0,
+        fps: float = 0.0,
+        eta_seconds: float | None = None,
+        score: float | None = None,
+        stage: str = "analise",
+        done: bool = False,
+        queue_position: int | None = None,
+    ):
+        self.progress = progress
+        self.frames_done = frames_done
+        self.total_frames = total_frames
+        self.fps = fps
+        self.eta_seconds = eta_seconds
+        self.score = score
+        self.stage = stage
+        self.done = done
+        # Posição na fila de admissão (stage="fila"); None fora da fila.
+        self.queue_position = queue_position
+
+    def __repr__(self):
+        return (
+            f"ProgressEvent(progress={self.progress:.3f}, frames={self.frames_done}/"
+            f"{self.total_frames}, fps={self.fps:.1f}, stage='{self.stage}', done={self.done})"
+        )
+
+
+class ProgressBus:
+    """
+    Barramento de progresso que desacopla a thread de análise da interface.
+
+    A thread de trabalho apenas publica eventos (operação O(1), sem chamar a UI).
+    Uma thread de entrega separada repassa aos assinantes somente o evento mais
+    recente, no máximo 'max_rate_hz' vezes por segundo. O evento final (done=True)
+    é sempre entregue.
+    """
+
+    def __init__(self, max_rate_hz: float = 10.0):
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._pending = None
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        self._start_time = None
+        self.published_count = 0
+        self.delivered_count = 0
+
+    def subscribe(self, callback):
+        """Registra uma função que receberá objetos ProgressEvent."""
+        self._subscribers.append(callback)
+
+    def start(self):
+        """Inicia a thread de entrega dos eventos."""
+        if self._thread is not None:
+            return
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._thread.start()
+
+    def restart_clock(self):
+        """Reinicia a contagem de tempo do fps/ETA (ex: após o job esperar na fila)."""
+        self._start_time = time.perf_counter()
+
+    def publish(self, event: ProgressEvent):
+        """Publica um evento. Eventos ainda não entregues são substituídos pelo novo."""
+        with self._lock:
+            self._pending = event
+            self.published_count += 1
+        self._wakeup.set()
+
+    def publish_frame(
+        self,
+        frames_done: int,
+        total_frames: int,
+        score: float | None = None,
+        stage: str = "analise",
+    ):
+        """Publica o progresso de um frame, calculando fps e tempo restante estimado."""
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+        elapsed = time.perf_counter() - self._start_time
+        fps = frames_done / elapsed if elapsed > 0 else 0.0
+        remaining = max(total_frames - frames_done, 0)
+        eta = remaining / fps if fps > 0 else None
+        progress = frames_done / total_frames if total_frames else 0.0
+        self.publish(
+            ProgressEvent(progress, frames_done, total_frames, fps, eta, score, stage)
+        )
+
+    def close(self, final_event: ProgressEvent | None = None, timeout: float = 5.0):
+        """
+        Encerra o barramento. Se informado, 'final_event' é publicado antes.
+        Aguarda a entrega do último evento pendente.
+        """
+        if final_event is not None:
+            self.publish(final_event)
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _take_pending(self):
+        with self._lock:
+            event, self._pending = self._pending, None
+            return event
+
+    def _deliver(self, event: ProgressEvent):
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                # Um erro na UI nunca deve interromper a análise.
+                logger.error(f"Erro ao entregar evento de progresso: {e}", exc_info=True)
+        self.delivered_count += 1
+
+    def _dispatch_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            event = self._take_pending()
+            if event is not None:
+                self._deliver(event)
+            if self._closed.is_set():
+                # Entrega o que tiver sido publicado entre a última entrega e o fechamento.
+                event = self._take_pending()
+                if event is not None:
+                    self._deliver(event)
+                break
+            # Aguarda o intervalo mínimo; eventos publicados nesse meio-tempo são agrupados.
+            self._closed.wait(self.min_interval)
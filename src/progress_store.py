@@ -0,0 +1,360 @@
+# src/progress_store.py
+
+# HISTÓRICO DE PROGRESSO DOS ALUNOS
+# As notas de cada análise sumiam ao fim da sessão, e um painel de progresso
+# teria de reagregar os resultados frame a frame de todas as análises a cada
+# visita. Aqui cada análise concluída vira um resumo em SQLite (nota média e
+# máxima, e a diferença média de cada articulação em relação ao mestre, a
+# partir dos angle_diffs do MotionComparator), por aluno, técnica e faixa.
+#
+# Na mesma transação em que o resumo é gravado, são atualizados os agregados
+# que o painel consulta, sem reler o histórico:
+#   - por aluno e técnica: total de sessões, soma/melhor/última nota, média
+#     móvel exponencial (PROGRESS_EMA_ALPHA) e média das últimas
+#     PROGRESS_ROLLING_WINDOW sessões (a sessão que sai da janela é achada pelo
+#     índice, não por varredura);
+#   - por aluno e articulação: as mesmas médias da diferença angular;
+#   - por faixa e articulação: soma e média móvel exponencial de todos os alunos;
+#   - por aluno e dia: sessões e soma das notas (gráfico de evolução).
+# Assim as consultas do painel leem poucas linhas, independente de quantas
+# sessões o aluno já tem. rebuild_aggregates() recalcula tudo a partir dos
+# resumos (migração ou conferência).
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.config import PROGRESS_DB_PATH, PROGRESS_EMA_ALPHA, PROGRESS_ROLLING_WINDOW
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS progress_sessions ("
+    " session_id INTEGER PRIMARY KEY AUTOINCREMENT, user TEXT NOT NULL, technique TEXT NOT NULL,"
+    " rank TEXT, recorded_at REAL NOT NULL, num_frames INTEGER NOT NULL,"
+    " avg_score REAL NOT NULL, max_score REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS progress_sessions_user ON progress_sessions (user, session_id)",
+    "CREATE INDEX IF NOT EXISTS progress_sessions_technique"
+    " ON progress_sessions (user, technique, session_id)",
+    "CREATE TABLE IF NOT EXISTS progress_session_joints ("
+    " session_id INTEGER NOT NULL, user TEXT NOT NULL, angle_name TEXT NOT NULL,"
+    " mean_diff REAL NOT NULL, frames INTEGER NOT NULL, PRIMARY KEY (session_id, angle_name))",
+    "CREATE INDEX IF NOT EXISTS progress_session_joints_user"
+    " ON progress_session_joints (user, angle_name, session_id)",
+    "CREATE TABLE IF NOT EXISTS progress_user_techniques ("
+    " user TEXT NOT NULL, technique TEXT NOT NULL, sessions INTEGER NOT NULL,"
+    " score_sum REAL NOT NULL, best_score REAL NOT NULL, last_score REAL NOT NULL,"
+    " ema_score REAL NOT NULL, window_sum REAL NOT NULL, window_count INTEGER NOT NULL,"
+    " first_at REAL NOT NULL, last_at REAL NOT NULL, PRIMARY KEY (user, technique))",
+    "CREATE TABLE IF NOT EXISTS progress_user_joints ("
+    " user TEXT NOT NULL, angle_name TEXT NOT NULL, sessions INTEGER NOT NULL,"
+    " diff_sum REAL NOT NULL, last_diff REAL NOT NULL, ema_diff REAL NOT NULL,"
+    " window_sum REAL NOT NULL, window_count INTEGER NOT NULL, PRIMARY KEY (user, angle_name))",
+    "CREATE TABLE IF NOT EXISTS progress_rank_joints ("
+    " rank TEXT NOT NULL, angle_name TEXT NOT NULL, sessions INTEGER NOT NULL,"
+    " diff_sum REAL NOT NULL, ema_diff REAL NOT NULL, PRIMARY KEY (rank, angle_name))",
+    "CREATE TABLE IF NOT EXISTS progress_user_days ("
+    " user TEXT NOT NULL, day TEXT NOT NULL, sessions INTEGER NOT NULL,"
+    " score_sum REAL NOT NULL, PRIMARY KEY (user, day))",
+)
+_AGGREGATE_TABLES = ("progress_user_techniques", "progress_user_joints", "progress_rank_joints", "progress_user_days")
+
+
+def summarize_session(session) -> dict:
+    """
+    Resumo de uma AnalysisSession (ou ResultsSnapshot) para o histórico: nota
+    média/máxima e, por articulação, a diferença média e em quantos frames ela
+    foi calculada. Articulações nunca calculadas ficam de fora.
+    """
+    summary = session.summary()
+    diffs = np.asarray(session.angle_diffs)
+    counts = np.count_nonzero(~np.isnan(diffs), axis=0) if diffs.size else []
+    joints = {
+        name: (summary["angle_means"][name], int(count))
+        for name, count in zip(session.angle_names, counts)
+        if count
+    }
+    return {
+        "num_frames": summary["num_frames"],
+        "avg_score": summary["avg_score"],
+        "max_score": summary["max_score"],
+        "joints": joints,
+    }
+
+
+class ProgressStore:
+    """Histórico de análises por aluno com agregados atualizados a cada gravação."""
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        window: int = PROGRESS_ROLLING_WINDOW,
+        ema_alpha: float = PROGRESS_EMA_ALPHA,
+    ):
+        if window < 1 or not 0 < ema_alpha <= 1:
+            raise ValueError("window deve ser >= 1 e ema_alpha deve estar em (0, 1].")
+        self.db_path = db_path or PROGRESS_DB_PATH
+        self.window = window
+        self.ema_alpha = ema_alpha
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: cada gravação abre a sua transação explicitamente.
+        self._db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def record_session(
+        self,
+        user: str,
+        technique: str,
+        session,
+        rank: str | None = None,
+        recorded_at: float | None = None,
+    ) -> int:
+        """Grava o resumo de uma análise concluída e atualiza os agregados. Retorna o id."""
+        summary = session if isinstance(session, dict) else summarize_session(session)
+        if not summary["num_frames"]:
+            raise ValueError("A análise não tem frames para registrar.")
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                session_id = self._insert(user, technique, rank, recorded_at, summary)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return session_id
+
+    def _insert(self, user, technique, rank, recorded_at, summary) -> int:
+        db = self._db
+        score = float(summary["avg_score"])
+        cursor = db.execute(
+            "INSERT INTO progress_sessions (user, technique, rank, recorded_at, num_frames, avg_score, max_score)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user, technique, rank, recorded_at, summary["num_frames"], score, float(summary["max_score"])),
+        )
+        session_id = cursor.lastrowid
+        db.executemany(
+            "INSERT INTO progress_session_joints (session_id, user, angle_name, mean_diff, frames) VALUES (?, ?, ?, ?, ?)",
+            [(session_id, user, name, float(diff), frames) for name, (diff, frames) in summary["joints"].items()],
+        )
+        self._update_aggregates(session_id, user, technique, rank, recorded_at, summary)
+        return session_id
+
+    def _update_aggregates(self, session_id, user, technique, rank, recorded_at, summary):
+        """Soma a sessão 'session_id' (já gravada) aos agregados."""
+        db = self._db
+        score = float(summary["avg_score"])
+        # Sessão que sai da janela móvel (a window-ésima anterior a esta), pelo índice.
+        leaving = db.execute(
+            "SELECT avg_score FROM progress_sessions WHERE user = ? AND technique = ? AND session_id < ?"
+            " ORDER BY session_id DESC LIMIT 1 OFFSET ?",
+            (user, technique, session_id, self.window - 1),
+        ).fetchone()
+        row = db.execute(
+            "SELECT ema_score, window_sum FROM progress_user_techniques WHERE user = ? AND technique = ?",
+            (user, technique),
+        ).fetchone()
+        if row is None:
+            db.execute(
+                "INSERT INTO progress_user_techniques VALUES (?, ?, 1, ?, ?, ?, ?, ?, 1, ?, ?)",
+                (user, technique, score, score, score, score, score, recorded_at, recorded_at),
+            )
+        else:
+            ema, window_sum = row
+            window_sum += score - (leaving[0] if leaving else 0.0)
+            db.execute(
+                "UPDATE progress_user_techniques SET sessions = sessions + 1, score_sum = score_sum + ?,"
+                " best_score = MAX(best_score, ?), last_score = ?, ema_score = ?, window_sum = ?,"
+                " window_count = MIN(window_count + 1, ?), last_at = MAX(last_at, ?)"
+                " WHERE user = ? AND technique = ?",
+                (score, score, score, self._ema(ema, score), window_sum, self.window, recorded_at, user, technique),
+            )
+
+        for name, (diff, _) in summary["joints"].items():
+            diff = float(diff)
+            leaving = db.execute(
+                "SELECT mean_diff FROM progress_session_joints WHERE user = ? AND angle_name = ? AND session_id < ?"
+                " ORDER BY session_id DESC LIMIT 1 OFFSET ?",
+                (user, name, session_id, self.window - 1),
+            ).fetchone()
+            row = db.execute(
+                "SELECT ema_diff, window_sum FROM progress_user_joints WHERE user = ? AND angle_name = ?",
+                (user, name),
+            ).fetchone()
+            if row is None:
+                db.execute(
+                    "INSERT INTO progress_user_joints VALUES (?, ?, 1, ?, ?, ?, ?, 1)",
+                    (user, name, diff, diff, diff, diff),
+                )
+            else:
+                ema, window_sum = row
+                db.execute(
+                    "UPDATE progress_user_joints SET sessions = sessions + 1, diff_sum = diff_sum + ?,"
+                    " last_diff = ?, ema_diff = ?, window_sum = ?, window_count = MIN(window_count + 1, ?)"
+                    " WHERE user = ? AND angle_name = ?",
+                    (diff, diff, self._ema(ema, diff), window_sum + diff - (leaving[0] if leaving else 0.0),
+                     self.window, user, name),
+                )
+            if rank:
+                row = db.execute(
+                    "SELECT ema_diff FROM progress_rank_joints WHERE rank = ? AND angle_name = ?", (rank, name)
+                ).fetchone()
+                if row is None:
+                    db.execute("INSERT INTO progress_rank_joints VALUES (?, ?, 1, ?, ?)", (rank, name, diff, diff))
+                else:
+                    db.execute(
+                        "UPDATE progress_rank_joints SET sessions = sessions + 1, diff_sum = diff_sum + ?,"
+                        " ema_diff = ? WHERE rank = ? AND angle_name = ?",
+                        (diff, self._ema(row[0], diff), rank, name),
+                    )
+
+        db.execute(
+            "INSERT INTO progress_user_days VALUES (?, ?, 1, ?) ON CONFLICT (user, day)"
+            " DO UPDATE SET sessions = sessions + 1, score_sum = score_sum + excluded.score_sum",
+            (user, datetime.fromtimestamp(recorded_at).strftime("%Y-%m-%d"), score),
+        )
+
+    def _ema(self, previous: float, value: float) -> float:
+        return previous + self.ema_alpha * (value - previous)
+
+    def user_overview(self, user: str) -> dict:
+        """Progresso do aluno para o painel: por técnica e por articulação (só agregados)."""
+        with self._lock:
+            techniques = self._db.execute(
+                "SELECT technique, sessions, score_sum, best_score, last_score, ema_score, window_sum,"
+                " window_count, last_at FROM progress_user_techniques WHERE user = ? ORDER BY last_at DESC",
+                (user,),
+            ).fetchall()
+            joints = self._db.execute(
+                "SELECT angle_name, sessions, diff_sum, last_diff, ema_diff, window_sum, window_count"
+                " FROM progress_user_joints WHERE user = ?",
+                (user,),
+            ).fetchall()
+        technique_stats = [
+            {
+                "technique": technique,
+                "sessions": sessions,
+                "avg_score": score_sum / sessions,
+                "best_score": best,
+                "last_score": last,
+                "ema_score": ema,
+                "rolling_score": window_sum / window_count,
+                "last_at": last_at,
+            }
+            for technique, sessions, score_sum, best, last, ema, window_sum, window_count, last_at in techniques
+        ]
+        joint_stats = {
+            name: {
+                "sessions": sessions,
+                "avg_diff": diff_sum / sessions,
+                "last_diff": last,
+                "ema_diff": ema,
+                "rolling_diff": window_sum / window_count,
+            }
+            for name, sessions, diff_sum, last, ema, window_sum, window_count in joints
+        }
+        total = sum(t["sessions"] for t in technique_stats)
+        return {
+            "sessions": total,
+            "avg_score": sum(t["avg_score"] * t["sessions"] for t in technique_stats) / total if total else 0.0,
+            "techniques": technique_stats,
+            "joints": joint_stats,
+            # Articulações com a maior diferença recente: onde o aluno deve focar.
+            "weakest_joints": sorted(joint_stats, key=lambda n: joint_stats[n]["rolling_diff"], reverse=True)[:3],
+        }
+
+    def technique_history(self, user: str, technique: str, limit: int = 50) -> list:
+        """As 'limit' análises mais recentes do aluno nessa técnica (mais recente primeiro)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT session_id, recorded_at, num_frames, avg_score, max_score FROM progress_sessions"
+                " WHERE user = ? AND technique = ? ORDER BY session_id DESC LIMIT ?",
+                (user, technique, limit),
+            ).fetchall()
+        keys = ("session_id", "recorded_at", "num_frames", "avg_score", "max_score")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def daily_scores(self, user: str, days: int = 30) -> list:
+        """(dia, sessões, nota média) dos 'days' dias mais recentes com análises, em ordem cronológica."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, sessions, score_sum / sessions FROM progress_user_days"
+                " WHERE user = ? ORDER BY day DESC LIMIT ?",
+                (user, days),
+            ).fetchall()
+        return rows[::-1]
+
+    def rank_joint_averages(self, rank: str) -> dict:
+        """Diferença média (geral e móvel) de cada articulação entre os alunos da faixa."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT angle_name, sessions, diff_sum, ema_diff FROM progress_rank_joints WHERE rank = ?", (rank,)
+            ).fetchall()
+        return {
+            name: {"sessions": sessions, "avg_diff": diff_sum / sessions, "ema_diff": ema}
+            for name, sessions, diff_sum, ema in rows
+        }
+
+    def rebuild_aggregates(self):
+        """
+        Recalcula todos os agregados a partir dos resumos gravados, em ordem de
+        gravação (ex: depois de mudar a janela ou o alfa das médias móveis).
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                sessions = self._db.execute(
+                    "SELECT session_id, user, technique, rank, recorded_at, num_frames, avg_score, max_score"
+                    " FROM progress_sessions ORDER BY session_id"
+                ).fetchall()
+                joints = {}
+                for session_id, name, diff, frames in self._db.execute(
+                    "SELECT session_id, angle_name, mean_diff, frames FROM progress_session_joints"
+                ):
+                    joints.setdefault(session_id, {})[name] = (diff, frames)
+                for table in _AGGREGATE_TABLES:
+                    self._db.execute(f"DELETE FROM {table}")
+                for session_id, user, technique, rank, recorded_at, num_frames, avg, best in sessions:
+                    summary = {
+                        "num_frames": num_frames,
+                        "avg_score": avg,
+                        "max_score": best,
+                        "joints": joints.get(session_id, {}),
+                    }
+                    self._update_aggregates(session_id, user, technique, rank, recorded_at, summary)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        logger.info(f"Agregados de progresso recalculados a partir de {len(sessions)} sessões.")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_progress_store() -> ProgressStore:
+    """Histórico de progresso do processo (PROGRESS_DB_PATH), aberto no primeiro uso."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ProgressStore()
+        return _default_store
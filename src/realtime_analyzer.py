@@ -0,0 +1,283 @@
+# src/realtime_analyzer.py
+
+import threading
+import time
+import cv2
+import numpy as np
+from src.utils import get_logger
+from src.motion_comparator import MotionComparator
+from src.session_store import load_session
+
+logger = get_logger(__name__)
+
+
+def extract_landmark_sequence(video_path: str, pose_estimator) -> tuple[list, float]:
+    """
+    Extrai os landmarks de todos os frames de um vídeo (ex: o vídeo do mestre).
+    O resultado pode ser reaproveitado em várias sessões em tempo real.
+
+    Returns:
+        tuple: (lista de landmarks por frame, fps do vídeo)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Não foi possível abrir o vídeo: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    sequence = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            results = pose_estimator.estimate_pose(frame)
+            sequence.append(pose_estimator.get_landmarks_as_list(results.pose_landmarks))
+    finally:
+        cap.release()
+    logger.info(f"Sequência de {len(sequence)} frames extraída de: {video_path}")
+    return sequence, fps
+
+
+class RealtimeStats:
+    """Métricas de uma sessão em tempo real (fps alcançado, quadros descartados e latência)."""
+
+    def __init__(self, latency_budget_ms: float):
+        self.latency_budget_ms = latency_budget_ms
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.frames_over_budget = 0
+        self.latencies_ms = []
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    @property
+    def achieved_fps(self) -> float:
+        return self.frames_processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        latencies = np.asarray(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "frames_over_budget": self.frames_over_budget,
+            "achieved_fps": round(self.achieved_fps, 2),
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "latency_budget_ms": self.latency_budget_ms,
+        }
+
+
+class RealtimeAnalyzer:
+    """
+    Analisa, em tempo real, os frames de uma câmera (ou de um arquivo que simula
+    uma câmera) contra uma sequência de landmarks do mestre já processada.
+
+    A captura roda em uma thread própria e mantém apenas o frame mais recente.
+    Se a inferência ficar para trás, os frames intermediários são descartados,
+    de forma que a latência ponta a ponta não cresce com o tempo.
+    """
+
+    def __init__(
+        self,
+        master_landmarks: list,
+        master_fps: float = 30.0,
+        source=0,
+        pose_estimator=None,
+        latency_budget_ms: float = 150.0,
+        simulate_realtime: bool = True,
+        loop_master: bool = True,
+    ):
+        """
+        Args:
+            master_landmarks (list): Landmarks do mestre por frame (formato de get_landmarks_as_list).
+            master_fps (float): Taxa de quadros da sequência do mestre, usada no alinhamento temporal.
+            source: Índice do dispositivo para cv2.VideoCapture ou caminho de um arquivo de vídeo.
+            pose_estimator: Instância de PoseEstimator. Criada sob demanda se não for informada.
+            latency_budget_ms (float): Latência máxima aceitável entre captura e overlay pronto.
+            simulate_realtime (bool): Para arquivos, entrega os frames no ritmo do fps do vídeo.
+            loop_master (bool): Reinicia a sequência do mestre ao chegar ao fim.
+        """
+        if not master_landmarks:
+            raise ValueError("A sequência do mestre está vazia.")
+        if pose_estimator is None:
+            from src.pose_estimator import PoseEstimator
+
+            pose_estimator = PoseEstimator()
+        self.pose_estimator = pose_estimator
+        self.motion_comparator = MotionComparator()
+        self.master_landmarks = master_landmarks
+        self.master_fps = master_fps
+        self.source = source
+        self.latency_budget_ms = latency_budget_ms
+        self.simulate_realtime = simulate_realtime and not isinstance(source, int)
+        self.loop_master = loop_master
+
+        self.stats = RealtimeStats(latency_budget_ms)
+        self.last_result = None
+
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stop = threading.Event()
+        self._latest = None  # (frame, timestamp_captura)
+        self._capture_thread = None
+        self._capture_finished = False
+        logger.info(
+            f"RealtimeAnalyzer configurado: fonte={source}, {len(master_landmarks)} frames do mestre, "
+            f"orçamento de latência={latency_budget_ms} ms."
+        )
+
+    @classmethod
+    def from_session(cls, session_path: str, **kwargs) -> "RealtimeAnalyzer":
+        """Cria o analisador usando os landmarks do mestre de uma sessão salva."""
+        session = load_session(session_path)
+        master = [
+            session.landmarks_as_list(i, is_aluno=False) for i in range(session.num_frames)
+        ]
+        kwargs.setdefault("master_fps", session.fps or 30.0)
+        return cls(master, **kwargs)
+
+    def _capture_loop(self, cap):
+        """Lê frames continuamente, mantendo apenas o mais recente."""
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_interval = 1.0 / fps
+        next_frame_time = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                if self.simulate_realtime:
+                    # Um arquivo é lido muito mais rápido que uma câmera: espera o "tempo real".
+                    delay = next_frame_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_frame_time += frame_interval
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                captured_at = time.perf_counter()
+                with self._lock:
+                    if self._latest is not None:
+                        # O frame anterior não chegou a ser processado.
+                        self.stats.frames_dropped += 1
+                    self._latest = (frame, captured_at)
+                    self.stats.frames_captured += 1
+                self._new_frame.set()
+        finally:
+            cap.release()
+            self._capture_finished = True
+            self._new_frame.set()
+
+    def _take_latest(self):
+        with self._lock:
+            latest, self._latest = self._latest, None
+            return latest
+
+    def master_index_at(self, elapsed_seconds: float) -> int | None:
+        """Índice do frame do mestre alinhado ao tempo decorrido desde o início."""
+        index = int(elapsed_seconds * self.master_fps)
+        if index >= len(self.master_landmarks):
+            if not self.loop_master:
+                return None
+            index %= len(self.master_landmarks)
+        return index
+
+    def process_frame(self, frame: np.ndarray, master_index: int) -> tuple[np.ndarray, dict]:
+        """Estima a pose, compara com o frame do mestre e desenha o overlay de feedback."""
+        results = self.pose_estimator.estimate_pose(frame)
+        aluno_landmarks = self.pose_estimator.get_landmarks_as_list(results.pose_landmarks)
+        score, feedback, diffs = self.motion_comparator.compare_poses(
+            aluno_landmarks, self.master_landmarks[master_index]
+        )
+        # O frame capturado não é reaproveitado, então o overlay é desenhado nele mesmo.
+        annotated = self.pose_estimator.draw_feedback_skeleton(
+            frame, aluno_landmarks, diffs, self.motion_comparator.KEY_ANGLES, in_place=True
+        )
+        cv2.putText(
+            annotated,
+            f"{score:.0f}%",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.0,
+            (255, 255, 255),
+            2,
+        )
+        return annotated, {
+            "score": score,
+            "feedback": feedback,
+            "diffs": diffs,
+            "master_index": master_index,
+        }
+
+    def run(self, on_frame=None, max_seconds: float | None = None) -> dict:
+        """
+        Executa a análise até a fonte terminar, stop() ser chamado ou max_seconds expirar.
+
+        Args:
+            on_frame: Função chamada com (frame_anotado, resultado) para cada frame processado.
+            max_seconds: Duração máxima da sessão.
+
+        Returns:
+            dict: As métricas da sessão (ver RealtimeStats.to_dict).
+        """
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            raise ValueError(f"Não foi possível abrir a fonte de vídeo: {self.source}")
+
+        self._stop.clear()
+        self._capture_finished = False
+        self.stats = RealtimeStats(self.latency_budget_ms)
+        self.stats.start_time = time.perf_counter()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(cap,), daemon=True
+        )
+        self._capture_thread.start()
+
+        try:
+            while not self._stop.is_set():
+                if max_seconds is not None and self.stats.elapsed >= max_seconds:
+                    break
+                self._new_frame.wait(timeout=0.5)
+                self._new_frame.clear()
+                latest = self._take_latest()
+                if latest is None:
+                    if self._capture_finished:
+                        break
+                    continue
+
+                frame, captured_at = latest
+                master_index = self.master_index_at(captured_at - self.stats.start_time)
+                if master_index is None:
+                    break
+
+                annotated, result = self.process_frame(frame, master_index)
+                latency_ms = (time.perf_counter() - captured_at) * 1000
+                result["latency_ms"] = latency_ms
+                self.stats.frames_processed += 1
+                self.stats.latencies_ms.append(latency_ms)
+                if latency_ms > self.latency_budget_ms:
+                    self.stats.frames_over_budget += 1
+                self.last_result = result
+
+                if on_frame:
+                    on_frame(annotated, result)
+        finally:
+            self.stop()
+            self.stats.end_time = time.perf_counter()
+
+        stats = self.stats.to_dict()
+        logger.info(f"Sessão em tempo real finalizada: {stats}")
+        return stats
+
+    def stop(self):
+        """Interrompe a captura e a análise."""
+        self._stop.set()
+        self._new_frame.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
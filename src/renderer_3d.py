@@ -10,10 +10,12 @@ from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 import io
 import cv2
-from src.utils import get_logger
+from src.utils import LogSampler, get_logger
 
 # Obtém uma instância do logger para este módulo.
 logger = get_logger(__name__)
+# Chamado a cada frame exibido: avisos repetitivos são amostrados.
+sampled_logger = LogSampler(logger, every=100)
 
 # Mapeamento de conexões para o esqueleto 3D, usando os nomes dos landmarks.
 # Isso nos permite desenhar os "ossos" conectando as articulações corretas.
@@ -59,8 +61,9 @@ def render_3d_skeleton(landmarks_list: list) -> np.ndarray:
     """
     # Se não houver landmarks, retorna uma imagem preta vazia.
     if not landmarks_list:
-        logger.warning(
-            "Tentativa de renderizar esqueleto 3D com lista de landmarks vazia. Retornando imagem vazia."
+        sampled_logger.warning(
+            "lista_vazia",
+            "Tentativa de renderizar esqueleto 3D com lista de landmarks vazia. Retornando imagem vazia.",
         )
         return np.zeros((640, 640, 3), dtype=np.uint8)
 
@@ -0,0 +1,245 @@
+# src/repetitions.py
+
+# SEGMENTAÇÃO DE REPETIÇÕES
+# Alunos costumam gravar várias repetições de uma técnica no mesmo arquivo.
+# Comparar o vídeo inteiro com o mestre frame a frame desalinha tudo depois da
+# primeira repetição; aqui a sequência de poses do aluno é dividida em
+# repetições e cada uma é pontuada separadamente contra o mestre.
+#
+# Tudo opera sobre os arrays de landmarks (N, 33, 4) do pipeline de pose:
+#   1. Os ângulos chave viram um sinal (N, A), normalizado para 0..1.
+#   2. O período do movimento é estimado pela autocorrelação do sinal (FFT).
+#   3. Cada repetição termina quando o aluno volta à pose inicial: as
+#      fronteiras são os mínimos da distância à primeira pose, procurados a
+#      cada período.
+#   4. Cada repetição é esticada/comprimida para a duração do mestre e
+#      pontuada como no MotionComparator (similaridade média dos ângulos).
+
+import numpy as np
+from src.config import KEY_ANGLE_DEFINITIONS
+from src.utils import angle_sequences, get_logger
+
+logger = get_logger(__name__)
+
+# Autocorrelação mínima para considerar o movimento repetitivo.
+MIN_PERIODICITY = 0.3
+# Repetições com movimento abaixo desta fração da mediana (aluno parado) são descartadas.
+MIN_MOTION_RATIO = 0.25
+# Picos da autocorrelação com pelo menos esta fração do maior valem como período
+# (evita escolher um múltiplo do período verdadeiro).
+PEAK_TOLERANCE = 0.9
+# Faixa (fração da variação) considerada "na pose de repouso", usada nas
+# fronteiras entre repetições e para recortar o aluno parado no início/fim.
+REST_BAND_RATIO = 0.1
+
+
+def _angle_signal(landmarks: np.ndarray) -> np.ndarray:
+    """Ângulos (N, A) em 0..1 com as lacunas interpoladas; ângulos nunca visíveis saem do sinal."""
+    angles = angle_sequences(landmarks) / 180.0
+    frames = np.arange(len(angles))
+    columns = []
+    for j in range(angles.shape[1]):
+        visible = ~np.isnan(angles[:, j])
+        if visible.sum() >= 2:
+            columns.append(np.interp(frames, frames[visible], angles[visible, j]))
+    if not columns:
+        return np.empty((len(angles), 0), dtype=np.float32)
+    return np.stack(columns, axis=1).astype(np.float32)
+
+
+def estimate_period(signal: np.ndarray, min_frames: int, max_frames: int) -> tuple[int, float]:
+    """
+    Período (em frames) do sinal (N, A) pela autocorrelação, somada sobre os ângulos.
+    Retorna (período, força), com força em -1..1; (0, 0.0) se não houver período
+    possível com pelo menos duas repetições.
+    """
+    n = len(signal)
+    max_frames = min(max_frames, n // 2)
+    if signal.shape[1] == 0 or max_frames < min_frames:
+        return 0, 0.0
+    centered = signal - signal.mean(axis=0)
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centered, size, axis=0)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size, axis=0)[:n].sum(axis=1)
+    if autocorr[0] <= 0:
+        return 0, 0.0
+    autocorr = autocorr / autocorr[0]
+
+    # O pico é escolhido na autocorrelação com viés, que decai com o atraso e
+    # favorece o período verdadeiro em vez dos seus múltiplos.
+    lags = np.arange(min_frames, max_frames + 1)
+    values = autocorr[lags]
+    interior = (values >= autocorr[lags - 1]) & (values >= autocorr[np.minimum(lags + 1, n - 1)])
+    if not interior.any():
+        return 0, 0.0
+    peaks = lags[interior]
+    best = autocorr[peaks].max()
+    period = int(peaks[np.argmax(autocorr[peaks] >= PEAK_TOLERANCE * best)])
+    # A força é a correlação sem viés: cada atraso tem n - atraso pares de frames.
+    return period, float(autocorr[period] * n / (n - period))
+
+
+def _rest_center(distance: np.ndarray) -> int:
+    """
+    Centro do trecho mais próximo da pose inicial na janela. Perto da pose de
+    repouso o movimento é lento e vários frames empatam; o centro da região
+    é menos sensível ao ruído que o mínimo isolado.
+    """
+    lowest = int(np.argmin(distance))
+    threshold = distance[lowest] + REST_BAND_RATIO * (distance.max() - distance[lowest])
+    left = right = lowest
+    while left > 0 and distance[left - 1] <= threshold:
+        left -= 1
+    while right < len(distance) - 1 and distance[right + 1] <= threshold:
+        right += 1
+    return (left + right) // 2
+
+
+def _idle_frames(distance: np.ndarray) -> int:
+    """
+    Frames iniciais parados na pose de repouso: o movimento começa no último
+    mínimo da distância antes de ela sair da faixa de repouso.
+    """
+    moving = np.flatnonzero(distance > REST_BAND_RATIO * distance.max())
+    if not len(moving):
+        return 0
+    start = int(moving[0])
+    while start > 0 and distance[start - 1] < distance[start]:
+        start -= 1
+    return start
+
+
+def segment_repetitions(
+    landmarks: np.ndarray,
+    fps: float = 30.0,
+    min_seconds: float = 0.4,
+    max_seconds: float = 10.0,
+) -> list:
+    """
+    Divide a sequência de poses (N, 33, 4) em repetições.
+
+    Returns:
+        list: Intervalos [(início, fim), ...] em frames da sequência. Um movimento
+              não repetitivo resulta em um único intervalo com a sequência toda.
+    """
+    landmarks = np.asarray(landmarks)
+    n = len(landmarks)
+    whole = [(0, n)] if n else []
+    signal = _angle_signal(landmarks)
+    fps = fps or 30.0
+    period, strength = estimate_period(
+        signal, max(2, int(round(min_seconds * fps))), int(round(max_seconds * fps))
+    )
+    if period == 0 or strength < MIN_PERIODICITY:
+        logger.info(f"Nenhuma repetição detectada em {n} frames (periodicidade {strength:.2f}).")
+        return whole
+
+    # Distância de cada frame à primeira pose com todos os ângulos (a pose de partida).
+    has_pose = ~np.isnan(angle_sequences(landmarks)).all(axis=1)
+    anchor = int(np.argmax(has_pose))
+    distance = np.linalg.norm(signal - signal[anchor], axis=1)
+
+    boundaries = [anchor]
+    while True:
+        low = boundaries[-1] + period // 2
+        high = min(boundaries[-1] + (3 * period) // 2, n)
+        if high - low < period // 2:
+            break
+        boundaries.append(low + _rest_center(distance[low:high]))
+    if len(boundaries) < 2:
+        return whole
+    # A sobra depois da última fronteira pertence à última repetição.
+    boundaries[-1] = n if n - boundaries[-1] < period // 2 else boundaries[-1]
+    if boundaries[-1] < n:
+        boundaries.append(n)
+    segments = list(zip(boundaries[:-1], boundaries[1:]))
+    # Aluno parado na pose inicial antes de começar ou depois de terminar: a
+    # primeira e a última repetição são recortadas onde o movimento começa/acaba.
+    segments[0] = (segments[0][0] + _idle_frames(distance[slice(*segments[0])]), segments[0][1])
+    segments[-1] = (segments[-1][0], segments[-1][1] - _idle_frames(distance[slice(*segments[-1])][::-1]))
+
+    # Trechos em que o aluno ficou parado não são repetições.
+    motion = np.array([np.ptp(signal[start:end], axis=0).sum() for start, end in segments])
+    keep = motion >= MIN_MOTION_RATIO * np.median(motion)
+    segments = [segment for segment, kept in zip(segments, keep) if kept]
+    logger.info(
+        f"{len(segments)} repetições detectadas em {n} frames "
+        f"(período de {period} frames, periodicidade {strength:.2f})."
+    )
+    return segments or whole
+
+
+def score_repetitions(aluno_landmarks: np.ndarray, mestre_landmarks: np.ndarray, segments: list) -> list:
+    """
+    Pontua cada repetição do aluno contra a sequência do mestre. A repetição é
+    reamostrada para a duração do mestre e cada frame recebe a pontuação do
+    MotionComparator: média de max(0, 1 - diferença / 180) sobre os ângulos,
+    ignorando ângulos sem visibilidade e valendo 0 sem pose em um dos lados.
+    """
+    angle_names = list(KEY_ANGLE_DEFINITIONS)
+    aluno_landmarks = np.asarray(aluno_landmarks, dtype=np.float32)
+    mestre_landmarks = np.asarray(mestre_landmarks, dtype=np.float32)
+    aluno_angles = angle_sequences(aluno_landmarks)
+    mestre_angles = angle_sequences(mestre_landmarks)
+    aluno_has_pose = ~np.isnan(aluno_landmarks).all(axis=(1, 2))
+    mestre_has_pose = ~np.isnan(mestre_landmarks).all(axis=(1, 2))
+    results = []
+    for start, end in segments:
+        # Frame da repetição correspondente a cada frame do mestre.
+        frames = np.round(np.linspace(start, end - 1, len(mestre_angles))).astype(int)
+        diffs = np.abs(aluno_angles[frames] - mestre_angles)
+        visible = ~np.isnan(diffs)
+        # Ângulo não visível em um dos lados não penaliza (como no MotionComparator).
+        similarities = np.clip(1.0 - np.where(visible, diffs, 0.0) / 180.0, 0.0, None)
+        scores = similarities.mean(axis=1) * 100
+        scores = np.where(aluno_has_pose[frames] & mestre_has_pose, scores, 0.0)
+        counts = visible.sum(axis=0)
+        angle_means = np.where(visible, diffs, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        results.append(
+            {
+                "start": int(start),
+                "end": int(end),
+                "num_frames": int(end - start),
+                "avg_score": float(scores.mean()) if len(scores) else 0.0,
+                "min_score": float(scores.min()) if len(scores) else 0.0,
+                "angle_means": {
+                    name: float(value)
+                    for name, value, count in zip(angle_names, angle_means, counts)
+                    if count
+                },
+            }
+        )
+    return results
+
+
+def summarize_repetitions(repetitions: list) -> dict:
+    """Resumo geral das repetições pontuadas por score_repetitions."""
+    if not repetitions:
+        return {
+            "num_repetitions": 0,
+            "avg_score": 0.0,
+            "score_std": 0.0,
+            "best": None,
+            "worst": None,
+            "repetitions": [],
+        }
+    scores = np.array([rep["avg_score"] for rep in repetitions])
+    return {
+        "num_repetitions": len(repetitions),
+        "avg_score": float(scores.mean()),
+        # Desvio das notas entre repetições: quanto menor, mais consistente o aluno.
+        "score_std": float(scores.std()),
+        "best": int(scores.argmax()),
+        "worst": int(scores.argmin()),
+        "repetitions": repetitions,
+    }
+
+
+def analyze_repetitions(
+    aluno_landmarks: np.ndarray, mestre_landmarks: np.ndarray, fps: float = 30.0, **segment_options
+) -> dict:
+    """Segmenta as repetições do aluno e as pontua contra o mestre (ver summarize_repetitions)."""
+    segments = segment_repetitions(aluno_landmarks, fps=fps, **segment_options)
+    summary = summarize_repetitions(score_repetitions(aluno_landmarks, mestre_landmarks, segments))
+    summary["fps"] = float(fps)
+    return summary
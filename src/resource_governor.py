@@ -0,0 +1,360 @@
+# src/resource_governor.py
+
+# CONTROLE DE ADMISSÃO DAS ANÁLISES
+# Cada análise guarda os frames originais e anotados dos dois vídeos em memória,
+# então algumas análises simultâneas em alta resolução podem esgotar a RAM do
+# servidor. O ResourceGovernor estima o custo de cada job (resolução x número de
+# frames) e só o admite se houver uma vaga de CPU e memória no orçamento. Os
+# demais esperam em fila (FIFO), com posição e tempo estimado de espera.
+# Em vez de recusar ou travar o servidor, o governor degrada a análise quando
+# possível: um job que não cabe no orçamento (ou que cabe apenas reduzido,
+# quando há vaga de CPU livre) é admitido com a resolução de inferência
+# reduzida, até o limite ANALYSIS_MIN_INFERENCE_HEIGHT.
+# A vaga de CPU é devolvida quando o processamento termina (ticket.finish()),
+# mas a memória só quando os frames guardados são liberados (ticket.release()),
+# pois o VideoAnalyzer mantém os frames para a revisão do resultado.
+
+import cv2
+import math
+import os
+import threading
+import time
+from src.config import (
+    ANALYSIS_CPU_SLOTS,
+    ANALYSIS_INITIAL_FPS,
+    ANALYSIS_MEMORY_BUDGET_MB,
+    ANALYSIS_MIN_INFERENCE_HEIGHT,
+)
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Cópias de cada frame mantidas pelo VideoAnalyzer: o original e o anotado.
+FRAME_COPIES_PER_VIDEO = 2
+# Memória fixa estimada por job (modelo, landmarks, buffers do decodificador).
+JOB_BASE_BYTES = 64 * 2**20
+
+
+def physical_memory_bytes() -> int | None:
+    """Memória física total da máquina (None se não for possível descobrir)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_cpu_slots() -> int:
+    """Vagas de CPU das análises: ANALYSIS_CPU_SLOTS ou o número de CPUs."""
+    return ANALYSIS_CPU_SLOTS or os.cpu_count() or 1
+
+
+def default_memory_budget_mb() -> float:
+    """Orçamento de memória das análises: ANALYSIS_MEMORY_BUDGET_MB ou metade da memória física."""
+    if ANALYSIS_MEMORY_BUDGET_MB is not None:
+        return ANALYSIS_MEMORY_BUDGET_MB
+    total = physical_memory_bytes()
+    return total / 2 / 2**20 if total else 2048
+
+
+class JobCost:
+    """Custo estimado de uma análise, na resolução original dos vídeos."""
+
+    def __init__(self, frame_sizes: list, num_frames: int):
+        """
+        Args:
+            frame_sizes (list): (largura, altura) de cada vídeo analisado.
+            num_frames (int): Quantos frames de cada vídeo serão analisados.
+        """
+        self.frame_sizes = list(frame_sizes)
+        self.num_frames = max(int(num_frames), 0)
+        self.frame_bytes = sum(w * h * 3 * FRAME_COPIES_PER_VIDEO for w, h in self.frame_sizes)
+        self.max_height = max((h for _, h in self.frame_sizes), default=0)
+
+    @classmethod
+    def from_captures(cls, captures: list, num_frames: int) -> "JobCost":
+        """Estima o custo a partir das capturas OpenCV abertas."""
+        sizes = [
+            (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            for cap in captures
+        ]
+        return cls(sizes, num_frames)
+
+    def memory_bytes(self, scale: float = 1.0) -> int:
+        """Memória estimada do job com os frames redimensionados por 'scale'."""
+        return int(JOB_BASE_BYTES + self.frame_bytes * self.num_frames * scale * scale)
+
+    def __repr__(self):
+        return (
+            f"JobCost(frames={self.num_frames}, resolucoes={self.frame_sizes}, "
+            f"memoria={self.memory_bytes() / 2**20:.0f} MB)"
+        )
+
+
+class AdmissionTicket:
+    """
+    Pedido de execução de um job. Enquanto espera, informa a posição na fila e
+    o tempo estimado até a admissão; depois de admitido, 'scale' indica a
+    fração da resolução original com que o job deve rodar (1.0 = sem redução).
+    """
+
+    def __init__(self, governor: "ResourceGovernor", cost: JobCost, job_name: str):
+        self.governor = governor
+        self.cost = cost
+        self.job_name = job_name
+        self.scale = 1.0
+        self.position = 0  # posição na fila (0 = admitido)
+        self.eta_seconds = 0.0
+        self.admitted = False
+        self.finished = False
+        self.released = False
+        self.requested_at = time.monotonic()
+        self.admitted_at = None
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.cost.memory_bytes(self.scale)
+
+    @property
+    def degraded(self) -> bool:
+        return self.scale < 1.0
+
+    def wait(self, timeout: float | None = None, on_update=None) -> bool:
+        """
+        Bloqueia até o job ser admitido. 'on_update' recebe o próprio ticket
+        sempre que a posição ou a estimativa de espera mudam.
+
+        Returns:
+            bool: True se admitido, False se o timeout expirou antes.
+        """
+        return self.governor._wait(self, timeout, on_update)
+
+    def finish(self, frames_done: int | None = None):
+        """Fim do processamento: devolve a vaga de CPU e mantém a memória reservada."""
+        self.governor._finish(self, frames_done)
+
+    def release(self, frames_done: int | None = None):
+        """Devolve a vaga de CPU e a memória ao governor (idempotente)."""
+        self.governor._release(self, frames_done)
+
+    def __enter__(self):
+        self.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def __repr__(self):
+        return (
+            f"AdmissionTicket(job='{self.job_name}', admitido={self.admitted}, "
+            f"posicao={self.position}, escala={self.scale:.2f}, eta={self.eta_seconds:.1f}s)"
+        )
+
+
+class ResourceGovernor:
+    """
+    Admite análises contra um número de vagas de CPU e um orçamento de memória.
+    Seguro para uso por várias threads.
+    """
+
+    def __init__(
+        self,
+        cpu_slots: int | None = None,
+        memory_budget_mb: float | None = None,
+        min_inference_height: int | None = None,
+        initial_fps: float | None = None,
+    ):
+        """
+        Args:
+            cpu_slots (int): Máximo de análises simultâneas (padrão: número de CPUs).
+            memory_budget_mb (float): Memória total para as análises em andamento
+                (padrão: metade da memória física).
+            min_inference_height (int): Menor altura de frame aceita ao degradar um job.
+            initial_fps (float): Vazão (frames/s) assumida para o ETA antes de a
+                primeira análise terminar; depois é medida.
+        """
+        self.cpu_slots = cpu_slots or default_cpu_slots()
+        if memory_budget_mb is None:
+            memory_budget_mb = default_memory_budget_mb()
+        if self.cpu_slots < 1 or memory_budget_mb <= 0:
+            raise ValueError(
+                f"Orçamento inválido: {self.cpu_slots} vagas de CPU, {memory_budget_mb} MB."
+            )
+        self.memory_budget_bytes = int(memory_budget_mb * 2**20)
+        self.min_inference_height = min_inference_height or ANALYSIS_MIN_INFERENCE_HEIGHT
+        self.fps = initial_fps or ANALYSIS_INITIAL_FPS
+        self._running = []  # ocupam uma vaga de CPU
+        self._reserved = []  # ocupam memória (em execução ou com frames guardados)
+        self._waiting = []
+        self._condition = threading.Condition()
+
+    # --- Consultas ---
+
+    @property
+    def memory_in_use_bytes(self) -> int:
+        return sum(ticket.memory_bytes for ticket in self._reserved)
+
+    def snapshot(self) -> dict:
+        """Estado atual do governor (para logs e métricas)."""
+        with self._condition:
+            return {
+                "em_execucao": len(self._running),
+                "na_fila": len(self._waiting),
+                "reservas_memoria": len(self._reserved),
+                "vagas_cpu": self.cpu_slots,
+                "memoria_em_uso_mb": round(self.memory_in_use_bytes / 2**20, 1),
+                "orcamento_memoria_mb": round(self.memory_budget_bytes / 2**20, 1),
+                "fps_estimado": round(self.fps, 2),
+            }
+
+    # --- Admissão ---
+
+    def request(self, cost: JobCost, job_name: str = "analise") -> AdmissionTicket:
+        """
+        Registra um job. O ticket volta admitido se houver recursos; caso
+        contrário, entra na fila e deve ser aguardado com ticket.wait().
+
+        Raises:
+            ValueError: Se o job não cabe no orçamento nem na resolução mínima.
+        """
+        ticket = AdmissionTicket(self, cost, job_name)
+        min_scale = self._min_scale(cost)
+        if cost.memory_bytes(min_scale) > self.memory_budget_bytes:
+            raise ValueError(
+                f"A análise '{job_name}' precisa de {cost.memory_bytes(min_scale) / 2**20:.0f} MB "
+                f"mesmo na resolução mínima, acima do orçamento de "
+                f"{self.memory_budget_bytes / 2**20:.0f} MB. Analise um trecho menor do vídeo."
+            )
+        with self._condition:
+            self._waiting.append(ticket)
+            self._admit_waiting()
+            if not ticket.admitted:
+                logger.info(
+                    f"Análise '{job_name}' na fila (posição {ticket.position}, "
+                    f"espera estimada {ticket.eta_seconds:.0f}s)."
+                )
+        return ticket
+
+    def _min_scale(self, cost: JobCost) -> float:
+        if cost.max_height <= self.min_inference_height:
+            return 1.0
+        return self.min_inference_height / cost.max_height
+
+    def _fitting_scale(self, ticket: AdmissionTicket, available: int) -> float | None:
+        """Maior escala (<= 1.0, >= mínima) com que o job cabe em 'available' bytes."""
+        cost = ticket.cost
+        if cost.memory_bytes(1.0) <= available:
+            return 1.0
+        frames_bytes = cost.frame_bytes * cost.num_frames
+        if frames_bytes <= 0 or available <= JOB_BASE_BYTES:
+            return None
+        scale = math.sqrt((available - JOB_BASE_BYTES) / frames_bytes)
+        # Arredonda para baixo: a escala aplicada nunca ultrapassa o orçamento.
+        scale = math.floor(scale * 100) / 100
+        return scale if scale >= self._min_scale(cost) else None
+
+    def _admit_waiting(self):
+        """Admite os jobs do início da fila que couberem (chamado com a trava)."""
+        while self._waiting and len(self._running) < self.cpu_slots:
+            ticket = self._waiting[0]
+            available = self.memory_budget_bytes - self.memory_in_use_bytes
+            scale = self._fitting_scale(ticket, available)
+            if scale is None:
+                # Ordem FIFO: jobs menores não passam à frente (evita inanição).
+                break
+            self._waiting.pop(0)
+            ticket.scale = scale
+            ticket.admitted = True
+            ticket.position = 0
+            ticket.eta_seconds = 0.0
+            ticket.admitted_at = time.monotonic()
+            self._running.append(ticket)
+            self._reserved.append(ticket)
+            if ticket.degraded:
+                logger.warning(
+                    f"Análise '{ticket.job_name}' admitida com resolução reduzida "
+                    f"(escala {scale:.2f}) para caber no orçamento de memória."
+                )
+            else:
+                logger.info(f"Análise '{ticket.job_name}' admitida.")
+        self._update_estimates()
+        self._condition.notify_all()
+
+    def _estimated_duration(self, ticket: AdmissionTicket) -> float:
+        return ticket.cost.num_frames / self.fps if self.fps > 0 else 0.0
+
+    def _update_estimates(self):
+        """Recalcula a posição e o ETA dos jobs em espera (chamado com a trava)."""
+        now = time.monotonic()
+        # Instantes em que cada vaga de CPU fica livre, simulando a fila em ordem.
+        free_at = [
+            max(self._estimated_duration(t) - (now - t.admitted_at), 0.0) for t in self._running
+        ]
+        free_at += [0.0] * (self.cpu_slots - len(free_at))
+        free_at.sort()
+        for position, ticket in enumerate(self._waiting, start=1):
+            start = free_at.pop(0)
+            ticket.position = position
+            ticket.eta_seconds = start
+            free_at.append(start + self._estimated_duration(ticket))
+            free_at.sort()
+
+    def _wait(self, ticket: AdmissionTicket, timeout: float | None, on_update) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last_seen = None
+        with self._condition:
+            while not ticket.admitted:
+                if ticket.released:
+                    return False
+                state = (ticket.position, round(ticket.eta_seconds))
+                if on_update and state != last_seen:
+                    last_seen = state
+                    on_update(ticket)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Acorda periodicamente para atualizar o ETA enquanto espera.
+                self._condition.wait(1.0 if remaining is None else min(remaining, 1.0))
+                self._update_estimates()
+        return True
+
+    def _finish_locked(self, ticket: AdmissionTicket, frames_done: int | None):
+        if ticket.finished or ticket not in self._running:
+            return
+        ticket.finished = True
+        self._running.remove(ticket)
+        elapsed = time.monotonic() - ticket.admitted_at
+        frames = ticket.cost.num_frames if frames_done is None else frames_done
+        if frames and elapsed > 0:
+            # Média móvel da vazão, usada nas estimativas de espera.
+            self.fps = 0.7 * self.fps + 0.3 * (frames / elapsed)
+
+    def _finish(self, ticket: AdmissionTicket, frames_done: int | None):
+        with self._condition:
+            self._finish_locked(ticket, frames_done)
+            self._admit_waiting()
+
+    def _release(self, ticket: AdmissionTicket, frames_done: int | None):
+        with self._condition:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._finish_locked(ticket, frames_done)
+            if ticket in self._reserved:
+                self._reserved.remove(ticket)
+            self._admit_waiting()
+
+
+_default_governor = None
+_default_governor_lock = threading.Lock()
+
+
+def get_default_governor() -> ResourceGovernor:
+    """Governor compartilhado pelas análises do processo, criado com os valores de config."""
+    global _default_governor
+    with _default_governor_lock:
+        if _default_governor is None:
+            _default_governor = ResourceGovernor()
+        return _default_governor
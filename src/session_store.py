@@ -0,0 +1,324 @@
+# src/session_store.py
+
+import json
+import os
+import struct
+import warnings
+import zipfile
+from datetime import datetime
+
+import numpy as np
+
+from src.config import POSE_LANDMARK_NAMES
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Versão do formato de sessão em disco. Deve ser incrementada sempre que a
+# estrutura dos arrays salvos mudar de forma incompatível.
+SESSION_FORMAT_VERSION = 1
+
+# Campos de cada landmark armazenados no array colunar (N, 33, 4).
+LANDMARK_FIELDS = ("x", "y", "z", "visibility")
+
+# Tamanho fixo do cabeçalho local de um arquivo dentro de um ZIP.
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def landmarks_list_to_array(landmarks_list: list | None) -> np.ndarray:
+    """
+    Converte a lista de dicionários de landmarks (get_landmarks_as_list) em um
+    array (33, 4) float32. Frames sem pose detectada viram um array de NaN.
+    """
+    array = np.full(
+        (len(POSE_LANDMARK_NAMES), len(LANDMARK_FIELDS)), np.nan, dtype=np.float32
+    )
+    if not landmarks_list:
+        return array
+    for i, lm in enumerate(landmarks_list[: len(POSE_LANDMARK_NAMES)]):
+        array[i] = (lm["x"], lm["y"], lm["z"], lm["visibility"])
+    return array
+
+
+def array_to_landmarks_list(array: np.ndarray, names: list | None = None) -> list | None:
+    """
+    Operação inversa de landmarks_list_to_array: reconstrói a lista de
+    dicionários usada pelo MotionComparator e pelo PoseEstimator.
+    Retorna None se o frame não tiver pose (todos os valores NaN).
+    """
+    names = names or POSE_LANDMARK_NAMES
+    if np.isnan(array).all():
+        return None
+    return [
+        {
+            "x": float(row[0]),
+            "y": float(row[1]),
+            "z": float(row[2]),
+            "visibility": float(row[3]),
+            "name": names[i],
+        }
+        for i, row in enumerate(array)
+    ]
+
+
+class AnalysisSession:
+    """
+    Resultado completo de uma análise aluno x mestre em formato colunar.
+    Os arrays podem ser arrays NumPy comuns ou np.memmap (quando carregados do disco).
+    """
+
+    def __init__(
+        self,
+        aluno_landmarks: np.ndarray,
+        mestre_landmarks: np.ndarray,
+        scores: np.ndarray,
+        angle_diffs: np.ndarray,
+        angle_names: list,
+        feedbacks: np.ndarray | None = None,
+        video_aluno: str | None = None,
+        video_mestre: str | None = None,
+        fps: float | None = None,
+        metadata: dict | None = None,
+    ):
+        self.aluno_landmarks = aluno_landmarks
+        self.mestre_landmarks = mestre_landmarks
+        self.scores = scores
+        self.angle_diffs = angle_diffs
+        self.angle_names = list(angle_names)
+        if feedbacks is None:
+            feedbacks = np.array([""] * len(scores), dtype=np.str_)
+        self.feedbacks = feedbacks
+        self.video_aluno = video_aluno
+        self.video_mestre = video_mestre
+        self.fps = fps
+        self.metadata = metadata or {}
+        self.landmark_names = list(POSE_LANDMARK_NAMES)
+
+    @property
+    def num_frames(self) -> int:
+        return int(len(self.scores))
+
+    @classmethod
+    def from_comparison(
+        cls,
+        aluno_landmarks_list: list,
+        mestre_landmarks_list: list,
+        comparison_results: list,
+        angle_names: list,
+        **kwargs,
+    ) -> "AnalysisSession":
+        """
+        Cria uma sessão a partir das listas produzidas pelo VideoAnalyzer
+        (landmarks como dicionários e os dicts de comparison_results).
+        """
+        num_frames = len(comparison_results)
+        shape = (num_frames, len(POSE_LANDMARK_NAMES), len(LANDMARK_FIELDS))
+        aluno = np.empty(shape, dtype=np.float32)
+        mestre = np.empty(shape, dtype=np.float32)
+        for i in range(num_frames):
+            aluno[i] = landmarks_list_to_array(aluno_landmarks_list[i])
+            mestre[i] = landmarks_list_to_array(mestre_landmarks_list[i])
+
+        scores = np.array([r["score"] for r in comparison_results], dtype=np.float32)
+        # Ângulos ausentes em um frame (ex: pose não detectada) ficam como NaN.
+        angle_diffs = np.full((num_frames, len(angle_names)), np.nan, dtype=np.float32)
+        for i, result in enumerate(comparison_results):
+            for j, angle_name in enumerate(angle_names):
+                if angle_name in result["diffs"]:
+                    angle_diffs[i, j] = result["diffs"][angle_name]
+        feedbacks = np.array([r["feedback"] for r in comparison_results], dtype=np.str_)
+
+        return cls(aluno, mestre, scores, angle_diffs, angle_names, feedbacks, **kwargs)
+
+    @classmethod
+    def from_analyzer(cls, analyzer) -> "AnalysisSession":
+        """Cria uma sessão a partir do estado de um VideoAnalyzer após a análise."""
+        return cls.from_comparison(
+            analyzer.aluno_landmarks_list,
+            analyzer.mestre_landmarks_list,
+            analyzer.comparison_results,
+            list(analyzer.motion_comparator.KEY_ANGLES.keys()),
+            video_aluno=analyzer.video_aluno_path,
+            video_mestre=analyzer.video_mestre_path,
+            # Frame de cada vídeo correspondente ao frame 0 da sessão (análise de trechos).
+            metadata={"start_frames": dict(analyzer.segment_start_frames)},
+        )
+
+    def frame_result(self, index: int) -> dict:
+        """Retorna o resultado de um frame no mesmo formato de comparison_results."""
+        diffs = {
+            name: float(value)
+            for name, value in zip(self.angle_names, self.angle_diffs[index])
+            if not np.isnan(value)
+        }
+        return {
+            "score": float(self.scores[index]),
+            "feedback": str(self.feedbacks[index]),
+            "diffs": diffs,
+        }
+
+    def landmarks_as_list(self, index: int, is_aluno: bool = True) -> list | None:
+        """Retorna os landmarks de um frame no formato de get_landmarks_as_list."""
+        source = self.aluno_landmarks if is_aluno else self.mestre_landmarks
+        return array_to_landmarks_list(np.asarray(source[index]), self.landmark_names)
+
+    def summary(self) -> dict:
+        """Calcula as estatísticas da sessão diretamente sobre os arrays colunares."""
+        if self.num_frames == 0:
+            return {
+                "num_frames": 0,
+                "avg_score": 0.0,
+                "max_score": 0.0,
+                "min_score": 0.0,
+                "angle_means": {},
+            }
+        scores = np.asarray(self.scores)
+        diffs = np.asarray(self.angle_diffs)
+        # Colunas inteiramente NaN (ângulo nunca calculado) resultam em NaN; o
+        # nanmean avisa "Mean of empty slice" via warnings, não via errstate.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            angle_means = np.nanmean(diffs, axis=0) if diffs.size else []
+        return {
+            "num_frames": self.num_frames,
+            "avg_score": float(np.mean(scores)),
+            "max_score": float(np.max(scores)),
+            "min_score": float(np.min(scores)),
+            "angle_means": {
+                name: float(value) for name, value in zip(self.angle_names, angle_means)
+            },
+        }
+
+
+def save_session(session: AnalysisSession, path: str) -> str:
+    """
+    Salva a sessão em um arquivo .npz NÃO comprimido.
+    Sem compressão, cada array fica contíguo dentro do ZIP e pode ser lido
+    via memory-map por load_session, sem carregar o arquivo inteiro.
+    """
+    if not path.endswith(".npz"):
+        path += ".npz"
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    meta = {
+        "format_version": SESSION_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "num_frames": session.num_frames,
+        "angle_names": session.angle_names,
+        "landmark_names": session.landmark_names,
+        "landmark_fields": list(LANDMARK_FIELDS),
+        "video_aluno": session.video_aluno,
+        "video_mestre": session.video_mestre,
+        "fps": session.fps,
+        "metadata": session.metadata,
+    }
+    meta_bytes = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+
+    np.savez(
+        path,
+        meta=meta_bytes,
+        aluno_landmarks=np.ascontiguousarray(session.aluno_landmarks, dtype=np.float32),
+        mestre_landmarks=np.ascontiguousarray(session.mestre_landmarks, dtype=np.float32),
+        scores=np.ascontiguousarray(session.scores, dtype=np.float32),
+        angle_diffs=np.ascontiguousarray(session.angle_diffs, dtype=np.float32),
+        feedbacks=np.asarray(session.feedbacks, dtype=np.str_),
+    )
+    logger.info(f"Sessão com {session.num_frames} frames salva em: {path}")
+    return path
+
+
+def _memmap_npz_member(path: str, archive: zipfile.ZipFile, member: str) -> np.ndarray:
+    """Mapeia em memória um array .npy armazenado sem compressão dentro do .npz."""
+    info = archive.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"O membro '{member}' está comprimido e não pode ser mapeado.")
+
+    with open(path, "rb") as f:
+        # O cabeçalho local pode ter um campo 'extra' diferente do diretório central,
+        # por isso o deslocamento real dos dados é lido do próprio cabeçalho local.
+        f.seek(info.header_offset)
+        local_header = f.read(_ZIP_LOCAL_HEADER_SIZE)
+        name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        shape=shape,
+        order="F" if fortran_order else "C",
+        offset=data_offset,
+    )
+
+
+def load_session(path: str, mmap: bool = True) -> AnalysisSession:
+    """
+    Carrega uma sessão salva por save_session.
+    Com mmap=True os arrays grandes são np.memmap: abrir a sessão é instantâneo
+    e apenas os frames efetivamente acessados são lidos do disco.
+    """
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("meta.npy") as f:
+            meta = json.loads(np.lib.format.read_array(f).tobytes().decode("utf-8"))
+        version = meta.get("format_version")
+        if version != SESSION_FORMAT_VERSION:
+            raise ValueError(
+                f"Versão de sessão não suportada: {version} (esperada {SESSION_FORMAT_VERSION})."
+            )
+
+        arrays = {}
+        for name in ("aluno_landmarks", "mestre_landmarks", "scores", "angle_diffs", "feedbacks"):
+            member = f"{name}.npy"
+            if mmap:
+                arrays[name] = _memmap_npz_member(path, archive, member)
+            else:
+                with archive.open(member) as f:
+                    arrays[name] = np.lib.format.read_array(f)
+
+    session = AnalysisSession(
+        arrays["aluno_landmarks"],
+        arrays["mestre_landmarks"],
+        arrays["scores"],
+        arrays["angle_diffs"],
+        meta["angle_names"],
+        arrays["feedbacks"],
+        video_aluno=meta.get("video_aluno"),
+        video_mestre=meta.get("video_mestre"),
+        fps=meta.get("fps"),
+        metadata=meta.get("metadata"),
+    )
+    session.landmark_names = meta.get("landmark_names", session.landmark_names)
+    logger.info(f"Sessão com {session.num_frames} frames carregada de: {path}")
+    return session
+
+
+def compare_sessions(session_a: AnalysisSession, session_b: AnalysisSession) -> dict:
+    """
+    Compara duas sessões salvas sem reprocessar vídeo algum: apenas as
+    estatísticas agregadas dos arrays são usadas. Valores positivos em
+    'angle_delta' indicam que a sessão B tem diferença média MENOR (melhorou).
+    """
+    summary_a = session_a.summary()
+    summary_b = session_b.summary()
+    angle_delta = {
+        name: summary_a["angle_means"][name] - summary_b["angle_means"][name]
+        for name in summary_a["angle_means"]
+        if name in summary_b["angle_means"]
+    }
+    return {
+        "score_delta": summary_b["avg_score"] - summary_a["avg_score"],
+        "angle_delta": angle_delta,
+        "summary_a": summary_a,
+        "summary_b": summary_b,
+    }
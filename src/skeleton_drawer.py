@@ -0,0 +1,200 @@
+# src/skeleton_drawer.py
+
+# MOTOR DE DESENHO VETORIZADO DO ESQUELETO
+# As conexões, os grupos de cor e as tabelas de ângulos são pré-calculados uma
+# única vez como arrays de índices. Em cada frame, as coordenadas de todos os
+# landmarks são convertidas para pixels de uma só vez e cada grupo de cor é
+# desenhado com uma única chamada a cv2.polylines.
+
+import cv2
+import numpy as np
+from src.config import POSE_CONNECTIONS, POSE_LANDMARK_NAMES
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Mesmo limiar de visibilidade usado pelo drawing_utils do MediaPipe.
+VISIBILITY_THRESHOLD = 0.5
+
+# Cores (BGR), iguais aos estilos definidos no PoseEstimator.
+COLOR_DEFAULT = (255, 255, 255)
+COLOR_LEFT = (0, 165, 255)  # Laranja
+COLOR_RIGHT = (255, 100, 0)  # Azul
+COLOR_CORRECT = (0, 255, 0)
+COLOR_INCORRECT = (0, 0, 255)
+
+_LANDMARK_INDEX = {name: i for i, name in enumerate(POSE_LANDMARK_NAMES)}
+
+
+def landmarks_to_array(pose_landmarks) -> np.ndarray | None:
+    """
+    Converte landmarks para um array (33, 4) com x, y, z e visibility.
+    Aceita um NormalizedLandmarkList do MediaPipe, uma lista de dicionários
+    (get_landmarks_as_list) ou um array já convertido.
+    """
+    if pose_landmarks is None:
+        return None
+    if isinstance(pose_landmarks, np.ndarray):
+        return pose_landmarks
+    if isinstance(pose_landmarks, list):
+        if not pose_landmarks:
+            return None
+        return np.array(
+            [(lm["x"], lm["y"], lm["z"], lm["visibility"]) for lm in pose_landmarks],
+            dtype=np.float32,
+        )
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+        dtype=np.float32,
+    )
+
+
+class SkeletonDrawer:
+    """
+    Desenha o esqueleto por lado e o esqueleto de feedback usando tabelas pré-calculadas.
+    """
+
+    def __init__(
+        self,
+        key_angles: dict | None = None,
+        thickness: int = 2,
+        feedback_thickness: int = 3,
+        point_radius: int = 3,
+        feedback_point_radius: int = 4,
+    ):
+        self.thickness = thickness
+        self.feedback_thickness = feedback_thickness
+        self.point_radius = point_radius
+        self.feedback_point_radius = feedback_point_radius
+
+        # Separa as conexões do MediaPipe em grupos de cor (esquerda, direita e centro).
+        groups = {COLOR_LEFT: [], COLOR_RIGHT: [], COLOR_DEFAULT: []}
+        for a, b in POSE_CONNECTIONS:
+            name_a, name_b = POSE_LANDMARK_NAMES[a], POSE_LANDMARK_NAMES[b]
+            if "LEFT" in name_a and "LEFT" in name_b:
+                groups[COLOR_LEFT].append((a, b))
+            elif "RIGHT" in name_a and "RIGHT" in name_b:
+                groups[COLOR_RIGHT].append((a, b))
+            else:
+                groups[COLOR_DEFAULT].append((a, b))
+        # Cada grupo vira um array (k, 2) de índices de landmarks.
+        self.side_groups = [
+            (color, np.array(pairs, dtype=np.intp)) for color, pairs in groups.items()
+        ]
+        self.connected_points = np.unique(
+            np.concatenate([pairs.ravel() for _, pairs in self.side_groups])
+        )
+
+        self.angle_names = []
+        self.feedback_connections = np.empty((0, 2), dtype=np.intp)
+        self.angle_membership = np.empty((0, 0), dtype=bool)
+        if key_angles:
+            self.set_key_angles(key_angles)
+        logger.info("SkeletonDrawer inicializado com tabelas de conexões pré-calculadas.")
+
+    def set_key_angles(self, key_angles: dict):
+        """
+        Pré-calcula, para os ângulos de feedback, as conexões únicas ("pernas" dos
+        ângulos) e uma matriz booleana conexão x ângulo indicando a qual ângulo
+        cada conexão pertence.
+        """
+        self.angle_names = list(key_angles.keys())
+        connections = []
+        membership = []
+        for j, angle_name in enumerate(self.angle_names):
+            p1, p2, p3 = (_LANDMARK_INDEX[name] for name in key_angles[angle_name])
+            for connection in (tuple(sorted((p1, p2))), tuple(sorted((p2, p3)))):
+                if connection not in connections:
+                    connections.append(connection)
+                    membership.append([False] * len(self.angle_names))
+                membership[connections.index(connection)][j] = True
+        self.feedback_connections = np.array(connections, dtype=np.intp).reshape(-1, 2)
+        self.angle_membership = np.array(membership, dtype=bool).reshape(
+            len(connections), len(self.angle_names)
+        )
+
+    @staticmethod
+    def _to_pixels(landmarks: np.ndarray, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Converte todos os landmarks para pixels e calcula a máscara de visibilidade."""
+        height, width = image.shape[:2]
+        xy = landmarks[:, :2]
+        visible = (
+            (landmarks[:, 3] >= VISIBILITY_THRESHOLD)
+            & (xy[:, 0] >= 0)
+            & (xy[:, 0] <= 1)
+            & (xy[:, 1] >= 0)
+            & (xy[:, 1] <= 1)
+        )
+        pixels = np.empty((len(landmarks), 2), dtype=np.int32)
+        pixels[:, 0] = np.minimum(np.floor(xy[:, 0] * width), width - 1)
+        pixels[:, 1] = np.minimum(np.floor(xy[:, 1] * height), height - 1)
+        return pixels, visible
+
+    @staticmethod
+    def _draw_segments(image, pixels, visible, pairs, color, thickness):
+        """Desenha, em uma única chamada, todos os segmentos visíveis de um grupo."""
+        if len(pairs) == 0:
+            return
+        pairs = pairs[visible[pairs[:, 0]] & visible[pairs[:, 1]]]
+        if len(pairs) == 0:
+            return
+        segments = pixels[pairs]  # (k, 2, 2)
+        cv2.polylines(image, list(segments), False, color, thickness)
+
+    @staticmethod
+    def _draw_points(image, pixels, indices, color, radius):
+        for x, y in pixels[indices]:
+            cv2.circle(image, (int(x), int(y)), radius, color, -1)
+
+    def draw_by_side(self, image: np.ndarray, pose_landmarks, in_place: bool = False) -> np.ndarray:
+        """
+        Desenha o esqueleto com o lado esquerdo em laranja, o direito em azul e o
+        tronco em branco. Com in_place=True o frame recebido é modificado, sem cópia.
+        """
+        annotated = image if in_place else image.copy()
+        landmarks = landmarks_to_array(pose_landmarks)
+        if landmarks is None:
+            return annotated
+        pixels, visible = self._to_pixels(landmarks, annotated)
+        for color, pairs in self.side_groups:
+            self._draw_segments(annotated, pixels, visible, pairs, color, self.thickness)
+        points = self.connected_points[visible[self.connected_points]]
+        self._draw_points(annotated, pixels, points, COLOR_DEFAULT, self.point_radius)
+        return annotated
+
+    def draw_feedback(
+        self,
+        image: np.ndarray,
+        pose_landmarks,
+        angle_diffs: dict,
+        threshold: float = 15.0,
+        in_place: bool = False,
+    ) -> np.ndarray:
+        """
+        Desenha as "pernas" de cada ângulo em verde (acerto) ou vermelho (erro).
+        Uma conexão compartilhada por um ângulo correto e um incorreto fica vermelha.
+        """
+        annotated = image if in_place else image.copy()
+        landmarks = landmarks_to_array(pose_landmarks)
+        if landmarks is None or not angle_diffs or not self.angle_names:
+            return annotated
+
+        diffs = np.array(
+            [angle_diffs.get(name, np.nan) for name in self.angle_names], dtype=np.float32
+        )
+        present = ~np.isnan(diffs)
+        incorrect = present & (diffs > threshold)
+        drawn = self.angle_membership[:, present].any(axis=1)
+        red = self.angle_membership[:, incorrect].any(axis=1)
+
+        pixels, visible = self._to_pixels(landmarks, annotated)
+        for color, mask in ((COLOR_CORRECT, drawn & ~red), (COLOR_INCORRECT, red)):
+            pairs = self.feedback_connections[mask]
+            pairs = pairs[visible[pairs[:, 0]] & visible[pairs[:, 1]]]
+            if len(pairs) == 0:
+                continue
+            cv2.polylines(annotated, list(pixels[pairs]), False, color, self.feedback_thickness)
+            self._draw_points(
+                annotated, pixels, np.unique(pairs), color, self.feedback_point_radius
+            )
+        return annotated
@@ -0,0 +1,304 @@
+# src/technique_index.py
+
+# ÍNDICE DE TÉCNICAS POR SEMELHANÇA DE POSE
+# Responde "com qual técnica da biblioteca este vídeo do aluno mais se parece?"
+# sem rodar o VideoAnalyzer contra cada vídeo. Cada vídeo da biblioteca
+# (assets/videos_tecnicas/<faixa>/*.mp4) vira um descritor de tamanho fixo:
+#   - as sequências dos ângulos chave (KEY_ANGLE_DEFINITIONS), frame a frame;
+#   - reamostradas para DESCRIPTOR_STEPS instantes, o que torna o descritor
+#     independente da duração e do fps do vídeo;
+#   - normalizadas para 0..1 (ângulo / 180).
+# Os descritores são calculados offline (python -m src.technique_index) e
+# guardados em um .npz. Na consulta, há uma BallTree (scikit-learn) por faixa;
+# a busca percorre só as faixas acessíveis ao usuário (get_accessible_ranks)
+# e junta os k mais próximos de cada uma.
+
+import argparse
+import os
+import threading
+import cv2
+import numpy as np
+from sklearn.neighbors import BallTree
+from src.analysis_cache import file_content_hash
+from src.config import (
+    KEY_ANGLE_DEFINITIONS,
+    POSE_LANDMARK_NAMES,
+    TECHNIQUE_INDEX_PATH,
+    TECHNIQUE_INDEX_SAMPLE_FPS,
+    TECHNIQUE_VIDEOS_DIR,
+)
+from src.session_store import landmarks_list_to_array
+from src.utils import angle_sequences, get_logger, setup_logging, shutdown_logging
+
+logger = get_logger(__name__)
+
+# Versão do formato do arquivo; incrementar exige gerar o índice de novo.
+INDEX_FORMAT_VERSION = 1
+# Instantes da reamostragem temporal de cada ângulo.
+DESCRIPTOR_STEPS = 16
+DESCRIPTOR_SIZE = DESCRIPTOR_STEPS * len(KEY_ANGLE_DEFINITIONS)
+# Valor de um ângulo nunca visível no vídeo (90 graus, o meio da escala).
+MISSING_ANGLE_VALUE = 0.5
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi")
+
+
+def pose_descriptor(landmarks: np.ndarray, steps: int = DESCRIPTOR_STEPS) -> np.ndarray | None:
+    """
+    Descritor de tamanho fixo (steps x ângulos) de uma sequência de poses (N, 33, 4).
+    Retorna None se houver menos de dois frames com pose.
+    """
+    angles = angle_sequences(landmarks)
+    # Frames sem nenhum ângulo (sem pose no início/fim do vídeo) são descartados.
+    angles = angles[~np.isnan(angles).all(axis=1)]
+    if len(angles) < 2:
+        return None
+    frames = np.arange(len(angles))
+    grid = np.linspace(0, len(angles) - 1, steps)
+    descriptor = np.full((steps, angles.shape[1]), MISSING_ANGLE_VALUE, dtype=np.float32)
+    for j in range(angles.shape[1]):
+        visible = ~np.isnan(angles[:, j])
+        if visible.any():
+            descriptor[:, j] = np.interp(grid, frames[visible], angles[visible, j]) / 180.0
+    return descriptor.ravel()
+
+
+def extract_video_landmarks(
+    path: str, pose_estimator, sample_fps: float = TECHNIQUE_INDEX_SAMPLE_FPS
+) -> np.ndarray:
+    """Landmarks (N, 33, 4) do vídeo, amostrado a 'sample_fps' quadros por segundo."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Não foi possível abrir o vídeo: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, round(fps / sample_fps))
+    frames = []
+    index = 0
+    try:
+        while True:
+            if index % step:
+                # grab() avança sem decodificar a imagem dos frames descartados.
+                if not cap.grab():
+                    break
+            else:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                results = pose_estimator.estimate_pose(frame)
+                frames.append(
+                    landmarks_list_to_array(pose_estimator.get_landmarks_as_list(results.pose_landmarks))
+                )
+            index += 1
+    finally:
+        cap.release()
+    if not frames:
+        return np.empty((0, len(POSE_LANDMARK_NAMES), 4), dtype=np.float32)
+    return np.stack(frames)
+
+
+def _display_name(video_path: str) -> str:
+    """Nome da técnica como exibido na tela de vídeos."""
+    return os.path.splitext(os.path.basename(video_path))[0].replace("_", " ").title()
+
+
+class TechniqueIndex:
+    """Descritores de pose dos vídeos da biblioteca, com busca dos k mais próximos por faixa."""
+
+    def __init__(self, descriptors: np.ndarray, ranks: list, videos: list, hashes: list | None = None):
+        self.descriptors = np.asarray(descriptors, dtype=np.float32).reshape(len(videos), DESCRIPTOR_SIZE)
+        self.ranks = list(ranks)
+        self.videos = list(videos)
+        self.hashes = list(hashes) if hashes is not None else [""] * len(self.videos)
+        if not (len(self.ranks) == len(self.videos) == len(self.hashes)):
+            raise ValueError("Descritores, faixas, vídeos e hashes devem ter o mesmo tamanho.")
+        # Uma árvore por faixa: o filtro por graduação não precisa descartar resultados.
+        self._trees = {}
+        for rank in dict.fromkeys(self.ranks):
+            rows = np.array([i for i, r in enumerate(self.ranks) if r == rank])
+            self._trees[rank] = (BallTree(self.descriptors[rows]), rows)
+
+    def __len__(self):
+        return len(self.videos)
+
+    @classmethod
+    def build(
+        cls,
+        videos_dir: str = TECHNIQUE_VIDEOS_DIR,
+        extractor=None,
+        previous: "TechniqueIndex | None" = None,
+    ) -> "TechniqueIndex":
+        """
+        Gera o índice a partir de <videos_dir>/<faixa>/<vídeo>.
+
+        Args:
+            extractor: Função caminho -> landmarks (N, 33, 4). Padrão: um
+                PoseEstimator com amostragem a TECHNIQUE_INDEX_SAMPLE_FPS.
+            previous (TechniqueIndex): Índice anterior; vídeos com o mesmo
+                conteúdo reaproveitam o descritor já calculado.
+        """
+        reusable = {}
+        if previous is not None:
+            reusable = {h: previous.descriptors[i] for i, h in enumerate(previous.hashes) if h}
+        pose_estimator = None
+        if extractor is None:
+            pose_estimator = _default_pose_estimator()
+            extractor = lambda path: extract_video_landmarks(path, pose_estimator)
+
+        try:
+            descriptors, ranks, videos, hashes = [], [], [], []
+            for rank in sorted(os.listdir(videos_dir)):
+                rank_path = os.path.join(videos_dir, rank)
+                if not os.path.isdir(rank_path):
+                    continue
+                for video_file in sorted(os.listdir(rank_path)):
+                    if not video_file.lower().endswith(VIDEO_EXTENSIONS):
+                        continue
+                    video_path = os.path.join(rank_path, video_file).replace("\\", "/")
+                    content_hash = file_content_hash(video_path)
+                    descriptor = reusable.get(content_hash)
+                    if descriptor is None:
+                        try:
+                            descriptor = pose_descriptor(extractor(video_path))
+                        except ValueError as e:
+                            logger.warning(f"Vídeo ignorado no índice de técnicas ({video_path}): {e}")
+                            continue
+                        if descriptor is None:
+                            logger.warning(f"Nenhuma pose detectada em {video_path}; vídeo fora do índice.")
+                            continue
+                    descriptors.append(descriptor)
+                    ranks.append(rank)
+                    videos.append(video_path)
+                    hashes.append(content_hash)
+        finally:
+            if pose_estimator is not None:
+                pose_estimator.close()
+
+        logger.info(f"Índice de técnicas gerado com {len(videos)} vídeos.")
+        return cls(np.array(descriptors, dtype=np.float32), ranks, videos, hashes)
+
+    def save(self, path: str = TECHNIQUE_INDEX_PATH) -> str:
+        """Grava o índice em .npz (de forma atômica) e retorna o caminho."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.int32(INDEX_FORMAT_VERSION),
+                steps=np.int32(DESCRIPTOR_STEPS),
+                angle_names=np.array(list(KEY_ANGLE_DEFINITIONS), dtype=np.str_),
+                descriptors=self.descriptors,
+                ranks=np.array(self.ranks, dtype=np.str_),
+                videos=np.array(self.videos, dtype=np.str_),
+                hashes=np.array(self.hashes, dtype=np.str_),
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = TECHNIQUE_INDEX_PATH) -> "TechniqueIndex":
+        """Carrega um índice gravado por save(). ValueError se ele for de outra versão."""
+        with np.load(path, allow_pickle=False) as data:
+            if (
+                int(data["format_version"]) != INDEX_FORMAT_VERSION
+                or int(data["steps"]) != DESCRIPTOR_STEPS
+                or list(data["angle_names"]) != list(KEY_ANGLE_DEFINITIONS)
+            ):
+                raise ValueError(f"Índice de técnicas desatualizado, gere-o novamente: {path}")
+            return cls(
+                data["descriptors"],
+                [str(r) for r in data["ranks"]],
+                [str(v) for v in data["videos"]],
+                [str(h) for h in data["hashes"]],
+            )
+
+    def query(self, descriptor: np.ndarray, k: int = 5, ranks: list | None = None) -> list:
+        """
+        Retorna as k técnicas mais parecidas com o descritor, da mais próxima
+        para a mais distante, considerando só as faixas em 'ranks' (None = todas).
+        Cada resultado é um dict com 'rank', 'video', 'name' e 'distance'.
+        """
+        descriptor = np.asarray(descriptor, dtype=np.float32).reshape(-1)
+        if descriptor.shape[0] != DESCRIPTOR_SIZE:
+            raise ValueError(
+                f"Descritor com {descriptor.shape[0]} valores; o índice usa {DESCRIPTOR_SIZE}."
+            )
+        if k < 1:
+            raise ValueError(f"k deve ser positivo: {k}")
+        candidates = []
+        for rank in self._trees if ranks is None else ranks:
+            entry = self._trees.get(rank)
+            if entry is None:
+                continue
+            tree, rows = entry
+            distances, indices = tree.query(descriptor[None, :], k=min(k, len(rows)))
+            candidates.extend(zip(distances[0], rows[indices[0]]))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [
+            {
+                "rank": self.ranks[row],
+                "video": self.videos[row],
+                "name": _display_name(self.videos[row]),
+                "distance": float(distance),
+            }
+            for distance, row in candidates[:k]
+        ]
+
+    def query_landmarks(self, landmarks: np.ndarray, k: int = 5, ranks: list | None = None) -> list:
+        """Busca a partir de uma sequência de poses (N, 33, 4); lista vazia se não houver pose."""
+        descriptor = pose_descriptor(landmarks)
+        if descriptor is None:
+            return []
+        return self.query(descriptor, k=k, ranks=ranks)
+
+    def query_session(self, session, k: int = 5, ranks: list | None = None) -> list:
+        """Busca as técnicas mais parecidas com o movimento do aluno de uma AnalysisSession."""
+        return self.query_landmarks(np.asarray(session.aluno_landmarks), k=k, ranks=ranks)
+
+
+def _default_pose_estimator():
+    # Importado só na geração do índice: a consulta não precisa do MediaPipe.
+    from src.pose_estimator import PoseEstimator
+
+    return PoseEstimator()
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_technique_index() -> TechniqueIndex | None:
+    """Índice gravado em TECHNIQUE_INDEX_PATH, carregado uma vez (None se ainda não foi gerado)."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            if not os.path.exists(TECHNIQUE_INDEX_PATH):
+                logger.warning(f"Índice de técnicas não encontrado em {TECHNIQUE_INDEX_PATH}.")
+                return None
+            _default_index = TechniqueIndex.load(TECHNIQUE_INDEX_PATH)
+        return _default_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o índice de técnicas da biblioteca de vídeos.")
+    parser.add_argument("--videos-dir", default=TECHNIQUE_VIDEOS_DIR)
+    parser.add_argument("--output", default=TECHNIQUE_INDEX_PATH)
+    parser.add_argument("--full", action="store_true", help="Recalcula todos os vídeos.")
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        previous = None
+        if not args.full and os.path.exists(args.output):
+            try:
+                previous = TechniqueIndex.load(args.output)
+            except ValueError as e:
+                logger.warning(str(e))
+        index = TechniqueIndex.build(args.videos_dir, previous=previous)
+        path = index.save(args.output)
+    finally:
+        # Esvazia a fila do QueueListener antes de sair.
+        shutdown_logging()
+    print(f"Índice com {len(index)} vídeos gravado em {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# src/user_directory.py
+
+# DIRETÓRIO DE USUÁRIOS COMPARTILHADO PELO PROCESSO
+# No modo web/servidor do Flet cada conexão cria seu próprio AppFBKMKLN; antes,
+# cada um baixava a planilha e mantinha um DataFrame próprio com todos os alunos.
+# Aqui a planilha é mantida uma única vez por processo, em um "snapshot"
+# imutável (DataFrame + índice por CPF) que todas as sessões leem sem trava.
+# Uma recarga monta um snapshot novo e troca a referência de uma só vez
+# (copy-on-write); só uma thread baixa a planilha por vez, e as que chegam
+# durante a recarga esperam e reaproveitam o resultado em vez de baixar de novo.
+
+import threading
+import time
+import pandas as pd
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class UserSnapshot:
+    """Cópia imutável da planilha de usuários, com índice por CPF."""
+
+    def __init__(self, frame: pd.DataFrame, loaded_at: float):
+        self.frame = frame
+        self.loaded_at = loaded_at
+        self._by_cpf = {}
+        if "CPF" in frame.columns:
+            for record in frame.to_dict("records"):
+                cpf = record.get("CPF")
+                # Como no filtro do DataFrame, vale a primeira linha de um CPF repetido.
+                if isinstance(cpf, str) and cpf not in self._by_cpf:
+                    self._by_cpf[cpf] = record
+
+    def find(self, cpf: str) -> dict | None:
+        """Retorna uma cópia da linha do usuário com esse CPF (ou None)."""
+        record = self._by_cpf.get(cpf)
+        return dict(record) if record is not None else None
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def __len__(self):
+        return len(self.frame)
+
+
+class UserDirectory:
+    """
+    Planilha de usuários compartilhada por todas as sessões do processo.
+
+    As leituras usam o snapshot atual, sem trava. 'refresh_interval' define
+    por quanto tempo um snapshot é considerado atual: refresh_if_stale() só
+    baixa a planilha de novo depois desse intervalo (0 = sempre recarrega).
+    """
+
+    def __init__(self, sheet_url: str, refresh_interval: float = 0.0):
+        self.sheet_url = sheet_url
+        self.refresh_interval = refresh_interval
+        self.fetch_count = 0
+        self._snapshot = UserSnapshot(pd.DataFrame(), loaded_at=0.0)
+        self._generation = 0  # número de recargas concluídas (com sucesso ou não)
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> UserSnapshot:
+        return self._snapshot
+
+    def refresh(self) -> UserSnapshot:
+        """
+        Baixa a planilha e troca o snapshot. Se outra thread terminou uma recarga
+        enquanto esta esperava pela trava, o resultado dela é reaproveitado.
+        """
+        generation = self._generation
+        with self._refresh_lock:
+            if self._generation != generation:
+                return self._snapshot
+            self.fetch_count += 1
+            try:
+                logger.info(f"Recarregando dados dos usuários de: {self.sheet_url}")
+                frame = pd.read_csv(self.sheet_url, dtype={"CPF": str})
+                self._snapshot = UserSnapshot(frame, loaded_at=time.monotonic())
+                logger.info(f"{len(frame)} usuários carregados com sucesso.")
+            except Exception as e:
+                # Mantém o snapshot anterior: uma falha momentânea da planilha não
+                # deve impedir o login de todas as sessões.
+                logger.error(
+                    f"Falha ao carregar ou processar a planilha de usuários: {e}",
+                    exc_info=True,
+                )
+            self._generation += 1
+            return self._snapshot
+
+    def refresh_if_stale(self) -> UserSnapshot:
+        """Recarrega apenas se não houver dados ou se o snapshot for mais velho que o intervalo."""
+        snapshot = self._snapshot
+        age = time.monotonic() - snapshot.loaded_at
+        if snapshot.empty or age >= self.refresh_interval:
+            return self.refresh()
+        return snapshot
+
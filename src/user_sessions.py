@@ -0,0 +1,144 @@
+# src/user_sessions.py
+
+# SESSÕES DE USUÁRIO NO SERVIDOR
+# Após o login, os dados do usuário ficam em memória no servidor, indexados por
+# um token opaco. O navegador guarda apenas o token (nunca a linha da planilha,
+# que inclui a senha), e a navegação entre telas consulta só a memória local,
+# sem ida e volta ao cliente. Opcionalmente as sessões são persistidas em SQLite
+# com data de expiração, sobrevivendo a reconexões e reinícios do servidor.
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Campos da planilha que nunca são mantidos na sessão.
+SENSITIVE_USER_FIELDS = ("Senha",)
+
+
+def _sanitize_user(user_data: dict) -> dict:
+    """Remove campos sensíveis e converte valores do pandas/numpy para tipos nativos."""
+    clean = {}
+    for key, value in user_data.items():
+        if key in SENSITIVE_USER_FIELDS:
+            continue
+        if hasattr(value, "item"):  # numpy.int64, numpy.float64...
+            value = value.item()
+        if isinstance(value, float) and value != value:  # NaN de células vazias
+            value = None
+        clean[key] = value
+    return clean
+
+
+class UserSessionStore:
+    """
+    Armazena sessões de usuário indexadas por tokens opacos.
+
+    A consulta (get) é feita em memória; o SQLite, se configurado, é usado
+    apenas na criação/remoção das sessões e para recuperar sessões que não
+    estão em memória (ex: após reiniciar o servidor).
+    """
+
+    def __init__(self, ttl_seconds: float = 12 * 3600, db_path: str | None = None):
+        """
+        Args:
+            ttl_seconds (float): Validade de uma sessão a partir do login.
+            db_path (str): Arquivo SQLite para persistir as sessões (None = só memória).
+        """
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._sessions = {}  # token -> (dados do usuário, expira_em)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS user_sessions ("
+                " token TEXT PRIMARY KEY, user_json TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            self.purge_expired()
+        logger.info(
+            f"UserSessionStore inicializado (validade={ttl_seconds:.0f}s, persistência={db_path or 'memória'})."
+        )
+
+    def create(self, user_data: dict) -> str:
+        """Cria uma sessão para o usuário e retorna o token opaco."""
+        token = secrets.token_urlsafe(32)
+        user = _sanitize_user(user_data)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._sessions[token] = (user, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO user_sessions (token, user_json, expires_at) VALUES (?, ?, ?)",
+                    (token, json.dumps(user, ensure_ascii=False), expires_at),
+                )
+                self._db.commit()
+        logger.info(f"Sessão criada para o usuário '{user.get('LOGIN')}'.")
+        return token
+
+    def get(self, token) -> dict | None:
+        """Retorna os dados do usuário da sessão, ou None se o token for inválido ou expirado."""
+        if not isinstance(token, str) or not token:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT user_json, expires_at FROM user_sessions WHERE token = ?", (token,)
+                ).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+                    self._sessions[token] = entry
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= now:
+                self._remove_locked(token)
+                return None
+            return user
+
+    def revoke(self, token):
+        """Encerra a sessão (logout)."""
+        if not isinstance(token, str):
+            return
+        with self._lock:
+            self._remove_locked(token)
+
+    def purge_expired(self) -> int:
+        """Remove as sessões expiradas da memória e do SQLite. Retorna quantas foram removidas."""
+        now = time.time()
+        with self._lock:
+            expired = [t for t, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for token in expired:
+                del self._sessions[token]
+            removed = len(expired)
+            if self._db is not None:
+                cursor = self._db.execute("DELETE FROM user_sessions WHERE expires_at <= ?", (now,))
+                self._db.commit()
+                removed = max(removed, cursor.rowcount)
+        return removed
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _remove_locked(self, token: str):
+        self._sessions.pop(token, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM user_sessions WHERE token = ?", (token,))
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,29 +1,185 @@
 # src/utils.py
 
+import atexit
 import logging
+import logging.handlers
+import math
 import os
+import queue
+import threading
+import numpy as np
+from src.config import KEY_ANGLE_DEFINITIONS, POSE_LANDMARK_NAMES
 
-def setup_logging():
+# Listener ativo do logging assíncrono (ver setup_logging).
+_log_listener = None
+
+
+def setup_logging(
+    level: str | int | None = None,
+    levels: dict | None = None,
+    log_dir: str | None = None,
+    log_file: str | None = None,
+    max_bytes: int | None = None,
+    backup_count: int | None = None,
+    console: bool = True,
+    stream=None,
+):
     """
     Configura o sistema de logging para a aplicação, definindo o formato,
     o nível de saída e os destinos (console e arquivo).
+
+    As threads da aplicação apenas enfileiram os registros (QueueHandler); a
+    escrita no arquivo e no console é feita por uma thread própria
+    (QueueListener), de forma que o loop de análise nunca espera por disco.
+    O arquivo é rotacionado por tamanho. Os parâmetros omitidos usam os
+    valores LOG_* de src/config.py. 'stream' redireciona a saída de console
+    (padrão: sys.stderr).
+
+    Returns:
+        logging.handlers.QueueListener: O listener em execução.
     """
-    log_dir = "logs"
-    log_file = os.path.join(log_dir, "app.log")
+    from src.config import (
+        LOG_BACKUP_COUNT,
+        LOG_DIR,
+        LOG_FILE,
+        LOG_LEVEL,
+        LOG_LEVELS,
+        LOG_MAX_BYTES,
+    )
+
+    global _log_listener
+    log_dir = log_dir or LOG_DIR
+    log_path = os.path.join(log_dir, log_file or LOG_FILE)
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Uma nova chamada substitui a configuração anterior.
+    shutdown_logging()
+
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handlers = [
+        logging.handlers.RotatingFileHandler(
+            log_path,
+            maxBytes=LOG_MAX_BYTES if max_bytes is None else max_bytes,
+            backupCount=LOG_BACKUP_COUNT if backup_count is None else backup_count,
+            encoding="utf-8",
+        )
+    ]
+    if console:
+        handlers.append(logging.StreamHandler(stream))
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL if level is None else level)
+    for name, subsystem_level in {**LOG_LEVELS, **(levels or {})}.items():
+        logging.getLogger(name).setLevel(subsystem_level)
 
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file, mode='w'),
-            logging.StreamHandler()
-        ]
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
     )
-    logging.info("Sistema de logging configurado para console (DEBUG) e arquivo.")
+    _log_listener.start()
+    logging.info("Sistema de logging assíncrono configurado (arquivo com rotação: %s).", log_path)
+    return _log_listener
+
+
+def shutdown_logging():
+    """Grava os registros pendentes e encerra a thread de escrita do logging."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    listener, _log_listener = _log_listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
+
 
 def get_logger(name: str):
     """Retorna uma instância de logger com o nome especificado."""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
+
+
+class LogSampler:
+    """
+    Registra apenas a primeira e, depois, uma a cada 'every' ocorrências de uma
+    mensagem repetitiva (ex: avisos emitidos a cada frame). A checagem de nível
+    vem antes de tudo, então mensagens desativadas não custam formatação.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 100):
+        self.logger = logger
+        self.every = max(int(every), 1)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, msg: str, *args):
+        """
+        Args:
+            key (str): Identifica a mensagem repetitiva (normalmente o ponto de chamada).
+            msg, args: Mensagem no estilo %-format, formatada apenas se registrada.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if (count - 1) % self.every:
+            return
+        if count > 1:
+            msg = f"{msg} (registrada 1 a cada {self.every} ocorrências; total: %d)"
+            args = (*args, count)
+        self.logger.log(level, msg, *args)
+
+    def warning(self, key: str, msg: str, *args):
+        self.log(logging.WARNING, key, msg, *args)
+
+    def debug(self, key: str, msg: str, *args):
+        self.log(logging.DEBUG, key, msg, *args)
+
+def calculate_angle(a: dict, b: dict, c: dict, min_visibility: float = 0.5) -> float:
+    """
+    Calcula o ângulo (em graus, de 0 a 180) formado no vértice 'b' pelos pontos a-b-c.
+    Os pontos são dicionários de landmarks com as chaves 'x', 'y' e 'visibility'.
+    Retorna 0.0 quando algum dos pontos tem baixa visibilidade, sinalizando ao
+    MotionComparator que o ângulo não é confiável.
+    """
+    if min(a["visibility"], b["visibility"], c["visibility"]) < min_visibility:
+        return 0.0
+    radians = math.atan2(c["y"] - b["y"], c["x"] - b["x"]) - math.atan2(
+        a["y"] - b["y"], a["x"] - b["x"]
+    )
+    angle = abs(math.degrees(radians))
+    if angle > 180.0:
+        angle = 360.0 - angle
+    return angle
+
+
+def angle_sequences(
+    landmarks: np.ndarray,
+    angle_definitions: dict = KEY_ANGLE_DEFINITIONS,
+    min_visibility: float = 0.5,
+) -> np.ndarray:
+    """
+    Versão vetorizada de calculate_angle para uma sequência de poses.
+    Recebe landmarks (N, 33, 4) e retorna os ângulos (N, A) em graus, com NaN
+    onde algum ponto do ângulo tem baixa visibilidade ou não há pose.
+    """
+    index = {name: i for i, name in enumerate(POSE_LANDMARK_NAMES)}
+    triples = np.array([[index[name] for name in points] for points in angle_definitions.values()])
+    points = np.asarray(landmarks, dtype=np.float32)[:, triples, :]  # (N, A, 3, 4)
+    a, b, c = points[:, :, 0], points[:, :, 1], points[:, :, 2]
+    radians = np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0]) - np.arctan2(
+        a[..., 1] - b[..., 1], a[..., 0] - b[..., 0]
+    )
+    angles = np.abs(np.degrees(radians))
+    angles = np.where(angles > 180.0, 360.0 - angles, angles)
+    # Comparações com NaN são falsas: frames sem pose ficam invisíveis.
+    visible = points[..., 3].min(axis=2) >= min_visibility
+    return np.where(visible, angles, np.nan).astype(np.float32)
@@ -5,9 +5,25 @@ import os
 import tempfile
 import threading
 import numpy as np
+from src.config import (
+    ANALYSIS_METRICS_PATH,
+    ANALYSIS_PROFILE_CPU,
+    ANALYSIS_PROFILE_DIR,
+    ANALYSIS_PROFILE_MEMORY,
+    POSE_LANDMARK_NAMES,
+)
 from src.utils import get_logger
+from src.analysis_cache import AnalysisCache, analysis_cache_key, file_content_hash
+from src.analysis_results import AnalysisResults, ResultsSnapshot
+from src.metrics import JobProfiler, PipelineMetrics
 from src.pose_estimator import PoseEstimator
 from src.motion_comparator import MotionComparator
+from src.session_store import AnalysisSession, landmarks_list_to_array, save_session
+from src.progress_bus import ProgressBus, ProgressEvent
+from src.repetitions import analyze_repetitions
+from src.resource_governor import JobCost, ResourceGovernor, get_default_governor
+from src.video_exporter import StreamingVideoExporter, VideoExportJob
+from src.video_seek import VideoSegment, open_segment
 
 logger = get_logger(__name__)
 
@@ -18,9 +34,25 @@ class VideoAnalyzer:
     e fornecer feedback.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        governor: ResourceGovernor | None = None,
+        cache: AnalysisCache | None = None,
+    ):
+        """
+        Args:
+            governor (ResourceGovernor): Controle de admissão das análises
+                (padrão: o governor compartilhado pelo processo).
+            cache (AnalysisCache): Cache de resultados por conteúdo dos vídeos. Com
+                ele, repetir a análise de um mesmo par de vídeos não refaz a
+                inferência (os frames não são guardados no cache).
+        """
         logger.info("Inicializando VideoAnalyzer...")
+        # Um estimador por vídeo: o rastreamento (região de interesse e rastreador
+        # interno do MediaPipe) guarda estado entre frames e não pode alternar entre
+        # o vídeo do aluno e o do mestre.
         self.pose_estimator = PoseEstimator()
+        self.mestre_pose_estimator = PoseEstimator()
         self.motion_comparator = MotionComparator()
 
         # Armazena os frames originais (sem anotação)
@@ -41,13 +73,45 @@ class VideoAnalyzer:
 
         self.comparison_results = []
 
+        # Buffer publicado para leitura concorrente (snapshot_results). Cada análise
+        # troca a referência por um buffer novo em vez de limpar o anterior.
+        self.results = AnalysisResults(0, list(self.motion_comparator.KEY_ANGLES.keys()))
+        self.results.finish()
+
         self.cap_aluno = None
         self.cap_mestre = None
         self.video_aluno_path = None
         self.video_mestre_path = None
+        # Arquivos temporários criados por load_video_from_bytes (removidos no __del__).
+        self._temp_video_paths = []
 
         self.is_processing = False
         self.processing_thread = None
+        self.exported_video_path = None
+        # Erro que interrompeu a última análise (None se ela terminou normalmente).
+        self.last_error = None
+
+        # Trechos analisados (em segundos) e o frame inicial efetivo de cada vídeo.
+        self.aluno_segment = VideoSegment()
+        self.mestre_segment = VideoSegment()
+        self.segment_start_frames = {"aluno": 0, "mestre": 0}
+        # Resumo da última análise de repetições (run_repetition_analysis).
+        self.repetition_results = None
+
+        # Métricas por etapa da última análise e arquivos de perfil, se capturados.
+        self.metrics = PipelineMetrics()
+        self.profile_outputs = {}
+
+        # Admissão das análises: fração da resolução original usada na última
+        # análise (menor que 1.0 quando o governor degradou o job).
+        self.governor = governor or get_default_governor()
+        self.frame_scale = 1.0
+        # Ticket da última análise; a memória reservada é devolvida em clear_frames().
+        self.admission = None
+
+        # Cache de resultados; cache_hit indica se a última análise veio dele.
+        self.cache = cache
+        self.cache_hit = False
         logger.info("Variáveis de estado do VideoAnalyzer configuradas.")
 
     def load_video_from_bytes(self, video_bytes: bytes, is_aluno: bool):
@@ -60,6 +124,7 @@ class VideoAnalyzer:
             temp_file.write(video_bytes)
             temp_file.close()
             video_path = temp_file.name
+            self._temp_video_paths.append(video_path)
 
             if is_aluno:
                 self.video_aluno_path = video_path
@@ -76,22 +141,395 @@ class VideoAnalyzer:
             logger.error(f"Erro ao carregar vídeo de bytes: {e}", exc_info=True)
             raise
 
-    def analyze_and_compare(self, post_analysis_callback, progress_callback=None):
-        # ... (código inalterado) ...
+    def load_video_from_path(self, video_path: str, is_aluno: bool):
+        """Abre um vídeo já gravado em disco (ex: enviado por um worker de análise)."""
+        if not os.path.exists(video_path):
+            raise ValueError(f"Vídeo não encontrado: {video_path}")
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Não foi possível abrir o vídeo: {video_path}")
+        if is_aluno:
+            self.video_aluno_path = video_path
+            self.cap_aluno = cap
+        else:
+            self.video_mestre_path = video_path
+            self.cap_mestre = cap
+        return video_path
+
+    def analyze_and_compare(
+        self,
+        post_analysis_callback,
+        progress_callback=None,
+        event_callback=None,
+        max_update_hz: float = 10.0,
+        export_path: str | None = None,
+        export_backend: str = "auto",
+        profile_cpu: bool | None = None,
+        profile_memory: bool | None = None,
+        metrics_path: str | None = None,
+        aluno_segment=None,
+        mestre_segment=None,
+        keep_frames: bool | None = None,
+    ):
+        """
+        Inicia a análise em uma thread separada.
+
+        Args:
+            post_analysis_callback: Chamada ao final da análise.
+            progress_callback: Recebe a fração concluída (0.0 a 1.0).
+            event_callback: Recebe objetos ProgressEvent (fps, ETA, pontuação atual).
+            max_update_hz: Frequência máxima de atualizações entregues à interface.
+            export_path: Se informado, o vídeo lado a lado anotado é gravado durante a
+                         análise, frame a frame (ver StreamingVideoExporter).
+            export_backend: "auto", "ffmpeg" ou "opencv".
+            profile_cpu: Captura um perfil cProfile do job (padrão: ANALYSIS_PROFILE_CPU).
+            profile_memory: Captura um resumo do tracemalloc (padrão: ANALYSIS_PROFILE_MEMORY).
+            metrics_path: Arquivo para as métricas do job, em JSON ou Prometheus (".prom").
+            aluno_segment, mestre_segment: Trecho (início, fim) em segundos a analisar em
+                         cada vídeo, ou None para o vídeo inteiro. Os vídeos são posicionados
+                         diretamente no início do trecho, sem decodificar o que vem antes.
+            keep_frames: Guarda os frames originais e anotados para revisão na interface.
+                         Com False, os frames vão apenas para o exportador e a memória
+                         fica limitada à fila dele; landmarks e pontuações continuam
+                         disponíveis. None (padrão): guarda só quando não há export_path.
+        """
         if self.is_processing:
             logger.info("Análise já em andamento.")
             return
 
+        # As atualizações de UI passam pelo barramento, que as agrupa e entrega
+        # fora da thread de análise; assim a latência da UI não atrasa o loop.
+        progress_bus = ProgressBus(max_rate_hz=max_update_hz)
+        if progress_callback:
+            progress_bus.subscribe(lambda event: progress_callback(event.progress))
+        if event_callback:
+            progress_bus.subscribe(event_callback)
+
+        # Valida os trechos e pede a admissão antes de iniciar a thread (erros,
+        # como um job grande demais para o orçamento de memória, chegam a quem chamou).
+        self.aluno_segment = VideoSegment.coerce(aluno_segment)
+        self.mestre_segment = VideoSegment.coerce(mestre_segment)
+        if keep_frames is None:
+            keep_frames = not export_path
+        ticket = self._request_admission(keep_frames)
+
+        self.metrics = PipelineMetrics()
+        exporter = None
+        if export_path:
+            try:
+                exporter = StreamingVideoExporter(
+                    export_path,
+                    fps=self.cap_aluno.get(cv2.CAP_PROP_FPS),
+                    backend=export_backend,
+                    metrics=self.metrics,
+                )
+            except Exception:
+                ticket.release()
+                raise
+        profiler = JobProfiler(
+            ANALYSIS_PROFILE_DIR,
+            cpu=ANALYSIS_PROFILE_CPU if profile_cpu is None else profile_cpu,
+            memory=ANALYSIS_PROFILE_MEMORY if profile_memory is None else profile_memory,
+        )
+        metrics_path = metrics_path or ANALYSIS_METRICS_PATH
+
         def target():
-            self._run_analysis_thread(progress_callback)
-            post_analysis_callback()
+            progress_bus.start()
+            try:
+                cache_key = self._cache_key()
+                # Com exportação pedida, os frames precisam ser decodificados de qualquer forma.
+                if exporter is None and self._load_from_cache(cache_key):
+                    ticket.release()
+                else:
+                    self._wait_admission(ticket, progress_bus)
+                    # O profiler é ativado dentro da thread de análise, que é a medida.
+                    with profiler:
+                        self._run_analysis_thread(progress_bus, exporter, keep_frames)
+                    self._store_in_cache(cache_key)
+                self.profile_outputs = profiler.outputs
+                if metrics_path:
+                    self.metrics.dump(metrics_path)
+            except Exception as e:
+                # Falhas fora do loop de análise (cache, admissão, métricas) chegam à
+                # interface como as demais: pelo last_error no callback final.
+                logger.error(f"Erro na análise: {e}", exc_info=True)
+                self.last_error = e
+            finally:
+                self.is_processing = False
+                ticket.finish(len(self.comparison_results))
+                # O evento final é sempre entregue, independente da limitação de taxa.
+                frames_done = len(self.comparison_results)
+                progress_bus.close(
+                    ProgressEvent(
+                        1.0, frames_done, frames_done, stage="concluido", done=True
+                    )
+                )
+                post_analysis_callback()
 
         self.is_processing = True
         logger.info("Iniciando a thread de processamento de vídeo.")
         self.processing_thread = threading.Thread(target=target, daemon=True)
         self.processing_thread.start()
 
-    def _run_analysis_thread(self, progress_callback=None):
+    def run_analysis(
+        self,
+        progress_bus: ProgressBus | None = None,
+        aluno_segment=None,
+        mestre_segment=None,
+        keep_frames: bool = False,
+    ):
+        """
+        Executa a análise na thread atual, sem callbacks de interface. Usado pelos
+        workers de análise em processos separados (ver src/analysis_jobs.py).
+        Diferente de analyze_and_compare, um erro na análise é propagado. Por
+        padrão os frames não são guardados: o worker salva só landmarks e
+        pontuações (keep_frames como em analyze_and_compare).
+        """
+        self.aluno_segment = VideoSegment.coerce(aluno_segment)
+        self.mestre_segment = VideoSegment.coerce(mestre_segment)
+        ticket = self._request_admission(keep_frames)
+        self.metrics = PipelineMetrics()
+        self.is_processing = True
+        try:
+            cache_key = self._cache_key()
+            if self._load_from_cache(cache_key):
+                ticket.release()
+            else:
+                self._wait_admission(ticket, progress_bus)
+                self._run_analysis_thread(progress_bus, keep_frames=keep_frames)
+                self._store_in_cache(cache_key)
+        finally:
+            self.is_processing = False
+            ticket.finish(len(self.comparison_results))
+        if self.last_error is not None:
+            raise self.last_error
+
+    def run_repetition_analysis(
+        self,
+        progress_bus: ProgressBus | None = None,
+        aluno_segment=None,
+        mestre_segment=None,
+    ) -> dict:
+        """
+        Analisa uma gravação com várias repetições da técnica. As poses dos dois
+        trechos são extraídas por inteiro (o do aluno não é cortado na duração do
+        mestre), o aluno é dividido em repetições e cada uma é pontuada contra o
+        mestre (ver src/repetitions.py). Os frames não são guardados.
+
+        Returns:
+            dict: O resumo de analyze_repetitions, com 'start_frame' (frame do
+                  vídeo do aluno onde o trecho começa). Fica também em
+                  self.repetition_results.
+        """
+        self.aluno_segment = VideoSegment.coerce(aluno_segment)
+        self.mestre_segment = VideoSegment.coerce(mestre_segment)
+        self.clear_frames()
+        # Sem frames guardados, a memória do job é só a base (modelo e buffers).
+        cost = JobCost.from_captures([self.cap_aluno, self.cap_mestre], 0)
+        name = os.path.basename(self.video_aluno_path or "") or "repeticoes"
+        ticket = self.admission = self.governor.request(cost, job_name=name)
+        self.metrics = PipelineMetrics()
+        self.is_processing = True
+        num_frames = 0
+        try:
+            self._wait_admission(ticket, progress_bus)
+            with self.metrics.stage("busca"):
+                start_aluno, frames_aluno = open_segment(self.cap_aluno, self.aluno_segment)
+                start_mestre, frames_mestre = open_segment(self.cap_mestre, self.mestre_segment)
+            self.segment_start_frames = {"aluno": start_aluno, "mestre": start_mestre}
+            total = frames_aluno + frames_mestre
+
+            def on_frame(done):
+                if progress_bus:
+                    progress_bus.publish_frame(done, total, stage="repeticoes")
+
+            mestre = self._extract_landmarks(
+                self.cap_mestre, self.mestre_pose_estimator, frames_mestre, on_frame
+            )
+            aluno = self._extract_landmarks(
+                self.cap_aluno, self.pose_estimator, frames_aluno, lambda done: on_frame(len(mestre) + done)
+            )
+            num_frames = len(aluno) + len(mestre)
+            if not len(aluno) or not len(mestre):
+                raise ValueError("Não foi possível ler os frames dos vídeos para a análise de repetições.")
+            with self.metrics.stage("repeticoes"):
+                summary = analyze_repetitions(aluno, mestre, fps=self.cap_aluno.get(cv2.CAP_PROP_FPS))
+            summary["start_frame"] = start_aluno
+            self.repetition_results = summary
+        finally:
+            ticket.finish(num_frames)
+            ticket.release()
+            self.is_processing = False
+            for cap in (self.cap_aluno, self.cap_mestre):
+                if cap:
+                    cap.release()
+            self.metrics.finish()
+        logger.info(
+            f"Análise de repetições concluída: {summary['num_repetitions']} repetições, "
+            f"média {summary['avg_score']:.1f}."
+        )
+        return summary
+
+    def _extract_landmarks(self, cap, pose_estimator, num_frames: int, on_frame=None) -> np.ndarray:
+        """Landmarks (N, 33, 4) dos próximos 'num_frames' frames da captura, sem guardar imagens."""
+        landmarks = []
+        for i in range(num_frames):
+            with self.metrics.stage("decodificacao"):
+                ret, frame = cap.read()
+            if not ret:
+                break
+            with self.metrics.stage("inferencia"):
+                results = pose_estimator.estimate_pose(frame)
+            if not results.pose_landmarks:
+                self.metrics.count("frames_sem_pose")
+            landmarks.append(
+                landmarks_list_to_array(pose_estimator.get_landmarks_as_list(results.pose_landmarks))
+            )
+            self.metrics.count("frames_analisados")
+            if on_frame:
+                on_frame(i + 1)
+        if not landmarks:
+            return np.empty((0, len(POSE_LANDMARK_NAMES), 4), dtype=np.float32)
+        return np.stack(landmarks)
+
+    def _segment_frame_ranges(self) -> dict:
+        """Intervalo [início, fim) em frames do trecho de cada vídeo."""
+        ranges = {}
+        for name, cap, segment in (
+            ("aluno", self.cap_aluno, self.aluno_segment),
+            ("mestre", self.cap_mestre, self.mestre_segment),
+        ):
+            ranges[name] = segment.frame_range(
+                cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            )
+        return ranges
+
+    def _request_admission(self, keep_frames: bool = True):
+        """Estima o custo da análise (resolução x frames dos trechos) e pede a admissão."""
+        # Uma nova análise descarta os frames da anterior e a memória reservada para eles.
+        self.clear_frames()
+        counts = [end - start for start, end in self._segment_frame_ranges().values()]
+        # Sem guardar os frames, só os da fila do exportador ficam em memória
+        # (cobertos pela memória base do job).
+        num_frames = min(counts) if keep_frames else 0
+        cost = JobCost.from_captures([self.cap_aluno, self.cap_mestre], num_frames)
+        name = os.path.basename(self.video_aluno_path or "") or "analise"
+        self.admission = self.governor.request(cost, job_name=name)
+        return self.admission
+
+    def _wait_admission(self, ticket, progress_bus: ProgressBus | None):
+        """Aguarda a vez do job, publicando a posição na fila e a espera estimada."""
+        def publish(t):
+            if progress_bus:
+                progress_bus.publish(
+                    ProgressEvent(0.0, stage="fila", eta_seconds=t.eta_seconds, queue_position=t.position)
+                )
+
+        queued = not ticket.admitted
+        ticket.wait(on_update=publish)
+        if queued and progress_bus:
+            # O tempo na fila não entra no fps/ETA da análise.
+            progress_bus.restart_clock()
+        self.frame_scale = ticket.scale
+        if ticket.degraded:
+            logger.warning(
+                f"Análise degradada: frames processados a {ticket.scale:.0%} da resolução original."
+            )
+
+    def _cache_key(self) -> str | None:
+        """Chave da análise atual no cache (None sem cache ou sem os arquivos dos vídeos)."""
+        self.cache_hit = False
+        if self.cache is None or not self.video_aluno_path or not self.video_mestre_path:
+            return None
+        try:
+            return analysis_cache_key(
+                file_content_hash(self.video_aluno_path),
+                file_content_hash(self.video_mestre_path),
+                self.pose_estimator.config,
+                self.motion_comparator.VERSION,
+                list(self.motion_comparator.KEY_ANGLES.keys()),
+                self._segment_frame_ranges(),
+            )
+        except Exception as e:
+            logger.error(f"Não foi possível calcular a chave do cache de análises: {e}")
+            return None
+
+    def _load_from_cache(self, cache_key: str | None) -> bool:
+        """Preenche os resultados a partir do cache. Retorna False se não houver entrada."""
+        if cache_key is None:
+            return False
+        with self.metrics.stage("cache"):
+            session = self.cache.get(cache_key)
+        if session is None:
+            return False
+
+        for lst in [
+            self.aluno_landmarks_list,
+            self.mestre_landmarks_list,
+            self.aluno_landmarks_raw,
+            self.mestre_landmarks_raw,
+            self.comparison_results,
+        ]:
+            lst.clear()
+        self.results = AnalysisResults.from_session(session, self.results.generation + 1)
+        for i in range(session.num_frames):
+            self.aluno_landmarks_list.append(session.landmarks_as_list(i, is_aluno=True))
+            self.mestre_landmarks_list.append(session.landmarks_as_list(i, is_aluno=False))
+            self.comparison_results.append(session.frame_result(i))
+        # Os objetos do MediaPipe não são guardados; os landmarks em lista bastam
+        # para comparar, exportar (export_video) e gerar o relatório.
+        self.aluno_landmarks_raw.extend([None] * session.num_frames)
+        self.mestre_landmarks_raw.extend([None] * session.num_frames)
+        self.segment_start_frames = dict(
+            session.metadata.get("start_frames", {"aluno": 0, "mestre": 0})
+        )
+        self.frame_scale = 1.0
+        self.cache_hit = True
+        # O resultado do cache substitui o da análise anterior, inclusive um erro.
+        self.last_error = None
+        self.metrics.count("cache_hits")
+        self.metrics.finish()
+        self.is_processing = False
+        for cap in (self.cap_aluno, self.cap_mestre):
+            if cap:
+                cap.release()
+        logger.info(f"Resultado de {session.num_frames} frames obtido do cache de análises.")
+        return True
+
+    def _store_in_cache(self, cache_key: str | None):
+        """Guarda o resultado da análise recém-concluída no cache."""
+        # Análises interrompidas ou degradadas pelo governor não são reaproveitadas.
+        if cache_key is None or self.last_error is not None or self.frame_scale < 1.0:
+            return
+        if not self.comparison_results:
+            return
+        try:
+            self.cache.put(cache_key, AnalysisSession.from_analyzer(self))
+        except Exception as e:
+            logger.error(f"Erro ao guardar o resultado no cache de análises: {e}", exc_info=True)
+
+    def clear_frames(self):
+        """Libera os frames (originais e anotados) guardados da última análise."""
+        for lst in [
+            self.raw_frames_aluno,
+            self.raw_frames_mestre,
+            self.processed_frames_aluno,
+            self.processed_frames_mestre,
+        ]:
+            lst.clear()
+        self.results.release_frames()
+        if self.admission is not None:
+            self.admission.release()
+            self.admission = None
+
+    def _run_analysis_thread(
+        self,
+        progress_bus: ProgressBus | None = None,
+        exporter: StreamingVideoExporter | None = None,
+        keep_frames: bool = True,
+    ):
+        self.exported_video_path = None
+        self.last_error = None
         try:
             logger.info("Thread de análise iniciada.")
 
@@ -109,76 +547,193 @@ class VideoAnalyzer:
             ]:
                 lst.clear()
 
-            num_frames = min(
-                int(self.cap_aluno.get(cv2.CAP_PROP_FRAME_COUNT)),
-                int(self.cap_mestre.get(cv2.CAP_PROP_FRAME_COUNT)),
+            # Posiciona cada vídeo no início do seu trecho; só o trecho é decodificado.
+            with self.metrics.stage("busca"):
+                start_aluno, frames_aluno = open_segment(self.cap_aluno, self.aluno_segment)
+                start_mestre, frames_mestre = open_segment(self.cap_mestre, self.mestre_segment)
+            self.segment_start_frames = {"aluno": start_aluno, "mestre": start_mestre}
+            num_frames = min(frames_aluno, frames_mestre)
+            results = AnalysisResults(
+                num_frames, list(self.motion_comparator.KEY_ANGLES.keys()), self.results.generation + 1
+            )
+            self.results = results
+            logger.info(
+                f"Iniciando processamento e comparação de {num_frames} frames "
+                f"(aluno a partir do frame {start_aluno}, mestre a partir do frame {start_mestre})."
             )
-            logger.info(f"Iniciando processamento e comparação de {num_frames} frames.")
 
+            metrics = self.metrics
             for i in range(num_frames):
-                ret_aluno, frame_aluno = self.cap_aluno.read()
-                ret_mestre, frame_mestre = self.cap_mestre.read()
+                with metrics.stage("decodificacao"):
+                    ret_aluno, frame_aluno = self.cap_aluno.read()
+                    ret_mestre, frame_mestre = self.cap_mestre.read()
 
                 if not ret_aluno or not ret_mestre:
                     break
-
-                self.raw_frames_aluno.append(frame_aluno)
-                self.raw_frames_mestre.append(frame_mestre)
-
-                results_aluno = self.pose_estimator.estimate_pose(frame_aluno)
-                results_mestre = self.pose_estimator.estimate_pose(frame_mestre)
+                metrics.count("frames_decodificados", 2)
+
+                if self.frame_scale < 1.0:
+                    # Job degradado pelo governor: reduz a inferência e a memória guardada.
+                    with metrics.stage("redimensionamento"):
+                        frame_aluno = cv2.resize(
+                            frame_aluno, None, fx=self.frame_scale, fy=self.frame_scale,
+                            interpolation=cv2.INTER_AREA,
+                        )
+                        frame_mestre = cv2.resize(
+                            frame_mestre, None, fx=self.frame_scale, fy=self.frame_scale,
+                            interpolation=cv2.INTER_AREA,
+                        )
+
+                if keep_frames:
+                    self.raw_frames_aluno.append(frame_aluno)
+                    self.raw_frames_mestre.append(frame_mestre)
+
+                with metrics.stage("inferencia"):
+                    results_aluno = self.pose_estimator.estimate_pose(frame_aluno)
+                    results_mestre = self.mestre_pose_estimator.estimate_pose(frame_mestre)
+                if not results_aluno.pose_landmarks or not results_mestre.pose_landmarks:
+                    metrics.count("frames_sem_pose")
 
                 # ALTERAÇÃO: Usa a nova função para desenhar o esqueleto colorido por lado
-                annotated_aluno = self.pose_estimator.draw_skeleton_by_side(
-                    frame_aluno, results_aluno.pose_landmarks
-                )
-                annotated_mestre = self.pose_estimator.draw_skeleton_by_side(
-                    frame_mestre, results_mestre.pose_landmarks
-                )
-
-                self.processed_frames_aluno.append(annotated_aluno)
-                self.processed_frames_mestre.append(annotated_mestre)
-
-                # Armazena ambos os formatos de landmarks
-                lm_list_aluno = self.pose_estimator.get_landmarks_as_list(
-                    results_aluno.pose_landmarks
-                )
-                lm_list_mestre = self.pose_estimator.get_landmarks_as_list(
-                    results_mestre.pose_landmarks
-                )
-
-                self.aluno_landmarks_list.append(lm_list_aluno)
-                self.mestre_landmarks_list.append(lm_list_mestre)
-                self.aluno_landmarks_raw.append(results_aluno.pose_landmarks)
-                self.mestre_landmarks_raw.append(results_mestre.pose_landmarks)
-
-                score, feedback, diffs = self.motion_comparator.compare_poses(
-                    lm_list_aluno, lm_list_mestre
-                )
-                self.comparison_results.append(
-                    {"score": score, "feedback": feedback, "diffs": diffs}
-                )
-
-                if progress_callback:
-                    progress_callback((i + 1) / num_frames)
+                with metrics.stage("desenho"):
+                    annotated_aluno = self.pose_estimator.draw_skeleton_by_side(
+                        frame_aluno, results_aluno.pose_landmarks
+                    )
+                    annotated_mestre = self.pose_estimator.draw_skeleton_by_side(
+                        frame_mestre, results_mestre.pose_landmarks
+                    )
+
+                if keep_frames:
+                    self.processed_frames_aluno.append(annotated_aluno)
+                    self.processed_frames_mestre.append(annotated_mestre)
+
+                with metrics.stage("comparacao"):
+                    # Armazena ambos os formatos de landmarks
+                    lm_list_aluno = self.pose_estimator.get_landmarks_as_list(
+                        results_aluno.pose_landmarks
+                    )
+                    lm_list_mestre = self.pose_estimator.get_landmarks_as_list(
+                        results_mestre.pose_landmarks
+                    )
+
+                    self.aluno_landmarks_list.append(lm_list_aluno)
+                    self.mestre_landmarks_list.append(lm_list_mestre)
+                    self.aluno_landmarks_raw.append(results_aluno.pose_landmarks)
+                    self.mestre_landmarks_raw.append(results_mestre.pose_landmarks)
+
+                    score, feedback, diffs = self.motion_comparator.compare_poses(
+                        lm_list_aluno, lm_list_mestre
+                    )
+                    self.comparison_results.append(
+                        {"score": score, "feedback": feedback, "diffs": diffs}
+                    )
+                    results.append(
+                        score, feedback, diffs, lm_list_aluno, lm_list_mestre,
+                        *((annotated_aluno, annotated_mestre) if keep_frames else ()),
+                    )
+
+                if exporter:
+                    # Inclui a espera quando a fila do codificador está cheia.
+                    with metrics.stage("exportacao"):
+                        exporter.submit(annotated_aluno, annotated_mestre, score)
+                    metrics.gauge("fila_exportacao", exporter.queue_depth)
+
+                metrics.count("frames_analisados")
+                if progress_bus:
+                    progress_bus.publish_frame(i + 1, num_frames, score)
+
+            if exporter:
+                self.exported_video_path = exporter.close()
+                exporter = None
 
         except Exception as e:
             logger.error(f"Erro na thread de análise: {e}", exc_info=True)
+            self.last_error = e
         finally:
+            if exporter:
+                # Análise interrompida: finaliza o arquivo com os frames já escritos.
+                try:
+                    exporter.close()
+                except Exception as e:
+                    logger.error(f"Erro ao finalizar a exportação: {e}")
+            self.results.finish()
             self.is_processing = False
             if self.cap_aluno:
                 self.cap_aluno.release()
             if self.cap_mestre:
                 self.cap_mestre.release()
-            logger.info("Thread de análise finalizada.")
+            self.metrics.finish()
+            logger.info(
+                "Thread de análise finalizada. Etapa dominante: %s. Métricas: %s",
+                self.metrics.bottleneck(),
+                self.metrics.snapshot()["stages"],
+            )
 
-    def __del__(self):
-        # ... (código inalterado) ...
+    def snapshot_results(self) -> ResultsSnapshot:
+        """
+        Resultados já calculados da análise atual (ou da última), seguros para
+        ler de outra thread enquanto a análise continua. O snapshot não muda
+        depois de criado; para atualizar a interface, peça um novo e leia só os
+        frames a partir do num_frames do anterior.
+        """
+        return self.results.snapshot()
+
+    def save_session(self, path: str) -> str:
+        """
+        Salva o resultado da última análise no formato de sessão em disco,
+        permitindo reabrir e comparar a sessão sem rodar a inferência novamente.
+        """
+        session = AnalysisSession.from_analyzer(self)
+        return save_session(session, path)
+
+    def export_video(
+        self,
+        output_path: str,
+        done_callback=None,
+        progress_callback=None,
+        event_callback=None,
+        **export_options,
+    ) -> VideoExportJob:
+        """
+        Exporta, em segundo plano, o vídeo lado a lado da última análise a partir dos
+        landmarks já calculados. O progresso chega com stage="exportacao" e
+        done_callback recebe o caminho do vídeo (ou None em caso de erro).
+        """
+        session = AnalysisSession.from_analyzer(self)
+        job = VideoExportJob(
+            session,
+            output_path,
+            done_callback=done_callback,
+            progress_callback=progress_callback,
+            event_callback=event_callback,
+            **export_options,
+        )
+        return job.start()
+
+    def close(self):
+        """
+        Libera os estimadores de pose, a memória reservada e os arquivos temporários.
+        Chame quando o analisador não for mais usado.
+        """
+        self.pose_estimator.close()
+        self.mestre_pose_estimator.close()
+        self._release_resources()
+
+    def _release_resources(self):
+        if getattr(self, "_released", False):
+            return
+        self._released = True
         logger.info("Destruindo VideoAnalyzer e limpando arquivos.")
+        if getattr(self, "admission", None) is not None:
+            self.admission.release()
         try:
-            if self.video_aluno_path and os.path.exists(self.video_aluno_path):
-                os.remove(self.video_aluno_path)
-            if self.video_mestre_path and os.path.exists(self.video_mestre_path):
-                os.remove(self.video_mestre_path)
+            # Vídeos abertos com load_video_from_path pertencem a quem os enviou.
+            for path in self._temp_video_paths:
+                if os.path.exists(path):
+                    os.remove(path)
         except Exception as e:
             logger.error(f"Erro ao limpar arquivos temporários: {e}")
+
+    def __del__(self):
+        # Os estimadores de pose se liberam sozinhos (ver PoseEstimator.__del__).
+        self._release_resources()
@@ -0,0 +1,399 @@
+# src/video_exporter.py
+
+# EXPORTAÇÃO DO VÍDEO ANOTADO LADO A LADO
+# Os frames (aluno | mestre, com esqueletos coloridos e a pontuação do frame)
+# são escritos em streaming: cada frame composto é enviado ao codificador assim
+# que é produzido, através de uma fila limitada consumida por uma thread de escrita.
+# Nenhuma lista de frames é acumulada, então a memória usada não depende da
+# duração da sessão.
+
+import queue
+import shutil
+import subprocess
+import threading
+import cv2
+import numpy as np
+from src.utils import get_logger
+from src.progress_bus import ProgressBus, ProgressEvent
+from src.skeleton_drawer import SkeletonDrawer
+from src.video_seek import seek_to_frame
+
+logger = get_logger(__name__)
+
+# Marcador de fim da fila de escrita.
+_END_OF_STREAM = None
+
+
+class SideBySideComposer:
+    """
+    Monta o frame de saída com o aluno à esquerda e o mestre à direita.
+    O tamanho dos painéis é fixado no primeiro frame, pois o vídeo de saída
+    precisa de dimensões constantes.
+    """
+
+    def __init__(self, max_height: int = 720):
+        self.max_height = max_height
+        self.panel_sizes = None  # ((largura_aluno, altura), (largura_mestre, altura))
+
+    @property
+    def frame_size(self) -> tuple[int, int] | None:
+        """Dimensões (largura, altura) do frame composto, conhecidas após o primeiro frame."""
+        if self.panel_sizes is None:
+            return None
+        (width_a, height), (width_m, _) = self.panel_sizes
+        return width_a + width_m, height
+
+    def _init_sizes(self, frame_aluno: np.ndarray, frame_mestre: np.ndarray):
+        height = min(frame_aluno.shape[0], frame_mestre.shape[0], self.max_height)
+        height -= height % 2  # Codificadores H.264/yuv420p exigem dimensões pares.
+        sizes = []
+        for frame in (frame_aluno, frame_mestre):
+            width = int(round(frame.shape[1] * height / frame.shape[0]))
+            sizes.append((width - width % 2, height))
+        self.panel_sizes = tuple(sizes)
+
+    @staticmethod
+    def _fit(frame: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+        if (frame.shape[1], frame.shape[0]) == size:
+            return frame
+        return cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+
+    def compose(
+        self, frame_aluno: np.ndarray, frame_mestre: np.ndarray, score: float | None = None
+    ) -> np.ndarray:
+        if self.panel_sizes is None:
+            self._init_sizes(frame_aluno, frame_mestre)
+        size_aluno, size_mestre = self.panel_sizes
+        composed = np.hstack(
+            (self._fit(frame_aluno, size_aluno), self._fit(frame_mestre, size_mestre))
+        )
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        cv2.putText(composed, "Aluno", (10, 30), font, 0.8, (255, 255, 255), 2)
+        cv2.putText(composed, "Mestre", (size_aluno[0] + 10, 30), font, 0.8, (255, 255, 255), 2)
+        if score is not None:
+            cv2.putText(composed, f"{score:.0f}%", (10, 65), font, 1.0, (0, 255, 255), 2)
+        return composed
+
+
+class OpenCVVideoSink:
+    """Escreve os frames com cv2.VideoWriter (codec MPEG-4 por padrão)."""
+
+    name = "opencv"
+
+    def __init__(self, output_path: str, fps: float, frame_size: tuple[int, int], fourcc: str = "mp4v"):
+        self.writer = cv2.VideoWriter(
+            output_path, cv2.VideoWriter_fourcc(*fourcc), fps, frame_size
+        )
+        if not self.writer.isOpened():
+            raise ValueError(f"Não foi possível criar o vídeo de saída: {output_path}")
+
+    def write(self, frame: np.ndarray):
+        self.writer.write(frame)
+
+    def close(self):
+        self.writer.release()
+
+
+class FfmpegVideoSink:
+    """
+    Envia os frames BGR brutos para um processo ffmpeg local pelo stdin,
+    codificando em H.264 (compatível com navegadores e players comuns).
+    """
+
+    name = "ffmpeg"
+
+    def __init__(self, output_path: str, fps: float, frame_size: tuple[int, int], ffmpeg_path: str = "ffmpeg"):
+        width, height = frame_size
+        command = [
+            ffmpeg_path, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", f"{fps}",
+            "-i", "-",
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+            output_path,
+        ]
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        self.process.stdin.close()
+        stderr = self.process.stderr.read()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg falhou: {stderr.decode(errors='replace').strip()}")
+
+
+def create_video_sink(output_path: str, fps: float, frame_size: tuple[int, int], backend: str = "auto"):
+    """
+    Cria o destino dos frames. Com backend="auto", usa o ffmpeg se ele estiver
+    instalado e, caso contrário, o cv2.VideoWriter.
+    """
+    if backend == "auto":
+        backend = "ffmpeg" if shutil.which("ffmpeg") else "opencv"
+    if backend == "ffmpeg":
+        ffmpeg_path = shutil.which("ffmpeg")
+        if ffmpeg_path is None:
+            raise ValueError("Backend 'ffmpeg' solicitado, mas o ffmpeg não foi encontrado no PATH.")
+        return FfmpegVideoSink(output_path, fps, frame_size, ffmpeg_path)
+    if backend == "opencv":
+        return OpenCVVideoSink(output_path, fps, frame_size)
+    raise ValueError(f"Backend de exportação desconhecido: '{backend}'. Use 'auto', 'ffmpeg' ou 'opencv'.")
+
+
+class StreamingVideoExporter:
+    """
+    Recebe pares de frames anotados e os escreve no vídeo de saída em uma thread
+    própria. A fila é limitada: se o codificador ficar para trás, submit() bloqueia
+    o produtor em vez de acumular frames na memória.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: float = 30.0,
+        total_frames: int = 0,
+        backend: str = "auto",
+        max_height: int = 720,
+        queue_size: int = 8,
+        progress_bus: ProgressBus | None = None,
+        metrics=None,
+    ):
+        """
+        Args:
+            output_path (str): Caminho do vídeo a ser gerado.
+            fps (float): Taxa de quadros do vídeo de saída.
+            total_frames (int): Total esperado de frames, usado no cálculo do progresso.
+            backend (str): "auto", "ffmpeg" ou "opencv" (ver create_video_sink).
+            max_height (int): Altura máxima do vídeo de saída.
+            queue_size (int): Número máximo de frames aguardando codificação.
+            progress_bus (ProgressBus): Barramento que recebe o progresso da exportação.
+            metrics (PipelineMetrics): Recebe o tempo de codificação e a profundidade da fila.
+        """
+        self.output_path = output_path
+        self.fps = fps or 30.0
+        self.total_frames = total_frames
+        self.backend = backend
+        self.progress_bus = progress_bus
+        self.metrics = metrics
+        self.composer = SideBySideComposer(max_height)
+        self.frames_written = 0
+        self.error = None
+        self._sink = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Número de frames aguardando codificação."""
+        return self._queue.qsize()
+
+    def start(self):
+        """Inicia a thread de escrita."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame_aluno: np.ndarray, frame_mestre: np.ndarray, score: float | None = None):
+        """
+        Compõe o frame lado a lado e o enfileira para escrita (bloqueia se a fila
+        estiver cheia). A composição roda na thread do produtor, de forma que ela
+        se sobrepõe à codificação do frame anterior.
+        """
+        if self.error is not None:
+            raise RuntimeError(f"A exportação do vídeo falhou: {self.error}") from self.error
+        if self._thread is None:
+            self.start()
+        self._queue.put((self.composer.compose(frame_aluno, frame_mestre, score), score))
+
+    def close(self, timeout: float | None = None) -> str:
+        """Finaliza o vídeo, aguardando a escrita dos frames pendentes."""
+        if self._thread is not None:
+            self._queue.put(_END_OF_STREAM)
+            self._thread.join(timeout)
+            self._thread = None
+        if self.error is not None:
+            raise RuntimeError(f"A exportação do vídeo falhou: {self.error}") from self.error
+        logger.info(f"Vídeo exportado com {self.frames_written} frames: {self.output_path}")
+        return self.output_path
+
+    def _writer_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                if self.error is not None:
+                    continue  # Apenas drena a fila para não bloquear o produtor.
+                try:
+                    self._write(*item)
+                except Exception as e:
+                    logger.error(f"Erro ao escrever frame do vídeo exportado: {e}", exc_info=True)
+                    self.error = e
+        finally:
+            if self._sink is not None:
+                try:
+                    self._sink.close()
+                except Exception as e:
+                    logger.error(f"Erro ao finalizar o vídeo exportado: {e}", exc_info=True)
+                    self.error = self.error or e
+                self._sink = None
+
+    def _write(self, composed: np.ndarray, score: float | None):
+        if self._sink is None:
+            self._sink = create_video_sink(
+                self.output_path, self.fps, self.composer.frame_size, self.backend
+            )
+            logger.info(
+                f"Exportando vídeo {self.composer.frame_size} a {self.fps:.1f} fps "
+                f"via '{self._sink.name}': {self.output_path}"
+            )
+        if self.metrics is not None:
+            with self.metrics.stage("codificacao"):
+                self._sink.write(composed)
+        else:
+            self._sink.write(composed)
+        self.frames_written += 1
+        if self.progress_bus:
+            self.progress_bus.publish_frame(
+                self.frames_written, self.total_frames, score, stage="exportacao"
+            )
+
+
+def _landmarks_or_none(array: np.ndarray) -> np.ndarray | None:
+    """Frames sem pose são gravados na sessão como NaN."""
+    landmarks = np.asarray(array)
+    return None if np.isnan(landmarks[0, 0]) else landmarks
+
+
+def export_session_video(
+    session,
+    output_path: str,
+    video_aluno: str | None = None,
+    video_mestre: str | None = None,
+    progress_bus: ProgressBus | None = None,
+    backend: str = "auto",
+    max_height: int = 720,
+    drawer: SkeletonDrawer | None = None,
+) -> str:
+    """
+    Gera o vídeo lado a lado de uma sessão já analisada, decodificando novamente
+    os vídeos originais e desenhando os landmarks salvos (sem rodar a inferência).
+    A decodificação e o desenho rodam nesta thread; a composição e a codificação,
+    na thread de escrita do StreamingVideoExporter.
+
+    Args:
+        session (AnalysisSession): Sessão com landmarks e pontuações por frame.
+        output_path (str): Caminho do vídeo a ser gerado.
+        video_aluno, video_mestre (str): Vídeos originais. Por padrão, os registrados na sessão.
+    """
+    video_aluno = video_aluno or session.video_aluno
+    video_mestre = video_mestre or session.video_mestre
+    if not video_aluno or not video_mestre:
+        raise ValueError("A sessão não registra os vídeos originais do aluno e do mestre.")
+
+    cap_aluno = cv2.VideoCapture(video_aluno)
+    cap_mestre = cv2.VideoCapture(video_mestre)
+    try:
+        if not cap_aluno.isOpened() or not cap_mestre.isOpened():
+            raise ValueError(f"Não foi possível abrir os vídeos: {video_aluno}, {video_mestre}")
+        # Sessões de um trecho começam no meio dos vídeos originais.
+        start_frames = session.metadata.get("start_frames", {})
+        for cap, key in ((cap_aluno, "aluno"), (cap_mestre, "mestre")):
+            if start_frames.get(key):
+                seek_to_frame(cap, start_frames[key])
+        fps = session.fps or cap_aluno.get(cv2.CAP_PROP_FPS) or 30.0
+        drawer = drawer or SkeletonDrawer()
+        num_frames = session.num_frames
+        exporter = StreamingVideoExporter(
+            output_path, fps, num_frames, backend, max_height, progress_bus=progress_bus
+        )
+        exporter.start()
+        try:
+            for i in range(num_frames):
+                ret_aluno, frame_aluno = cap_aluno.read()
+                ret_mestre, frame_mestre = cap_mestre.read()
+                if not ret_aluno or not ret_mestre:
+                    break
+                # Os frames recém-decodificados não são reaproveitados: desenha neles mesmos.
+                aluno = _landmarks_or_none(session.aluno_landmarks[i])
+                mestre = _landmarks_or_none(session.mestre_landmarks[i])
+                if aluno is not None:
+                    drawer.draw_by_side(frame_aluno, aluno, in_place=True)
+                if mestre is not None:
+                    drawer.draw_by_side(frame_mestre, mestre, in_place=True)
+                exporter.submit(frame_aluno, frame_mestre, float(session.scores[i]))
+        finally:
+            exporter.close()
+    finally:
+        cap_aluno.release()
+        cap_mestre.release()
+    return output_path
+
+
+class VideoExportJob:
+    """
+    Executa export_session_video em segundo plano, reportando o progresso pelo
+    ProgressBus (eventos com stage="exportacao").
+    """
+
+    def __init__(
+        self,
+        session,
+        output_path: str,
+        done_callback=None,
+        progress_callback=None,
+        event_callback=None,
+        max_update_hz: float = 10.0,
+        **export_options,
+    ):
+        self.session = session
+        self.output_path = output_path
+        self.done_callback = done_callback
+        self.export_options = export_options
+        self.error = None
+        self.progress_bus = ProgressBus(max_rate_hz=max_update_hz)
+        if progress_callback:
+            self.progress_bus.subscribe(lambda event: progress_callback(event.progress))
+        if event_callback:
+            self.progress_bus.subscribe(event_callback)
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "VideoExportJob":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> str:
+        """Aguarda o fim da exportação e retorna o caminho do vídeo."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise RuntimeError(f"A exportação do vídeo falhou: {self.error}") from self.error
+        return self.output_path
+
+    def _run(self):
+        self.progress_bus.start()
+        try:
+            export_session_video(
+                self.session,
+                self.output_path,
+                progress_bus=self.progress_bus,
+                **self.export_options,
+            )
+        except Exception as e:
+            logger.error(f"Erro na exportação do vídeo: {e}", exc_info=True)
+            self.error = e
+        finally:
+            frames = self.session.num_frames
+            self.progress_bus.close(
+                ProgressEvent(1.0, frames, frames, stage="exportacao", done=True)
+            )
+        if self.done_callback:
+            self.done_callback(self.output_path if self.error is None else None)
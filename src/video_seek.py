@@ -0,0 +1,97 @@
+# src/video_seek.py
+
+# POSICIONAMENTO DIRETO EM TRECHOS DE VÍDEO
+# Permite analisar apenas um trecho (ex: uma técnica dentro da gravação de uma
+# aula inteira) sem decodificar o vídeo desde o primeiro frame. A busca usa
+# CAP_PROP_POS_FRAMES: o backend FFmpeg do OpenCV volta ao keyframe anterior e
+# decodifica até o frame pedido, e o resultado é conferido pela posição
+# reportada, com correção quando o backend para antes ou depois do alvo.
+
+import cv2
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Quantos frames antes do alvo a busca recomeça se o backend passar do ponto.
+SEEK_PREROLL_FRAMES = 120
+
+
+class VideoSegment:
+    """Trecho de um vídeo, em segundos. end=None vai até o fim do vídeo."""
+
+    def __init__(self, start: float = 0.0, end: float | None = None):
+        if start < 0:
+            raise ValueError(f"O início do trecho não pode ser negativo: {start}")
+        if end is not None and end <= start:
+            raise ValueError(f"O fim do trecho ({end}) precisa ser maior que o início ({start}).")
+        self.start = float(start)
+        self.end = None if end is None else float(end)
+
+    @classmethod
+    def coerce(cls, value) -> "VideoSegment":
+        """Aceita um VideoSegment, uma tupla (início, fim) ou None (vídeo inteiro)."""
+        if value is None:
+            return cls()
+        if isinstance(value, VideoSegment):
+            return value
+        start, end = value
+        return cls(start or 0.0, end)
+
+    def frame_range(self, fps: float, frame_count: int) -> tuple[int, int]:
+        """Converte o trecho em [frame_inicial, frame_final) dentro do vídeo."""
+        fps = fps or 30.0
+        start = min(int(round(self.start * fps)), frame_count)
+        end = frame_count if self.end is None else min(int(round(self.end * fps)), frame_count)
+        return start, max(start, end)
+
+    def __repr__(self):
+        return f"VideoSegment(start={self.start}, end={self.end})"
+
+
+def seek_to_frame(cap: cv2.VideoCapture, frame_index: int) -> int:
+    """
+    Posiciona a captura para que o próximo read() retorne o frame 'frame_index'.
+
+    Returns:
+        int: A posição efetiva. Pode ser menor que a pedida apenas se o vídeo
+             terminar antes do alvo.
+    """
+    frame_index = max(int(frame_index), 0)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if position == frame_index:
+        return position
+
+    if position > frame_index or position < 0:
+        # O backend passou do alvo (keyframes esparsos ou timestamps imprecisos):
+        # recomeça antes e avança decodificando.
+        restart = max(frame_index - SEEK_PREROLL_FRAMES, 0)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, restart)
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if position > frame_index or position < 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            position = 0
+        logger.debug(f"Busca imprecisa para o frame {frame_index}; recomeçando em {position}.")
+
+    # grab() avança sem converter o frame, o que é bem mais barato que read().
+    while position < frame_index:
+        if not cap.grab():
+            break
+        position += 1
+    return position
+
+
+def open_segment(cap: cv2.VideoCapture, segment) -> tuple[int, int]:
+    """
+    Posiciona a captura no início do trecho.
+
+    Returns:
+        tuple: (frame_inicial, número de frames do trecho)
+    """
+    segment = VideoSegment.coerce(segment)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    start, end = segment.frame_range(fps, frame_count)
+    # Sem início definido, a leitura segue do ponto atual, sem busca.
+    position = seek_to_frame(cap, start) if start > 0 else 0
+    return position, max(end - position, 0)
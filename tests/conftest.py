@@ -0,0 +1,17 @@
+# tests/conftest.py
+
+import os
+import shutil
+import tempfile
+
+# Os testes importam o main, que configura o logging na importação: os logs
+# vão para uma pasta temporária em vez de logs/ do projeto.
+_LOG_DIR = tempfile.mkdtemp(prefix="fbkmkln_test_logs_")
+os.environ["FBKMKLN_LOG_DIR"] = _LOG_DIR
+
+
+def pytest_unconfigure(config):
+    from src.utils import shutdown_logging
+
+    shutdown_logging()
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
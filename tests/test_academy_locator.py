@@ -0,0 +1,137 @@
+# tests/test_academy_locator.py
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+import src.academy_locator as academy_locator
+from src.academy_locator import AcademyLocator, normalize_text
+from synthetic import write_academies_csv
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, np.asarray(lat2, float), np.asarray(lon2, float)))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * academy_locator.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def locator(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("academias") / "academias.csv")
+    write_academies_csv(path, 3000)
+    return AcademyLocator.from_csv(path)
+
+
+def test_nearest_matches_brute_force(locator):
+    """Verifica que os k mais próximos do índice são os mesmos de uma varredura completa."""
+    print("\nExecutando test_nearest_matches_brute_force...")
+    latitudes = np.array([r["LATITUDE"] for r in locator.records])
+    longitudes = np.array([r["LONGITUDE"] for r in locator.records])
+    for lat, lon in [(-23.5, -46.6), (-3.0, -60.0), (-30.2, -51.0), (40.7, -74.0)]:
+        distances = _haversine_km(lat, lon, latitudes, longitudes)
+        expected = np.argsort(distances)[:10]
+        found = locator.nearest(lat, lon, k=10)
+        assert [a["ID"] for a in found] == list(expected)
+        assert [a["DISTANCIA_KM"] for a in found] == pytest.approx(distances[expected], abs=0.01)
+    close = locator.nearest(-23.5, -46.6, k=50, max_km=3)
+    assert 0 < len(close) < 50 and all(a["DISTANCIA_KM"] <= 3 for a in close)
+    print("✓ Vizinhos mais próximos corretos (Correto)")
+
+
+def test_prefix_search(locator, monkeypatch):
+    """Busca por prefixo, sem acento e com várias palavras, ordenada por nome ou distância."""
+    print("\nExecutando test_prefix_search...")
+    assert normalize_text("Goiânia - São Paulo") == ["goiania", "sao", "paulo"]
+
+    results = locator.search("krav sul", limit=1000)
+    assert results and all(r["NOME"].startswith("Krav Maga Sul") for r in results)
+    assert [r["ID"] for r in results] == sorted(r["ID"] for r in results)
+    assert {r["CIDADE"] for r in locator.search("goiania", limit=1000)} == {"Goiânia"}
+    assert {r["UF"] for r in locator.search("BELO HORIZ", limit=5)} == {"MG"}
+    assert locator.search("xyzabc") == [] and locator.search("  ") == []
+
+    # Com localização, a ordem é a da distância, tanto nas buscas estreitas
+    # quanto nas amplas (que usam a árvore em vez de medir todos os candidatos).
+    monkeypatch.setattr(academy_locator, "NEAR_SEARCH_TREE_FRACTION", 0.01)
+    for query in ["escola norte", "s", "a"]:
+        matches = locator.search(query, limit=10**6)
+        near = locator.search(query, near=(-22.9, -43.2), limit=15)
+        distances = _haversine_km(-22.9, -43.2, [m["LATITUDE"] for m in matches], [m["LONGITUDE"] for m in matches])
+        expected = [matches[i]["ID"] for i in np.argsort(distances)[:15]]
+        assert [r["ID"] for r in near] == expected
+    print("✓ Busca por prefixo (Correto)")
+
+
+def test_invalid_rows_and_training_location_view(tmp_path):
+    """Linhas sem coordenadas são ignoradas; a tela busca enquanto o usuário digita."""
+    import main
+
+    rows = [
+        {"NOME": "Krav Maga Centro", "CIDADE": "São Paulo", "UF": "SP", "LATITUDE": "-23.55", "LONGITUDE": "-46.63"},
+        {"NOME": "Sem Coordenadas", "CIDADE": "Recife", "UF": "PE", "LATITUDE": "", "LONGITUDE": ""},
+        {"NOME": "Krav Maga Sul", "CIDADE": "Porto Alegre", "UF": "RS", "LATITUDE": "-30.03", "LONGITUDE": "-51.23"},
+    ]
+    small = AcademyLocator(rows)
+    assert len(small) == 2
+
+    app = main.AppFBKMKLN(MagicMock())
+    with patch.object(main, "get_default_academy_locator", return_value=small):
+        view = app.create_training_location_view()
+    search_field = view.controls[1].controls[0]
+    results = view.controls[3]
+    search_field.value = "porto"
+    search_field.on_change(None)
+    assert len(results.controls) == 1
+    search_field.value = "krav"
+    search_field.on_change(None)
+    assert len(results.controls) == 2
+
+
+def test_sample_csv_and_near_me_requests_permission():
+    """O CSV de exemplo carrega e "Perto de mim" pede a permissão de localização antes de ler a posição."""
+    import flet as ft
+    import main
+
+    sample = AcademyLocator.from_csv(os.path.join(os.path.dirname(__file__), "..", "data", "academias.csv"))
+    assert len(sample) == 5
+
+    app = main.AppFBKMKLN(MagicMock())
+    geolocator = MagicMock()
+    geolocator.request_permission.return_value = ft.GeolocatorPermissionStatus.DENIED
+    with patch.object(main, "get_default_academy_locator", return_value=sample), patch.object(
+        main.ft, "Geolocator", return_value=geolocator
+    ):
+        view = app.create_training_location_view()
+        near_me = view.controls[1].controls[1]
+        near_me.on_click(None)
+        geolocator.get_current_position.assert_not_called()
+        assert "Permita" in view.controls[2].value
+
+        geolocator.request_permission.return_value = ft.GeolocatorPermissionStatus.WHILE_IN_USE
+        geolocator.get_current_position.return_value = MagicMock(latitude=-23.0, longitude=-46.0)
+        near_me.on_click(None)
+    results = view.controls[3].controls
+    assert len(results) == 5
+    assert results[0].content.controls[0].controls[0].value == "Academia Exemplo Centro"
+
+
+def test_short_csv_rows_have_empty_fields(tmp_path):
+    """Colunas ausentes em uma linha curta do CSV ficam vazias, não viram o termo "none"."""
+    path = tmp_path / "academias.csv"
+    path.write_text(
+        "NOME,LATITUDE,LONGITUDE,CIDADE,UF\n"
+        "Krav Maga Norte,-3.73,-38.52\n"
+        "Krav Maga Sul,-30.03,-51.23,Porto Alegre,RS\n",
+        encoding="utf-8",
+    )
+    locator = AcademyLocator.from_csv(str(path))
+    assert len(locator) == 2
+    assert locator.records[0]["CIDADE"] == "" and locator.records[0]["UF"] == ""
+    assert locator.search("none") == []
+    assert [a["NOME"] for a in locator.search("krav")] == ["Krav Maga Norte", "Krav Maga Sul"]
@@ -0,0 +1,165 @@
+# tests/test_analysis_cache.py
+
+import shutil
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.analysis_cache import AnalysisCache, analysis_cache_key, file_content_hash
+from src.pose_backends import PoseBackend, PoseResult
+from src.pose_estimator import PoseEstimator
+from src.resource_governor import ResourceGovernor
+from src.session_store import AnalysisSession
+import src.video_analyzer as video_analyzer
+from synthetic import write_stick_figure_video
+
+MB = 2**20
+
+
+class EmptyPoseBackend(PoseBackend):
+    name = "vazio"
+
+    def process(self, image_rgb):
+        return PoseResult(None)
+
+
+def _session(num_frames: int, seed: int = 0) -> AnalysisSession:
+    """Sessão com dados aleatórios (pouco compressíveis) para testar o orçamento em disco."""
+    rng = np.random.default_rng(seed)
+    landmarks = rng.random((num_frames, 33, 4), dtype=np.float32)
+    return AnalysisSession(
+        landmarks,
+        landmarks.copy(),
+        rng.random(num_frames, dtype=np.float32),
+        rng.random((num_frames, 2), dtype=np.float32),
+        ["cotovelo", "joelho"],
+    )
+
+
+def _analyzer(path: str, cache: AnalysisCache):
+    analyzer = video_analyzer.VideoAnalyzer(
+        governor=ResourceGovernor(cpu_slots=1, memory_budget_mb=1024), cache=cache
+    )
+    analyzer.load_video_from_path(path, is_aluno=True)
+    analyzer.load_video_from_path(path, is_aluno=False)
+    return analyzer
+
+
+def test_repeated_analysis_is_served_from_cache(tmp_path, monkeypatch):
+    """Verifica que repetir a análise do mesmo conteúdo reaproveita o resultado salvo."""
+    print("\nExecutando test_repeated_analysis_is_served_from_cache...")
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    path = str(tmp_path / "boneco.avi")
+    write_stick_figure_video(path, num_frames=15, width=320, height=240)
+    cache = AnalysisCache(str(tmp_path / "cache"), max_mb=64)
+
+    first = _analyzer(path, cache)
+    first.run_analysis()
+    assert not first.cache_hit and len(cache) == 1
+
+    # Mesmo conteúdo com outro nome de arquivo (ex: reenvio do aluno).
+    copy = str(tmp_path / "reenvio.avi")
+    shutil.copyfile(path, copy)
+    second = _analyzer(copy, cache)
+    second.run_analysis()
+    assert second.cache_hit
+    assert second.raw_frames_aluno == []
+    assert second.comparison_results == first.comparison_results
+    assert second.aluno_landmarks_list == first.aluno_landmarks_list
+    assert second.metrics.snapshot()["counters"]["cache_hits"] == 1
+
+    # Outro trecho do vídeo é outra análise.
+    third = _analyzer(path, cache)
+    third.run_analysis(aluno_segment=(0.0, 0.2))
+    assert not third.cache_hit
+    print("✓ Análise repetida servida pelo cache (Correto)")
+
+
+def test_cache_key_depends_on_content_and_configuration(tmp_path):
+    """Verifica que a chave muda com o conteúdo, a configuração do modelo e a versão da comparação."""
+    video = tmp_path / "a.bin"
+    video.write_bytes(b"conteudo original")
+    renamed = tmp_path / "b.bin"
+    renamed.write_bytes(b"conteudo original")
+    assert file_content_hash(str(video)) == file_content_hash(str(renamed))
+
+    base = dict(
+        aluno_hash=file_content_hash(str(video)),
+        mestre_hash=file_content_hash(str(renamed)),
+        pose_config={"backend": "mediapipe", "options": {"model_complexity": 1}},
+        comparator_version=1,
+        angle_names=["cotovelo"],
+        frame_ranges={"aluno": (0, 10), "mestre": (0, 10)},
+    )
+    key = analysis_cache_key(**base)
+    assert analysis_cache_key(**base) == key
+    assert analysis_cache_key(**{**base, "comparator_version": 2}) != key
+    assert analysis_cache_key(
+        **{**base, "pose_config": {"backend": "mediapipe", "options": {"model_complexity": 2}}}
+    ) != key
+    assert analysis_cache_key(**{**base, "frame_ranges": {"aluno": (0, 5), "mestre": (0, 10)}}) != key
+
+    video.write_bytes(b"conteudo alterado")
+    os.utime(video, ns=(0, 1))
+    assert analysis_cache_key(**{**base, "aluno_hash": file_content_hash(str(video))}) != key
+
+
+def test_corrupted_entry_is_discarded(tmp_path):
+    """Verifica que uma entrada corrompida vira um miss e é removida do índice."""
+    cache = AnalysisCache(str(tmp_path), max_mb=64)
+    cache.put("chave", _session(10))
+    with open(tmp_path / "chave.npz", "r+b") as f:
+        f.seek(100)
+        f.write(b"\x00" * 64)
+
+    assert cache.get("chave") is None
+    assert len(cache) == 0 and not (tmp_path / "chave.npz").exists()
+    assert cache.misses == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Verifica que o cache respeita o orçamento removendo as entradas menos usadas."""
+    probe = AnalysisCache(str(tmp_path / "medida"), max_mb=64)
+    probe.put("medida", _session(200))
+    entry_mb = probe.total_bytes / MB
+
+    cache = AnalysisCache(str(tmp_path / "cache"), max_mb=2.5 * entry_mb)
+    cache.put("a", _session(200, seed=1))
+    cache.put("b", _session(200, seed=2))
+    assert cache.get("a") is not None  # "b" passa a ser a menos usada
+    cache.put("c", _session(200, seed=3))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.total_bytes <= cache.max_bytes
+    assert not cache.put("grande", _session(2000))
+
+
+def test_cache_hit_clears_previous_error_and_failures_reach_callback(tmp_path, monkeypatch):
+    """Um hit depois de uma falha não reporta o erro antigo; falhas antes do loop ainda chamam o callback."""
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    path = str(tmp_path / "boneco.avi")
+    write_stick_figure_video(path, num_frames=10, width=320, height=240)
+    cache = AnalysisCache(str(tmp_path / "cache"), max_mb=64)
+    _analyzer(path, cache).run_analysis()
+
+    analyzer = _analyzer(path, cache)
+    analyzer.last_error = RuntimeError("análise anterior interrompida")
+    analyzer.run_analysis()
+    assert analyzer.cache_hit and analyzer.last_error is None
+
+    def broken_cache_key():
+        raise OSError("disco indisponível")
+
+    failing = _analyzer(path, cache)
+    monkeypatch.setattr(failing, "_cache_key", broken_cache_key)
+    done = []
+    failing.analyze_and_compare(lambda: done.append(failing.is_processing))
+    failing.processing_thread.join(timeout=30)
+    assert done == [False]
+    assert isinstance(failing.last_error, OSError)
+    assert failing.governor.snapshot()["em_execucao"] == 0
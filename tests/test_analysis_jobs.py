@@ -0,0 +1,360 @@
+# tests/test_analysis_jobs.py
+
+import numpy as np
+import pytest
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.analysis_jobs import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    AnalysisJobQueue,
+    AnalysisWorkerPool,
+)
+from synthetic import write_stick_figure_video
+
+
+@pytest.fixture(scope="module")
+def videos(tmp_path_factory):
+    """Par de vídeos sintéticos curtos (aluno e mestre)."""
+    directory = tmp_path_factory.mktemp("videos_jobs")
+    aluno = str(directory / "aluno.avi")
+    mestre = str(directory / "mestre.avi")
+    write_stick_figure_video(aluno, num_frames=12, width=320, height=240, variant=1)
+    write_stick_figure_video(mestre, num_frames=12, width=320, height=240, variant=0)
+    return aluno, mestre
+
+
+def test_queue_is_durable_and_claims_each_job_once(tmp_path, videos):
+    """Verifica que jobs sobrevivem a reabrir a fila e que cada um é reservado uma única vez."""
+    print("\nExecutando test_queue_is_durable_and_claims_each_job_once...")
+    db_path = str(tmp_path / "fila.sqlite3")
+    first = AnalysisJobQueue(db_path)
+    job_a = first.submit(*videos)
+    job_b = first.submit(*videos, aluno_segment=(0.1, 0.3))
+    first.close()
+
+    queue = AnalysisJobQueue(db_path)
+    assert [job.job_id for job in queue.list_jobs(JOB_PENDING)] == [job_a, job_b]
+    assert queue.claim(worker_pid=111).job_id == job_a
+    claimed = queue.claim(worker_pid=222)
+    assert claimed.job_id == job_b and claimed.options["aluno_segment"] == [0.1, 0.3]
+    assert queue.claim(worker_pid=333) is None
+
+    queue.fail(job_b, "erro de teste")
+    assert queue.get(job_b).status == JOB_FAILED
+    with pytest.raises(ValueError):
+        queue.load_result(job_b)
+    with pytest.raises(ValueError):
+        queue.submit(str(tmp_path / "inexistente.mp4"), videos[1])
+    print("✓ Fila durável e sem reserva duplicada (Correto)")
+
+
+def test_orphaned_jobs_return_to_queue(tmp_path, videos):
+    """Verifica que o job de um worker morto volta para a fila até esgotar as tentativas."""
+    queue = AnalysisJobQueue(str(tmp_path / "fila.sqlite3"), max_attempts=2)
+    job_id = queue.submit(*videos)
+
+    queue.claim(worker_pid=111)
+    assert queue.requeue_orphaned(alive_pids=[111]) == 0
+    assert queue.get(job_id).status == JOB_RUNNING
+    assert queue.requeue_orphaned(alive_pids=[]) == 1
+    assert queue.get(job_id).status == JOB_PENDING
+
+    queue.claim(worker_pid=222)
+    queue.requeue_orphaned()
+    job = queue.get(job_id)
+    assert job.status == JOB_FAILED and job.attempts == 2
+    assert "222" in job.error
+
+
+def test_queue_reports_position_and_eta(tmp_path, videos):
+    """A fila informa a posição de um job pendente e a espera estimada pelos jobs anteriores."""
+    print("\nExecutando test_queue_reports_position_and_eta...")
+    queue = AnalysisJobQueue(str(tmp_path / "fila.sqlite3"))
+    ids = [queue.submit(*videos) for _ in range(4)]
+    # Sem jobs concluídos não há como estimar a espera.
+    assert queue.queue_status(ids[2]) == {"position": 3, "eta_seconds": None}
+
+    done = queue.claim(worker_pid=1)
+    queue.complete(done.job_id, None, {})
+    running = queue.claim(worker_pid=2)
+    queue.update_progress(running.job_id, 0.5)
+    with queue._lock:
+        # Jobs levam 10 s; o em execução está na metade, após 4 s.
+        queue._db.execute("UPDATE analysis_jobs SET started_at = finished_at - 10 WHERE job_id = ?", (done.job_id,))
+        queue._db.execute("UPDATE analysis_jobs SET started_at = ? WHERE job_id = ?", (time.time() - 4, running.job_id))
+
+    assert queue.queue_status(running.job_id) is None
+    one_worker = queue.queue_status(ids[3], num_workers=1)
+    two_workers = queue.queue_status(ids[3], num_workers=2)
+    queue.close()
+    assert one_worker["position"] == two_workers["position"] == 2
+    # Um worker: espera o atual (4 s) e o job à frente (10 s). Dois: o job à
+    # frente vai para o worker livre e este espera só o atual.
+    assert one_worker["eta_seconds"] == pytest.approx(14, abs=0.5)
+    assert two_workers["eta_seconds"] == pytest.approx(4, abs=0.5)
+    print("✓ Posição e espera estimada na fila (Correto)")
+
+
+def test_pool_splits_budget_across_workers(tmp_path, monkeypatch):
+    """O orçamento do governor vale para o pool: memória dividida e um worker por vaga de CPU."""
+    import src.analysis_jobs as analysis_jobs
+
+    print("\nExecutando test_pool_splits_budget_across_workers...")
+    monkeypatch.setattr(analysis_jobs, "default_cpu_slots", lambda: 4)
+    pool = AnalysisWorkerPool(num_workers=2, db_path=str(tmp_path / "fila.sqlite3"), memory_budget_mb=1000)
+    pool.queue.close()
+    assert pool.num_workers == 2 and pool.worker_memory_budget_mb == 500
+
+    monkeypatch.setattr(analysis_jobs, "default_cpu_slots", lambda: 1)
+    limited = AnalysisWorkerPool(num_workers=2, db_path=str(tmp_path / "fila.sqlite3"), memory_budget_mb=1000)
+    limited.queue.close()
+    assert limited.num_workers == 1 and limited.worker_memory_budget_mb == 1000
+    print("✓ Orçamento dividido entre os workers (Correto)")
+
+
+def test_worker_pool_runs_analysis_in_another_process(tmp_path, videos):
+    """Executa jobs reais em um processo worker e carrega o resultado salvo."""
+    print("\nExecutando test_worker_pool_runs_analysis_in_another_process...")
+    broken = tmp_path / "corrompido.mp4"
+    broken.write_bytes(b"isto nao e um video")
+
+    with AnalysisWorkerPool(
+        num_workers=1,
+        db_path=str(tmp_path / "fila.sqlite3"),
+        results_dir=str(tmp_path / "resultados"),
+        poll_interval=0.1,
+        cache_dir=str(tmp_path / "cache"),
+        log_dir=str(tmp_path / "logs"),
+    ) as pool:
+        ok_id = pool.queue.submit(*videos)
+        broken_id = pool.queue.submit(str(broken), videos[1])
+        ok_job = pool.queue.wait(ok_id, timeout=120)
+        broken_job = pool.queue.wait(broken_id, timeout=60)
+        # O mesmo par de vídeos de novo: resultado vem do cache de análises.
+        repeated_job = pool.queue.wait(pool.queue.submit(*videos), timeout=60)
+        worker_pids = pool.worker_pids
+
+    assert os.getpid() not in worker_pids
+    assert ok_job.status == JOB_DONE and ok_job.progress == 1.0
+    assert ok_job.worker_pid in worker_pids
+    assert ok_job.summary["num_frames"] == 12 and not ok_job.summary["cache"]
+    assert repeated_job.summary["cache"] and repeated_job.summary["num_frames"] == 12
+    assert repeated_job.summary["avg_score"] == pytest.approx(ok_job.summary["avg_score"])
+    session = pool.queue.load_result(ok_id)
+    assert session.num_frames == 12
+    assert broken_job.status == JOB_FAILED and broken_job.error
+    assert (tmp_path / "logs" / "analysis_worker_0.log").exists()
+    # Os resultados parciais são apagados quando o job termina.
+    assert not list((tmp_path / "resultados").glob("*.parcial*"))
+    print(f"✓ Análise executada no processo {ok_job.worker_pid} (Correto)")
+
+
+def test_repetition_job_keeps_result_in_summary(tmp_path, videos, monkeypatch):
+    """Verifica que um job de repetições conclui com o resumo por repetição e sem sessão."""
+    import src.video_analyzer as video_analyzer
+    from src.analysis_jobs import _process_job
+    from src.pose_backends import PoseBackend, PoseResult
+    from src.pose_estimator import PoseEstimator
+
+    class EmptyPoseBackend(PoseBackend):
+        name = "vazio"
+
+        def process(self, image_rgb):
+            return PoseResult(None)
+
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    queue = AnalysisJobQueue(str(tmp_path / "fila.sqlite3"))
+    job_id = queue.submit(*videos, repetitions=True)
+    job = queue.claim(worker_pid=os.getpid())
+    assert job.options == {"repetitions": True}
+
+    _process_job(queue, video_analyzer.VideoAnalyzer(), job, str(tmp_path))
+    job = queue.get(job_id)
+    assert job.status == JOB_DONE
+    # Sem pose detectada, a gravação inteira é uma única "repetição" com nota 0.
+    assert job.summary["num_repetitions"] == 1 and job.summary["avg_score"] == 0.0
+    with pytest.raises(ValueError):
+        queue.load_result(job_id)
+
+
+def test_analyzer_view_submits_job_to_worker_pool(tmp_path, videos, monkeypatch):
+    """A tela do analisador envia o job para a fila e exibe o resultado carregado do worker."""
+    from unittest.mock import MagicMock
+
+    import main
+
+    print("\nExecutando test_analyzer_view_submits_job_to_worker_pool...")
+    with AnalysisWorkerPool(
+        num_workers=1,
+        db_path=str(tmp_path / "fila.sqlite3"),
+        results_dir=str(tmp_path / "resultados"),
+        poll_interval=0.1,
+        cache_dir=str(tmp_path / "cache"),
+        log_dir=str(tmp_path / "logs"),
+    ) as pool:
+        monkeypatch.setattr(main, "get_default_worker_pool", lambda: pool)
+        monkeypatch.setattr(main, "ANALYSIS_JOB_POLL_SECONDS", 0.05)
+        app = main.AppFBKMKLN(MagicMock())
+        app.record_progress = MagicMock()
+        app.analysis_state["aluno"], app.analysis_state["mestre"] = videos
+        view = app.create_analyzer_view({"LOGIN": "aluno1"})
+        analyze_button = view.controls[4].controls[0]
+        assert not analyze_button.disabled
+
+        analyze_button.on_click(None)
+        job_id = app.analysis_state["job_id"]
+        assert job_id is not None and analyze_button.disabled
+        deadline = time.monotonic() + 120
+        while app.analysis_state["results"] is None and time.monotonic() < deadline:
+            time.sleep(0.1)
+        job = pool.queue.get(job_id)
+        app.close_analyzer()
+
+    assert job.status == JOB_DONE and job.worker_pid != os.getpid()
+    assert app.analysis_state["job_id"] is None
+    assert app.analysis_state["results"].snapshot().num_frames == 12
+    app.record_progress.assert_called_once()
+    print("✓ Análise da tela executada no worker (Correto)")
+
+
+def test_worker_job_does_not_keep_frames(tmp_path, videos):
+    """O job do worker salva só landmarks e pontuações: nenhum frame fica em memória."""
+    from src.analysis_jobs import _process_job
+    from src.video_analyzer import VideoAnalyzer
+
+    print("\nExecutando test_worker_job_does_not_keep_frames...")
+    queue = AnalysisJobQueue(str(tmp_path / "fila.sqlite3"))
+    job_id = queue.submit(*videos)
+    job = queue.claim(worker_pid=os.getpid())
+    analyzer = VideoAnalyzer()
+    requested, kept = [], []
+    request = analyzer.governor.request
+    analyzer.governor.request = lambda cost, **kwargs: requested.append(cost) or request(cost, **kwargs)
+    clear_frames = analyzer.clear_frames
+
+    def record_and_clear():
+        kept.append(
+            [
+                len(frames)
+                for frames in (
+                    analyzer.processed_frames_aluno,
+                    analyzer.processed_frames_mestre,
+                    analyzer.raw_frames_aluno,
+                    analyzer.raw_frames_mestre,
+                )
+            ]
+        )
+        clear_frames()
+
+    analyzer.clear_frames = record_and_clear
+    try:
+        _process_job(queue, analyzer, job, str(tmp_path))
+    finally:
+        analyzer.close()
+
+    assert queue.get(job_id).status == JOB_DONE
+    assert queue.load_result(job_id).num_frames == 12
+    # A última limpeza é a do fim do job: as listas de frames nunca foram preenchidas.
+    assert kept[-1] == [0, 0, 0, 0]
+    assert requested and all(cost.num_frames == 0 for cost in requested)
+    print("✓ Job do worker sem frames em memória (Correto)")
+
+
+def test_partial_result_writer_checkpoints_current_job(tmp_path):
+    """O worker salva os frames já analisados do job atual, no máximo a cada intervalo."""
+    import types
+
+    from src.analysis_jobs import PartialResultWriter
+    from src.analysis_results import AnalysisResults
+    from src.progress_bus import ProgressEvent
+    from src.session_store import load_session
+
+    print("\nExecutando test_partial_result_writer_checkpoints_current_job...")
+    analyzer = types.SimpleNamespace(
+        results=AnalysisResults(10, ["LEFT_ELBOW_ANGLE"], generation=3),
+        video_aluno_path="aluno.avi",
+        video_mestre_path="mestre.avi",
+        segment_start_frames={"aluno": 5, "mestre": 0},
+    )
+    analyzer.snapshot_results = lambda: analyzer.results.snapshot()
+    path = str(tmp_path / "job.parcial.npz")
+    writer = PartialResultWriter(analyzer, path, interval=60)
+
+    # Ainda o buffer da análise anterior: nada é salvo.
+    writer(ProgressEvent(0.0))
+    assert not os.path.exists(path)
+
+    analyzer.results = AnalysisResults(10, ["LEFT_ELBOW_ANGLE"], generation=4)
+    for score in (50.0, 70.0, 90.0):
+        analyzer.results.append(score, "ok", {"LEFT_ELBOW_ANGLE": 10.0}, None, None)
+    writer(ProgressEvent(0.3, 3, 10))
+    partial = load_session(path, mmap=False)
+    assert partial.num_frames == 3 and list(partial.scores) == [50.0, 70.0, 90.0]
+    assert partial.video_aluno == "aluno.avi"
+    assert partial.metadata == {"start_frames": {"aluno": 5, "mestre": 0}, "total_frames": 10}
+
+    # Antes do intervalo, novos frames esperam o próximo checkpoint.
+    analyzer.results.append(10.0, "ok", {}, None, None)
+    writer(ProgressEvent(0.4, 4, 10))
+    assert load_session(path, mmap=False).num_frames == 3
+    writer.interval = 0
+    writer(ProgressEvent(0.4, 4, 10))
+    assert load_session(path, mmap=False).num_frames == 4
+
+    writer.remove()
+    assert not os.path.exists(path)
+    print("✓ Resultado parcial salvo durante a análise (Correto)")
+
+
+def test_analyzer_view_shows_partial_results(tmp_path, videos, monkeypatch):
+    """Enquanto o job roda, a tela exibe os frames do resultado parcial salvo pelo worker."""
+    import types
+    from unittest.mock import MagicMock
+
+    import main
+    from src.session_store import AnalysisSession
+
+    print("\nExecutando test_analyzer_view_shows_partial_results...")
+    partial = AnalysisSession(
+        np.zeros((4, 33, 4), dtype=np.float32),
+        np.zeros((4, 33, 4), dtype=np.float32),
+        np.full(4, 80.0, dtype=np.float32),
+        np.zeros((4, 1), dtype=np.float32),
+        ["LEFT_ELBOW_ANGLE"],
+        video_aluno=videos[0],
+        video_mestre=videos[1],
+    )
+    running = types.SimpleNamespace(status=JOB_RUNNING, progress=0.3, finished=False)
+    queue = MagicMock()
+    queue.submit.return_value = "job1"
+    queue.get.return_value = running
+    pool = MagicMock(queue=queue)
+    pool.load_partial.return_value = partial
+    monkeypatch.setattr(main, "get_default_worker_pool", lambda: pool)
+    monkeypatch.setattr(main, "ANALYSIS_JOB_POLL_SECONDS", 0.02)
+    monkeypatch.setattr(main, "ANALYSIS_CHECKPOINT_SECONDS", 0.0)
+
+    app = main.AppFBKMKLN(MagicMock())
+    app.analysis_state["aluno"], app.analysis_state["mestre"] = videos
+    view = app.create_analyzer_view({"LOGIN": "aluno1"})
+    view.controls[4].controls[0].on_click(None)
+    deadline = time.monotonic() + 10
+    while app.frame_delivery is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    slider = view.controls[7].controls[0]
+    try:
+        assert app.frame_delivery is not None and not slider.disabled and slider.max == 3
+        assert app.analysis_state["results"].snapshot().num_frames == 4
+        assert app.analysis_state["job_id"] == "job1"
+    finally:
+        app.analysis_state["watcher"] = None
+        app.close_analyzer()
+    print("✓ Resultado parcial exibido durante a análise (Correto)")
@@ -0,0 +1,161 @@
+# tests/test_analysis_results.py
+
+import threading
+import numpy as np
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.analysis_results import AnalysisResults
+from src.pose_backends import PoseBackend, PoseResult, landmarks_from_array
+from src.pose_estimator import PoseEstimator
+from src.resource_governor import ResourceGovernor
+from src.session_store import landmarks_list_to_array
+import src.video_analyzer as video_analyzer
+from synthetic import pose_to_landmarks, stick_figure_pose, write_stick_figure_video
+
+ANGLES = ["cotovelo", "joelho"]
+
+
+def _landmarks(value: float) -> list:
+    return [{"x": value, "y": value, "z": 0.0, "visibility": 1.0}] * 33
+
+
+def _append(results: AnalysisResults, i: int):
+    """Frame i com todos os campos derivados de i, para detectar leituras misturadas."""
+    results.append(
+        float(i), str(i), {"cotovelo": float(i)}, _landmarks(i), _landmarks(-i),
+        np.full((2, 2), i), np.full((2, 2), -i),
+    )
+
+
+def test_snapshot_is_immutable_and_incremental():
+    """Verifica que um snapshot não muda com novos frames e expõe só os publicados."""
+    print("\nExecutando test_snapshot_is_immutable_and_incremental...")
+    results = AnalysisResults(10, ANGLES)
+    for i in range(3):
+        _append(results, i)
+    first = results.snapshot()
+    for i in range(3, 7):
+        _append(results, i)
+    second = results.snapshot()
+
+    assert first.num_frames == 3 and second.num_frames == 7
+    assert not second.finished and second.progress == pytest.approx(0.7)
+    assert [r["score"] for r in second.frame_results(first.num_frames)] == [3.0, 4.0, 5.0, 6.0]
+    assert second.frame_result(5) == {"score": 5.0, "feedback": "5", "diffs": {"cotovelo": 5.0}}
+    assert second.processed_frame(4, is_aluno=False)[0, 0] == -4
+    with pytest.raises(ValueError):
+        first.scores[0] = 99.0
+    with pytest.raises(IndexError):
+        first.processed_frame(3)
+
+    results.finish()
+    assert results.snapshot().finished and results.snapshot().progress == 1.0
+    print("✓ Snapshots imutáveis e leitura incremental (Correto)")
+
+
+def test_concurrent_reader_never_sees_partial_frames():
+    """Lê snapshots em outra thread enquanto a escritora publica frames."""
+    print("\nExecutando test_concurrent_reader_never_sees_partial_frames...")
+    total = 3000
+    results = AnalysisResults(total, ANGLES)
+    errors, counts = [], []
+
+    def reader():
+        while True:
+            snapshot = results.snapshot()
+            n = snapshot.num_frames
+            counts.append(n)
+            if n:
+                last = n - 1
+                # O último frame publicado está completo em todos os campos.
+                if not (
+                    snapshot.scores[last] == last
+                    and snapshot.feedbacks[last] == str(last)
+                    and snapshot.angle_diffs[last, 0] == last
+                    and snapshot.aluno_landmarks[last, 0, 0] == last
+                    and snapshot.mestre_landmarks[last, 0, 0] == -last
+                    and snapshot.processed_frame(last)[0, 0] == last
+                ):
+                    errors.append(last)
+            if snapshot.finished:
+                return
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(total):
+        _append(results, i)
+    results.finish()
+    thread.join(timeout=30)
+
+    assert not errors
+    assert counts == sorted(counts) and counts[-1] == total
+    print(f"✓ {len(counts)} leituras concorrentes consistentes (Correto)")
+
+
+class SteppedBackend(PoseBackend):
+    """Devolve as poses do boneco e pausa a análise depois de 'pause_after' chamadas."""
+
+    name = "passo_a_passo"
+
+    def __init__(self, poses: list, pause_after: int):
+        self._poses = poses
+        self._calls = 0
+        self.pause_after = pause_after
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def process(self, image_rgb):
+        if self._calls == self.pause_after:
+            self.paused.set()
+            self.resume.wait(10)
+        array = landmarks_list_to_array(self._poses[self._calls % len(self._poses)])
+        self._calls += 1
+        return PoseResult(landmarks_from_array(array))
+
+
+def test_analyzer_publishes_partial_results(tmp_path):
+    """Lê resultados parciais do VideoAnalyzer durante a análise e troca de geração."""
+    path = str(tmp_path / "boneco.avi")
+    write_stick_figure_video(path, num_frames=20, width=320, height=240)
+    poses = [pose_to_landmarks(stick_figure_pose(i / 20)) for i in range(20)]
+    backend = SteppedBackend(poses, pause_after=10)
+
+    analyzer = video_analyzer.VideoAnalyzer(governor=ResourceGovernor(cpu_slots=1, memory_budget_mb=1024))
+    # O mesmo estimador para os dois vídeos: o backend de teste segue a ordem das chamadas.
+    analyzer.pose_estimator = analyzer.mestre_pose_estimator = PoseEstimator(backend, roi_tracking=False)
+    analyzer.load_video_from_path(path, is_aluno=True)
+    analyzer.load_video_from_path(path, is_aluno=False)
+    thread = threading.Thread(target=analyzer.run_analysis, kwargs={"keep_frames": True})
+    thread.start()
+
+    # Duas chamadas de pose por frame: 10 chamadas = 5 frames completos.
+    assert backend.paused.wait(10)
+    partial = analyzer.snapshot_results()
+    assert partial.num_frames == 5 and partial.total_frames == 20 and not partial.finished
+    assert partial.processed_frame(4) is not None
+    backend.resume.set()
+    thread.join(timeout=30)
+
+    final = analyzer.snapshot_results()
+    assert final.finished and final.num_frames == 20
+    assert final.generation == partial.generation
+    # Arrays em float32, como na AnalysisSession.
+    scores = [r["score"] for r in analyzer.comparison_results]
+    assert [r["score"] for r in final.frame_results()] == pytest.approx(scores, rel=1e-6)
+    assert [r["feedback"] for r in final.frame_results()] == [r["feedback"] for r in analyzer.comparison_results]
+    np.testing.assert_array_equal(final.aluno_landmarks[4], partial.aluno_landmarks[4])
+
+    # Nova análise: novo buffer; o snapshot anterior continua íntegro.
+    analyzer.clear_frames()
+    assert analyzer.snapshot_results().processed_frame(4) is None
+    assert final.processed_frame(4) is not None
+    analyzer.load_video_from_path(path, is_aluno=True)
+    analyzer.load_video_from_path(path, is_aluno=False)
+    analyzer.run_analysis()
+    assert analyzer.snapshot_results().generation == final.generation + 1
+    assert final.num_frames == 20 and list(final.scores) == pytest.approx(scores, rel=1e-6)
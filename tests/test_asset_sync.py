@@ -0,0 +1,159 @@
+# tests/test_asset_sync.py
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.asset_sync import AssetSyncClient, AssetSyncError, asset_rank, update_manifest
+from synthetic import LocalAssetServer
+
+CHUNK = 64 * 1024
+
+
+def _write(path, size: int, seed: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(bytes((seed + i * 7) % 251 for i in range(size)))
+
+
+@pytest.fixture
+def server_assets(tmp_path):
+    """Pasta de assets do servidor com três faixas."""
+    root = tmp_path / "servidor"
+    _write(str(root / "programa_tecnico" / "Branca.pdf"), 50_000, 1)
+    _write(str(root / "programa_tecnico" / "Amarela.pdf"), 90_000, 2)
+    _write(str(root / "programa_tecnico" / "Preta.pdf"), 70_000, 3)
+    _write(str(root / "videos_tecnicas" / "Branca" / "Soco.mp4"), 300_000, 4)
+    _write(str(root / "videos_tecnicas" / "Amarela" / "Chute.mp4"), 200_000, 5)
+    _write(str(root / "videos_tecnicas" / "Preta" / "Faca.mp4"), 400_000, 6)
+    return root
+
+
+def _manifest(root):
+    """Manifesto em blocos de 64 KB gravado na pasta servida."""
+    return update_manifest(str(root), chunk_size=CHUNK)
+
+
+def test_sync_downloads_only_accessible_ranks_then_only_changes(server_assets, tmp_path):
+    """Primeira sincronização baixa as faixas do aluno; a seguinte, só o que mudou."""
+    print("\nExecutando test_sync_downloads_only_accessible_ranks_then_only_changes...")
+    manifest = _manifest(server_assets)
+    assert manifest["files"]["videos_tecnicas/Preta/Faca.mp4"]["rank"] == "Preta"
+    assert len(manifest["files"]["videos_tecnicas/Branca/Soco.mp4"]["chunks"]) == 5
+    local = tmp_path / "celular"
+
+    with LocalAssetServer(str(server_assets)) as server:
+        client = AssetSyncClient(server.url(""), str(local))
+        first = client.sync(["Branca", "Amarela"])
+        assert sorted(first.downloaded) == [
+            "programa_tecnico/Amarela.pdf",
+            "programa_tecnico/Branca.pdf",
+            "videos_tecnicas/Amarela/Chute.mp4",
+            "videos_tecnicas/Branca/Soco.mp4",
+        ]
+        assert first.bytes_downloaded == 640_000
+        assert not (local / "programa_tecnico" / "Preta.pdf").exists()
+        assert (local / "videos_tecnicas" / "Branca" / "Soco.mp4").read_bytes() == (
+            server_assets / "videos_tecnicas" / "Branca" / "Soco.mp4"
+        ).read_bytes()
+
+        # Nada mudou: só o manifesto trafega.
+        server.reset_counters()
+        second = AssetSyncClient(server.url(""), str(local)).sync(["Branca", "Amarela"])
+        assert second.downloaded == [] and second.up_to_date == 4
+        assert server.stats["requests"] == 1
+
+        # Um PDF alterado e um vídeo removido no servidor.
+        _write(str(server_assets / "programa_tecnico" / "Amarela.pdf"), 95_000, 9)
+        os.remove(server_assets / "videos_tecnicas" / "Branca" / "Soco.mp4")
+        _manifest(server_assets)
+        server.reset_counters()
+        third = client.sync(["Branca", "Amarela"])
+
+    assert third.downloaded == ["programa_tecnico/Amarela.pdf"]
+    assert third.bytes_downloaded == 95_000
+    assert third.deleted == ["videos_tecnicas/Branca/Soco.mp4"]
+    assert not (local / "videos_tecnicas" / "Branca" / "Soco.mp4").exists()
+    print("✓ Só os arquivos novos ou alterados são baixados (Correto)")
+
+
+def test_interrupted_download_resumes_from_last_valid_chunk(server_assets, tmp_path):
+    """Uma queda no meio do download é retomada do último bloco verificado."""
+    print("\nExecutando test_interrupted_download_resumes_from_last_valid_chunk...")
+    _manifest(server_assets)
+    local = tmp_path / "celular"
+
+    with LocalAssetServer(str(server_assets)) as server:
+        client = AssetSyncClient(server.url(""), str(local), retries=0)
+        # Manifesto, os 2 blocos do PDF e 3 blocos do vídeo; depois a conexão "cai".
+        server.fail_after(6)
+        interrupted = client.sync(["Preta"])
+        assert interrupted.downloaded == ["programa_tecnico/Preta.pdf"]
+        assert list(interrupted.failed) == ["videos_tecnicas/Preta/Faca.mp4"]
+        assert not (local / "videos_tecnicas" / "Preta" / "Faca.mp4").exists()
+
+        server.fail_after(None)
+        resumed = client.sync(["Preta"])
+
+    assert resumed.downloaded == ["videos_tecnicas/Preta/Faca.mp4"] and resumed.up_to_date == 1
+    assert resumed.resumed_bytes == 3 * CHUNK
+    assert resumed.bytes_downloaded == 400_000 - 3 * CHUNK
+    assert (local / "videos_tecnicas" / "Preta" / "Faca.mp4").read_bytes() == (
+        server_assets / "videos_tecnicas" / "Preta" / "Faca.mp4"
+    ).read_bytes()
+    assert not [name for name in os.listdir(local / "videos_tecnicas" / "Preta") if name.endswith(".part")]
+    print("✓ Download retomado do ponto da queda (Correto)")
+
+
+def test_corrupted_content_is_rejected(server_assets, tmp_path):
+    """Conteúdo que não confere com o manifesto nunca substitui o arquivo local."""
+    _manifest(server_assets)
+    # O servidor passa a entregar outro conteúdo sem regerar o manifesto.
+    _write(str(server_assets / "programa_tecnico" / "Branca.pdf"), 50_000, 42)
+    local = tmp_path / "celular"
+
+    with LocalAssetServer(str(server_assets)) as server:
+        report = AssetSyncClient(server.url(""), str(local), retries=1).sync(["Branca"])
+        assert list(report.failed) == ["programa_tecnico/Branca.pdf"]
+        assert report.downloaded == ["videos_tecnicas/Branca/Soco.mp4"]
+        assert not (local / "programa_tecnico" / "Branca.pdf").exists()
+
+        # Manifesto com caminho fora da pasta local é recusado.
+        manifest = json.loads((server_assets / "asset_manifest.json").read_text())
+        manifest["files"]["../fora.pdf"] = dict(manifest["files"]["programa_tecnico/Branca.pdf"])
+        (server_assets / "asset_manifest.json").write_text(json.dumps(manifest))
+        with pytest.raises(AssetSyncError):
+            AssetSyncClient(server.url(""), str(local)).sync(["Branca"])
+
+    assert asset_rank("videos_tecnicas/Preta e Branca/Faca.mp4") == "Preta e Branca"
+    assert asset_rank("icon.jpg") is None
+
+
+def test_bundled_identical_files_are_not_downloaded(server_assets, tmp_path):
+    """Assets que já vêm com a instalação (sem estado salvo) não são baixados de novo."""
+    print("\nExecutando test_bundled_identical_files_are_not_downloaded...")
+    _manifest(server_assets)
+    local = tmp_path / "instalacao"
+    for relative in ("programa_tecnico/Branca.pdf", "videos_tecnicas/Branca/Soco.mp4"):
+        os.makedirs(local / os.path.dirname(relative), exist_ok=True)
+        (local / relative).write_bytes((server_assets / relative).read_bytes())
+    # Mesmo tamanho, conteúdo diferente: precisa ser baixado.
+    _write(str(local / "programa_tecnico" / "Amarela.pdf"), 90_000, 8)
+
+    with LocalAssetServer(str(server_assets)) as server:
+        report = AssetSyncClient(server.url(""), str(local)).sync(["Branca"])
+        assert report.downloaded == [] and report.bytes_downloaded == 0
+        assert report.up_to_date == 2
+        assert server.stats["requests"] == 1
+        amarela = AssetSyncClient(server.url(""), str(local)).sync(["Branca", "Amarela"])
+
+    assert sorted(amarela.downloaded) == ["programa_tecnico/Amarela.pdf", "videos_tecnicas/Amarela/Chute.mp4"]
+    assert amarela.up_to_date == 2
+    state = json.loads((local / ".asset_sync_state.json").read_text())
+    assert "videos_tecnicas/Branca/Soco.mp4" in state["files"]
+    print("✓ Arquivos idênticos da instalação reaproveitados (Correto)")
@@ -0,0 +1,52 @@
+# tests/test_benchmark_suite.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.auth import AuthService
+from src.config import POSE_LANDMARK_NAMES
+from run_suite import compare_with_baseline
+from synthetic import LocalSheetServer, write_stick_figure_video, write_users_csv
+
+
+def test_local_sheet_server_replaces_google_sheet(tmp_path):
+    """Verifica que o AuthService funciona offline com a planilha servida localmente."""
+    print("\nExecutando test_local_sheet_server_replaces_google_sheet...")
+    credentials = write_users_csv(str(tmp_path / "usuarios.csv"), num_users=20)
+    with LocalSheetServer(str(tmp_path)) as server:
+        service = AuthService(server.url("usuarios.csv"))
+
+    assert len(service.user_data) == 20
+    cpf, senha = credentials[1]
+    assert service.login(cpf, senha)["NOME"] == "Aluno 1"
+    # O usuário 0 está inativo.
+    assert service.login(*credentials[0]) is None
+    print("✓ Planilha local usada no lugar do Google Sheets (Correto)")
+
+
+def test_stick_figure_video_has_ground_truth(tmp_path):
+    """Verifica que o vídeo sintético é gravado junto com os landmarks de cada frame."""
+    import cv2
+
+    path = str(tmp_path / "boneco.avi")
+    landmarks = write_stick_figure_video(path, num_frames=10, width=160, height=120)
+    cap = cv2.VideoCapture(path)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 10
+    cap.release()
+    assert len(landmarks) == 10
+    assert [lm["name"] for lm in landmarks[0]] == POSE_LANDMARK_NAMES
+    # O punho direito avança ao longo do golpe.
+    right_wrist = POSE_LANDMARK_NAMES.index("RIGHT_WRIST")
+    assert landmarks[5][right_wrist]["x"] < landmarks[0][right_wrist]["x"]
+
+
+def test_compare_with_baseline_flags_slowdowns():
+    """Verifica que só casos acima da tolerância contam como regressão."""
+    baseline = {"cases": {"rapido": {"ms": 1.0}, "lento": {"ms": 1.0}}}
+    results = {"rapido": {"ms": 1.2}, "lento": {"ms": 2.0}, "novo": {"ms": 5.0}}
+    regressions = compare_with_baseline(results, baseline, tolerance=0.5)
+    assert len(regressions) == 1 and regressions[0].startswith("lento")
+    assert results["rapido"]["ratio"] == 1.2
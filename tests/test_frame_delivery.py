@@ -0,0 +1,100 @@
+# tests/test_frame_delivery.py
+
+import base64
+import threading
+import time
+import cv2
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.analysis_results import AnalysisResults
+from src.frame_delivery import AnalysisFrameSource, EncodedFrameCache, FrameDelivery, JpegFrameEncoder
+from synthetic import pose_to_landmarks, stick_figure_pose, write_stick_figure_video
+
+ANGLES = ["RIGHT_ELBOW_ANGLE"]
+
+
+def _decode(payload: str) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(base64.b64decode(payload), np.uint8), cv2.IMREAD_COLOR)
+
+
+def _results(num_frames: int, with_frames: bool = True) -> AnalysisResults:
+    results = AnalysisResults(num_frames, ANGLES)
+    for i in range(num_frames):
+        frame = np.full((240, 320, 3), i % 256, dtype=np.uint8) if with_frames else None
+        landmarks = pose_to_landmarks(stick_figure_pose(i / 20))
+        results.append(float(i % 100), "", {}, landmarks, landmarks, frame, frame)
+    results.finish()
+    return results
+
+
+def test_encoder_scales_to_display_width():
+    """Verifica que o frame é reduzido para a largura de exibição antes do JPEG."""
+    print("\nExecutando test_encoder_scales_to_display_width...")
+    frame = np.random.default_rng(0).integers(0, 255, (720, 2560, 3), dtype=np.uint8)
+    encoder = JpegFrameEncoder(display_width=640, quality=70)
+    image = _decode(encoder.encode(frame))
+    assert image.shape == (180, 640, 3)
+    # Frames menores que a largura de exibição não são ampliados.
+    assert _decode(encoder.encode(frame[:100, :200])).shape == (100, 200, 3)
+    print("✓ Frame reduzido para 640x180 (Correto)")
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    """Verifica o limite em bytes e a ordem de remoção do cache LRU."""
+    cache = EncodedFrameCache(max_mb=3 * 1000 / 2**20)
+    for key in "abc":
+        cache.put(key, "x" * 1000)
+    assert cache.get("a") is not None
+    cache.put("d", "x" * 1000)
+    assert "b" not in cache and "a" in cache and len(cache) == 3
+    assert cache.size_bytes == 3000
+
+
+def test_delivery_coalesces_scrubbing_and_prefetches():
+    """Simula o arraste do controle: só os pedidos mais recentes são entregues."""
+    print("\nExecutando test_delivery_coalesces_scrubbing_and_prefetches...")
+    results = _results(300)
+    delivered = []
+    done = threading.Event()
+
+    def on_frame(index, payload):
+        delivered.append(index)
+        if index == 299:
+            done.set()
+
+    source = AnalysisFrameSource(results.snapshot)
+    delivery = FrameDelivery(source, on_frame, max_fps=20, prefetch=6).start()
+    for index in range(300):
+        delivery.request(index)
+        time.sleep(0.001)
+    assert done.wait(10)
+    delivery.close()
+
+    assert delivered[-1] == 299 and len(delivered) < 300
+    assert delivered == sorted(delivered)
+    # O frame entregue tem o valor do frame processado (aluno | mestre lado a lado).
+    frame = _decode(delivery.frame(150))
+    assert abs(int(frame[frame.shape[0] // 2, 5, 0]) - 150) <= 3
+    # A janela à frente da posição foi pré-codificada durante as pausas.
+    assert any((results.generation, i) in delivery.cache for i in range(300) if i not in delivered)
+    print(f"✓ {len(delivered)} entregas para 300 pedidos (Correto)")
+
+
+def test_source_decodes_frames_missing_from_memory(tmp_path):
+    """Sem frames anotados na memória (ex: resultado do cache), decodifica os vídeos."""
+    path = str(tmp_path / "boneco.avi")
+    write_stick_figure_video(path, num_frames=10, width=320, height=240)
+    results = _results(10, with_frames=False)
+    source = AnalysisFrameSource(results.snapshot, path, path, {"aluno": 2, "mestre": 0})
+    assert AnalysisFrameSource(results.snapshot).render(3) is None
+
+    for index in (0, 1, 5, 2):
+        frame = source.render(index)
+        assert frame is not None and frame.shape == (240, 640, 3)
+    assert source.render(10) is None
+    source.close()
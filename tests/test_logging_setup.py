@@ -0,0 +1,75 @@
+# tests/test_logging_setup.py
+
+import logging
+import logging.handlers
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils import LogSampler, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """Restaura a configuração de logging do pytest após o teste."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.getLogger("teste.subsistema").setLevel(logging.NOTSET)
+
+
+def test_setup_logging_writes_through_queue(tmp_path, restore_logging):
+    """Verifica que os registros passam pela fila e chegam ao arquivo com os níveis por subsistema."""
+    print("\nExecutando test_setup_logging_writes_through_queue...")
+    listener = setup_logging(
+        level="DEBUG",
+        levels={"teste.subsistema": "WARNING"},
+        log_dir=str(tmp_path),
+        log_file="app.log",
+        console=False,
+    )
+    root = logging.getLogger()
+    assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+    assert isinstance(listener.handlers[0], logging.handlers.RotatingFileHandler)
+
+    logging.getLogger("teste.outro").debug("mensagem %s", "visivel")
+    logging.getLogger("teste.subsistema").info("mensagem filtrada")
+    logging.getLogger("teste.subsistema").warning("aviso do subsistema")
+    shutdown_logging()  # Garante que a fila foi esvaziada.
+
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert "mensagem visivel" in content
+    assert "aviso do subsistema" in content
+    assert "mensagem filtrada" not in content
+    print("✓ Logging assíncrono com níveis por subsistema (Correto)")
+
+
+def test_log_file_is_rotated_by_size(tmp_path, restore_logging):
+    """Verifica a rotação do arquivo de log ao atingir o tamanho máximo."""
+    setup_logging(log_dir=str(tmp_path), max_bytes=2000, backup_count=2, console=False)
+    logger = logging.getLogger("teste.rotacao")
+    for i in range(200):
+        logger.info("linha de log número %d", i)
+    shutdown_logging()
+    assert (tmp_path / "app.log.1").exists()
+    assert not (tmp_path / "app.log.3").exists()
+
+
+def test_log_sampler_emits_one_in_n(caplog):
+    """Verifica que mensagens repetitivas são registradas por amostragem."""
+    sampler = LogSampler(logging.getLogger("teste.amostragem"), every=10)
+    with caplog.at_level(logging.WARNING, logger="teste.amostragem"):
+        for _ in range(25):
+            sampler.warning("chave", "aviso repetido %s", "x")
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 3  # Ocorrências 1, 11 e 21.
+    assert messages[0] == "aviso repetido x"
+    assert "total: 21" in messages[2]
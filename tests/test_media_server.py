@@ -0,0 +1,121 @@
+# tests/test_media_server.py
+
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.asset_sync import AssetSyncClient, update_manifest
+from src.media_server import MediaServer, parse_range
+
+CONTENT = bytes(i % 251 for i in range(200_000))
+
+
+@pytest.fixture
+def media(tmp_path):
+    """Servidor de mídia sobre uma pasta de assets com um vídeo e um PDF."""
+    assets = tmp_path / "assets"
+    (assets / "videos_tecnicas" / "Preta e Branca").mkdir(parents=True)
+    (assets / "programa_tecnico").mkdir()
+    (assets / "videos_tecnicas" / "Preta e Branca" / "Faca.mp4").write_bytes(CONTENT)
+    (assets / "programa_tecnico" / "Preta e Branca.pdf").write_bytes(b"%PDF-1.4 programa")
+    (assets / "icon.jpg").write_bytes(b"logo")
+    with MediaServer(str(assets), port=0) as server:
+        yield server, assets
+
+
+def _get(url, headers=None, method="GET"):
+    request = urllib.request.Request(url, headers=headers or {}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_range_requests(media):
+    """Verifica as respostas parciais (206), o arquivo inteiro (200) e o 416."""
+    print("\nExecutando test_range_requests...")
+    server, assets = media
+    url = server.url(str(assets / "videos_tecnicas" / "Preta e Branca" / "Faca.mp4"))
+
+    status, headers, body = _get(url, {"Range": "bytes=1000-1999"})
+    assert status == 206 and body == CONTENT[1000:2000]
+    assert headers["Content-Range"] == "bytes 1000-1999/200000"
+    assert headers["Content-Type"] == "video/mp4" and headers["Accept-Ranges"] == "bytes"
+
+    assert _get(url, {"Range": "bytes=199000-"})[2] == CONTENT[199000:]
+    assert _get(url, {"Range": "bytes=-500"})[2] == CONTENT[-500:]
+    status, headers, body = _get(url)
+    assert status == 200 and body == CONTENT
+
+    status, headers, _ = _get(url, {"Range": "bytes=300000-"})
+    assert status == 416 and headers["Content-Range"] == "bytes */200000"
+    # Intervalo malformado ou múltiplo: arquivo inteiro.
+    assert _get(url, {"Range": "bytes=0-10,20-30"})[0] == 200
+    assert parse_range("bytes=abc-", 100) is None
+    print("✓ Requisições parciais atendidas (Correto)")
+
+
+def test_cache_validation_and_versioned_urls(media):
+    """URLs com hash são imutáveis; as demais são revalidadas por ETag/Last-Modified."""
+    print("\nExecutando test_cache_validation_and_versioned_urls...")
+    server, assets = media
+    video = assets / "videos_tecnicas" / "Preta e Branca" / "Faca.mp4"
+    versioned = server.url(str(video))
+    plain = server.url("videos_tecnicas/Preta e Branca/Faca.mp4", versioned=False)
+    assert "/v/" in versioned and "%20" in versioned
+
+    status, headers, _ = _get(versioned, method="HEAD")
+    assert status == 200 and "immutable" in headers["Cache-Control"]
+    etag, last_modified = headers["ETag"], headers["Last-Modified"]
+    status, headers, _ = _get(plain)
+    assert headers["Cache-Control"] == "no-cache" and headers["ETag"] == etag
+
+    assert _get(plain, {"If-None-Match": etag})[0] == 304
+    assert _get(plain, {"If-Modified-Since": last_modified})[0] == 304
+    # If-Range com ETag antigo: o conteúdo mudou, manda o arquivo inteiro.
+    assert _get(plain, {"Range": "bytes=0-9", "If-Range": '"antigo"'})[0] == 200
+
+    # Conteúdo novo: a URL muda e a antiga deixa de existir.
+    video.write_bytes(CONTENT[::-1])
+    os.utime(video, ns=(1, 1))
+    assert server.url(str(video)) != versioned
+    assert _get(versioned)[0] == 404
+    assert _get(server.url(str(video)))[2] == CONTENT[::-1]
+    assert _get(plain, {"If-None-Match": etag})[0] == 200
+
+    # Só as pastas de mídia são servidas.
+    assert _get(f"{server.base_url}/icon.jpg")[0] == 404
+    assert _get(f"{server.base_url}/videos_tecnicas/../icon.jpg")[0] == 404
+    assert _get(f"{server.base_url}/programa_tecnico/Preta%20e%20Branca.pdf")[2] == b"%PDF-1.4 programa"
+    print("✓ Cabeçalhos de cache e URLs versionadas (Correto)")
+
+
+def test_asset_sync_and_web_video_use_media_server(media, tmp_path):
+    """A sincronização offline e o ft.Video no modo web usam o servidor de mídia."""
+    server, assets = media
+    update_manifest(str(assets))
+    report = AssetSyncClient(server.base_url, str(tmp_path / "celular")).sync(["Preta e Branca"])
+    assert len(report.downloaded) == 2 and not report.failed
+
+    import main
+
+    mock_page = MagicMock()
+    mock_page.web = True
+    app = main.AppFBKMKLN(mock_page)
+    video = str(assets / "videos_tecnicas" / "Preta e Branca" / "Faca.mp4")
+    with patch.object(main, "get_media_server", return_value=server):
+        with patch.object(main, "MEDIA_SERVER_PUBLIC_URL", server.base_url):
+            resource = app.media_resource(video)
+        # Sem endereço público configurado, o navegador recebe o caminho do asset.
+        with patch.object(main, "MEDIA_SERVER_PUBLIC_URL", None):
+            assert app.media_resource(video) == video
+    assert resource.startswith(server.base_url + "/v/")
+    mock_page.web = False
+    assert app.media_resource("assets/videos_tecnicas/x.mp4") == "assets/videos_tecnicas/x.mp4"
@@ -0,0 +1,112 @@
+# tests/test_metrics.py
+
+import json
+import time
+import numpy as np
+import cv2
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.metrics import JobProfiler, PipelineMetrics
+from src.pose_backends import PoseBackend, PoseResult, landmarks_from_array
+from src.pose_estimator import PoseEstimator
+import src.video_analyzer as video_analyzer
+
+
+class FixedPoseBackend(PoseBackend):
+    """Backend de teste que sempre devolve a mesma pose."""
+
+    name = "fixo"
+
+    def process(self, image_rgb):
+        array = np.column_stack(
+            [np.linspace(0.2, 0.8, 33), np.linspace(0.1, 0.9, 33), np.zeros(33), np.full(33, 0.9)]
+        )
+        return PoseResult(landmarks_from_array(array))
+
+
+def _write_video(path, num_frames):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(num_frames):
+        writer.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+    writer.release()
+
+
+def test_pipeline_metrics_snapshot_and_prometheus():
+    """Verifica os temporizadores, contadores, medidores e a exportação Prometheus."""
+    print("\nExecutando test_pipeline_metrics_snapshot_and_prometheus...")
+    metrics = PipelineMetrics("teste")
+    for _ in range(5):
+        with metrics.stage("inferencia"):
+            time.sleep(0.002)
+        metrics.record("desenho", 0.1)
+        metrics.count("frames_analisados")
+    metrics.gauge("fila", 3)
+    metrics.gauge("fila", 1)
+    metrics.finish()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["inferencia"]["count"] == 5
+    assert snapshot["stages"]["inferencia"]["p50_ms"] >= 2.0
+    assert snapshot["counters"]["frames_analisados"] == 5
+    assert snapshot["gauges"]["fila"] == {"atual": 1, "maximo": 3}
+    assert snapshot["peak_rss_mb"] > 0
+    assert metrics.bottleneck() == "inferencia"
+
+    text = metrics.to_prometheus()
+    assert 'kravmaga_analise_stage_seconds_count{job="teste",stage="desenho"} 5' in text
+    assert 'kravmaga_analise_gauge_max{job="teste",name="fila"} 3' in text
+    print("✓ Métricas por etapa e exportação Prometheus (Correto)")
+
+
+def test_analysis_records_stage_metrics_and_profiles(tmp_path, monkeypatch):
+    """Verifica que a análise registra as etapas e grava os perfis quando solicitado."""
+    print("\nExecutando test_analysis_records_stage_metrics_and_profiles...")
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(FixedPoseBackend()))
+    monkeypatch.setattr(video_analyzer, "ANALYSIS_PROFILE_DIR", str(tmp_path / "perfis"))
+    analyzer = video_analyzer.VideoAnalyzer()
+    for is_aluno in (True, False):
+        path = str(tmp_path / f"{is_aluno}.avi")
+        _write_video(path, 6)
+        if is_aluno:
+            analyzer.cap_aluno = cv2.VideoCapture(path)
+        else:
+            analyzer.cap_mestre = cv2.VideoCapture(path)
+
+    metrics_path = str(tmp_path / "metricas.json")
+    analyzer.analyze_and_compare(
+        lambda: None, profile_cpu=True, profile_memory=True, metrics_path=metrics_path
+    )
+    analyzer.processing_thread.join(timeout=30)
+
+    stages = analyzer.metrics.snapshot()["stages"]
+    for stage in ("decodificacao", "inferencia", "desenho", "comparacao"):
+        assert stages[stage]["count"] == 6
+    assert analyzer.metrics.snapshot()["counters"]["frames_decodificados"] == 12
+    assert os.path.exists(analyzer.profile_outputs["cpu"])
+    assert os.path.exists(analyzer.profile_outputs["memory"])
+    with open(metrics_path, encoding="utf-8") as f:
+        assert json.load(f)["counters"]["frames_analisados"] == 6
+    print("✓ Métricas e perfis da análise registrados (Correto)")
+
+
+def test_job_profiler_disabled_by_default(tmp_path):
+    """Verifica que, sem opções, o profiler não grava nada."""
+    with JobProfiler(str(tmp_path / "perfis")) as profiler:
+        sum(range(1000))
+    assert profiler.outputs == {}
+    assert not (tmp_path / "perfis").exists()
+
+
+def test_metrics_without_resource_module(monkeypatch):
+    """Sem o módulo resource (Windows), o pico de memória vem como None e o resto funciona."""
+    from src import metrics
+
+    monkeypatch.setattr(metrics, "resource", None)
+    collected = PipelineMetrics("windows")
+    with collected.stage("inferencia"):
+        pass
+    assert collected.snapshot()["peak_rss_mb"] is None
+    assert "peak_rss_bytes" not in collected.to_prometheus()
@@ -0,0 +1,166 @@
+# tests/test_pdf_pages.py
+
+import time
+import flet as ft
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pdf_pages import PdfPageService, PdfRenderer, create_pdf_renderer
+
+
+class FakeRenderer(PdfRenderer):
+    """Renderizador sem dependências: página i é uma imagem cinza de tom i."""
+
+    name = "falso"
+
+    def __init__(self, num_pages: int = 100, delay: float = 0.0):
+        self.num_pages = num_pages
+        self.delay = delay
+        self.rendered = []
+
+    def page_sizes(self, path):
+        return [(595.0, 842.0)] * self.num_pages
+
+    def render(self, path, page, zoom):
+        time.sleep(self.delay)
+        self.rendered.append((page, zoom))
+        return np.full((int(84 * zoom), int(60 * zoom), 3), page % 256, dtype=np.uint8)
+
+
+def _pdf(tmp_path, content: bytes = b"%PDF-1.4 programa") -> str:
+    path = str(tmp_path / "Amarela.pdf")
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def _wait(condition, timeout: float = 10.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_first_page_is_ready_on_open_and_rest_in_background(tmp_path):
+    """Verifica que só a primeira página é renderizada ao abrir e as demais depois."""
+    print("\nExecutando test_first_page_is_ready_on_open_and_rest_in_background...")
+    renderer = FakeRenderer(num_pages=20, delay=0.005)
+    service = PdfPageService(str(tmp_path / "cache"), renderer, zoom_levels=(1.0, 2.0))
+    ready = []
+    # A thread de renderização só começa depois que open() termina.
+    with patch.object(service, "_start"):
+        document = service.open(_pdf(tmp_path), on_page_ready=lambda page, zoom: ready.append((page, zoom)))
+        assert renderer.rendered == [(0, 1.0)]
+        assert document.page_count == 20 and document.aspect(0) == pytest.approx(842 / 595)
+    service._start()
+    assert _wait(lambda: len(renderer.rendered) == 40)
+    service.close()
+
+    # Zoom padrão de todas as páginas antes dos outros níveis.
+    assert [zoom for _, zoom in renderer.rendered[:20]] == [1.0] * 20
+    assert len(ready) == 39
+    image = service.page_path(document, 7, 2.0)
+    assert image.endswith("00007_z2.jpg") and os.path.exists(image)
+    print("✓ Primeira página na abertura e demais em segundo plano (Correto)")
+
+
+def test_pages_are_reused_by_content_hash(tmp_path):
+    """Reabrir o mesmo conteúdo (outro processo, outro nome) não renderiza de novo."""
+    cache_dir = str(tmp_path / "cache")
+    first = PdfPageService(cache_dir, FakeRenderer(num_pages=5), zoom_levels=(1.0,))
+    document = first.open(_pdf(tmp_path))
+    assert _wait(lambda: all(first.is_ready(document, page) for page in range(5)))
+    first.close()
+
+    copy = str(tmp_path / "copia.pdf")
+    with open(copy, "wb") as f:
+        f.write(b"%PDF-1.4 programa")
+    renderer = FakeRenderer(num_pages=5)
+    second = PdfPageService(cache_dir, renderer, zoom_levels=(1.0,))
+    reopened = second.open(copy)
+    assert reopened.content_hash == document.content_hash and reopened.page_count == 5
+    assert second.page_base64(reopened, 4)
+    second.close()
+    assert renderer.rendered == []
+
+
+def test_visible_pages_jump_the_queue(tmp_path):
+    """Verifica que as páginas visíveis passam à frente da renderização em segundo plano."""
+    renderer = FakeRenderer(num_pages=100, delay=0.002)
+    service = PdfPageService(str(tmp_path / "cache"), renderer, zoom_levels=(1.0,))
+    document = service.open(_pdf(tmp_path))
+    service.request_pages(document, [80, 81], margin=1)
+    assert _wait(lambda: service.is_ready(document, 81))
+    service.close()
+
+    order = [page for page, _ in renderer.rendered]
+    assert order.index(80) < 10 and order.index(81) < 10
+    assert set(order[: order.index(81) + 1]) <= {0, 1, 2, 3, 4, 5, 6, 7, 79, 80, 81, 82}
+    with pytest.raises(ValueError):
+        service.page_path(document, 100)
+    with pytest.raises(ValueError):
+        create_pdf_renderer("desconhecido")
+
+    class PageSizesOnly(PdfRenderer):
+        def page_sizes(self, path):
+            return []
+
+    # Um renderizador incompleto é recusado ao ser criado.
+    with pytest.raises(TypeError):
+        PageSizesOnly()
+
+
+def test_program_viewer_view_streams_visible_pages(tmp_path):
+    """Monta a tela do visualizador com a primeira página já carregada."""
+    import main
+
+    service = PdfPageService(str(tmp_path / "cache"), FakeRenderer(num_pages=30), zoom_levels=(1.5, 1.0))
+    mock_page = MagicMock()
+    mock_page.width = 1000
+    app = main.AppFBKMKLN(mock_page)
+    app.program_path = str(tmp_path)
+    _pdf(tmp_path)
+    app.auth_service.get_accessible_ranks = MagicMock(return_value=["Branca", "Amarela"])
+
+    with patch.object(main, "get_default_pdf_service", return_value=service):
+        view = app.create_pdf_viewer_view({"LOGIN": "Teste"}, "Amarela")
+        denied = app.create_pdf_viewer_view({"LOGIN": "Teste"}, "Preta")
+    service.close()
+
+    slots = view.controls[2].controls[0].controls
+    assert len(slots) == 30
+    assert isinstance(slots[0].content, ft.Image) and slots[29].content is None
+    assert slots[0].height == int(slots[0].width * 842 / 595)
+    assert "não disponível" in denied.controls[1].value
+
+
+def test_program_list_falls_back_to_launch_url_without_renderer(tmp_path):
+    """Sem PyMuPDF nem Poppler, o programa abre no leitor do sistema em vez do visualizador."""
+    import main
+
+    service = PdfPageService(str(tmp_path / "cache"), zoom_levels=(1.0,))
+    app = main.AppFBKMKLN(MagicMock())
+    app.program_path = str(tmp_path)
+    _pdf(tmp_path)
+    app.auth_service.get_accessible_ranks = MagicMock(return_value=["Amarela"])
+
+    unavailable = ImportError("Nenhum renderizador de PDF disponível")
+    with patch.object(main, "get_default_pdf_service", return_value=service), patch(
+        "src.pdf_pages.create_pdf_renderer", side_effect=unavailable
+    ):
+        view = app.create_program_view({"LOGIN": "Teste"})
+    service._renderer = FakeRenderer()
+    with patch.object(main, "get_default_pdf_service", return_value=service):
+        viewer_view = app.create_program_view({"LOGIN": "Teste"})
+    service.close()
+
+    view.controls[3].controls[0].on_click(None)
+    app.page.launch_url.assert_called_once()
+    assert app.page.launch_url.call_args[0][0].endswith("Amarela.pdf")
+    viewer_view.controls[3].controls[0].on_click(None)
+    app.page.go.assert_called_with("/program_viewer?rank=Amarela")
@@ -0,0 +1,135 @@
+# tests/test_pose_backends.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_backends import (
+    NUM_POSE_LANDMARKS,
+    PoseBackend,
+    PoseResult,
+    create_pose_backend,
+    landmarks_from_array,
+)
+from src.pose_estimator import PoseEstimator
+
+
+class FixedPoseBackend(PoseBackend):
+    """Backend de teste que sempre devolve a mesma pose."""
+
+    name = "fixo"
+
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+    def process(self, image_rgb):
+        self.calls += 1
+        array = np.tile([0.5, 0.5, 0.0, 0.9], (33, 1))
+        return PoseResult(landmarks_from_array(array))
+
+    def close(self):
+        self.closed = True
+
+
+def test_estimator_accepts_custom_backend_instance():
+    """Verifica que o PoseEstimator usa qualquer implementação de PoseBackend."""
+    print("\nExecutando test_estimator_accepts_custom_backend_instance...")
+    backend = FixedPoseBackend()
+    estimator = PoseEstimator(backend)
+    results = estimator.estimate_pose(np.zeros((48, 64, 3), dtype=np.uint8))
+    landmarks = estimator.get_landmarks_as_list(results.pose_landmarks)
+
+    assert backend.calls == 1
+    assert len(landmarks) == 33
+    assert landmarks[0]["name"] == "NOSE"
+    assert landmarks[0]["visibility"] == pytest.approx(0.9)
+    # O resultado precisa ser desenhável pelas funções existentes.
+    annotated = estimator.draw_skeleton_by_side(
+        np.zeros((48, 64, 3), dtype=np.uint8), results.pose_landmarks
+    )
+    assert annotated.shape == (48, 64, 3)
+    print("✓ Backend customizado integrado ao PoseEstimator (Correto)")
+
+
+def test_unknown_backend_is_rejected():
+    """Verifica que um nome de backend inválido gera erro explícito."""
+    with pytest.raises(ValueError):
+        create_pose_backend("inexistente")
+
+
+def test_onnx_backend_reports_missing_dependency():
+    """Sem onnxruntime instalado, o backend onnx deve explicar a dependência opcional."""
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="onnxruntime"):
+            create_pose_backend("onnx", model_path="modelo.onnx")
+    else:
+        pytest.skip("onnxruntime instalado neste ambiente.")
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    """Um backend sem process() é recusado ao ser criado, não no primeiro frame."""
+
+    class IncompleteBackend(PoseBackend):
+        name = "incompleto"
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_onnx_backend_decodes_blazepose_output(monkeypatch):
+    """Com uma sessão falsa, confere a conversão da saída (x, y, z, visibilidade, presença) em pixels."""
+    import types
+
+    raw = np.zeros((NUM_POSE_LANDMARKS, 5), dtype=np.float32)
+    raw[:, 0] = np.arange(NUM_POSE_LANDMARKS) * 4.0  # x em pixels da entrada (256 de largura)
+    raw[:, 1] = 64.0  # y em pixels da entrada (128 de altura)
+    raw[:, 2] = -32.0  # z na escala da largura
+    raw[:, 3] = 10.0  # logit da visibilidade
+
+    class FakeSession:
+        def __init__(self, model_path, sess_options=None, providers=None):
+            self.output = raw
+            self.inputs = []
+
+        def get_inputs(self):
+            return [types.SimpleNamespace(name="entrada", shape=[1, 128, 256, 3])]
+
+        def run(self, outputs, feeds):
+            self.inputs.append(feeds["entrada"])
+            return [self.output.reshape(1, -1)]
+
+    fake_ort = types.SimpleNamespace(SessionOptions=lambda: types.SimpleNamespace(), InferenceSession=FakeSession)
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake_ort)
+
+    backend = create_pose_backend("onnx", model_path="modelo.onnx")
+    result = backend.process(np.full((480, 640, 3), 255, dtype=np.uint8))
+    tensor = backend.session.inputs[0]
+    assert tensor.shape == (1, 128, 256, 3) and tensor.dtype == np.float32 and tensor.max() == 1.0
+    landmarks = result.pose_landmarks.landmark
+    assert len(landmarks) == NUM_POSE_LANDMARKS
+    assert landmarks[10].x == pytest.approx(40 / 256) and landmarks[10].y == pytest.approx(0.5)
+    assert landmarks[10].z == pytest.approx(-0.125)
+    assert landmarks[10].visibility == pytest.approx(1 / (1 + np.exp(-10.0)), rel=1e-5)
+
+    # Nenhum landmark visível: sem pose.
+    backend.session.output = raw.copy()
+    backend.session.output[:, 3] = -10.0
+    assert backend.process(np.zeros((480, 640, 3), dtype=np.uint8)).pose_landmarks is None
+
+
+def test_estimator_close_releases_backend_once():
+    """close() (ou o bloco with) libera o backend uma vez; o destrutor não repete."""
+    backend = FixedPoseBackend()
+    with PoseEstimator(backend, roi_tracking=False) as estimator:
+        estimator.estimate_pose(np.zeros((48, 64, 3), dtype=np.uint8))
+    assert backend.closed and estimator.backend is None
+    backend.closed = False
+    estimator.close()
+    del estimator
+    assert not backend.closed
@@ -0,0 +1,66 @@
+# tests/test_progress_bus.py
+
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.progress_bus import ProgressBus, ProgressEvent
+
+
+def test_bus_coalesces_frequent_updates():
+    """Verifica que milhares de publicações resultam em poucas entregas à UI."""
+    print("\nExecutando test_bus_coalesces_frequent_updates...")
+    received = []
+    bus = ProgressBus(max_rate_hz=10.0)
+    bus.subscribe(received.append)
+    bus.start()
+
+    total = 5000
+    start = time.perf_counter()
+    for i in range(total):
+        bus.publish_frame(i + 1, total, score=90.0)
+    publish_elapsed = time.perf_counter() - start
+    bus.close(ProgressEvent(1.0, total, total, done=True))
+
+    assert bus.published_count == total + 1
+    # Com 10 Hz e uma publicação muito rápida, poucas entregas são esperadas.
+    assert len(received) < 20
+    assert received[-1].done
+    assert publish_elapsed < 1.0
+    print(f"✓ {total} publicações geraram {len(received)} entregas (Correto)")
+
+
+def test_bus_events_carry_fps_and_eta():
+    """Verifica que os eventos de frame carregam fps, ETA e pontuação."""
+    received = []
+    bus = ProgressBus(max_rate_hz=0)
+    bus.subscribe(received.append)
+    bus.start()
+    bus.publish_frame(1, 4, score=75.0)
+    time.sleep(0.01)
+    bus.publish_frame(2, 4, score=80.0)
+    bus.close()
+
+    last = received[-1]
+    assert last.frames_done == 2
+    assert last.progress == 0.5
+    assert last.score == 80.0
+    assert last.fps > 0
+    assert last.eta_seconds is not None
+
+
+def test_bus_isolates_subscriber_errors():
+    """Verifica que um erro em um assinante não impede os demais de receberem eventos."""
+    received = []
+
+    def broken(event):
+        raise RuntimeError("falha na UI")
+
+    bus = ProgressBus()
+    bus.subscribe(broken)
+    bus.subscribe(received.append)
+    bus.start()
+    bus.close(ProgressEvent(1.0, done=True))
+    assert received and received[-1].done
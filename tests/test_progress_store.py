@@ -0,0 +1,108 @@
+# tests/test_progress_store.py
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.progress_store import ProgressStore, summarize_session
+from src.session_store import AnalysisSession
+
+ANGLES = ["LEFT_ELBOW_ANGLE", "RIGHT_ELBOW_ANGLE", "LEFT_KNEE_ANGLE"]
+DAY = 86400.0
+
+
+def _session(score: float, elbow_diff: float, frames: int = 20) -> AnalysisSession:
+    """Sessão sintética: nota constante, cotovelos com 'elbow_diff' e joelho nunca calculado."""
+    landmarks = np.zeros((frames, 33, 4), dtype=np.float32)
+    diffs = np.full((frames, len(ANGLES)), np.nan, dtype=np.float32)
+    diffs[:, 0] = elbow_diff
+    diffs[: frames // 2, 1] = elbow_diff / 2
+    return AnalysisSession(landmarks, landmarks, np.full(frames, score, dtype=np.float32), diffs, ANGLES)
+
+
+def test_incremental_aggregates(tmp_path):
+    """Verifica médias, média móvel da janela, média exponencial e agregados por faixa e dia."""
+    print("\nExecutando test_incremental_aggregates...")
+    store = ProgressStore(str(tmp_path / "progress.sqlite3"), window=3, ema_alpha=0.5)
+    scores = [50.0, 60.0, 70.0, 80.0, 90.0]
+    for i, score in enumerate(scores):
+        store.record_session("aluno1", "Soco Direto", _session(score, 100 - score), rank="Amarela", recorded_at=i * DAY)
+    store.record_session("aluno1", "Chute Frontal", _session(40.0, 30.0), rank="Amarela", recorded_at=5 * DAY)
+    store.record_session("aluno2", "Soco Direto", _session(20.0, 90.0), rank="Amarela", recorded_at=5 * DAY)
+
+    summary = summarize_session(_session(50.0, 10.0))
+    assert set(summary["joints"]) == {"LEFT_ELBOW_ANGLE", "RIGHT_ELBOW_ANGLE"}
+    assert summary["joints"]["RIGHT_ELBOW_ANGLE"] == (pytest.approx(5.0), 10)
+
+    overview = store.user_overview("aluno1")
+    assert overview["sessions"] == 6
+    assert overview["avg_score"] == pytest.approx((sum(scores) + 40) / 6)
+    soco = next(t for t in overview["techniques"] if t["technique"] == "Soco Direto")
+    assert soco["avg_score"] == pytest.approx(70.0) and soco["best_score"] == 90.0 and soco["last_score"] == 90.0
+    assert soco["rolling_score"] == pytest.approx(80.0)  # 70, 80, 90
+    ema = scores[0]
+    for score in scores[1:]:
+        ema += 0.5 * (score - ema)
+    assert soco["ema_score"] == pytest.approx(ema)
+    assert overview["techniques"][0]["technique"] == "Chute Frontal"  # mais recente primeiro
+
+    elbow = overview["joints"]["LEFT_ELBOW_ANGLE"]
+    assert elbow["sessions"] == 6 and elbow["rolling_diff"] == pytest.approx((20 + 10 + 30) / 3)
+    assert "LEFT_KNEE_ANGLE" not in overview["joints"]
+    assert overview["weakest_joints"][0] == "LEFT_ELBOW_ANGLE"
+
+    rank = store.rank_joint_averages("Amarela")["LEFT_ELBOW_ANGLE"]
+    assert rank["sessions"] == 7 and rank["avg_diff"] == pytest.approx((50 + 40 + 30 + 20 + 10 + 30 + 90) / 7)
+    assert len(store.daily_scores("aluno1")) == 6 and store.daily_scores("aluno1", days=2)[-1][1] == 1
+    history = store.technique_history("aluno1", "Soco Direto", limit=2)
+    assert [h["avg_score"] for h in history] == [90.0, 80.0]
+    assert store.user_overview("ninguem")["sessions"] == 0
+    print("✓ Agregados incrementais corretos (Correto)")
+
+
+def test_rebuild_matches_incremental_and_persists(tmp_path):
+    """Recalcular do zero dá os mesmos agregados; o histórico sobrevive a reabrir o banco."""
+    path = str(tmp_path / "progress.sqlite3")
+    store = ProgressStore(path, window=4)
+    rng = np.random.default_rng(0)
+    for i in range(40):
+        technique = ["Soco", "Chute", "Faca"][i % 3]
+        store.record_session("aluno", technique, _session(float(rng.uniform(30, 95)), float(rng.uniform(0, 60))),
+                             rank="Verde", recorded_at=i * 3600.0)
+    incremental = store.user_overview("aluno"), store.rank_joint_averages("Verde")
+    store.rebuild_aggregates()
+    rebuilt = store.user_overview("aluno"), store.rank_joint_averages("Verde")
+    assert rebuilt[0]["techniques"] == pytest.approx(incremental[0]["techniques"])
+    for name, stats in incremental[0]["joints"].items():
+        assert rebuilt[0]["joints"][name] == pytest.approx(stats)
+        assert rebuilt[1][name] == pytest.approx(incremental[1][name])
+
+    with pytest.raises(ValueError):
+        store.record_session("aluno", "Soco", _session(50.0, 10.0, frames=0))
+    store.close()
+    reopened = ProgressStore(path, window=4)
+    assert reopened.user_overview("aluno")["sessions"] == 40
+    reopened.close()
+
+
+def test_dashboard_shows_progress_after_analysis(tmp_path):
+    """A análise concluída vai para o histórico e o dashboard mostra o resumo."""
+    import main
+
+    db_path = str(tmp_path / "progress.sqlite3")
+    store = ProgressStore(db_path)
+    app = main.AppFBKMKLN(MagicMock())
+    user = {"LOGIN": "aluno1", "GRADUACAO_ATUAL": "Amarela"}
+    with patch.object(main, "PROGRESS_DB_PATH", db_path), patch.object(main, "get_default_progress_store", return_value=store):
+        assert app.progress_summary(user) is None
+        app.record_progress(user, "assets/videos_tecnicas/Amarela/soco_direto.mp4", _session(75.0, 12.0))
+        text = app.progress_summary(user)
+        view = app.create_dashboard_view(user)
+    assert "1 análises" in text and "Soco Direto" in text and "left elbow" in text
+    assert view.controls[0].controls[-1].value == text
+    assert store.rank_joint_averages("Amarela")["LEFT_ELBOW_ANGLE"]["sessions"] == 1
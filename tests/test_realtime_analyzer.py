@@ -0,0 +1,87 @@
+# tests/test_realtime_analyzer.py
+
+import time
+import pytest
+import numpy as np
+import cv2
+from unittest.mock import MagicMock
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.realtime_analyzer import RealtimeAnalyzer
+
+
+def _landmarks():
+    return [
+        {"x": 0.3 + i / 100, "y": 0.2 + i / 50, "z": 0.0, "visibility": 0.9, "name": name}
+        for i, name in enumerate(POSE_LANDMARK_NAMES)
+    ]
+
+
+@pytest.fixture
+def camera_file(tmp_path):
+    """Cria um vídeo sintético de 30 frames que faz o papel da câmera."""
+    path = str(tmp_path / "camera.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 60, (64, 48))
+    for i in range(30):
+        frame = np.full((48, 64, 3), i * 8, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def slow_estimator():
+    """Estimador de pose simulado, mais lento que a câmera, para forçar descartes."""
+    estimator = MagicMock()
+
+    def estimate(frame):
+        time.sleep(0.04)
+        return MagicMock(pose_landmarks="pose")
+
+    estimator.estimate_pose.side_effect = estimate
+    estimator.get_landmarks_as_list.return_value = _landmarks()
+    estimator.draw_feedback_skeleton.side_effect = lambda frame, *args, **kw: frame.copy()
+    return estimator
+
+
+def test_realtime_drops_frames_when_inference_is_slow(camera_file, slow_estimator):
+    """Verifica que frames são descartados (e não enfileirados) quando a inferência atrasa."""
+    print("\nExecutando test_realtime_drops_frames_when_inference_is_slow...")
+    analyzer = RealtimeAnalyzer(
+        [_landmarks()] * 10,
+        master_fps=60,
+        source=camera_file,
+        pose_estimator=slow_estimator,
+        latency_budget_ms=1000,
+    )
+    frames = []
+    stats = analyzer.run(on_frame=lambda frame, result: frames.append(result))
+
+    assert stats["frames_captured"] == 30
+    assert stats["frames_processed"] == len(frames)
+    assert stats["frames_dropped"] > 0
+    assert stats["frames_processed"] + stats["frames_dropped"] <= 30
+    # Com landmarks idênticos, a pontuação deve ser máxima.
+    assert frames[0]["score"] == pytest.approx(100.0)
+    assert stats["latency_p95_ms"] < 1000
+    print(f"✓ Estatísticas da sessão em tempo real: {stats}")
+
+
+def test_master_index_alignment():
+    """Verifica o alinhamento temporal com a sequência do mestre, com e sem repetição."""
+    analyzer = RealtimeAnalyzer(
+        [_landmarks()] * 30, master_fps=30, pose_estimator=MagicMock()
+    )
+    assert analyzer.master_index_at(0.5) == 15
+    assert analyzer.master_index_at(1.5) == 15
+    analyzer.loop_master = False
+    assert analyzer.master_index_at(1.5) is None
+
+
+def test_empty_master_sequence_is_rejected():
+    with pytest.raises(ValueError):
+        RealtimeAnalyzer([], pose_estimator=MagicMock())
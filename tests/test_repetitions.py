@@ -0,0 +1,104 @@
+# tests/test_repetitions.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.pose_backends import PoseBackend, PoseResult, landmarks_from_array
+from src.pose_estimator import PoseEstimator
+from src.repetitions import analyze_repetitions, segment_repetitions
+from src.resource_governor import ResourceGovernor
+from src.session_store import landmarks_list_to_array
+import src.video_analyzer as video_analyzer
+from synthetic import pose_to_landmarks, stick_figure_pose, write_stick_figure_video
+
+
+def _drill(lengths: list, variants: list | None = None, idle: int = 0, seed: int = 0):
+    """Gravação sintética: 'idle' frames parado e uma repetição do soco por duração em 'lengths'."""
+    variants = variants or [0] * len(lengths)
+    phases, kinds, boundaries = [0.0] * idle, [0] * idle, [idle]
+    for length, variant in zip(lengths, variants):
+        phases += list(np.arange(length) / length)
+        kinds += [variant] * length
+        boundaries.append(boundaries[-1] + length)
+    landmarks = np.stack(
+        [landmarks_list_to_array(pose_to_landmarks(stick_figure_pose(t, v))) for t, v in zip(phases, kinds)]
+    )
+    # Ruído de detecção, como o de um modelo de pose real.
+    landmarks[..., :2] += np.random.default_rng(seed).normal(0, 0.003, landmarks[..., :2].shape)
+    return landmarks, boundaries
+
+
+class GroundTruthBackend(PoseBackend):
+    """Devolve, em ordem, os landmarks exatos dos vídeos sintéticos."""
+
+    name = "gabarito"
+
+    def __init__(self, sequences: list):
+        self._landmarks = [lm for sequence in sequences for lm in sequence]
+
+    def process(self, image_rgb):
+        array = landmarks_list_to_array(self._landmarks.pop(0))
+        return PoseResult(landmarks_from_array(array))
+
+
+def test_segments_repetitions_with_different_tempos():
+    """Verifica as fronteiras de repetições com durações diferentes e uma pausa inicial."""
+    print("\nExecutando test_segments_repetitions_with_different_tempos...")
+    landmarks, boundaries = _drill([30, 36, 27, 33, 40], idle=20)
+    segments = segment_repetitions(landmarks, fps=30)
+
+    assert len(segments) == 5
+    found = [start for start, _ in segments] + [segments[-1][1]]
+    assert np.abs(np.array(found) - np.array(boundaries)).max() <= 3
+    print(f"✓ Repetições: {segments} (Correto)")
+
+
+def test_non_repetitive_motion_is_a_single_segment():
+    """Verifica que um movimento único ou uma pose parada não são divididos."""
+    single, _ = _drill([60])
+    assert segment_repetitions(single, fps=30) == [(0, 60)]
+    still, _ = _drill([], idle=50)
+    assert segment_repetitions(still, fps=30) == [(0, 50)]
+    assert segment_repetitions(np.full((40, 33, 4), np.nan, dtype=np.float32)) == [(0, 40)]
+
+
+def test_each_repetition_is_scored_against_the_master():
+    """Verifica que a repetição mais fraca é identificada no resumo."""
+    print("\nExecutando test_each_repetition_is_scored_against_the_master...")
+    aluno, _ = _drill([30, 34, 28, 31], variants=[0, 0, 2, 0])
+    mestre, _ = _drill([30], seed=1)
+    summary = analyze_repetitions(aluno, mestre, fps=30)
+
+    assert summary["num_repetitions"] == 4
+    scores = [rep["avg_score"] for rep in summary["repetitions"]]
+    assert summary["worst"] == 2 and scores[2] < min(scores[:2] + scores[3:]) - 2
+    assert summary["avg_score"] == pytest.approx(np.mean(scores))
+    assert "RIGHT_ELBOW_ANGLE" in summary["repetitions"][2]["angle_means"]
+    print(f"✓ Notas por repetição: {[round(s, 1) for s in scores]} (Correto)")
+
+
+def test_analyzer_scores_long_recording_rep_by_rep(tmp_path):
+    """Executa a análise de repetições no VideoAnalyzer com um aluno mais longo que o mestre."""
+    aluno_path, mestre_path = str(tmp_path / "aluno.avi"), str(tmp_path / "mestre.avi")
+    aluno = write_stick_figure_video(aluno_path, num_frames=150, width=320, height=240, variant=1)
+    mestre = write_stick_figure_video(mestre_path, num_frames=30, width=320, height=240)
+
+    analyzer = video_analyzer.VideoAnalyzer(governor=ResourceGovernor(cpu_slots=1, memory_budget_mb=1024))
+    # O mesmo estimador para os dois vídeos: o backend de teste segue a ordem das chamadas.
+    estimator = PoseEstimator(GroundTruthBackend([mestre, aluno]), roi_tracking=False)
+    analyzer.pose_estimator = analyzer.mestre_pose_estimator = estimator
+    analyzer.load_video_from_path(aluno_path, is_aluno=True)
+    analyzer.load_video_from_path(mestre_path, is_aluno=False)
+    summary = analyzer.run_repetition_analysis()
+
+    assert summary["num_repetitions"] == 5
+    # Fronteiras com tolerância de alguns frames (início lento do golpe).
+    assert summary["repetitions"][0]["start"] <= 5 and summary["repetitions"][-1]["end"] >= 145
+    assert analyzer.repetition_results is summary
+    assert analyzer.raw_frames_aluno == [] and not analyzer.is_processing
+    assert analyzer.metrics.snapshot()["counters"]["frames_analisados"] == 180
@@ -0,0 +1,116 @@
+# tests/test_resource_governor.py
+
+import pytest
+import threading
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.pose_backends import PoseBackend, PoseResult
+from src.pose_estimator import PoseEstimator
+from src.resource_governor import JobCost, ResourceGovernor
+import src.video_analyzer as video_analyzer
+from synthetic import write_stick_figure_video
+
+MB = 2**20
+
+
+class EmptyPoseBackend(PoseBackend):
+    name = "vazio"
+
+    def process(self, image_rgb):
+        return PoseResult(None)
+
+
+def _cost(height: int, num_frames: int) -> JobCost:
+    """Custo de um par de vídeos 16:9 com a altura informada."""
+    width = height * 16 // 9
+    return JobCost([(width, height), (width, height)], num_frames)
+
+
+def test_jobs_beyond_cpu_slots_wait_in_fifo_order():
+    """Verifica que os jobs excedentes esperam em fila com posição e ETA."""
+    print("\nExecutando test_jobs_beyond_cpu_slots_wait_in_fifo_order...")
+    governor = ResourceGovernor(cpu_slots=2, memory_budget_mb=4096, initial_fps=10)
+    tickets = [governor.request(_cost(480, 100), job_name=f"job{i}") for i in range(4)]
+
+    assert [t.admitted for t in tickets] == [True, True, False, False]
+    assert [t.position for t in tickets[2:]] == [1, 2]
+    # 100 frames a 10 fps: o terceiro espera ~10 s, o quarto também (outra vaga).
+    assert tickets[2].eta_seconds == pytest.approx(10, abs=1)
+    assert tickets[2].wait(timeout=0.05) is False
+
+    tickets[0].release()
+    assert tickets[2].admitted and tickets[3].position == 1
+    tickets[1].release()
+    assert tickets[3].wait(timeout=1)
+    assert governor.snapshot()["em_execucao"] == 2
+    print(f"✓ Fila de admissão: {governor.snapshot()} (Correto)")
+
+
+def test_oversized_job_is_degraded_or_rejected():
+    """Verifica que um job acima do orçamento roda em resolução menor, até o mínimo."""
+    full_hd = _cost(1080, 600)
+    budget_mb = full_hd.memory_bytes(0.5) / MB
+    governor = ResourceGovernor(cpu_slots=2, memory_budget_mb=budget_mb, min_inference_height=360)
+
+    ticket = governor.request(full_hd)
+    assert ticket.admitted and ticket.degraded
+    assert 360 / 1080 <= ticket.scale <= 0.5
+    assert ticket.memory_bytes <= governor.memory_budget_bytes
+
+    with pytest.raises(ValueError):
+        governor.request(_cost(1080, 60000))
+
+
+def test_memory_pressure_degrades_instead_of_waiting():
+    """Com vaga de CPU livre e pouca memória, o job entra reduzido em vez de esperar."""
+    job = _cost(720, 300)
+    governor = ResourceGovernor(cpu_slots=2, memory_budget_mb=1.5 * job.memory_bytes() / MB)
+    first = governor.request(job)
+    second = governor.request(job)
+    assert first.admitted and not first.degraded
+    assert second.admitted and second.degraded
+    assert governor.memory_in_use_bytes <= governor.memory_budget_bytes
+
+    # Sem memória nem para a resolução mínima, o próximo espera.
+    third = governor.request(job)
+    assert not third.admitted
+    first.release()
+    assert third.admitted
+
+
+def test_analyzer_reports_queue_and_runs_after_admission(tmp_path, monkeypatch):
+    """Verifica que a segunda análise espera a primeira e publica a posição na fila."""
+    print("\nExecutando test_analyzer_reports_queue_and_runs_after_admission...")
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    path = str(tmp_path / "boneco.avi")
+    write_stick_figure_video(path, num_frames=20, width=320, height=240)
+
+    governor = ResourceGovernor(cpu_slots=1, memory_budget_mb=1024)
+    blocker = governor.request(JobCost([(320, 240)], 10), job_name="outra_sessao")
+    analyzer = video_analyzer.VideoAnalyzer(governor=governor)
+    analyzer.load_video_from_path(path, is_aluno=True)
+    analyzer.load_video_from_path(path, is_aluno=False)
+
+    events = []
+    queued = threading.Event()
+
+    def on_event(event):
+        events.append(event)
+        if event.stage == "fila":
+            queued.set()
+
+    analyzer.analyze_and_compare(lambda: None, event_callback=on_event, max_update_hz=0)
+    assert queued.wait(timeout=5)
+    assert analyzer.raw_frames_aluno == []
+    blocker.release()
+    analyzer.processing_thread.join(timeout=30)
+
+    queue_events = [e for e in events if e.stage == "fila"]
+    assert queue_events[0].queue_position == 1
+    assert len(analyzer.comparison_results) == 20
+    assert governor.snapshot()["em_execucao"] == 0
+    print("✓ Análise aguardou a vaga e rodou em seguida (Correto)")
@@ -0,0 +1,127 @@
+# tests/test_roi_tracking.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_backends import (
+    PoseBackend,
+    PoseResult,
+    RoiTrackingBackend,
+    landmarks_from_array,
+)
+
+
+class BrightRegionBackend(PoseBackend):
+    """
+    Backend de teste que "detecta" a região clara da imagem e espalha os 33
+    landmarks sobre ela. Assim o resultado depende do recorte recebido.
+    """
+
+    name = "regiao"
+
+    def __init__(self, visibility=0.9):
+        self.visibility = visibility
+        self.input_shapes = []
+
+    def process(self, image_rgb):
+        self.input_shapes.append(image_rgb.shape[:2])
+        ys, xs = np.nonzero(image_rgb[:, :, 0] > 127)
+        if len(xs) == 0:
+            return PoseResult(None)
+        height, width = image_rgb.shape[:2]
+        array = np.zeros((33, 4), dtype=np.float32)
+        array[:, 0] = np.linspace(xs.min(), xs.max() + 1, 33) / width
+        array[:, 1] = np.linspace(ys.min(), ys.max() + 1, 33) / height
+        array[:, 3] = self.visibility
+        return PoseResult(landmarks_from_array(array))
+
+
+def _frame(x0=600, y0=300, size=120):
+    """Frame 1280x720 com uma 'pessoa' clara ocupando uma pequena região."""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    frame[y0 : y0 + size, x0 : x0 + size] = 255
+    return frame
+
+
+def _xy(results):
+    return np.array([(lm.x, lm.y) for lm in results.pose_landmarks.landmark])
+
+
+def test_roi_crop_is_used_and_landmarks_are_remapped():
+    """Verifica que, após a detecção inicial, só o recorte é processado e o resultado volta ao frame inteiro."""
+    print("\nExecutando test_roi_crop_is_used_and_landmarks_are_remapped...")
+    inner = BrightRegionBackend()
+    backend = RoiTrackingBackend(inner, padding=0.3, crop_size=256)
+    frame = _frame()
+
+    full = backend.process(frame)
+    tracked = backend.process(frame)
+
+    assert inner.input_shapes == [(720, 1280), (256, 256)]
+    assert backend.full_frames == 1 and backend.roi_frames == 1
+    # O recorte reamostrado introduz no máximo alguns pixels de erro.
+    np.testing.assert_allclose(_xy(tracked), _xy(full), atol=3 / 720)
+    print("✓ Recorte usado e landmarks remapeados para o frame inteiro (Correto)")
+
+
+def test_roi_follows_small_motion_without_redetection():
+    """Verifica que pequenos deslocamentos mantêm o rastreamento no recorte."""
+    inner = BrightRegionBackend()
+    backend = RoiTrackingBackend(inner, padding=0.3, crop_size=256)
+    backend.process(_frame(x0=600))
+    for x0 in (605, 610, 615, 620):
+        results = backend.process(_frame(x0=x0))
+        assert _xy(results)[0, 0] == pytest.approx(x0 / 1280, abs=3 / 1280)
+    assert backend.full_frames == 1
+    assert backend.fallbacks == 0
+
+
+def test_roi_falls_back_to_full_frame_when_pose_is_lost():
+    """Verifica a volta para o frame inteiro quando a pose sai do recorte."""
+    print("\nExecutando test_roi_falls_back_to_full_frame_when_pose_is_lost...")
+    crop_backend = BrightRegionBackend()
+    full_backend = BrightRegionBackend()
+    backend = RoiTrackingBackend(crop_backend, full_frame_backend=full_backend)
+    backend.process(_frame(x0=100))
+
+    # A "pessoa" salta para o outro lado do frame: o recorte fica vazio.
+    results = backend.process(_frame(x0=1000))
+
+    assert backend.fallbacks == 1
+    assert len(full_backend.input_shapes) == 2
+    assert _xy(results)[0, 0] == pytest.approx(1000 / 1280)
+    print("✓ Detecção em frame inteiro retomada após perda da pose (Correto)")
+
+
+def test_roi_requires_confident_torso():
+    """Verifica que poses com tronco pouco visível não iniciam o rastreamento."""
+    backend = RoiTrackingBackend(BrightRegionBackend(visibility=0.2), min_confidence=0.5)
+    backend.process(_frame())
+    backend.process(_frame())
+    assert backend.roi is None
+    assert backend.full_frames == 2
+
+
+def test_roi_resets_when_frame_size_alternates():
+    """Alternar frames 1280x720 e 640x360 não recorta fora do frame e mantém os landmarks corretos."""
+    print("\nExecutando test_roi_resets_when_frame_size_alternates...")
+    backend = RoiTrackingBackend(BrightRegionBackend(), crop_size=256)
+    small = np.zeros((360, 640, 3), dtype=np.uint8)
+    small[40:100, 20:80] = 255
+    for _ in range(3):
+        large_xy = _xy(backend.process(_frame(x0=1000, y0=500)))
+        small_xy = _xy(backend.process(small))
+        assert small_xy[0] == pytest.approx([20 / 640, 40 / 360], abs=0.02)
+        assert large_xy[0] == pytest.approx([1000 / 1280, 500 / 720], abs=0.02)
+    assert backend.frame_shape == (360, 640)
+
+    # Região herdada maior que o frame é ajustada ao frame atual.
+    backend.roi = (500, 300, 1000)
+    backend.process(small)
+    rx, ry, side = backend.roi
+    assert 0 <= rx and 0 <= ry and rx + side <= 640 and ry + side <= 360
+    print("✓ Rastreamento reiniciado a cada troca de resolução (Correto)")
@@ -0,0 +1,116 @@
+# tests/test_session_store.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.session_store import (
+    AnalysisSession,
+    compare_sessions,
+    load_session,
+    save_session,
+)
+
+ANGLE_NAMES = ["LEFT_ELBOW_ANGLE", "RIGHT_ELBOW_ANGLE"]
+
+
+def _fake_landmarks(offset: float):
+    """Gera uma lista de landmarks no formato de get_landmarks_as_list."""
+    return [
+        {"x": offset + i / 100, "y": 0.5, "z": 0.0, "visibility": 0.9, "name": name}
+        for i, name in enumerate(POSE_LANDMARK_NAMES)
+    ]
+
+
+@pytest.fixture
+def session():
+    """Cria uma sessão com 3 frames, sendo o último sem pose do aluno."""
+    aluno = [_fake_landmarks(0.1), _fake_landmarks(0.2), None]
+    mestre = [_fake_landmarks(0.1), _fake_landmarks(0.3), _fake_landmarks(0.4)]
+    results = [
+        {
+            "score": 95.0,
+            "feedback": "Excelente movimento!",
+            "diffs": {"LEFT_ELBOW_ANGLE": 5.0, "RIGHT_ELBOW_ANGLE": 4.0},
+        },
+        {
+            "score": 80.0,
+            "feedback": "Aumente o ângulo do Cotovelo Esquerdo",
+            "diffs": {"LEFT_ELBOW_ANGLE": 30.0, "RIGHT_ELBOW_ANGLE": 6.0},
+        },
+        {"score": 0.0, "feedback": "Aguardando pose...", "diffs": {}},
+    ]
+    return AnalysisSession.from_comparison(
+        aluno, mestre, results, ANGLE_NAMES, video_aluno="aluno.mp4"
+    )
+
+
+def test_save_and_load_roundtrip_with_mmap(session, tmp_path):
+    """Verifica que a sessão salva é reaberta via memory-map com os mesmos dados."""
+    path = save_session(session, str(tmp_path / "sessao"))
+    loaded = load_session(path)
+
+    assert path.endswith(".npz")
+    assert isinstance(loaded.aluno_landmarks, np.memmap)
+    assert loaded.num_frames == 3
+    assert loaded.video_aluno == "aluno.mp4"
+    np.testing.assert_allclose(loaded.scores, [95.0, 80.0, 0.0])
+    assert loaded.frame_result(1) == {
+        "score": 80.0,
+        "feedback": "Aumente o ângulo do Cotovelo Esquerdo",
+        "diffs": {"LEFT_ELBOW_ANGLE": 30.0, "RIGHT_ELBOW_ANGLE": 6.0},
+    }
+    assert loaded.frame_result(2)["diffs"] == {}
+    assert loaded.landmarks_as_list(2, is_aluno=True) is None
+    assert loaded.landmarks_as_list(0)[11]["name"] == "LEFT_SHOULDER"
+    print("✓ Sessão salva e recarregada via memory-map corretamente.")
+
+
+def test_load_without_mmap_matches(session, tmp_path):
+    """Verifica que a leitura sem memory-map produz os mesmos arrays."""
+    path = save_session(session, str(tmp_path / "sessao.npz"))
+    loaded = load_session(path, mmap=False)
+    assert not isinstance(loaded.scores, np.memmap)
+    np.testing.assert_allclose(loaded.angle_diffs, session.angle_diffs, equal_nan=True)
+
+
+def test_load_rejects_unknown_version(session, tmp_path, monkeypatch):
+    """Verifica que sessões de versões incompatíveis geram erro explícito."""
+    import src.session_store as session_store
+
+    path = save_session(session, str(tmp_path / "sessao.npz"))
+    monkeypatch.setattr(session_store, "SESSION_FORMAT_VERSION", 99)
+    with pytest.raises(ValueError):
+        load_session(path)
+
+
+def test_compare_sessions_uses_aggregates(session, tmp_path):
+    """Verifica a comparação entre duas sessões sem reprocessamento."""
+    better = AnalysisSession(
+        session.aluno_landmarks,
+        session.mestre_landmarks,
+        np.asarray(session.scores) + 10,
+        np.asarray(session.angle_diffs) / 2,
+        ANGLE_NAMES,
+    )
+    saved = load_session(save_session(session, str(tmp_path / "a")))
+    result = compare_sessions(saved, better)
+    assert result["score_delta"] == pytest.approx(10.0)
+    assert result["angle_delta"]["LEFT_ELBOW_ANGLE"] == pytest.approx(8.75)
+
+
+def test_summary_with_never_computed_angle_is_silent(session):
+    """Ângulo nunca calculado vira NaN no resumo sem emitir RuntimeWarning."""
+    import warnings
+
+    diffs = np.asarray(session.angle_diffs).copy()
+    diffs[:, 1] = np.nan
+    partial = AnalysisSession(session.aluno_landmarks, session.mestre_landmarks, session.scores, diffs, ANGLE_NAMES)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        means = partial.summary()["angle_means"]
+    assert np.isnan(means["RIGHT_ELBOW_ANGLE"]) and means["LEFT_ELBOW_ANGLE"] == pytest.approx(17.5)
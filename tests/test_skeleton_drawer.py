@@ -0,0 +1,110 @@
+# tests/test_skeleton_drawer.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.skeleton_drawer import (
+    COLOR_CORRECT,
+    COLOR_INCORRECT,
+    COLOR_LEFT,
+    COLOR_RIGHT,
+    SkeletonDrawer,
+)
+
+KEY_ANGLES = {
+    "LEFT_ELBOW_ANGLE": ("LEFT_SHOULDER", "LEFT_ELBOW", "LEFT_WRIST"),
+    "LEFT_SHOULDER_ANGLE": ("LEFT_HIP", "LEFT_SHOULDER", "LEFT_ELBOW"),
+}
+
+
+def _landmarks_list():
+    """Pose simples: lado esquerdo do corpo à direita da imagem, e vice-versa."""
+    positions = {
+        "LEFT_SHOULDER": (0.6, 0.3),
+        "LEFT_ELBOW": (0.7, 0.45),
+        "LEFT_WRIST": (0.8, 0.6),
+        "LEFT_HIP": (0.6, 0.7),
+        "RIGHT_SHOULDER": (0.4, 0.3),
+        "RIGHT_ELBOW": (0.3, 0.45),
+        "RIGHT_WRIST": (0.2, 0.6),
+        "RIGHT_HIP": (0.4, 0.7),
+    }
+    return [
+        {
+            "x": positions.get(name, (0.5, 0.1))[0],
+            "y": positions.get(name, (0.5, 0.1))[1],
+            "z": 0.0,
+            "visibility": 0.9 if name in positions else 0.1,
+            "name": name,
+        }
+        for name in POSE_LANDMARK_NAMES
+    ]
+
+
+def _pixel(image, x, y):
+    return tuple(int(c) for c in image[int(y * image.shape[0]), int(x * image.shape[1])])
+
+
+@pytest.fixture
+def drawer():
+    return SkeletonDrawer(key_angles=KEY_ANGLES)
+
+
+def test_draw_by_side_uses_side_colors(drawer):
+    """Verifica que o antebraço esquerdo sai em laranja e o direito em azul."""
+    print("\nExecutando test_draw_by_side_uses_side_colors...")
+    image = np.zeros((200, 200, 3), dtype=np.uint8)
+    annotated = drawer.draw_by_side(image, _landmarks_list())
+
+    # Ponto médio entre cotovelo e pulso de cada lado.
+    assert _pixel(annotated, 0.75, 0.525) == COLOR_LEFT
+    assert _pixel(annotated, 0.25, 0.525) == COLOR_RIGHT
+    # Sem in_place, a imagem original permanece intacta.
+    assert not image.any()
+    print("✓ Cores por lado aplicadas corretamente.")
+
+
+def test_draw_in_place_reuses_frame(drawer):
+    """Verifica que in_place=True desenha no próprio frame, sem cópia."""
+    image = np.zeros((200, 200, 3), dtype=np.uint8)
+    annotated = drawer.draw_by_side(image, _landmarks_list(), in_place=True)
+    assert annotated is image
+    assert image.any()
+
+
+def test_feedback_prioritizes_incorrect_color(drawer):
+    """Uma conexão compartilhada por um ângulo certo e um errado deve ficar vermelha."""
+    image = np.zeros((200, 200, 3), dtype=np.uint8)
+    diffs = {"LEFT_ELBOW_ANGLE": 5.0, "LEFT_SHOULDER_ANGLE": 40.0}
+    annotated = drawer.draw_feedback(image, _landmarks_list(), diffs)
+
+    # Ombro-cotovelo é compartilhada pelos dois ângulos -> vermelha.
+    assert _pixel(annotated, 0.65, 0.375) == COLOR_INCORRECT
+    # Cotovelo-pulso só pertence ao ângulo correto -> verde.
+    assert _pixel(annotated, 0.75, 0.525) == COLOR_CORRECT
+
+
+def test_feedback_without_pose_returns_copy(drawer):
+    image = np.zeros((50, 50, 3), dtype=np.uint8)
+    annotated = drawer.draw_feedback(image, None, {"LEFT_ELBOW_ANGLE": 5.0})
+    assert annotated is not image
+    assert not annotated.any()
+
+
+def test_connections_match_mediapipe_without_importing_it():
+    """As conexões fixas no config são as do MediaPipe, e o servidor não carrega o MediaPipe ao iniciar."""
+    import subprocess
+
+    import mediapipe as mp
+    from src.config import POSE_CONNECTIONS
+
+    assert sorted(POSE_CONNECTIONS) == sorted(mp.solutions.pose.POSE_CONNECTIONS)
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    code = "import sys, main; print('mediapipe' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,129 @@
+# tests/test_technique_index.py
+
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.auth import AuthService
+from src.session_store import landmarks_list_to_array
+from src.technique_index import TechniqueIndex, pose_descriptor
+from src.utils import angle_sequences
+from synthetic import pose_to_landmarks, stick_figure_pose
+
+
+def _mirror(pose: dict) -> dict:
+    """Espelha o boneco: o soco de direita vira um soco de esquerda."""
+    swapped = {}
+    for name, (x, y) in pose.items():
+        if name.startswith("LEFT_"):
+            name = "RIGHT_" + name[5:]
+        elif name.startswith("RIGHT_"):
+            name = "LEFT_" + name[6:]
+        swapped[name] = (1.0 - x, y)
+    return swapped
+
+
+def _motion(kind: str, num_frames: int) -> np.ndarray:
+    """Sequência de landmarks (N, 33, 4) de um movimento sintético."""
+    poses = []
+    for i in range(num_frames):
+        t = i / num_frames
+        if kind == "soco_direita":
+            pose = stick_figure_pose(t)
+        elif kind == "soco_esquerda":
+            pose = _mirror(stick_figure_pose(t))
+        else:  # guarda parada
+            pose = stick_figure_pose(0.0)
+        poses.append(landmarks_list_to_array(pose_to_landmarks(pose)))
+    return np.stack(poses)
+
+
+LIBRARY = {
+    ("Branca", "Soco_Direita.mp4"): "soco_direita",
+    ("Branca", "Guarda.mp4"): "guarda",
+    ("Amarela", "Soco_Esquerda.mp4"): "soco_esquerda",
+    ("Azul", "Soco_Direita_Avancado.mp4"): "soco_direita",
+}
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Biblioteca de vídeos por faixa; o extrator devolve o movimento de cada arquivo."""
+    for (rank, name), kind in LIBRARY.items():
+        (tmp_path / rank).mkdir(exist_ok=True)
+        (tmp_path / rank / name).write_bytes(f"{rank}/{name}".encode())
+    (tmp_path / "Branca" / "Guarda.txt").write_text("descrição")
+    calls = []
+
+    def extractor(path):
+        calls.append(path)
+        rank, name = path.split("/")[-2:]
+        return _motion(LIBRARY[(rank, name)], num_frames=60)
+
+    return str(tmp_path).replace("\\", "/"), extractor, calls
+
+
+def test_angles_match_scalar_calculation():
+    """Verifica os ângulos vetorizados e o descritor independente da duração do vídeo."""
+    print("\nExecutando test_angles_match_scalar_calculation...")
+    from src.utils import calculate_angle
+
+    landmarks = _motion("soco_direita", 30)
+    points = pose_to_landmarks(stick_figure_pose(0.0))
+    by_name = {lm["name"]: lm for lm in points}
+    expected = calculate_angle(by_name["RIGHT_SHOULDER"], by_name["RIGHT_ELBOW"], by_name["RIGHT_WRIST"])
+    assert angle_sequences(landmarks)[0, 1] == pytest.approx(expected, abs=1e-3)
+
+    # Mesmo golpe gravado com outra duração e com frames sem pose no início.
+    no_pose = np.full((10, 33, 4), np.nan, dtype=np.float32)
+    slower = np.concatenate([no_pose, _motion("soco_direita", 90)])
+    distance_same = np.linalg.norm(pose_descriptor(landmarks) - pose_descriptor(slower))
+    distance_other = np.linalg.norm(pose_descriptor(landmarks) - pose_descriptor(_motion("guarda", 30)))
+    assert distance_same < 0.1 * distance_other
+    assert pose_descriptor(np.full((5, 33, 4), np.nan, dtype=np.float32)) is None
+    print("✓ Descritor invariante à duração (Correto)")
+
+
+def test_query_returns_nearest_technique_filtered_by_rank(library):
+    """Verifica a busca dos k mais próximos restrita às faixas acessíveis ao usuário."""
+    print("\nExecutando test_query_returns_nearest_technique_filtered_by_rank...")
+    videos_dir, extractor, _ = library
+    index = TechniqueIndex.build(videos_dir, extractor=extractor)
+    assert len(index) == 4
+
+    student_clip = _motion("soco_esquerda", 45)
+    best = index.query_landmarks(student_clip, k=2)
+    assert best[0]["video"] == f"{videos_dir}/Amarela/Soco_Esquerda.mp4"
+    assert best[0]["name"] == "Soco Esquerda" and best[0]["distance"] < best[1]["distance"]
+
+    # Aluno de faixa Branca: acessa Branca e Amarela (a próxima), mas não Azul.
+    ranks = AuthService(sheet_url="fake_url").get_accessible_ranks({"GRADUACAO_ATUAL": "Branca"})
+    results = index.query_landmarks(_motion("soco_direita", 45), k=5, ranks=ranks)
+    assert sorted(r["rank"] for r in results) == ["Amarela", "Branca", "Branca"]
+    assert results[0]["name"] == "Soco Direita" and results[0]["rank"] == "Branca"
+    assert index.query_landmarks(student_clip, k=3, ranks=["Marrom"]) == []
+    with pytest.raises(ValueError):
+        index.query(np.zeros(3))
+    print(f"✓ Técnica mais parecida: {best[0]['name']} (Correto)")
+
+
+def test_saved_index_is_reused_for_unchanged_videos(library, tmp_path):
+    """Verifica que o índice gravado é recarregado e que só vídeos novos são processados."""
+    videos_dir, extractor, calls = library
+    index = TechniqueIndex.build(videos_dir, extractor=extractor)
+    path = index.save(str(tmp_path / "indice" / "tecnicas.npz"))
+
+    loaded = TechniqueIndex.load(path)
+    np.testing.assert_array_equal(loaded.descriptors, index.descriptors)
+    assert loaded.videos == index.videos and loaded.ranks == index.ranks
+
+    calls.clear()
+    with open(f"{videos_dir}/Amarela/Soco_Esquerda.mp4", "ab") as f:
+        f.write(b"nova versao")
+    rebuilt = TechniqueIndex.build(videos_dir, extractor=extractor, previous=loaded)
+    assert calls == [f"{videos_dir}/Amarela/Soco_Esquerda.mp4"]
+    assert len(rebuilt) == 4
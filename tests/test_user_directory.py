@@ -0,0 +1,76 @@
+# tests/test_user_directory.py
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from src.auth import AuthService
+from src.user_directory import UserDirectory
+from synthetic import LocalSheetServer, write_users_csv
+
+
+def test_concurrent_sessions_share_one_download(tmp_path):
+    """Simula centenas de logins simultâneos: a planilha é baixada uma única vez."""
+    print("\nExecutando test_concurrent_sessions_share_one_download...")
+    credentials = write_users_csv(str(tmp_path / "usuarios.csv"), num_users=200)
+    num_sessions = 300
+    results = [None] * num_sessions
+    barrier = threading.Barrier(num_sessions)
+
+    with LocalSheetServer(str(tmp_path)) as server:
+        directory = UserDirectory(server.url("usuarios.csv"), refresh_interval=60)
+
+        def session(i):
+            barrier.wait()
+            service = AuthService(directory.sheet_url, directory=directory)
+            cpf, senha = credentials[i % len(credentials)]
+            results[i] = service.login(cpf, senha)
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(num_sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert directory.fetch_count == 1
+    for i, user in enumerate(results):
+        # Na planilha sintética, um em cada dez usuários está inativo.
+        if (i % len(credentials)) % 10 == 0:
+            assert user is None
+        else:
+            assert user["NOME"] == f"Aluno {i % len(credentials)}"
+    print(f"✓ {num_sessions} sessões com {directory.fetch_count} download da planilha (Correto)")
+
+
+def test_reload_swaps_snapshot_without_touching_readers(tmp_path):
+    """Verifica que a recarga cria um snapshot novo e mantém o anterior intacto para quem o lê."""
+    path = str(tmp_path / "usuarios.csv")
+    credentials = write_users_csv(path, num_users=5)
+    directory = UserDirectory(path)
+    old = directory.refresh()
+
+    new_credentials = write_users_csv(path, num_users=8)
+    new = directory.refresh()
+
+    assert new is not old
+    assert len(old) == 5 and len(new) == 8
+    assert old.find(new_credentials[7][0]) is None
+    assert new.find(new_credentials[7][0])["NOME"] == "Aluno 7"
+    # Alterar a cópia devolvida não altera o snapshot compartilhado.
+    new.find(credentials[1][0])["NOME"] = "Outro"
+    assert new.find(credentials[1][0])["NOME"] == "Aluno 1"
+
+
+def test_failed_reload_keeps_previous_users(tmp_path):
+    """Verifica que uma falha ao recarregar a planilha não derruba o login das sessões."""
+    path = str(tmp_path / "usuarios.csv")
+    credentials = write_users_csv(path, num_users=5)
+    service = AuthService(path)
+    os.remove(path)
+
+    service.load_users()
+    assert service.directory.fetch_count == 2
+    assert service.login(*credentials[1])["LOGIN"] == "aluno1"
@@ -0,0 +1,98 @@
+# tests/test_user_sessions.py
+
+import time
+import numpy as np
+from unittest.mock import MagicMock
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.user_sessions import UserSessionStore
+
+USER_ROW = {
+    "CPF": "12345678900",
+    "Senha": "segredo",
+    "STATUS": "Ativo",
+    "NOME": "Aluno Teste",
+    "LOGIN": "aluno",
+    "GRADUACAO_ATUAL": "Amarela",
+    "IDADE": np.int64(30),
+}
+
+
+def test_session_roundtrip_without_password():
+    """Verifica que a sessão devolve o usuário pelo token e não guarda a senha."""
+    print("\nExecutando test_session_roundtrip_without_password...")
+    store = UserSessionStore()
+    token = store.create(USER_ROW)
+
+    user = store.get(token)
+    assert user["LOGIN"] == "aluno"
+    assert "Senha" not in user
+    assert type(user["IDADE"]) is int
+    assert store.get("token-invalido") is None
+    assert store.get(None) is None
+
+    store.revoke(token)
+    assert store.get(token) is None
+    print("✓ Sessão no servidor sem a senha do usuário (Correto)")
+
+
+def test_session_expires():
+    """Verifica que sessões expiradas são descartadas."""
+    store = UserSessionStore(ttl_seconds=0.05)
+    token = store.create(USER_ROW)
+    time.sleep(0.1)
+    assert store.get(token) is None
+    assert len(store) == 0
+
+
+def test_sqlite_sessions_survive_restart(tmp_path):
+    """Verifica que, com SQLite, a sessão continua válida em uma nova instância do store."""
+    db_path = str(tmp_path / "sessoes.sqlite3")
+    token = UserSessionStore(db_path=db_path).create(USER_ROW)
+
+    restarted = UserSessionStore(db_path=db_path)
+    assert restarted.get(token)["NOME"] == "Aluno Teste"
+    restarted.revoke(token)
+    assert UserSessionStore(db_path=db_path).get(token) is None
+
+
+def test_navigation_does_not_read_client_storage(monkeypatch):
+    """Verifica que, após o login, a troca de rotas não consulta o armazenamento do navegador."""
+    print("\nExecutando test_navigation_does_not_read_client_storage...")
+    import main
+
+    auth_service = MagicMock()
+    auth_service.login.return_value = dict(USER_ROW)
+    monkeypatch.setattr(main, "AuthService", lambda sheet_url, **kwargs: auth_service)
+    page = MagicMock()
+    page.client_storage.get.return_value = None
+
+    app = main.AppFBKMKLN(page)
+    app.cpf_field = MagicMock(value="123.456.789-00")
+    app.password_field = MagicMock(value="segredo")
+    app.login(None)
+
+    stored = {call.args[0]: call.args[1] for call in page.client_storage.set.call_args_list}
+    assert list(stored) == [main.SESSION_TOKEN_KEY]
+    assert stored[main.SESSION_TOKEN_KEY] == app.session_token
+
+    for route in ("/dashboard", "/videos", "/dashboard"):
+        page.route = route
+        app.on_route_change(None)
+    # Só a leitura do token na conexão, nenhuma por navegação.
+    assert page.client_storage.get.call_count == 1
+    assert page.views.append.call_args.args[0].route == "/dashboard"
+
+    # Uma nova conexão com o mesmo token recupera a sessão.
+    reconnect_page = MagicMock()
+    reconnect_page.client_storage.get.return_value = app.session_token
+    reconnect_page.route = "/dashboard"
+    reconnected = main.AppFBKMKLN(reconnect_page)
+    assert main.SESSION_STORE.get(reconnected.session_token)["LOGIN"] == "aluno"
+
+    app.logout(None)
+    assert main.SESSION_STORE.get(reconnected.session_token) is None
+    print("✓ Navegação usa apenas a sessão no servidor (Correto)")
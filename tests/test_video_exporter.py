@@ -0,0 +1,133 @@
+# tests/test_video_exporter.py
+
+import pytest
+import numpy as np
+import cv2
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import POSE_LANDMARK_NAMES
+from src.session_store import AnalysisSession
+from src.video_exporter import StreamingVideoExporter, VideoExportJob
+
+
+def _landmarks():
+    return [
+        {"x": 0.3 + i / 100, "y": 0.2 + i / 50, "z": 0.0, "visibility": 0.9, "name": name}
+        for i, name in enumerate(POSE_LANDMARK_NAMES)
+    ]
+
+
+def _write_video(path, num_frames, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for i in range(num_frames):
+        writer.write(np.full((size[1], size[0], 3), i * 8, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def _read_video(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_streaming_exporter_writes_side_by_side_frames(tmp_path):
+    """Verifica que os pares de frames viram um vídeo lado a lado com altura comum."""
+    print("\nExecutando test_streaming_exporter_writes_side_by_side_frames...")
+    output = str(tmp_path / "saida.mp4")
+    exporter = StreamingVideoExporter(output, fps=30, backend="opencv", queue_size=2)
+    aluno = np.zeros((48, 64, 3), dtype=np.uint8)
+    mestre = np.full((96, 64, 3), 200, dtype=np.uint8)  # Redimensionado para 48 px de altura.
+    for _ in range(12):
+        exporter.submit(aluno, mestre, 87.0)
+    assert exporter.close() == output
+
+    frames = _read_video(output)
+    assert exporter.frames_written == 12
+    assert len(frames) == 12
+    assert frames[0].shape == (48, 64 + 32, 3)
+    # Os frames enviados não são alterados pela composição.
+    assert not aluno.any()
+    print("✓ Vídeo lado a lado gerado em streaming (Correto)")
+
+
+def test_streaming_exporter_reports_sink_errors(tmp_path):
+    """Verifica que uma falha ao criar o vídeo é propagada ao produtor."""
+    exporter = StreamingVideoExporter(str(tmp_path / "saida.mp4"), backend="inexistente")
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    exporter.submit(frame, frame)
+    with pytest.raises(RuntimeError):
+        exporter.close()
+
+
+def test_export_job_renders_session_in_background(tmp_path):
+    """Verifica a exportação em segundo plano de uma sessão salva, com progresso."""
+    print("\nExecutando test_export_job_renders_session_in_background...")
+    video_aluno = _write_video(str(tmp_path / "aluno.avi"), 10)
+    video_mestre = _write_video(str(tmp_path / "mestre.avi"), 10)
+    results = [{"score": 90.0, "feedback": "", "diffs": {}}] * 10
+    session = AnalysisSession.from_comparison(
+        [_landmarks()] * 9 + [None],
+        [_landmarks()] * 10,
+        results,
+        [],
+        video_aluno=video_aluno,
+        video_mestre=video_mestre,
+    )
+
+    events = []
+    done = []
+    job = VideoExportJob(
+        session,
+        str(tmp_path / "sessao.mp4"),
+        done_callback=done.append,
+        event_callback=events.append,
+        backend="opencv",
+    )
+    path = job.start().wait(timeout=30)
+
+    assert done == [path]
+    assert len(_read_video(path)) == 10
+    assert events[-1].done and events[-1].stage == "exportacao"
+    print("✓ Sessão exportada em segundo plano (Correto)")
+
+
+def test_export_only_analysis_does_not_keep_frames(tmp_path, monkeypatch):
+    """Com export_path e sem keep_frames, a análise só exporta os frames: nada fica guardado em memória."""
+    print("\nExecutando test_export_only_analysis_does_not_keep_frames...")
+    from src import video_analyzer
+    from src.pose_backends import PoseBackend, PoseResult
+    from src.pose_estimator import PoseEstimator
+    from src.resource_governor import ResourceGovernor
+
+    class EmptyPoseBackend(PoseBackend):
+        name = "vazio"
+
+        def process(self, image_rgb):
+            return PoseResult(None)
+
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    analyzer = video_analyzer.VideoAnalyzer(governor=ResourceGovernor(cpu_slots=1, memory_budget_mb=1024))
+    analyzer.load_video_from_path(_write_video(str(tmp_path / "aluno.avi"), 10), is_aluno=True)
+    analyzer.load_video_from_path(_write_video(str(tmp_path / "mestre.avi"), 10), is_aluno=False)
+    output = str(tmp_path / "saida.avi")
+    analyzer.analyze_and_compare(lambda: None, export_path=output, export_backend="opencv")
+    analyzer.processing_thread.join(timeout=30)
+
+    assert analyzer.last_error is None and analyzer.exported_video_path == output
+    assert len(_read_video(output)) == 10 and len(analyzer.comparison_results) == 10
+    assert not analyzer.processed_frames_aluno and not analyzer.processed_frames_mestre
+    assert not analyzer.raw_frames_aluno and not analyzer.raw_frames_mestre
+    snapshot = analyzer.snapshot_results()
+    assert snapshot.num_frames == 10 and snapshot.processed_frame(0) is None
+    assert analyzer.admission.cost.num_frames == 0
+    print("✓ Exportação sem guardar frames (Correto)")
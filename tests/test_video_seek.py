@@ -0,0 +1,90 @@
+# tests/test_video_seek.py
+
+import pytest
+import numpy as np
+import cv2
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.pose_backends import PoseBackend, PoseResult
+from src.pose_estimator import PoseEstimator
+from src.video_seek import VideoSegment, open_segment, seek_to_frame
+import src.video_analyzer as video_analyzer
+
+BITS = 10
+
+
+def _encode(index):
+    """Frame com o índice gravado em blocos preto/branco (resiste à compressão)."""
+    frame = np.zeros((64, 16 * BITS, 3), dtype=np.uint8)
+    for bit in range(BITS):
+        if index >> bit & 1:
+            frame[:, bit * 16 : (bit + 1) * 16] = 255
+    return frame
+
+
+def _decode(frame):
+    return sum(1 << bit for bit in range(BITS) if frame[:, bit * 16 + 8].mean() > 127)
+
+
+@pytest.fixture
+def indexed_video(tmp_path):
+    """Vídeo MPEG-4 (com frames P entre os keyframes) de 300 frames a 30 fps."""
+    path = str(tmp_path / "indexado.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (16 * BITS, 64))
+    for i in range(300):
+        writer.write(_encode(i))
+    writer.release()
+    return path
+
+
+class EmptyPoseBackend(PoseBackend):
+    name = "vazio"
+
+    def process(self, image_rgb):
+        return PoseResult(None)
+
+
+def test_seek_to_frame_is_frame_accurate(indexed_video):
+    """Verifica que a busca para em exatamente o frame pedido, inclusive entre keyframes."""
+    print("\nExecutando test_seek_to_frame_is_frame_accurate...")
+    cap = cv2.VideoCapture(indexed_video)
+    for target in (137, 13, 250, 251, 0):
+        assert seek_to_frame(cap, target) == target
+        ret, frame = cap.read()
+        assert ret and _decode(frame) == target
+    cap.release()
+    print("✓ Busca precisa por frame (Correto)")
+
+
+def test_open_segment_converts_seconds_to_frames(indexed_video):
+    """Verifica a conversão do trecho em segundos e o limite no fim do vídeo."""
+    cap = cv2.VideoCapture(indexed_video)
+    assert open_segment(cap, (2.0, 3.5)) == (60, 45)
+    assert _decode(cap.read()[1]) == 60
+    assert open_segment(cap, VideoSegment(9.5, 20.0)) == (285, 15)
+    cap.release()
+    with pytest.raises(ValueError):
+        VideoSegment(5.0, 4.0)
+
+
+def test_analysis_decodes_only_requested_segments(indexed_video, monkeypatch):
+    """Verifica que a análise usa trechos independentes para aluno e mestre."""
+    print("\nExecutando test_analysis_decodes_only_requested_segments...")
+    monkeypatch.setattr(video_analyzer, "PoseEstimator", lambda: PoseEstimator(EmptyPoseBackend()))
+    analyzer = video_analyzer.VideoAnalyzer()
+    analyzer.cap_aluno = cv2.VideoCapture(indexed_video)
+    analyzer.cap_mestre = cv2.VideoCapture(indexed_video)
+
+    analyzer.analyze_and_compare(lambda: None, aluno_segment=(5.0, 6.0), mestre_segment=(1.0, None))
+    analyzer.processing_thread.join(timeout=30)
+
+    decoded_aluno = [_decode(f) for f in analyzer.raw_frames_aluno]
+    decoded_mestre = [_decode(f) for f in analyzer.raw_frames_mestre]
+    assert decoded_aluno == list(range(150, 180))
+    assert decoded_mestre == list(range(30, 60))
+    assert analyzer.segment_start_frames == {"aluno": 150, "mestre": 30}
+    assert analyzer.metrics.snapshot()["counters"]["frames_decodificados"] == 60
+    print("✓ Apenas os trechos pedidos foram decodificados (Correto)")